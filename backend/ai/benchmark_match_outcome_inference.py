@@ -0,0 +1,92 @@
+"""
+Micro-benchmark the 1X2 inference backends on the deployed artifacts.
+
+For each `MatchOutcomeInferenceService` backend (torch, torchscript,
+numpy) reports:
+- single-row latency (one `predict_batch` call per fixture, as the
+  per-match endpoints do)
+- 1k-row latency (one batch, as `generate_predictions` does)
+- rows/s with several threads calling single-row predictions at once
+- max absolute probability difference against the torch backend
+
+Features are random rows of the scaler's input width; latency does not
+depend on their values.
+
+    python -m ai.benchmark_match_outcome_inference --threads 4
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import numpy as np
+
+try:
+    from backend.ai.match_outcome_inference import INFERENCE_BACKENDS, MatchOutcomeInferenceService
+except ImportError:
+    from ai.match_outcome_inference import INFERENCE_BACKENDS, MatchOutcomeInferenceService
+
+
+def _median_seconds(call, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def _threaded_rows_per_second(service, rows: np.ndarray, threads: int, calls_per_thread: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(calls_per_thread):
+            service.predict_batch(rows[i % len(rows) : i % len(rows) + 1])
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * calls_per_thread / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark match-outcome inference backends")
+    parser.add_argument("--repeats", type=int, default=2000, help="Timed single-row calls per backend")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--batch-repeats", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    reference = MatchOutcomeInferenceService(backend="torch")
+    if not reference.is_ready():
+        print("Match-outcome artifacts are missing; train the model first (python -m ai.train).")
+        return
+
+    width = int(getattr(reference._snapshot.scaler, "n_features_in_"))
+    rng = np.random.default_rng(args.seed)
+    batch = rng.normal(size=(args.batch_size, width)).astype(np.float32)
+    expected = reference.predict_batch(batch)
+
+    print(f"features={width} batch={args.batch_size} threads={args.threads}")
+    print(f"{'backend':<12} {'1 row (us)':>11} {'batch (ms)':>11} {'threaded rows/s':>16} {'max |dp|':>10}")
+    for backend in INFERENCE_BACKENDS:
+        service = MatchOutcomeInferenceService(backend=backend)
+        service.predict_batch(batch[:1])  # load + warm up
+
+        single = _median_seconds(lambda: service.predict_batch(batch[:1]), args.repeats)
+        batched = _median_seconds(lambda: service.predict_batch(batch), args.batch_repeats)
+        threaded = _threaded_rows_per_second(service, batch, args.threads, max(1, args.repeats // args.threads))
+        drift = float(np.abs(service.predict_batch(batch) - expected).max())
+
+        print(f"{backend:<12} {single * 1e6:>11.1f} {batched * 1e3:>11.2f} {threaded:>16.0f} {drift:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark the Monte Carlo season simulator.
+
+Simulates the second half of a synthetic 20-team double round-robin
+(190 remaining fixtures, random 1X2 probabilities) and reports seasons
+per second for each simulation count and worker count.
+
+    python -m ai.benchmark_season_simulator --workers 1 4
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+try:
+    from backend.ai.season_simulator import SeasonState, simulate_season_positions
+except ImportError:
+    from ai.season_simulator import SeasonState, simulate_season_positions
+
+
+def _synthetic_state(n_teams: int, seed: int) -> SeasonState:
+    rng = np.random.default_rng(seed)
+    pairs = [(h, a) for h in range(n_teams) for a in range(n_teams) if h != a]
+    remaining = [pairs[i] for i in rng.permutation(len(pairs))[: len(pairs) // 2]]
+    probabilities = rng.dirichlet([4.5, 2.5, 3.0], size=len(remaining))
+    return SeasonState(
+        team_ids=tuple(range(1, n_teams + 1)),
+        points=np.sort(rng.integers(10, 45, size=n_teams))[::-1].astype(np.float32),
+        home_index=np.asarray([h for h, _ in remaining], dtype=np.int64),
+        away_index=np.asarray([a for _, a in remaining], dtype=np.int64),
+        probabilities=probabilities,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the season simulator")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--simulations", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    state = _synthetic_state(args.teams, args.seed)
+    simulate_season_positions(state, 1000, seed=args.seed)  # warm up
+
+    print(f"teams={args.teams} remaining_fixtures={len(state.home_index)} cpus={os.cpu_count()}")
+    print(f"{'simulations':>12} {'workers':>8} {'seconds':>9} {'seasons/s':>12}")
+    for n_simulations in args.simulations:
+        for workers in args.workers:
+            started = time.perf_counter()
+            counts, _ = simulate_season_positions(state, n_simulations, seed=args.seed, workers=workers)
+            elapsed = time.perf_counter() - started
+            assert counts.sum() == n_simulations * args.teams
+            print(f"{n_simulations:>12} {workers:>8} {elapsed:>9.3f} {n_simulations / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,102 +9,56 @@ The result is the ground truth used by the training pipeline:
 - For any future match, we look up the *latest* `post_match_elo` for each
   team and feed it as the `*_elo_pre` of that fixture.
 
-Re-run safely whenever new finished matches arrive: the table is
-truncated and rebuilt from scratch (cheap, ~2k matches in our dataset).
+The team form store (`ai.team_form_store`) is rebuilt afterwards, since its
+snapshots carry the ratings too.
+
+Re-run safely at any time: the table is truncated and rebuilt from
+scratch (cheap, ~2k matches in our dataset), together with the current
+rating per team (`team_elo_ratings`). Between runs the scheduler keeps
+both current with `ai.elo_updater.refresh_elo`.
 """
 
 from __future__ import annotations
 
 import os
 import sys
-from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import text  # noqa: E402
-
 try:
-    from backend.ai.elo import EloEngine, EloMatchInput
+    from backend.ai.elo_updater import rebuild_elo
+    from backend.ai.team_form_store import rebuild_team_form_store
     from backend.database import SessionLocal
-    from backend.models import Match, TeamEloSnapshot
+    from backend.models import TeamEloSnapshot
 except ImportError:
-    from ai.elo import EloEngine, EloMatchInput  # type: ignore[no-redef]
+    from ai.elo_updater import rebuild_elo  # type: ignore[no-redef]
+    from ai.team_form_store import rebuild_team_form_store  # type: ignore[no-redef]
     from database import SessionLocal  # type: ignore[no-redef]
-    from models import Match, TeamEloSnapshot  # type: ignore[no-redef]
-
-
-FINISHED_STATUSES = {"FT", "AET", "PEN"}
+    from models import TeamEloSnapshot  # type: ignore[no-redef]
 
 
 def main() -> None:
     db = SessionLocal()
     try:
-        # Wipe and rebuild from scratch. Cheaper than incremental updates
-        # at our scale and avoids tricky ordering bugs around late-arriving
-        # finished matches.
-        db.execute(text("DELETE FROM team_elo_snapshots"))
+        # Wipe and rebuild from scratch. The scheduler keeps the tables
+        # current incrementally (ai.elo_updater); this is the weekly safety
+        # net and the backfill after seed scripts.
+        ratings = rebuild_elo(db)
+        snapshot_count = db.query(TeamEloSnapshot).count()
         db.commit()
 
-        finished = (
-            db.query(Match)
-            .filter(Match.status.in_(FINISHED_STATUSES))
-            .filter(Match.home_score.isnot(None))
-            .filter(Match.away_score.isnot(None))
-            .order_by(Match.start_time.asc(), Match.id.asc())
-            .all()
-        )
-        print(f"Replaying Elo over {len(finished)} finished matches...")
-
-        engine = EloEngine()
-        snapshots = []
-
-        for match in finished:
-            update = engine.update_from_match(
-                EloMatchInput(
-                    match_id=match.id,
-                    home_team_id=match.home_team_id,
-                    away_team_id=match.away_team_id,
-                    home_score=match.home_score,
-                    away_score=match.away_score,
-                )
-            )
-            snapshot_at = match.start_time or datetime.utcnow()
-
-            snapshots.append(
-                TeamEloSnapshot(
-                    team_id=match.home_team_id,
-                    match_id=match.id,
-                    pre_match_elo=update.home_pre,
-                    post_match_elo=update.home_post,
-                    is_home=True,
-                    snapshot_at=snapshot_at,
-                )
-            )
-            snapshots.append(
-                TeamEloSnapshot(
-                    team_id=match.away_team_id,
-                    match_id=match.id,
-                    pre_match_elo=update.away_pre,
-                    post_match_elo=update.away_post,
-                    is_home=False,
-                    snapshot_at=snapshot_at,
-                )
-            )
-
-        # Insert in chunks so we don't overwhelm the Supabase pooler with
-        # one giant INSERT.
-        batch_size = 500
-        for i in range(0, len(snapshots), batch_size):
-            db.bulk_save_objects(snapshots[i : i + batch_size])
-            db.commit()
-
-        ratings = engine.snapshot()
         top10 = sorted(ratings.items(), key=lambda kv: kv[1], reverse=True)[:10]
-        print(f"\nFinal Elo top 10 (out of {len(ratings)} teams):")
+        print(f"Final Elo top 10 (out of {len(ratings)} teams):")
         for team_id, rating in top10:
             print(f"  team_id={team_id}  elo={rating:.1f}")
 
-        print(f"\nPersisted {len(snapshots)} snapshots.")
+        print(f"\nPersisted {snapshot_count} snapshots.")
+
+        # Team form snapshots carry Elo (and form vs strong opponents), so
+        # they are rebuilt against the new ratings.
+        form_rows = rebuild_team_form_store(db)
+        db.commit()
+        print(f"Rebuilt {form_rows} team form snapshots.")
     finally:
         db.close()
 
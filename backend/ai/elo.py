@@ -17,9 +17,11 @@ final rating dictionary. Persistence is handled separately.
 
 from __future__ import annotations
 
+import bisect
+import datetime
 import math
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 # Initial rating granted to a team the first time we see it. Anchored at
 # 1500 because that's the long-time community standard; calibration below
@@ -71,8 +73,13 @@ def _goal_diff_multiplier(goal_diff: int) -> float:
 class EloEngine:
     """Stateful per-team rating tracker."""
 
-    def __init__(self, default_rating: float = DEFAULT_RATING):
-        self._ratings: Dict[int, float] = {}
+    def __init__(
+        self,
+        default_rating: float = DEFAULT_RATING,
+        initial_ratings: Optional[Mapping[int, float]] = None,
+    ):
+        # `initial_ratings` resumes a replay part-way through the history.
+        self._ratings: Dict[int, float] = dict(initial_ratings or {})
         self._default_rating = default_rating
 
     def rating(self, team_id: int) -> float:
@@ -124,3 +131,34 @@ class EloEngine:
 def expected_home_score(home_rating: float, away_rating: float) -> float:
     """Convenience wrapper used at inference time (UI predictions)."""
     return _expected_score(home_rating + HOME_ADVANTAGE, away_rating)
+
+
+class EloTimeline:
+    """Persisted post-match ratings per team, answering "latest rating before t".
+
+    In-memory equivalent of querying `team_elo_snapshots` for the newest
+    `post_match_elo` with `snapshot_at < t` (DEFAULT_RATING when none).
+    """
+
+    def __init__(self, snapshots: Iterable[Any]):
+        by_team: Dict[int, List[Tuple[datetime.datetime, int, float]]] = {}
+        self._pre_match: Dict[Tuple[int, int], float] = {}
+        for snap in snapshots:
+            by_team.setdefault(snap.team_id, []).append((snap.snapshot_at, snap.id, float(snap.post_match_elo)))
+            self._pre_match[(snap.team_id, snap.match_id)] = float(snap.pre_match_elo)
+        self._times: Dict[int, List[datetime.datetime]] = {}
+        self._ratings: Dict[int, List[float]] = {}
+        for team_id, rows in by_team.items():
+            rows.sort(key=lambda row: (row[0], row[1]))
+            self._times[team_id] = [row[0] for row in rows]
+            self._ratings[team_id] = [row[2] for row in rows]
+
+    def latest_before(self, team_id: int, before: datetime.datetime) -> float:
+        times = self._times.get(team_id)
+        if not times:
+            return DEFAULT_RATING
+        position = bisect.bisect_left(times, before)
+        return self._ratings[team_id][position - 1] if position else DEFAULT_RATING
+
+    def pre_match(self, team_id: int, match_id: int) -> Optional[float]:
+        return self._pre_match.get((team_id, match_id))
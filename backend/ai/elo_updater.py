@@ -0,0 +1,252 @@
+"""Incremental maintenance of `team_elo_snapshots` and `team_elo_ratings`.
+
+`build_elo_history` replays every finished match from scratch. A result only
+changes the ratings from its own kickoff on, so once the sync that stores it
+has committed, the scheduler's `refresh_derived_data` job calls
+`refresh_elo(db, since)`:
+
+- Every team's rating just before `since` is read from its latest snapshot
+  (one window query), which is exactly where a full replay would stand at
+  that point.
+- Snapshots from `since` on are deleted and the finished matches from
+  `since` on are replayed in the full rebuild's order (kickoff, then id).
+  A new result at full time replays just that match; a late or corrected
+  result replays everything after it, including the downstream opponents
+  whose ratings it moves.
+- `team_elo_ratings` (current rating per team) is updated for every team
+  whose snapshots were touched.
+
+Finished matches without a kickoff can't be placed in the timeline and are
+not rated, by the full rebuild either.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, inspect as sa_inspect, select
+from sqlalchemy.orm import Session
+
+try:
+    from backend.ai.elo import EloEngine, EloMatchInput
+    from backend.models import Match, TeamEloRating, TeamEloSnapshot
+except ImportError:
+    from ai.elo import EloEngine, EloMatchInput  # type: ignore[no-redef]
+    from models import Match, TeamEloRating, TeamEloSnapshot  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+
+_ratings_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _latest_snapshots(
+    db: Session,
+    team_ids: Optional[Iterable[int]] = None,
+    before: Optional[datetime.datetime] = None,
+) -> List[Any]:
+    """Each team's newest snapshot (by kickoff, then match id), optionally before a kickoff."""
+    ranked = select(
+        TeamEloSnapshot.team_id,
+        TeamEloSnapshot.match_id,
+        TeamEloSnapshot.post_match_elo,
+        TeamEloSnapshot.snapshot_at,
+        func.row_number()
+        .over(
+            partition_by=TeamEloSnapshot.team_id,
+            order_by=(TeamEloSnapshot.snapshot_at.desc(), TeamEloSnapshot.match_id.desc()),
+        )
+        .label("position"),
+    )
+    if team_ids is not None:
+        ranked = ranked.where(TeamEloSnapshot.team_id.in_(sorted(set(team_ids))))
+    if before is not None:
+        ranked = ranked.where(TeamEloSnapshot.snapshot_at < before)
+    ranked = ranked.subquery()
+    return db.execute(select(ranked).where(ranked.c.position == 1)).all()
+
+
+def _rated_matches(db: Session, since: Optional[datetime.datetime]) -> List[Match]:
+    query = (
+        db.query(Match)
+        .filter(Match.status.in_(FINISHED_STATUSES))
+        .filter(Match.home_score.isnot(None))
+        .filter(Match.away_score.isnot(None))
+        .filter(Match.start_time.isnot(None))
+    )
+    if since is not None:
+        query = query.filter(Match.start_time >= since)
+    return query.order_by(Match.start_time.asc(), Match.id.asc()).all()
+
+
+def replay_elo_from(db: Session, since: Optional[datetime.datetime]) -> Dict[int, datetime.datetime]:
+    """Rewrite every Elo snapshot from `since` on (``None``: all of them).
+
+    Returns team_id -> earliest kickoff whose snapshot was added, changed
+    or removed, in the shape `team_form_store.refresh_team_form` takes.
+    Does not touch `team_elo_ratings`; see `refresh_elo`.
+    """
+    stale = db.query(TeamEloSnapshot.team_id, func.min(TeamEloSnapshot.snapshot_at)).group_by(TeamEloSnapshot.team_id)
+    if since is not None:
+        stale = stale.filter(TeamEloSnapshot.snapshot_at >= since)
+    touched: Dict[int, datetime.datetime] = {team_id: first for team_id, first in stale.all()}
+
+    matches = _rated_matches(db, since)
+    team_ids: Set[int] = {team_id for m in matches for team_id in (m.home_team_id, m.away_team_id)}
+    initial_ratings = {}
+    if since is not None and team_ids:
+        initial_ratings = {row.team_id: float(row.post_match_elo) for row in _latest_snapshots(db, team_ids, since)}
+
+    delete = db.query(TeamEloSnapshot)
+    if since is not None:
+        delete = delete.filter(TeamEloSnapshot.snapshot_at >= since)
+    delete.delete(synchronize_session=False)
+
+    engine = EloEngine(initial_ratings=initial_ratings)
+    snapshots: List[TeamEloSnapshot] = []
+    for match in matches:
+        update = engine.update_from_match(
+            EloMatchInput(
+                match_id=match.id,
+                home_team_id=match.home_team_id,
+                away_team_id=match.away_team_id,
+                home_score=match.home_score,
+                away_score=match.away_score,
+            )
+        )
+        for team_id, pre, post, is_home in (
+            (match.home_team_id, update.home_pre, update.home_post, True),
+            (match.away_team_id, update.away_pre, update.away_post, False),
+        ):
+            snapshots.append(
+                TeamEloSnapshot(
+                    team_id=team_id,
+                    match_id=match.id,
+                    pre_match_elo=pre,
+                    post_match_elo=post,
+                    is_home=is_home,
+                    snapshot_at=match.start_time,
+                )
+            )
+            if team_id not in touched or match.start_time < touched[team_id]:
+                touched[team_id] = match.start_time
+
+    # Insert in chunks so we don't overwhelm the Supabase pooler with one
+    # giant INSERT.
+    batch_size = 500
+    for i in range(0, len(snapshots), batch_size):
+        db.bulk_save_objects(snapshots[i : i + batch_size])
+    db.flush()
+    return touched
+
+
+def refresh_current_ratings(db: Session, team_ids: Optional[Iterable[int]] = None) -> int:
+    """Re-materialise `team_elo_ratings` from the snapshots (``None``: every team)."""
+    now = datetime.datetime.utcnow()
+    latest = {row.team_id: row for row in _latest_snapshots(db, team_ids)}
+
+    existing = db.query(TeamEloRating)
+    if team_ids is not None:
+        team_ids = sorted(set(team_ids))
+        existing = existing.filter(TeamEloRating.team_id.in_(team_ids))
+
+    for current in existing.all():
+        row = latest.pop(current.team_id, None)
+        if row is None:
+            db.delete(current)
+            continue
+        current.rating = float(row.post_match_elo)
+        current.last_match_id = row.match_id
+        current.last_match_at = row.snapshot_at
+        current.updated_at = now
+
+    db.add_all(
+        TeamEloRating(
+            team_id=row.team_id,
+            rating=float(row.post_match_elo),
+            last_match_id=row.match_id,
+            last_match_at=row.snapshot_at,
+            updated_at=now,
+        )
+        for row in latest.values()
+    )
+    db.flush()
+    return len(latest)
+
+
+def refresh_elo(db: Session, since: Optional[datetime.datetime]) -> Dict[int, datetime.datetime]:
+    """Replay Elo from `since` inside the caller's transaction.
+
+    Returns the teams whose snapshots changed (see `replay_elo_from`), empty
+    when nothing could be replayed. Runs in SAVEPOINTs so a missing table
+    (migration not applied yet) can't abort the caller's transaction.
+    """
+    if since is None:
+        return {}
+    try:
+        with db.begin_nested():
+            touched = replay_elo_from(db, since)
+    except Exception:
+        logger.warning("Could not replay Elo from %s; run ai/build_elo_history.py", since, exc_info=True)
+        return {}
+
+    try:
+        with db.begin_nested():
+            refresh_current_ratings(db, touched)
+    except Exception:
+        logger.warning("Could not refresh team_elo_ratings", exc_info=True)
+
+    logger.debug("Replayed Elo from %s for %s teams", since, len(touched))
+    return touched
+
+
+def rebuild_elo(db: Session) -> Dict[int, float]:
+    """Replace every snapshot and current rating. Returns the final ratings."""
+    replay_elo_from(db, None)
+    db.query(TeamEloRating).delete(synchronize_session=False)
+    refresh_current_ratings(db)
+    return {row.team_id: float(row.rating) for row in db.query(TeamEloRating).all()}
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+
+def _ratings_table_available(db: Session) -> bool:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    present = _ratings_table_present.get(engine)
+    if present is None:
+        present = sa_inspect(db.connection()).has_table(TeamEloRating.__tablename__)
+        _ratings_table_present[engine] = present
+    return present
+
+
+def current_ratings(db: Session, team_ids: Iterable[int]) -> Dict[int, float]:
+    """Current rating per team, for the teams that have one (one query)."""
+    team_ids = sorted(set(team_ids))
+    if not team_ids:
+        return {}
+    if _ratings_table_available(db):
+        rows = db.query(TeamEloRating.team_id, TeamEloRating.rating).filter(TeamEloRating.team_id.in_(team_ids))
+        return {team_id: float(rating) for team_id, rating in rows}
+    return {row.team_id: float(row.post_match_elo) for row in _latest_snapshots(db, team_ids)}
+
+
+def current_rating(db: Session, team_id: int, before: datetime.datetime) -> Optional[float]:
+    """The team's current rating if its latest rated match kicked off before `before`.
+
+    None means "ask `team_elo_snapshots`": the kickoff is in the past, the
+    team is unrated, or the table doesn't exist yet.
+    """
+    if not _ratings_table_available(db):
+        return None
+
+    current = db.get(TeamEloRating, team_id)
+    if current is None or current.last_match_at >= before:
+        return None
+    return float(current.rating)
@@ -16,22 +16,24 @@ from pathlib import Path
 
 try:
     from backend.database import SessionLocal
-    from backend.ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from backend.ai.next_event_features import FEATURE_COLUMNS
     from backend.ai.next_event_ranker import (
         DEFAULT_ARTIFACT_PATH,
         evaluate_ranked_samples,
         load_artifact,
         split_samples_chronologically,
     )
+    from backend.ai.next_event_training_data import WORKERS, cached_training_frames
 except ImportError:
     from database import SessionLocal
-    from ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from ai.next_event_features import FEATURE_COLUMNS
     from ai.next_event_ranker import (
         DEFAULT_ARTIFACT_PATH,
         evaluate_ranked_samples,
         load_artifact,
         split_samples_chronologically,
     )
+    from ai.next_event_training_data import WORKERS, cached_training_frames
 
 
 def _to_serializable(obj):
@@ -78,6 +80,7 @@ def main():
     parser.add_argument("--artifact", type=str, default=str(DEFAULT_ARTIFACT_PATH))
     parser.add_argument("--output", type=str, default="ai/artifacts/next_event_evaluation.json")
     parser.add_argument("--test-ratio", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=WORKERS)
     args = parser.parse_args()
 
     artifact_path = Path(args.artifact)
@@ -93,10 +96,10 @@ def main():
 
     db = SessionLocal()
     try:
-        builder = NextEventFeatureBuilder(db)
-
-        goal_frame = builder.build_training_frame("goal")
-        assist_frame = builder.build_training_frame("assist")
+        # Same frames as training; reused from its cache when the data hasn't changed.
+        frames = cached_training_frames(db, workers=args.workers)
+        goal_frame = frames["goal"]
+        assist_frame = frames["assist"]
 
         _, goal_test = split_samples_chronologically(goal_frame, test_ratio=args.test_ratio)
         _, assist_test = split_samples_chronologically(assist_frame, test_ratio=args.test_ratio)
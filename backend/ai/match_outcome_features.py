@@ -26,8 +26,9 @@ predicted draws. The additional signals target three known weaknesses:
 
 from __future__ import annotations
 
+import bisect
 import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -35,11 +36,17 @@ from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 try:
-    from backend.ai.elo import DEFAULT_RATING
+    from backend.ai.elo import DEFAULT_RATING, EloTimeline
+    from backend.ai.elo_updater import current_rating
+    from backend.ai.team_form_store import latest_team_form
     from backend.models import League, Match, Team, TeamEloSnapshot
+    from backend.services.team_matches import recent_team_matches
 except ImportError:
-    from ai.elo import DEFAULT_RATING  # type: ignore[no-redef]
+    from ai.elo import DEFAULT_RATING, EloTimeline  # type: ignore[no-redef]
+    from ai.elo_updater import current_rating  # type: ignore[no-redef]
+    from ai.team_form_store import latest_team_form  # type: ignore[no-redef]
     from models import League, Match, Team, TeamEloSnapshot  # type: ignore[no-redef]
+    from services.team_matches import recent_team_matches  # type: ignore[no-redef]
 
 
 FINISHED_STATUSES = {"FT", "AET", "PEN"}
@@ -475,6 +482,9 @@ def _team_pre_match_elo(db: Session, team_id: int, match_id: int) -> Optional[fl
 
 
 def _team_latest_post_elo(db: Session, team_id: int, before: datetime.datetime) -> float:
+    current = current_rating(db, team_id, before)
+    if current is not None:
+        return current
     snap = (
         db.query(TeamEloSnapshot)
         .filter(TeamEloSnapshot.team_id == team_id)
@@ -488,37 +498,13 @@ def _team_latest_post_elo(db: Session, team_id: int, before: datetime.datetime)
 def _recent_finished(
     db: Session, team_id: int, before: datetime.datetime, limit: int = 10
 ) -> List[Match]:
-    return (
-        db.query(Match)
-        .filter(Match.status.in_(FINISHED_STATUSES))
-        .filter(or_(Match.home_team_id == team_id, Match.away_team_id == team_id))
-        .filter(Match.start_time < before)
-        .filter(Match.home_score.isnot(None))
-        .filter(Match.away_score.isnot(None))
-        .order_by(Match.start_time.desc())
-        .limit(limit)
-        .all()
-    )
+    return recent_team_matches(db, team_id, before, limit, statuses=FINISHED_STATUSES, scored=True)
 
 
 def _recent_finished_at_venue(
     db: Session, team_id: int, before: datetime.datetime, is_home: bool, limit: int = 5
 ) -> List[Match]:
-    if is_home:
-        condition = Match.home_team_id == team_id
-    else:
-        condition = Match.away_team_id == team_id
-    return (
-        db.query(Match)
-        .filter(Match.status.in_(FINISHED_STATUSES))
-        .filter(condition)
-        .filter(Match.start_time < before)
-        .filter(Match.home_score.isnot(None))
-        .filter(Match.away_score.isnot(None))
-        .order_by(Match.start_time.desc())
-        .limit(limit)
-        .all()
-    )
+    return recent_team_matches(db, team_id, before, limit, statuses=FINISHED_STATUSES, scored=True, is_home=is_home)
 
 
 def _form_points(matches: List[Match], team_id: int) -> float:
@@ -556,13 +542,28 @@ def _form_vs_strong(
     db: Session, team_id: int, before: datetime.datetime, limit: int = 5
 ) -> float:
     recent = _recent_finished(db, team_id, before, limit=20)
+    return _form_vs_strong_from(
+        recent, team_id, lambda opp_id, at: _team_latest_post_elo(db, opp_id, at), limit=limit
+    )
+
+
+def _form_vs_strong_from(
+    recent: List[Match],
+    team_id: int,
+    opponent_elo: Callable[[int, datetime.datetime], float],
+    limit: int = 5,
+) -> float:
+    """`_form_vs_strong` over an already-loaded newest-first history.
+
+    `opponent_elo(team_id, t)` is the team's latest post-match Elo before t.
+    """
     if not recent:
         return 0.33
 
     strong: List[Match] = []
     for m in recent:
         opp_id = m.away_team_id if m.home_team_id == team_id else m.home_team_id
-        opp_elo = _team_latest_post_elo(db, opp_id, m.start_time)
+        opp_elo = opponent_elo(opp_id, m.start_time)
         if opp_elo >= 1600.0:
             strong.append(m)
             if len(strong) >= limit:
@@ -588,10 +589,14 @@ def _h2h_signal(
                 (Match.home_team_id == away_team_id) & (Match.away_team_id == home_team_id),
             )
         )
-        .order_by(Match.start_time.desc())
+        .order_by(Match.start_time.desc(), Match.id.desc())
         .limit(limit)
         .all()
     )
+    return _h2h_from(past, home_team_id)
+
+
+def _h2h_from(past: List[Match], home_team_id: int) -> Tuple[float, float, float]:
     if not past:
         return 0.45, 0.25, 2.6
 
@@ -615,51 +620,97 @@ def _h2h_signal(
     return home_wins / n, draws / n, total_goals / n
 
 
+def _team_form(db: Session, team_id: int, before: datetime.datetime, venue_is_home: bool) -> Dict[str, Any]:
+    """One team's inputs to `build_inference_features`.
+
+    Read from the team form store when it has a snapshot before kickoff
+    (one indexed lookup), otherwise computed from recent matches. Both give
+    the same values; `latest_elo` is None when it hasn't been looked up.
+    """
+    snapshot = latest_team_form(db, team_id, before)
+    if snapshot is not None:
+        return {
+            "latest_elo": float(snapshot.elo),
+            "form_5": snapshot.form_points_5,
+            "venue_form_5": snapshot.home_form_5 if venue_is_home else snapshot.away_form_5,
+            "goals_for": snapshot.goals_for_avg_10,
+            "goals_against": snapshot.goals_against_avg_10,
+            "btts": snapshot.btts_rate_10,
+            "strong": snapshot.form_vs_strong_5,
+            "rest": _rest_days_since(snapshot.as_of, before),
+        }
+
+    recent = _recent_finished(db, team_id, before, limit=10)
+    venue = _recent_finished_at_venue(db, team_id, before, is_home=venue_is_home, limit=5)
+    return {
+        "latest_elo": None,
+        "form_5": _form_points(recent[:5], team_id),
+        "venue_form_5": _form_points(venue, team_id),
+        "goals_for": _goals_avg(recent, team_id, scored=True),
+        "goals_against": _goals_avg(recent, team_id, scored=False),
+        "btts": _btts_rate(recent),
+        "strong": _form_vs_strong(db, team_id, before),
+        "rest": _rest_days(db, team_id, before),
+    }
+
+
 def build_inference_features(db: Session, match: Match) -> Optional[np.ndarray]:
     """Return a 1xN feature matrix for an upcoming/live match."""
     if match.start_time is None:
         return None
 
+    before = match.start_time
+
+    home = _team_form(db, match.home_team_id, before, venue_is_home=True)
+    away = _team_form(db, match.away_team_id, before, venue_is_home=False)
+
     home_elo = _team_pre_match_elo(db, match.home_team_id, match.id)
     if home_elo is None:
-        home_elo = _team_latest_post_elo(db, match.home_team_id, match.start_time)
+        home_elo = home["latest_elo"]
+        if home_elo is None:
+            home_elo = _team_latest_post_elo(db, match.home_team_id, match.start_time)
 
     away_elo = _team_pre_match_elo(db, match.away_team_id, match.id)
     if away_elo is None:
-        away_elo = _team_latest_post_elo(db, match.away_team_id, match.start_time)
+        away_elo = away["latest_elo"]
+        if away_elo is None:
+            away_elo = _team_latest_post_elo(db, match.away_team_id, match.start_time)
 
-    before = match.start_time
+    h2h = _h2h_signal(db, match.home_team_id, match.away_team_id, before)
 
-    home_recent = _recent_finished(db, match.home_team_id, before, limit=10)
-    away_recent = _recent_finished(db, match.away_team_id, before, limit=10)
-    home_recent_5 = home_recent[:5]
-    away_recent_5 = away_recent[:5]
+    return np.array([_inference_feature_vector(match, home, away, home_elo, away_elo, h2h)], dtype=np.float32)
 
-    home_home_5 = _recent_finished_at_venue(db, match.home_team_id, before, is_home=True, limit=5)
-    away_away_5 = _recent_finished_at_venue(db, match.away_team_id, before, is_home=False, limit=5)
 
-    home_form_5 = _form_points(home_recent_5, match.home_team_id)
-    away_form_5 = _form_points(away_recent_5, match.away_team_id)
-    home_home_form_5 = _form_points(home_home_5, match.home_team_id)
-    away_away_form_5 = _form_points(away_away_5, match.away_team_id)
+def _inference_feature_vector(
+    match: Match,
+    home: Dict[str, Any],
+    away: Dict[str, Any],
+    home_elo: float,
+    away_elo: float,
+    h2h: Tuple[float, float, float],
+) -> List[float]:
+    before = match.start_time
 
-    home_goals_for = _goals_avg(home_recent, match.home_team_id, scored=True)
-    away_goals_for = _goals_avg(away_recent, match.away_team_id, scored=True)
-    home_goals_against = _goals_avg(home_recent, match.home_team_id, scored=False)
-    away_goals_against = _goals_avg(away_recent, match.away_team_id, scored=False)
+    home_form_5 = home["form_5"]
+    away_form_5 = away["form_5"]
+    home_home_form_5 = home["venue_form_5"]
+    away_away_form_5 = away["venue_form_5"]
 
-    home_btts = _btts_rate(home_recent)
-    away_btts = _btts_rate(away_recent)
+    home_goals_for = home["goals_for"]
+    away_goals_for = away["goals_for"]
+    home_goals_against = home["goals_against"]
+    away_goals_against = away["goals_against"]
 
-    home_strong = _form_vs_strong(db, match.home_team_id, before)
-    away_strong = _form_vs_strong(db, match.away_team_id, before)
+    home_btts = home["btts"]
+    away_btts = away["btts"]
 
-    home_rest = _rest_days(db, match.home_team_id, before)
-    away_rest = _rest_days(db, match.away_team_id, before)
+    home_strong = home["strong"]
+    away_strong = away["strong"]
 
-    h2h_home_win_rate, h2h_draw_rate, h2h_avg_goals = _h2h_signal(
-        db, match.home_team_id, match.away_team_id, before
-    )
+    home_rest = home["rest"]
+    away_rest = away["rest"]
+
+    h2h_home_win_rate, h2h_draw_rate, h2h_avg_goals = h2h
 
     league_dummies = _league_dummy_columns(match.league_id)
 
@@ -692,19 +743,167 @@ def build_inference_features(db: Session, match: Match) -> Optional[np.ndarray]:
         **league_dummies,
     }
 
-    return np.array([[feats[col] for col in FEATURE_COLUMNS]], dtype=np.float32)
+    return [feats[col] for col in FEATURE_COLUMNS]
 
 
 def _rest_days(db: Session, team_id: int, before: datetime.datetime) -> float:
-    last = (
-        db.query(Match)
-        .filter(Match.status.in_(FINISHED_STATUSES))
-        .filter(or_(Match.home_team_id == team_id, Match.away_team_id == team_id))
-        .filter(Match.start_time < before)
-        .order_by(Match.start_time.desc())
-        .first()
-    )
+    recent = recent_team_matches(db, team_id, before, 1, statuses=FINISHED_STATUSES)
+    last = recent[0] if recent else None
     if not last or not last.start_time:
         return 7.0
-    delta = before - last.start_time
+    return _rest_days_since(last.start_time, before)
+
+
+def _rest_days_since(last_start: datetime.datetime, before: datetime.datetime) -> float:
+    delta = before - last_start
     return max(0.0, min(30.0, delta.total_seconds() / 86400.0))
+
+
+# ---------------------------------------------------------------------------
+# Batch inference
+# ---------------------------------------------------------------------------
+
+
+def _newest_first(rows: List[Any], end: int, limit: int, keep=None) -> List[Any]:
+    picked: List[Any] = []
+    for position in range(end - 1, -1, -1):
+        row = rows[position]
+        if keep is None or keep(row):
+            picked.append(row)
+            if len(picked) >= limit:
+                break
+    return picked
+
+
+class TeamMatchHistory:
+    """Finished matches and Elo snapshots for a set of teams, loaded in two queries.
+
+    Answers the same questions as the per-team queries behind
+    `build_inference_features` (`_recent_finished`, `_recent_finished_at_venue`,
+    `_rest_days`, `_team_latest_post_elo`, `_team_pre_match_elo`,
+    `_form_vs_strong`, `_h2h_signal`) from memory, with the same ordering,
+    so the values are identical. Used to score many fixtures at once and to
+    build the team form store.
+    """
+
+    def __init__(self, db: Session, team_ids):
+        team_ids = sorted({team_id for team_id in team_ids if team_id is not None})
+        finished = []
+        if team_ids:
+            finished = (
+                db.query(
+                    Match.id,
+                    Match.home_team_id,
+                    Match.away_team_id,
+                    Match.start_time,
+                    Match.home_score,
+                    Match.away_score,
+                )
+                .filter(Match.status.in_(FINISHED_STATUSES))
+                .filter(Match.start_time.isnot(None))
+                .filter(or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)))
+                .order_by(Match.start_time.asc(), Match.id.asc())
+                .all()
+            )
+
+        self._finished: Dict[int, List[Any]] = {team_id: [] for team_id in team_ids}
+        elo_team_ids = set(team_ids)
+        for m in finished:
+            for team_id in (m.home_team_id, m.away_team_id):
+                if team_id in self._finished:
+                    self._finished[team_id].append(m)
+            elo_team_ids.update((m.home_team_id, m.away_team_id))
+        elo_team_ids.discard(None)
+
+        self._finished_starts = {
+            team_id: [m.start_time for m in rows] for team_id, rows in self._finished.items()
+        }
+        self._scored = {
+            team_id: [m for m in rows if m.home_score is not None and m.away_score is not None]
+            for team_id, rows in self._finished.items()
+        }
+        self._scored_starts = {
+            team_id: [m.start_time for m in rows] for team_id, rows in self._scored.items()
+        }
+
+        self.elo = EloTimeline(
+            db.query(TeamEloSnapshot).filter(TeamEloSnapshot.team_id.in_(sorted(elo_team_ids))).all()
+            if elo_team_ids
+            else []
+        )
+
+    def finished_matches(self, team_id: int) -> List[Any]:
+        """Every finished match of the team with a kickoff, oldest first."""
+        return self._finished.get(team_id, [])
+
+    def recent(self, team_id: int, before: datetime.datetime, limit: int, keep=None) -> List[Any]:
+        """`_recent_finished` (newest first, scored, kickoff before `before`)."""
+        scored = self._scored.get(team_id, [])
+        end = bisect.bisect_left(self._scored_starts.get(team_id, []), before)
+        return _newest_first(scored, end, limit, keep)
+
+    def rest_days(self, team_id: int, before: datetime.datetime) -> float:
+        starts = self._finished_starts.get(team_id, [])
+        end = bisect.bisect_left(starts, before)
+        if not end:
+            return 7.0
+        return _rest_days_since(starts[end - 1], before)
+
+    def team_form(self, team_id: int, before: datetime.datetime, venue_is_home: bool) -> Dict[str, Any]:
+        """Same dict as `_team_form`, with `latest_elo` always resolved."""
+        recent = self.recent(team_id, before, 20)
+        if venue_is_home:
+            venue = self.recent(team_id, before, 5, keep=lambda m: m.home_team_id == team_id)
+        else:
+            venue = self.recent(team_id, before, 5, keep=lambda m: m.away_team_id == team_id)
+        recent_10 = recent[:10]
+        return {
+            "latest_elo": self.elo.latest_before(team_id, before),
+            "form_5": _form_points(recent_10[:5], team_id),
+            "venue_form_5": _form_points(venue, team_id),
+            "goals_for": _goals_avg(recent_10, team_id, scored=True),
+            "goals_against": _goals_avg(recent_10, team_id, scored=False),
+            "btts": _btts_rate(recent_10),
+            "strong": _form_vs_strong_from(recent, team_id, self.elo.latest_before),
+            "rest": self.rest_days(team_id, before),
+        }
+
+    def h2h(self, home_team_id: int, away_team_id: int, before: datetime.datetime) -> Tuple[float, float, float]:
+        past = self.recent(
+            home_team_id,
+            before,
+            5,
+            keep=lambda m: {m.home_team_id, m.away_team_id} == {home_team_id, away_team_id},
+        )
+        return _h2h_from(past, home_team_id)
+
+
+def build_inference_feature_matrix(db: Session, matches: List[Match]) -> Tuple[List[Match], np.ndarray]:
+    """Feature rows for many fixtures at once: `(scored_matches, matrix)`.
+
+    Row i of the matrix equals `build_inference_features(db, scored_matches[i])`.
+    Matches without a kickoff are skipped, as in the single-match path.
+    """
+    scorable = [m for m in matches if m.start_time is not None]
+    if not scorable:
+        return [], np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+
+    history = TeamMatchHistory(db, [t for m in scorable for t in (m.home_team_id, m.away_team_id)])
+
+    rows: List[List[float]] = []
+    for match in scorable:
+        before = match.start_time
+        home = history.team_form(match.home_team_id, before, venue_is_home=True)
+        away = history.team_form(match.away_team_id, before, venue_is_home=False)
+
+        home_elo = history.elo.pre_match(match.home_team_id, match.id)
+        if home_elo is None:
+            home_elo = home["latest_elo"]
+        away_elo = history.elo.pre_match(match.away_team_id, match.id)
+        if away_elo is None:
+            away_elo = away["latest_elo"]
+
+        h2h = history.h2h(match.home_team_id, match.away_team_id, before)
+        rows.append(_inference_feature_vector(match, home, away, home_elo, away_elo, h2h))
+
+    return scorable, np.array(rows, dtype=np.float32)
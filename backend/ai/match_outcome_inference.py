@@ -2,9 +2,12 @@
 
 Lazy-loads the PyTorch weights, the StandardScaler and the isotonic
 calibrators on first use. Reloads them transparently when the underlying
-files change on disk (training writes new artifacts -> next request
-picks them up). Pattern mirrors `XGInferenceService` so the rest of the
-backend stays consistent.
+files change on disk (training writes new artifacts -> a request picks
+them up within ``MATCH_OUTCOME_RELOAD_CHECK_SECONDS``). Pattern mirrors
+`XGInferenceService` so the rest of the backend stays consistent.
+``MATCH_OUTCOME_INFERENCE_BACKEND`` selects the forward pass (``torch``,
+``torchscript`` or ``numpy``); ``python -m ai.benchmark_match_outcome_inference``
+compares them.
 
 If LightGBM produced a clearly better test log-loss during training, we
 still default to the calibrated PyTorch network for the deployed
@@ -16,20 +19,31 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import pickle
 import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
 
 try:
-    from backend.ai.match_outcome_features import FEATURE_COLUMNS, build_inference_features
-    from backend.ai.model import FootballPredictor
+    from backend.ai.match_outcome_features import (
+        FEATURE_COLUMNS,
+        build_inference_feature_matrix,
+        build_inference_features,
+    )
+    from backend.ai.model import FootballPredictor, NumpyLayers, numpy_forward
 except ImportError:
-    from ai.match_outcome_features import FEATURE_COLUMNS, build_inference_features  # type: ignore[no-redef]
-    from ai.model import FootballPredictor  # type: ignore[no-redef]
+    from ai.match_outcome_features import (  # type: ignore[no-redef]
+        FEATURE_COLUMNS,
+        build_inference_feature_matrix,
+        build_inference_features,
+    )
+    from ai.model import FootballPredictor, NumpyLayers, numpy_forward  # type: ignore[no-redef]
 
 
 logger = logging.getLogger(__name__)
@@ -39,94 +53,197 @@ TORCH_WEIGHTS_PATH = Path(__file__).resolve().parent / "football_model.pth"
 ARTIFACTS_PATH = ARTIFACT_DIR / "match_outcome_artifacts.pkl"
 
 
+INFERENCE_BACKENDS = ("torch", "torchscript", "numpy")
+
+# `torch` runs the nn.Module as trained. `torchscript` runs a frozen
+# TorchScript export of it, `numpy` a NumPy forward pass with the scaler
+# folded into the first layer; both agree with `torch` to float32 rounding
+# and skip most of the per-call dispatch cost.
+INFERENCE_BACKEND = os.getenv("MATCH_OUTCOME_INFERENCE_BACKEND", "torch").strip().lower()
+
+# How often (seconds) a request may stat the artifact files to pick up a
+# retrain. 0 checks on every call.
+RELOAD_CHECK_SECONDS = float(os.getenv("MATCH_OUTCOME_RELOAD_CHECK_SECONDS", "5"))
+
+
+@dataclass(frozen=True)
+class _ModelSnapshot:
+    """One consistent set of loaded artifacts. Never mutated after load."""
+
+    weights_mtime: float
+    artifacts_mtime: float
+    scaler: Any
+    calibrators: Any
+    temperature: float
+    model: FootballPredictor
+    scripted: Optional[torch.jit.ScriptModule] = None
+    numpy_layers: Optional[NumpyLayers] = None
+    scaler_folded: bool = False
+
+
+def _scripted_model(model: FootballPredictor) -> torch.jit.ScriptModule:
+    return torch.jit.optimize_for_inference(torch.jit.freeze(torch.jit.script(model)))
+
+
+def _folded_numpy_layers(model: FootballPredictor, scaler: Any) -> Tuple[NumpyLayers, bool]:
+    """NumPy weights, with the scaler folded in when it is a plain StandardScaler."""
+    if hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        return model.export_numpy_layers(scaler.mean_, scaler.scale_), True
+    return model.export_numpy_layers(), False
+
+
 class MatchOutcomeInferenceService:
-    """Loads the trained model on first call and caches it across requests."""
-
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._model: Optional[FootballPredictor] = None
-        self._scaler = None
-        self._calibrators = None
-        self._temperature: float = 1.0
-        self._weights_mtime: Optional[float] = None
-        self._artifacts_mtime: Optional[float] = None
-
-    def _refresh(self) -> bool:
-        """Reload artifacts if the underlying files changed.
-
-        Returns True when the service is ready, False when the artifacts
-        are missing (caller should fall back to the heuristic).
+    """Loads the trained model on first call and caches it across requests.
+
+    The loaded artifacts live in one immutable `_ModelSnapshot`; a reload
+    builds a new snapshot and swaps the reference, so predictions never take
+    a lock and always see a consistent model/scaler/calibrator set. Only
+    reloads serialise, on `_reload_lock`.
+    """
+
+    def __init__(self, backend: Optional[str] = None) -> None:
+        backend = (backend or INFERENCE_BACKEND).strip().lower()
+        if backend not in INFERENCE_BACKENDS:
+            logger.warning("Unknown MATCH_OUTCOME_INFERENCE_BACKEND=%r; using torch", backend)
+            backend = "torch"
+        self.backend = backend
+        self._reload_lock = threading.Lock()
+        self._snapshot: Optional[_ModelSnapshot] = None
+        self._checked_at: Optional[float] = None
+
+    def _load_snapshot(self, weights_mtime: float, artifacts_mtime: float) -> _ModelSnapshot:
+        with ARTIFACTS_PATH.open("rb") as fh:
+            payload: Dict = pickle.load(fh)
+
+        scaler = payload["scaler"]
+        input_size = len(payload.get("feature_columns", FEATURE_COLUMNS))
+
+        model = FootballPredictor(
+            input_size=input_size,
+            hidden1=96,
+            hidden2=48,
+            hidden3=24,
+            dropout=0.20,
+        )
+        state = torch.load(TORCH_WEIGHTS_PATH, map_location="cpu", weights_only=True)
+        model.load_state_dict(state)
+        model.eval()
+
+        scripted = None
+        numpy_layers = None
+        scaler_folded = False
+        if self.backend == "torchscript":
+            scripted = _scripted_model(model)
+        elif self.backend == "numpy":
+            numpy_layers, scaler_folded = _folded_numpy_layers(model, scaler)
+
+        return _ModelSnapshot(
+            weights_mtime=weights_mtime,
+            artifacts_mtime=artifacts_mtime,
+            scaler=scaler,
+            calibrators=payload["isotonic_calibrators"],
+            temperature=float(payload.get("temperature", 1.0) or 1.0),
+            model=model,
+            scripted=scripted,
+            numpy_layers=numpy_layers,
+            scaler_folded=scaler_folded,
+        )
+
+    def _current(self) -> Optional[_ModelSnapshot]:
+        """The snapshot to predict with, reloading if the files changed.
+
+        Returns None when the artifacts are missing (caller should fall
+        back to the heuristic).
         """
+        snapshot = self._snapshot
+        now = time.monotonic()
+        checked_at = self._checked_at
+        if snapshot is not None and checked_at is not None and now - checked_at < RELOAD_CHECK_SECONDS:
+            return snapshot
+
         if not TORCH_WEIGHTS_PATH.exists() or not ARTIFACTS_PATH.exists():
-            return False
+            self._snapshot = None
+            return None
 
         weights_mtime = TORCH_WEIGHTS_PATH.stat().st_mtime
         artifacts_mtime = ARTIFACTS_PATH.stat().st_mtime
-
-        with self._lock:
+        if (
+            snapshot is not None
+            and snapshot.weights_mtime == weights_mtime
+            and snapshot.artifacts_mtime == artifacts_mtime
+        ):
+            self._checked_at = now
+            return snapshot
+
+        with self._reload_lock:
+            snapshot = self._snapshot
             if (
-                self._model is not None
-                and self._weights_mtime == weights_mtime
-                and self._artifacts_mtime == artifacts_mtime
+                snapshot is None
+                or snapshot.weights_mtime != weights_mtime
+                or snapshot.artifacts_mtime != artifacts_mtime
             ):
-                return True
-
-            with ARTIFACTS_PATH.open("rb") as fh:
-                payload: Dict = pickle.load(fh)
-
-            self._scaler = payload["scaler"]
-            self._calibrators = payload["isotonic_calibrators"]
-            self._temperature = float(payload.get("temperature", 1.0) or 1.0)
-            input_size = len(payload.get("feature_columns", FEATURE_COLUMNS))
-
-            model = FootballPredictor(
-                input_size=input_size,
-                hidden1=96,
-                hidden2=48,
-                hidden3=24,
-                dropout=0.20,
-            )
-            state = torch.load(TORCH_WEIGHTS_PATH, map_location="cpu", weights_only=True)
-            model.load_state_dict(state)
-            model.eval()
-            self._model = model
-            self._weights_mtime = weights_mtime
-            self._artifacts_mtime = artifacts_mtime
-
-        logger.info("MatchOutcomeInferenceService reloaded artifacts (T=%.3f)", self._temperature)
-        return True
+                snapshot = self._load_snapshot(weights_mtime, artifacts_mtime)
+                self._snapshot = snapshot
+                logger.info(
+                    "MatchOutcomeInferenceService reloaded artifacts (T=%.3f, backend=%s)",
+                    snapshot.temperature,
+                    self.backend,
+                )
+            self._checked_at = now
+        return snapshot
 
     def is_ready(self) -> bool:
-        return self._refresh()
+        return self._current() is not None
 
     def predict(self, features: np.ndarray) -> Optional[Tuple[float, float, float]]:
         if features is None:
             return None
-        if not self._refresh():
+        probs = self.predict_batch(features)
+        if probs is None:
+            return None
+        return float(probs[0, 0]), float(probs[0, 1]), float(probs[0, 2])
+
+    def predict_batch(self, features: np.ndarray) -> Optional[np.ndarray]:
+        """Calibrated (n, 3) home/draw/away probabilities for an (n, F) feature matrix.
+
+        One scaler transform and one forward pass for the whole batch.
+        Returns None when the artifacts are missing.
+        """
+        snapshot = self._current()
+        if snapshot is None:
             return None
-        with self._lock:
-            scaled = self._scaler.transform(features.astype(np.float32))
-            with torch.no_grad():
-                logits = self._model(torch.from_numpy(scaled).float()).numpy()[0]
-
-            # Temperature scaling: divide logits by T before softmax.
-            t = max(self._temperature, 1e-3)
-            shifted = logits / t
-            shifted -= shifted.max()
-            exp = np.exp(shifted)
-            probs = exp / exp.sum()
-
-        import os as _os
-
-        if _os.getenv("TERRABALL_ENABLE_ISOTONIC", "").strip() == "1":
-            calibrated = np.empty_like(probs)
-            for cls in range(3):
-                calibrated[cls] = self._calibrators[cls].predict([probs[cls]])[0]
+        if len(features) == 0:
+            return np.empty((0, 3), dtype=np.float32)
+
+        logits = self._logits(snapshot, features.astype(np.float32))
+
+        # Temperature scaling: divide logits by T before softmax.
+        t = max(snapshot.temperature, 1e-3)
+        shifted = logits / t
+        shifted -= shifted.max(axis=1, keepdims=True)
+        exp = np.exp(shifted)
+        probs = exp / exp.sum(axis=1, keepdims=True)
+
+        if os.getenv("TERRABALL_ENABLE_ISOTONIC", "").strip() == "1":
+            calibrated = np.column_stack(
+                [snapshot.calibrators[cls].predict(probs[:, cls]) for cls in range(3)]
+            ).astype(probs.dtype)
             calibrated = np.clip(calibrated, 1e-6, 1.0)
-            calibrated = calibrated / calibrated.sum()
+            calibrated = calibrated / calibrated.sum(axis=1, keepdims=True)
             probs = calibrated
 
-        return float(probs[0]), float(probs[1]), float(probs[2])
+        return probs
+
+    def _logits(self, snapshot: _ModelSnapshot, features: np.ndarray) -> np.ndarray:
+        if snapshot.numpy_layers is not None:
+            inputs = features if snapshot.scaler_folded else snapshot.scaler.transform(features).astype(np.float32)
+            return numpy_forward(snapshot.numpy_layers, inputs)
+
+        scaled = torch.from_numpy(snapshot.scaler.transform(features)).float()
+        with torch.inference_mode():
+            if snapshot.scripted is not None:
+                return snapshot.scripted(scaled).numpy()
+            return snapshot.model(scaled).numpy()
 
 
 match_outcome_inference_service = MatchOutcomeInferenceService()
@@ -140,3 +257,19 @@ def predict_for_match(db, match) -> Optional[Tuple[float, float, float]]:
     return match_outcome_inference_service.predict(features)
 
 
+def predict_for_matches(db, matches) -> Dict[int, Tuple[float, float, float]]:
+    """Batch counterpart of `predict_for_match`: probabilities keyed by match id.
+
+    Matches the model can't score (no kickoff, artifacts missing) are
+    absent from the result.
+    """
+    if not match_outcome_inference_service.is_ready():
+        return {}
+    scored, features = build_inference_feature_matrix(db, matches)
+    probs = match_outcome_inference_service.predict_batch(features)
+    if probs is None:
+        return {}
+    return {
+        match.id: (float(row[0]), float(row[1]), float(row[2]))
+        for match, row in zip(scored, probs)
+    }
@@ -7,10 +7,16 @@ input layer width is parametrised so the same class can host future
 feature extensions without having to update the inference singleton.
 """
 
+from typing import List, Optional, Tuple
+
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
+# (weight, bias) per linear layer, weight laid out (in, out) for `x @ W + b`.
+NumpyLayers = List[Tuple[np.ndarray, np.ndarray]]
+
 
 class FootballPredictor(nn.Module):
     def __init__(
@@ -39,3 +45,42 @@ class FootballPredictor(nn.Module):
         x = F.relu(self.fc3(x))
         x = self.fc4(x)
         return x  # raw logits
+
+    def export_numpy_layers(
+        self,
+        input_mean: Optional[np.ndarray] = None,
+        input_scale: Optional[np.ndarray] = None,
+    ) -> NumpyLayers:
+        """float32 weights for `numpy_forward`, optionally with input standardisation folded in.
+
+        With `input_mean`/`input_scale` (a fitted StandardScaler's `mean_` and
+        `scale_`), `numpy_forward(layers, x)` equals
+        `forward((x - mean) / scale)` up to float rounding, so the scaler
+        costs nothing at inference time.
+        """
+        layers = [
+            (
+                linear.weight.detach().cpu().numpy().astype(np.float64).T,
+                linear.bias.detach().cpu().numpy().astype(np.float64),
+            )
+            for linear in (self.fc1, self.fc2, self.fc3, self.fc4)
+        ]
+        if input_mean is not None or input_scale is not None:
+            weight, bias = layers[0]
+            mean = np.zeros(weight.shape[0]) if input_mean is None else np.asarray(input_mean, dtype=np.float64)
+            scale = np.ones(weight.shape[0]) if input_scale is None else np.asarray(input_scale, dtype=np.float64)
+            weight = weight / scale[:, None]
+            layers[0] = (weight, bias - mean @ weight)
+        return [
+            (np.ascontiguousarray(weight, dtype=np.float32), bias.astype(np.float32))
+            for weight, bias in layers
+        ]
+
+
+def numpy_forward(layers: NumpyLayers, x: np.ndarray) -> np.ndarray:
+    """`FootballPredictor.forward` in eval mode (dropout is the identity) on NumPy arrays."""
+    hidden = x
+    for weight, bias in layers[:-1]:
+        hidden = np.maximum(hidden @ weight + bias, 0.0)
+    weight, bias = layers[-1]
+    return hidden @ weight + bias
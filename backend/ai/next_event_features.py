@@ -1,13 +1,15 @@
 import datetime
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 try:
+    from backend.ai.team_form_store import latest_team_form
+    from backend.services.team_matches import recent_team_matches
     from backend.models import League, Match, MatchEvent, Player, Standing, Team
     from backend.ai.next_event_common import (
         FINISHED_MATCH_STATUSES,
@@ -21,6 +23,8 @@ try:
         normalize_text,
     )
 except ImportError:
+    from ai.team_form_store import latest_team_form
+    from services.team_matches import recent_team_matches
     from models import League, Match, MatchEvent, Player, Standing, Team
     from ai.next_event_common import (
         FINISHED_MATCH_STATUSES,
@@ -178,9 +182,26 @@ def _match_player_name(event_player_name: Optional[str], player_name: Optional[s
     return overlap >= min(len(event_tokens), len(target_tokens), 2)
 
 
+def squad_order(players: Sequence[Player]) -> List[Player]:
+    """A squad most-used first: the first 11 are the probable lineup."""
+    return sorted(
+        players,
+        key=lambda player: (
+            _safe_int(player.minutes_played),
+            _safe_float(player.rating_season),
+            _safe_float(player.goals_season),
+            _safe_float(player.assists_season),
+            player.name or "",
+        ),
+        reverse=True,
+    )
+
+
 class NextEventFeatureBuilder:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, use_feature_store: bool = False):
+        """`use_feature_store` reads team priors from `ai.team_form_store` when it can (inference)."""
         self.db = db
+        self.use_feature_store = use_feature_store
         self._team_cache: Dict[int, Optional[Team]] = {}
         self._league_cache: Dict[int, Optional[League]] = {}
         self._players_by_team_cache: Dict[int, List[Player]] = {}
@@ -188,6 +209,7 @@ class NextEventFeatureBuilder:
         self._probable_lineup_cache: Dict[int, List[int]] = {}
         self._team_prior_cache: Dict[Tuple[int, str], Dict[str, float]] = {}
         self._player_recent_form_cache: Dict[Tuple[int, str], Dict[str, float]] = {}
+        self._team_recent_events_cache: Dict[Tuple[int, str], Tuple[List[Match], Dict[int, List[MatchEvent]]]] = {}
 
     def _team(self, team_id: int) -> Optional[Team]:
         if team_id not in self._team_cache:
@@ -235,18 +257,7 @@ class NextEventFeatureBuilder:
     def _players_for_team(self, team_id: int) -> List[Player]:
         if team_id not in self._players_by_team_cache:
             players = self.db.query(Player).filter(Player.team_id == team_id).all()
-            players = sorted(
-                players,
-                key=lambda player: (
-                    _safe_int(player.minutes_played),
-                    _safe_float(player.rating_season),
-                    _safe_float(player.goals_season),
-                    _safe_float(player.assists_season),
-                    player.name or "",
-                ),
-                reverse=True,
-            )
-            self._players_by_team_cache[team_id] = players
+            self._players_by_team_cache[team_id] = squad_order(players)
         return self._players_by_team_cache[team_id]
 
     def _resolve_player_by_name(self, player_name: Optional[str], players: Sequence[Player]) -> Optional[Player]:
@@ -271,42 +282,40 @@ class NextEventFeatureBuilder:
         if cache_key in self._team_prior_cache:
             return self._team_prior_cache[cache_key]
 
-        recent_matches = (
-            self.db.query(Match)
-            .filter(
-                Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-                Match.home_score.isnot(None),
-                Match.away_score.isnot(None),
-                Match.start_time < cutoff_time,
-                or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
-            )
-            .order_by(Match.start_time.desc())
-            .limit(15)
-            .all()
-        )
+        snapshot = latest_team_form(self.db, team_id, cutoff_time) if self.use_feature_store else None
+        if snapshot is not None:
+            matches_count = snapshot.matches_15
+            goals_for = snapshot.goals_for_15
+            goals_against = snapshot.goals_against_15
+            points = snapshot.points_15
+        else:
+            recent_matches = self._recent_results(team_id, cutoff_time)
 
-        matches_count = len(recent_matches)
-        goals_for = 0.0
-        goals_against = 0.0
-        points = 0.0
+            matches_count = len(recent_matches)
+            goals_for = 0.0
+            goals_against = 0.0
+            points = 0.0
 
-        for row in recent_matches:
-            if row.home_team_id == team_id:
-                team_goals = _safe_float(row.home_score)
-                opp_goals = _safe_float(row.away_score)
-            else:
-                team_goals = _safe_float(row.away_score)
-                opp_goals = _safe_float(row.home_score)
+            for row in recent_matches:
+                if row.home_team_id == team_id:
+                    team_goals = _safe_float(row.home_score)
+                    opp_goals = _safe_float(row.away_score)
+                else:
+                    team_goals = _safe_float(row.away_score)
+                    opp_goals = _safe_float(row.home_score)
 
-            goals_for += team_goals
-            goals_against += opp_goals
+                goals_for += team_goals
+                goals_against += opp_goals
 
-            if team_goals > opp_goals:
-                points += 3.0
-            elif team_goals == opp_goals:
-                points += 1.0
+                if team_goals > opp_goals:
+                    points += 3.0
+                elif team_goals == opp_goals:
+                    points += 1.0
 
-        standing = self.db.query(Standing).filter(Standing.team_id == team_id).first()
+        # Only the cold-start branch reads the table row.
+        standing = None
+        if matches_count == 0:
+            standing = self._standing(team_id)
 
         if matches_count > 0:
             attack_prior = goals_for / matches_count
@@ -334,53 +343,71 @@ class NextEventFeatureBuilder:
         self._team_prior_cache[cache_key] = payload
         return payload
 
-    def _player_recent_form(self, player: Player, cutoff_time: datetime.datetime) -> Dict[str, float]:
-        cache_key = (player.id, cutoff_time.date().isoformat())
-        if cache_key in self._player_recent_form_cache:
-            return self._player_recent_form_cache[cache_key]
+    def _recent_results(self, team_id: int, cutoff_time: datetime.datetime) -> List[Match]:
+        """The team's last 15 finished, scored matches before `cutoff_time`, newest first."""
+        return recent_team_matches(self.db, team_id, cutoff_time, 15, statuses=FINISHED_MATCH_STATUSES, scored=True)
 
-        recent_matches = (
-            self.db.query(Match)
-            .filter(
-                Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-                Match.start_time < cutoff_time,
-                or_(Match.home_team_id == player.team_id, Match.away_team_id == player.team_id),
-            )
-            .order_by(Match.start_time.desc())
-            .limit(20)
-            .all()
-        )
+    def _standing(self, team_id: int) -> Optional[Standing]:
+        return self.db.query(Standing).filter(Standing.team_id == team_id).first()
 
-        goals_last5 = 0
-        assists_last5 = 0
-        matches_counted = 0
+    def _team_recent_events(
+        self, team_id: int, cutoff_time: datetime.datetime
+    ) -> Tuple[List[Match], Dict[int, List[MatchEvent]]]:
+        """The team's last 20 finished matches before `cutoff_time` and their events.
+
+        Shared by every player of the team (two queries per team, not per player).
+        """
+        cache_key = (team_id, cutoff_time.date().isoformat())
+        if cache_key in self._team_recent_events_cache:
+            return self._team_recent_events_cache[cache_key]
+
+        recent_matches = self._recent_matches(team_id, cutoff_time)
+        events_by_match = self._events_by_match_for([row.id for row in recent_matches])
 
-        if recent_matches:
-            match_ids = [row.id for row in recent_matches]
+        self._team_recent_events_cache[cache_key] = (recent_matches, events_by_match)
+        return recent_matches, events_by_match
+
+    def _recent_matches(self, team_id: int, cutoff_time: datetime.datetime) -> List[Match]:
+        """The team's last 20 finished matches before `cutoff_time`, newest first."""
+        return recent_team_matches(self.db, team_id, cutoff_time, 20, statuses=FINISHED_MATCH_STATUSES)
+
+    def _events_by_match_for(self, match_ids: Sequence[int]) -> Dict[int, List[MatchEvent]]:
+        events_by_match: Dict[int, List[MatchEvent]] = defaultdict(list)
+        if match_ids:
             all_events = (
                 self.db.query(MatchEvent)
                 .filter(MatchEvent.match_id.in_(match_ids))
                 .order_by(MatchEvent.match_id.asc(), MatchEvent.minute.asc(), MatchEvent.id.asc())
                 .all()
             )
-
-            events_by_match: Dict[int, List[MatchEvent]] = defaultdict(list)
             for event in all_events:
                 events_by_match[event.match_id].append(event)
+        return events_by_match
 
-            for row in recent_matches:
-                matches_counted += 1
-                for event in events_by_match.get(row.id, []):
-                    if is_goal_event(event.event_type) and _match_player_name(event.player_name, player.name):
-                        goals_last5 += 1
+    def _player_recent_form(self, player: Player, cutoff_time: datetime.datetime) -> Dict[str, float]:
+        cache_key = (player.id, cutoff_time.date().isoformat())
+        if cache_key in self._player_recent_form_cache:
+            return self._player_recent_form_cache[cache_key]
 
-                    if _match_player_name(extract_assist_name(event.detail), player.name):
-                        assists_last5 += 1
-                    elif "assist" in normalize_text(event.event_type) and _match_player_name(event.player_name, player.name):
-                        assists_last5 += 1
+        recent_matches, events_by_match = self._team_recent_events(player.team_id, cutoff_time)
 
-                if matches_counted >= 5:
-                    break
+        goals_last5 = 0
+        assists_last5 = 0
+        matches_counted = 0
+
+        for row in recent_matches:
+            matches_counted += 1
+            for event in events_by_match.get(row.id, []):
+                if is_goal_event(event.event_type) and _match_player_name(event.player_name, player.name):
+                    goals_last5 += 1
+
+                if _match_player_name(extract_assist_name(event.detail), player.name):
+                    assists_last5 += 1
+                elif "assist" in normalize_text(event.event_type) and _match_player_name(event.player_name, player.name):
+                    assists_last5 += 1
+
+            if matches_counted >= 5:
+                break
 
         payload = {
             "goals_last5": float(goals_last5),
@@ -550,13 +577,20 @@ class NextEventFeatureBuilder:
         }
         return row
 
-    def build_training_frame(self, task: str, min_candidates: int = 8) -> pd.DataFrame:
+    def build_training_frame(
+        self,
+        task: str,
+        min_candidates: int = 8,
+        matches: Optional[Sequence[Match]] = None,
+    ) -> pd.DataFrame:
+        """One row per on-pitch candidate per goal of `matches` (default: every supported finished match)."""
         task_normalized = normalize_text(task)
         if task_normalized not in {"goal", "assist"}:
             raise ValueError("task must be either 'goal' or 'assist'")
 
         rows: List[Dict[str, object]] = []
-        matches = self.get_supported_finished_matches()
+        if matches is None:
+            matches = self.get_supported_finished_matches()
 
         for match in matches:
             events = self._events_for_match(match.id)
@@ -688,12 +722,84 @@ class NextEventFeatureBuilder:
 
         return 1
 
-    def build_live_candidate_frame(self, match: Match, minute_override: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, object]]:
+    def build_match_context(self, match: Match) -> "NextEventMatchContext":
+        """Everything the live candidate frame needs that is fixed at kickoff."""
+        home_players = [CandidatePlayer.from_player(player) for player in self._players_for_team(match.home_team_id)]
+        away_players = [CandidatePlayer.from_player(player) for player in self._players_for_team(match.away_team_id)]
+        # Later lookups (lineups, name resolution) run on the snapshots.
+        self._players_by_team_cache[match.home_team_id] = home_players
+        self._players_by_team_cache[match.away_team_id] = away_players
+        probable = {
+            match.home_team_id: tuple(self._probable_lineup_ids(match.home_team_id)),
+            match.away_team_id: tuple(self._probable_lineup_ids(match.away_team_id)),
+        }
+
+        players = home_players + away_players
+        empty_state: Dict[str, object] = {
+            "home_goals": 0,
+            "away_goals": 0,
+            "team_yellow": {},
+            "team_red": {},
+            "player_yellow": {},
+            "player_red": {},
+        }
+        rows = [
+            self._candidate_feature_row(
+                match=match,
+                player=player,
+                is_on_pitch=True,
+                is_probable_starter=player.id in probable[match.home_team_id if player.team_id == match.home_team_id else match.away_team_id],
+                minute=0,
+                match_state=empty_state,
+            )
+            for player in players
+        ]
+        static_features = np.array(
+            [[row[column] for column in FEATURE_COLUMNS] for row in rows], dtype=np.float64
+        ).reshape(len(players), len(FEATURE_COLUMNS))
+
+        team_names = {}
+        for team_id in (match.home_team_id, match.away_team_id):
+            team = self._team(team_id)
+            team_names[team_id] = team.name if team else "Unknown"
+
+        return NextEventMatchContext(
+            key=NextEventMatchContext.key_for(match),
+            home_team_id=match.home_team_id,
+            away_team_id=match.away_team_id,
+            home_players=tuple(home_players),
+            away_players=tuple(away_players),
+            probable_lineups=probable,
+            team_names=team_names,
+            static_features=static_features,
+        )
+
+    def build_live_candidate_frame(
+        self,
+        match: Match,
+        minute_override: Optional[int] = None,
+        context: Optional["NextEventMatchContext"] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, object]]:
+        """Candidate rows for the players on the pitch.
+
+        With a cached `context` this reads only the match's events: the
+        pre-match columns come from `context.static_features` and just the
+        match-state columns (minute, score, cards, on-pitch set) are filled
+        in, for all candidates at once.
+        """
+        if context is None:
+            context = self.build_match_context(match)
+        else:
+            self._players_by_team_cache[context.home_team_id] = list(context.home_players)
+            self._players_by_team_cache[context.away_team_id] = list(context.away_players)
+            for team_id, lineup in context.probable_lineups.items():
+                self._probable_lineup_cache[team_id] = list(lineup)
+
         events = self._events_for_match(match.id)
         minute = self._infer_live_minute(match, events, minute_override)
 
-        home_players = self._players_for_team(match.home_team_id)
-        away_players = self._players_for_team(match.away_team_id)
+        home_players = list(context.home_players)
+        away_players = list(context.away_players)
         combined_players = home_players + away_players
 
         if not combined_players:
@@ -704,54 +810,21 @@ class NextEventFeatureBuilder:
                 "events_seen": len(events),
             }
 
-        home_on_pitch = set(self._on_pitch_ids(match, match.home_team_id, events, minute, home_players))
-        away_on_pitch = set(self._on_pitch_ids(match, match.away_team_id, events, minute, away_players))
-
-        probable_home = set(self._probable_lineup_ids(match.home_team_id))
-        probable_away = set(self._probable_lineup_ids(match.away_team_id))
-
+        on_pitch = {
+            match.home_team_id: set(self._on_pitch_ids(match, match.home_team_id, events, minute, home_players)),
+            match.away_team_id: set(self._on_pitch_ids(match, match.away_team_id, events, minute, away_players)),
+        }
         state = self._build_match_state(match, events, minute, home_players, away_players)
 
-        candidate_rows: List[Dict[str, object]] = []
-        missing_stats_count = 0
-
-        for candidate in combined_players:
-            is_home = candidate.team_id == match.home_team_id
-            on_pitch_ids = home_on_pitch if is_home else away_on_pitch
-            probable_ids = probable_home if is_home else probable_away
-
-            if candidate.id not in on_pitch_ids:
-                continue
-
-            if (
-                candidate.minutes_played is None
-                and candidate.goals_season is None
-                and candidate.assists_season is None
-                and candidate.rating_season is None
-            ):
-                missing_stats_count += 1
-
-            feature_row = self._candidate_feature_row(
-                match=match,
-                player=candidate,
-                is_on_pitch=True,
-                is_probable_starter=candidate.id in probable_ids,
-                minute=minute,
-                match_state=state,
-            )
-
-            candidate_rows.append(
-                {
-                    "player_id": candidate.id,
-                    "player_name": candidate.name,
-                    "team_id": candidate.team_id,
-                    "team_name": self._team(candidate.team_id).name if self._team(candidate.team_id) else "Unknown",
-                    "event_minute": minute,
-                    **feature_row,
-                }
-            )
+        candidate_index = [
+            i
+            for i, candidate in enumerate(combined_players)
+            if candidate.id in on_pitch[match.home_team_id if candidate.team_id == match.home_team_id else match.away_team_id]
+        ]
+        candidates = [combined_players[i] for i in candidate_index]
+        missing_stats_count = sum(1 for candidate in candidates if candidate.missing_season_stats)
 
-        if not candidate_rows:
+        if not candidates:
             return pd.DataFrame(), {
                 "minute": minute,
                 "candidate_count": 0,
@@ -759,11 +832,31 @@ class NextEventFeatureBuilder:
                 "events_seen": len(events),
             }
 
-        frame = pd.DataFrame(candidate_rows)
-        for column in FEATURE_COLUMNS:
-            frame[column] = frame[column].astype(float)
-
-        context = {
+        features = context.static_features[candidate_index].copy()
+        column = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+        is_home = np.array([candidate.team_id == match.home_team_id for candidate in candidates])
+        opponent_ids = [match.away_team_id if home else match.home_team_id for home in is_home]
+        goal_diff = np.where(is_home, 1.0, -1.0) * float(state["home_goals"] - state["away_goals"])
+
+        features[:, column["minute_norm"]] = _clamp(minute / 95.0, 0.0, 1.0)
+        features[:, column["goal_diff"]] = goal_diff
+        features[:, column["team_trailing"]] = goal_diff < 0
+        features[:, column["team_leading"]] = goal_diff > 0
+        features[:, column["team_red_cards"]] = [state["team_red"].get(c.team_id, 0) for c in candidates]
+        features[:, column["opp_red_cards"]] = [state["team_red"].get(opp, 0) for opp in opponent_ids]
+        features[:, column["team_yellow_cards"]] = [state["team_yellow"].get(c.team_id, 0) for c in candidates]
+        features[:, column["player_yellow_cards"]] = [state["player_yellow"].get(c.id, 0) for c in candidates]
+        features[:, column["player_red_cards"]] = [state["player_red"].get(c.id, 0) for c in candidates]
+        features[:, column["is_on_pitch"]] = 1.0
+
+        frame = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+        frame.insert(0, "player_id", [candidate.id for candidate in candidates])
+        frame.insert(1, "player_name", [candidate.name for candidate in candidates])
+        frame.insert(2, "team_id", [candidate.team_id for candidate in candidates])
+        frame.insert(3, "team_name", [context.team_names.get(candidate.team_id, "Unknown") for candidate in candidates])
+        frame.insert(4, "event_minute", minute)
+
+        context_info = {
             "minute": minute,
             "candidate_count": len(frame),
             "missing_player_stats": missing_stats_count,
@@ -771,4 +864,65 @@ class NextEventFeatureBuilder:
             "home_score_inferred": state["home_goals"],
             "away_score_inferred": state["away_goals"],
         }
-        return frame, context
+        return frame, context_info
+
+
+@dataclass(frozen=True)
+class CandidatePlayer:
+    """The `Player` fields the candidate features read, detached from any session."""
+
+    id: int
+    name: Optional[str]
+    team_id: Optional[int]
+    position: Optional[str]
+    minutes_played: Optional[int]
+    goals_season: Optional[int]
+    assists_season: Optional[int]
+    rating_season: Optional[float]
+
+    @classmethod
+    def from_player(cls, player: Player) -> "CandidatePlayer":
+        return cls(
+            id=player.id,
+            name=player.name,
+            team_id=player.team_id,
+            position=player.position,
+            minutes_played=player.minutes_played,
+            goals_season=player.goals_season,
+            assists_season=player.assists_season,
+            rating_season=player.rating_season,
+        )
+
+    @property
+    def missing_season_stats(self) -> bool:
+        return (
+            self.minutes_played is None
+            and self.goals_season is None
+            and self.assists_season is None
+            and self.rating_season is None
+        )
+
+
+@dataclass(frozen=True)
+class NextEventMatchContext:
+    """Pre-match half of a match's live candidate frame (see `build_match_context`).
+
+    Squads, probable lineups, team names and one row of `FEATURE_COLUMNS`
+    per player (home squad first) with the pre-match columns filled in:
+    season stats, recent form, team priors and position. These only
+    depend on data from before kickoff, so a context is built once per
+    match and reused for every request.
+    """
+
+    key: Tuple[int, Optional[datetime.datetime], Optional[int], Optional[int]]
+    home_team_id: int
+    away_team_id: int
+    home_players: Tuple[CandidatePlayer, ...]
+    away_players: Tuple[CandidatePlayer, ...]
+    probable_lineups: Dict[int, Tuple[int, ...]]
+    team_names: Dict[int, str]
+    static_features: np.ndarray
+
+    @staticmethod
+    def key_for(match: Match) -> Tuple[int, Optional[datetime.datetime], Optional[int], Optional[int]]:
+        return (match.id, match.start_time, match.home_team_id, match.away_team_id)
@@ -1,5 +1,9 @@
+import collections
 import datetime
+import os
 import pickle
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -10,15 +14,20 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
 try:
-    from backend.ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from backend.ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder, NextEventMatchContext
 except ImportError:
-    from ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder, NextEventMatchContext
 
 
 ARTIFACT_DIR = Path(__file__).resolve().parent / "artifacts"
 DEFAULT_ARTIFACT_PATH = ARTIFACT_DIR / "next_event_ranker.pkl"
 DEFAULT_METRICS_PATH = ARTIFACT_DIR / "next_event_metrics.json"
 
+# Per-match pre-match contexts (see `NextEventMatchContext`). They only
+# depend on data from before kickoff; the TTL picks up squad/stat syncs.
+CONTEXT_TTL_SECONDS = float(os.getenv("NEXT_EVENT_CONTEXT_TTL_SECONDS", "21600"))
+CONTEXT_CACHE_SIZE = int(os.getenv("NEXT_EVENT_CONTEXT_CACHE_SIZE", "256"))
+
 
 def split_samples_chronologically(frame: pd.DataFrame, test_ratio: float = 0.2) -> Tuple[pd.DataFrame, pd.DataFrame]:
     if frame.empty:
@@ -341,6 +350,32 @@ class NextEventInferenceService:
         self.artifact_path = artifact_path
         self._artifact: Optional[Dict[str, object]] = None
         self._artifact_mtime: Optional[float] = None
+        # match_id -> (built at, context), LRU.
+        self._contexts: "collections.OrderedDict[int, Tuple[float, NextEventMatchContext]]" = collections.OrderedDict()
+        self._contexts_lock = threading.Lock()
+
+    def _match_context(self, builder: NextEventFeatureBuilder, match) -> NextEventMatchContext:
+        """The match's cached pre-match context, built on first use."""
+        now = time.monotonic()
+        with self._contexts_lock:
+            cached = self._contexts.get(match.id)
+            if (
+                cached is not None
+                and now - cached[0] < CONTEXT_TTL_SECONDS
+                and cached[1].key == NextEventMatchContext.key_for(match)
+            ):
+                self._contexts.move_to_end(match.id)
+                return cached[1]
+
+        # Built outside the lock: concurrent first requests may both build
+        # it, but never block requests for other matches.
+        context = builder.build_match_context(match)
+        with self._contexts_lock:
+            self._contexts[match.id] = (now, context)
+            self._contexts.move_to_end(match.id)
+            while len(self._contexts) > CONTEXT_CACHE_SIZE:
+                self._contexts.popitem(last=False)
+        return context
 
     def _refresh_artifact(self) -> Optional[Dict[str, object]]:
         if not self.artifact_path.exists():
@@ -356,8 +391,10 @@ class NextEventInferenceService:
         return self._artifact
 
     def predict_for_match(self, db, match, minute_override: Optional[int] = None, top_k: int = 3) -> Dict[str, object]:
-        builder = NextEventFeatureBuilder(db)
-        candidates, context = builder.build_live_candidate_frame(match, minute_override=minute_override)
+        builder = NextEventFeatureBuilder(db, use_feature_store=True)
+        candidates, context = builder.build_live_candidate_frame(
+            match, minute_override=minute_override, context=self._match_context(builder, match)
+        )
 
         if candidates.empty:
             return {
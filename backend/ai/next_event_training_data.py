@@ -0,0 +1,340 @@
+"""Bulk-loaded, parallel training frames for the next-event ranker.
+
+`NextEventFeatureBuilder.build_training_frame` is written for a session:
+per match and per team it queries squads, events, recent results and
+recent events, which adds up to thousands of round trips over a full
+history. For training, everything it reads is loaded up front instead:
+
+- `load_training_snapshot` reads teams, leagues, players, finished
+  matches, their events and the standings in a handful of queries into
+  plain, picklable records (`TrainingSnapshot`). A SHA-256 of those rows
+  (plus `TRAINING_FRAME_VERSION` and the feature columns) is its
+  fingerprint: it changes whenever any row the features read changes,
+  including player stats synced by scripts, which the ``data_versions``
+  counter doesn't track.
+- `SnapshotFeatureBuilder` is the feature builder with its lookups served
+  from in-memory indexes, so the rows are exactly the ones the session
+  builder produces.
+- `build_training_frames` splits the supported matches into contiguous
+  chunks and builds them in a process pool (``NEXT_EVENT_TRAINING_WORKERS``,
+  default: all cores); chunks are concatenated in match order.
+- `cached_training_frames` stores the frames under the fingerprint in
+  ``ai/artifacts/cache/`` (Parquet when pyarrow is installed, pickle
+  otherwise) and reuses them until the data changes.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+try:
+    from backend.ai.next_event_common import FINISHED_MATCH_STATUSES
+    from backend.ai.next_event_features import (
+        FEATURE_COLUMNS,
+        TRAINING_COLUMNS,
+        CandidatePlayer,
+        NextEventFeatureBuilder,
+        squad_order,
+    )
+    from backend.models import League, Match, MatchEvent, Player, Standing, Team
+except ImportError:
+    from ai.next_event_common import FINISHED_MATCH_STATUSES  # type: ignore[no-redef]
+    from ai.next_event_features import (  # type: ignore[no-redef]
+        FEATURE_COLUMNS,
+        TRAINING_COLUMNS,
+        CandidatePlayer,
+        NextEventFeatureBuilder,
+        squad_order,
+    )
+    from models import League, Match, MatchEvent, Player, Standing, Team  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the feature code changes, so cached frames are rebuilt.
+TRAINING_FRAME_VERSION = 1
+
+TASKS = ("goal", "assist")
+CACHE_DIR = Path(__file__).resolve().parent / "artifacts" / "cache"
+WORKERS = max(1, int(os.getenv("NEXT_EVENT_TRAINING_WORKERS", str(os.cpu_count() or 1))))
+
+# Chunks per worker: small enough to balance uneven matches, large enough
+# that each worker's caches (priors, recent form) get reused.
+CHUNKS_PER_WORKER = 4
+
+TeamRecord = namedtuple("TeamRecord", "id league_id")
+LeagueRecord = namedtuple("LeagueRecord", "id name")
+MatchRecord = namedtuple(
+    "MatchRecord", "id home_team_id away_team_id league_id start_time status home_score away_score"
+)
+EventRecord = namedtuple("EventRecord", "id match_id minute event_type team_id player_name detail")
+StandingRecord = namedtuple("StandingRecord", "team_id played points goals_for goals_against goal_difference")
+
+
+@dataclass
+class TrainingSnapshot:
+    """Every row the training features read, detached from the session."""
+
+    teams: Dict[int, TeamRecord]
+    leagues: Dict[int, LeagueRecord]
+    players_by_team: Dict[int, List[CandidatePlayer]]
+    # Finished matches with a kickoff, oldest first.
+    matches: List[MatchRecord]
+    events_by_match: Dict[int, List[EventRecord]]
+    standings: Dict[int, StandingRecord]
+    fingerprint: str = ""
+
+
+def _hashed(digest, rows: Iterable[tuple]) -> List[tuple]:
+    rows = list(rows)
+    for row in rows:
+        digest.update(repr(row).encode("utf-8"))
+    digest.update(b"\x00")
+    return rows
+
+
+def load_training_snapshot(db: Session) -> TrainingSnapshot:
+    """Load the training inputs in six queries and fingerprint them."""
+    digest = hashlib.sha256(repr((TRAINING_FRAME_VERSION, FEATURE_COLUMNS)).encode("utf-8"))
+    finished = list(FINISHED_MATCH_STATUSES)
+
+    teams = _hashed(digest, (TeamRecord(*row) for row in db.query(Team.id, Team.league_id).order_by(Team.id)))
+    leagues = _hashed(digest, (LeagueRecord(*row) for row in db.query(League.id, League.name).order_by(League.id)))
+    players = _hashed(digest, (
+        CandidatePlayer(*row)
+        for row in db.query(
+            Player.id, Player.name, Player.team_id, Player.position, Player.minutes_played,
+            Player.goals_season, Player.assists_season, Player.rating_season,
+        ).order_by(Player.id)
+    ))
+    matches = _hashed(digest, (
+        MatchRecord(*row)
+        for row in db.query(
+            Match.id, Match.home_team_id, Match.away_team_id, Match.league_id, Match.start_time,
+            Match.status, Match.home_score, Match.away_score,
+        )
+        .filter(Match.status.in_(finished), Match.start_time.isnot(None))
+        .order_by(Match.start_time.asc(), Match.id.asc())
+    ))
+    # Ordered as `_events_for_match` orders them, by the database.
+    events = _hashed(digest, (
+        EventRecord(*row)
+        for row in db.query(
+            MatchEvent.id, MatchEvent.match_id, MatchEvent.minute, MatchEvent.event_type,
+            MatchEvent.team_id, MatchEvent.player_name, MatchEvent.detail,
+        )
+        .join(Match, Match.id == MatchEvent.match_id)
+        .filter(Match.status.in_(finished))
+        .order_by(MatchEvent.match_id.asc(), MatchEvent.minute.asc(), MatchEvent.id.asc())
+    ))
+    standings = _hashed(digest, (
+        StandingRecord(*row)
+        for row in db.query(
+            Standing.team_id, Standing.played, Standing.points, Standing.goals_for,
+            Standing.goals_against, Standing.goal_difference,
+        ).order_by(Standing.id)
+    ))
+
+    players_by_team: Dict[int, List[CandidatePlayer]] = defaultdict(list)
+    for player in players:
+        players_by_team[player.team_id].append(player)
+    events_by_match: Dict[int, List[EventRecord]] = defaultdict(list)
+    for event in events:
+        events_by_match[event.match_id].append(event)
+    first_standing: Dict[int, StandingRecord] = {}
+    for standing in standings:
+        first_standing.setdefault(standing.team_id, standing)
+
+    return TrainingSnapshot(
+        teams={team.id: team for team in teams},
+        leagues={league.id: league for league in leagues},
+        players_by_team={team_id: squad_order(squad) for team_id, squad in players_by_team.items()},
+        matches=matches,
+        events_by_match=dict(events_by_match),
+        standings=first_standing,
+        fingerprint=digest.hexdigest(),
+    )
+
+
+@dataclass
+class _TeamHistory:
+    """A team's finished matches, oldest first, with their kickoffs for bisecting."""
+
+    kickoffs: List = field(default_factory=list)
+    matches: List[MatchRecord] = field(default_factory=list)
+
+    def add(self, match: MatchRecord) -> None:
+        self.kickoffs.append(match.start_time)
+        self.matches.append(match)
+
+    def last_before(self, cutoff_time, limit: int) -> List[MatchRecord]:
+        end = bisect.bisect_left(self.kickoffs, cutoff_time)
+        return self.matches[max(0, end - limit):end][::-1]
+
+
+class SnapshotFeatureBuilder(NextEventFeatureBuilder):
+    """`NextEventFeatureBuilder` reading a `TrainingSnapshot` instead of the database."""
+
+    def __init__(self, snapshot: TrainingSnapshot):
+        super().__init__(db=None)
+        self.snapshot = snapshot
+        self._history: Dict[int, _TeamHistory] = defaultdict(_TeamHistory)
+        self._scored_history: Dict[int, _TeamHistory] = defaultdict(_TeamHistory)
+        for match in snapshot.matches:
+            scored = match.home_score is not None and match.away_score is not None
+            for team_id in {match.home_team_id, match.away_team_id}:
+                self._history[team_id].add(match)
+                if scored:
+                    self._scored_history[team_id].add(match)
+
+    def _team(self, team_id: int):
+        return self.snapshot.teams.get(team_id)
+
+    def _league_for_team(self, team_id: int):
+        team = self._team(team_id)
+        if not team or not team.league_id:
+            return None
+        return self.snapshot.leagues.get(team.league_id)
+
+    def get_supported_finished_matches(self) -> List[MatchRecord]:
+        return [
+            match
+            for match in self.snapshot.matches
+            if match.home_score is not None and match.away_score is not None and self.is_supported_match(match)
+        ]
+
+    def _events_for_match(self, match_id: int) -> List[EventRecord]:
+        return self.snapshot.events_by_match.get(match_id, [])
+
+    def _players_for_team(self, team_id: int) -> List[CandidatePlayer]:
+        return self.snapshot.players_by_team.get(team_id, [])
+
+    def _recent_results(self, team_id: int, cutoff_time) -> List[MatchRecord]:
+        return self._scored_history[team_id].last_before(cutoff_time, 15)
+
+    def _standing(self, team_id: int) -> Optional[StandingRecord]:
+        return self.snapshot.standings.get(team_id)
+
+    def _recent_matches(self, team_id: int, cutoff_time) -> List[MatchRecord]:
+        return self._history[team_id].last_before(cutoff_time, 20)
+
+    def _events_by_match_for(self, match_ids: Sequence[int]) -> Dict[int, List[EventRecord]]:
+        return self.snapshot.events_by_match
+
+
+_worker_builder: Optional[SnapshotFeatureBuilder] = None
+
+
+def _init_worker(snapshot: TrainingSnapshot) -> None:
+    global _worker_builder
+    _worker_builder = SnapshotFeatureBuilder(snapshot)
+
+
+def _build_chunk(match_ids: Sequence[int], tasks: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    builder = _worker_builder
+    by_id = {match.id: match for match in builder.snapshot.matches}
+    matches = [by_id[match_id] for match_id in match_ids]
+    return {task: builder.build_training_frame(task, matches=matches) for task in tasks}
+
+
+def _day_aligned_chunks(matches: Sequence[MatchRecord], n_chunks: int) -> List[List[int]]:
+    """Split `matches` (oldest first) into about `n_chunks` runs of ids that never split a day.
+
+    The builder's priors and recent form are cached per (team, kickoff
+    day) with the first kickoff of the day it sees, so a day must be built
+    by one worker, in order, for the rows to match a serial build.
+    """
+    chunks: List[List[int]] = []
+    target = max(1, -(-len(matches) // max(1, n_chunks)))
+    for i, match in enumerate(matches):
+        if not chunks or (len(chunks[-1]) >= target and match.start_time.date() != matches[i - 1].start_time.date()):
+            chunks.append([])
+        chunks[-1].append(match.id)
+    return chunks
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=TRAINING_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_training_frames(
+    snapshot: TrainingSnapshot,
+    tasks: Sequence[str] = TASKS,
+    workers: int = WORKERS,
+) -> Dict[str, pd.DataFrame]:
+    """Training frame per task, the supported matches split across `workers` processes."""
+    matches = SnapshotFeatureBuilder(snapshot).get_supported_finished_matches()
+    match_ids = [match.id for match in matches]
+    workers = max(1, min(workers, len(match_ids)))
+    if workers == 1:
+        _init_worker(snapshot)
+        return _build_chunk(match_ids, tasks)
+
+    chunks = _day_aligned_chunks(matches, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot,)) as pool:
+        results = list(pool.map(_build_chunk, chunks, [tasks] * len(chunks)))
+    return {task: _concat([result[task] for result in results]) for task in tasks}
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _cache_path(cache_dir: Path, fingerprint: str, task: str) -> Path:
+    suffix = "parquet" if _parquet_available() else "pkl"
+    return cache_dir / f"next_event_training_{task}_{fingerprint[:20]}.{suffix}"
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_pickle(path)
+
+
+def _write_frame(frame: pd.DataFrame, path: Path) -> None:
+    # Written aside and renamed, so a crash never leaves a truncated cache.
+    tmp_path = path.with_name(path.name + ".tmp")
+    if path.suffix == ".parquet":
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def cached_training_frames(
+    db: Session,
+    tasks: Sequence[str] = TASKS,
+    workers: int = WORKERS,
+    cache_dir: Path = CACHE_DIR,
+    rebuild: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """Training frames for the current data, built only when it changed since the last run."""
+    snapshot = load_training_snapshot(db)
+    paths = {task: _cache_path(cache_dir, snapshot.fingerprint, task) for task in tasks}
+    if not rebuild and all(path.exists() for path in paths.values()):
+        logger.info("Reusing next-event training frames %s", snapshot.fingerprint[:20])
+        return {task: _read_frame(path) for task, path in paths.items()}
+
+    frames = build_training_frames(snapshot, tasks, workers)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for task, path in paths.items():
+        for stale in cache_dir.glob(f"next_event_training_{task}_*"):
+            stale.unlink()
+        _write_frame(frames[task], path)
+    return frames
@@ -0,0 +1,256 @@
+"""Monte Carlo projection of a league's final table.
+
+Takes the current season's table (ranked rows as the standings endpoint
+serves them) and the league's remaining fixtures of that season, and plays
+the rest of the season `n_simulations` times, all at once in NumPy:
+
+- Each remaining fixture has home/draw/away probabilities: the stored
+  `Prediction` (1X2 model or its heuristic fallback) when there is one,
+  otherwise the Elo expected score of the teams' current ratings (as in
+  `expected_home_score`), split into a draw share (`DRAW_RATE` for evenly
+  matched sides) and home/away wins that keep that expected score.
+- One uniform draw per (season, fixture) picks the outcome; points per
+  season are the current points plus an (n, fixtures) x (fixtures, teams)
+  product with the home/away incidence matrices.
+- Goals are not simulated, so goal difference and goals scored stay as
+  they are: teams level on points keep their current table order, which
+  is exactly what `_compute_league_standings`' tiebreakers would give.
+
+`simulate_season_positions` can split the seasons across a process pool
+(``SEASON_SIM_WORKERS``); each chunk gets an independent seed from one
+`SeedSequence`, so a (seed, workers) pair is reproducible.
+``python -m ai.benchmark_season_simulator`` reports seasons per second.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+try:
+    from backend.ai.elo import DEFAULT_RATING, HOME_ADVANTAGE
+    from backend.ai.elo_updater import current_ratings
+    from backend.models import Match, Prediction
+    from backend.services.league_tables import season_start
+except ImportError:
+    from ai.elo import DEFAULT_RATING, HOME_ADVANTAGE  # type: ignore[no-redef]
+    from ai.elo_updater import current_ratings  # type: ignore[no-redef]
+    from models import Match, Prediction  # type: ignore[no-redef]
+    from services.league_tables import season_start  # type: ignore[no-redef]
+
+
+# Statuses whose result isn't in the table yet (`_compute_league_standings`
+# only counts FT).
+REMAINING_STATUSES = ["NS", "TBD", "PST", "SUSP", "LIVE", "HT", "ET", "P", "1H", "2H"]
+
+# Share of draws between two evenly matched sides (top-flight average);
+# shrinks linearly to 0 as one side's expected score approaches 1.
+DRAW_RATE = 0.27
+
+TOP_SPOTS = 4
+RELEGATION_SPOTS = 3
+
+DEFAULT_SIMULATIONS = int(os.getenv("SEASON_SIM_SIMULATIONS", "20000"))
+WORKERS = max(1, int(os.getenv("SEASON_SIM_WORKERS", "1")))
+
+# Seasons per vectorised chunk; bounds peak memory to a few tens of MB.
+CHUNK_SIZE = 20000
+
+
+@dataclass(frozen=True)
+class SeasonState:
+    """Everything a simulation needs, as arrays (picklable for the pool)."""
+
+    team_ids: Tuple[int, ...]  # current table order
+    points: np.ndarray  # (teams,)
+    home_index: np.ndarray  # (fixtures,) index into team_ids
+    away_index: np.ndarray  # (fixtures,)
+    probabilities: np.ndarray  # (fixtures, 3) home/draw/away
+
+
+def elo_fixture_probabilities(home_elo: np.ndarray, away_elo: np.ndarray) -> np.ndarray:
+    """(n, 3) home/draw/away probabilities from Elo, keeping the Elo expected score."""
+    # Vectorised `expected_home_score`.
+    expected = 1.0 / (1.0 + np.power(10.0, (away_elo - (home_elo + HOME_ADVANTAGE)) / 400.0))
+    draw = DRAW_RATE * (1.0 - np.abs(2.0 * expected - 1.0))
+    home = np.clip(expected - draw / 2.0, 0.0, 1.0)
+    away = np.clip(1.0 - expected - draw / 2.0, 0.0, 1.0)
+    probs = np.column_stack([home, draw, away])
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def fixture_probabilities(db: Session, fixtures: Sequence[Tuple[Match, Optional[Prediction]]]) -> np.ndarray:
+    """(fixtures, 3) home/draw/away probabilities: the stored prediction, else Elo."""
+    probabilities = np.zeros((len(fixtures), 3), dtype=np.float64)
+    needs_elo = []
+    for i, (_match, prediction) in enumerate(fixtures):
+        stored = (
+            [prediction.home_win_prob, prediction.draw_prob, prediction.away_win_prob]
+            if prediction is not None
+            else None
+        )
+        if stored is None or any(p is None or p < 0 for p in stored) or sum(stored) <= 0:
+            needs_elo.append(i)
+            continue
+        # Normalise: rows may be stored as fractions or as percentages.
+        probabilities[i] = np.asarray(stored, dtype=np.float64) / float(sum(stored))
+
+    if needs_elo:
+        ratings = current_ratings(
+            db, {team_id for m, _ in fixtures for team_id in (m.home_team_id, m.away_team_id)}
+        )
+        home_elo = np.asarray([ratings.get(fixtures[i][0].home_team_id, DEFAULT_RATING) for i in needs_elo])
+        away_elo = np.asarray([ratings.get(fixtures[i][0].away_team_id, DEFAULT_RATING) for i in needs_elo])
+        probabilities[needs_elo] = elo_fixture_probabilities(home_elo, away_elo)
+    return probabilities
+
+
+def build_season_state(
+    db: Session, league_id: int, season: int, table: Sequence[Dict[str, Any]]
+) -> SeasonState:
+    """`season`'s table plus the league's remaining fixtures of it between its teams (two queries).
+
+    Cup or European ties between two of the league's clubs are not league
+    fixtures and earn no table points, so only `league_id` fixtures count;
+    unplayed rows left over from earlier seasons are not simulated either.
+    """
+    team_ids = tuple(row["team_id"] for row in table)
+    position = {team_id: i for i, team_id in enumerate(team_ids)}
+
+    fixtures = (
+        db.query(Match, Prediction)
+        .outerjoin(Prediction, Prediction.match_id == Match.id)
+        .filter(
+            Match.league_id == league_id,
+            Match.start_time >= season_start(season),
+            Match.start_time < season_start(season + 1),
+            Match.home_team_id.in_(team_ids),
+            Match.away_team_id.in_(team_ids),
+            Match.status.in_(REMAINING_STATUSES),
+        )
+        .order_by(Match.start_time.asc(), Match.id.asc())
+        .all()
+    )
+
+    return SeasonState(
+        team_ids=team_ids,
+        points=np.asarray([row["points"] for row in table], dtype=np.float32),
+        home_index=np.asarray([position[m.home_team_id] for m, _ in fixtures], dtype=np.int64),
+        away_index=np.asarray([position[m.away_team_id] for m, _ in fixtures], dtype=np.int64),
+        probabilities=fixture_probabilities(db, fixtures),
+    )
+
+
+def _simulate_chunk(state: SeasonState, n_simulations: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """`(position_counts, points_sum)` over `n_simulations` seasons.
+
+    ``position_counts[t, p]`` is how often team t finished in position p.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(state.team_ids)
+    n_fixtures = len(state.home_index)
+
+    home_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_incidence[np.arange(n_fixtures), state.home_index] = 1.0
+    away_incidence[np.arange(n_fixtures), state.away_index] = 1.0
+    home_cut = state.probabilities[:, 0].astype(np.float32)
+    draw_cut = (state.probabilities[:, 0] + state.probabilities[:, 1]).astype(np.float32)
+
+    # Ties on points keep the current table order (index 0 = first).
+    table_order = np.arange(n_teams, 0, -1, dtype=np.float32) / (n_teams + 1)
+    slots = np.arange(n_teams)
+
+    position_counts = np.zeros(n_teams * n_teams, dtype=np.int64)
+    points_sum = np.zeros(n_teams, dtype=np.float64)
+    remaining = n_simulations
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        remaining -= size
+
+        draws = rng.random((size, n_fixtures), dtype=np.float32)
+        home_win = draws < home_cut
+        draw = ~home_win & (draws < draw_cut)
+        away_win = ~(home_win | draw)
+
+        home_points = (3 * home_win + draw).astype(np.float32)
+        away_points = (3 * away_win + draw).astype(np.float32)
+        points = state.points + home_points @ home_incidence + away_points @ away_incidence
+        points_sum += points.sum(axis=0, dtype=np.float64)
+
+        finishing_order = np.argsort(-(points + table_order), axis=1, kind="stable")
+        position_counts += np.bincount(
+            (finishing_order * n_teams + slots).ravel(), minlength=n_teams * n_teams
+        )
+
+    return position_counts.reshape(n_teams, n_teams), points_sum
+
+
+def simulate_season_positions(
+    state: SeasonState,
+    n_simulations: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """`(position_counts, points_sum)` over `n_simulations` seasons, optionally in a process pool."""
+    workers = max(1, min(workers, n_simulations))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    if workers == 1:
+        return _simulate_chunk(state, n_simulations, seeds[0])
+
+    sizes = [n_simulations // workers + (1 if i < n_simulations % workers else 0) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_simulate_chunk, [state] * workers, sizes, seeds))
+    return sum(counts for counts, _ in results), sum(points for _, points in results)
+
+
+def project_league(
+    db: Session,
+    league_id: int,
+    season: int,
+    table: Sequence[Dict[str, Any]],
+    n_simulations: int = DEFAULT_SIMULATIONS,
+    workers: int = WORKERS,
+) -> Dict[str, Any]:
+    """Title / top-4 / relegation odds and the finishing-position distribution per team.
+
+    Seeded by the league id, so every API worker renders the same body (and
+    ETag) for the same data.
+    """
+    state = build_season_state(db, league_id, season, table)
+    counts, points_sum = simulate_season_positions(state, n_simulations, seed=league_id, workers=workers)
+    probabilities = counts / float(n_simulations)
+
+    n_teams = len(state.team_ids)
+    relegation_from = max(n_teams - RELEGATION_SPOTS, 0)
+    teams: List[Dict[str, Any]] = []
+    for i, row in enumerate(table):
+        teams.append({
+            "team_id": row["team_id"],
+            "team_name": row["team_name"],
+            "team_logo": row["team_logo"],
+            "rank": row["rank"],
+            "points": row["points"],
+            "played": row["played"],
+            "expected_points": round(float(points_sum[i]) / n_simulations, 2),
+            "title": round(float(probabilities[i, 0]), 4),
+            "top4": round(float(probabilities[i, :TOP_SPOTS].sum()), 4),
+            "relegation": round(float(probabilities[i, relegation_from:].sum()), 4),
+            "positions": [round(float(p), 4) for p in probabilities[i]],
+        })
+    teams.sort(key=lambda team: (-team["expected_points"], team["rank"]))
+
+    return {
+        "league_id": league_id,
+        "season": season,
+        "simulations": n_simulations,
+        "remaining_fixtures": int(len(state.home_index)),
+        "top_spots": TOP_SPOTS,
+        "relegation_spots": RELEGATION_SPOTS,
+        "teams": teams,
+    }
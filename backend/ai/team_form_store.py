@@ -0,0 +1,280 @@
+"""Team form feature store: rolling pre-kickoff team context, persisted.
+
+The xG, match-outcome and next-event models each derived a team's recent
+form from raw `Match` rows at inference time: `XGFeatureBuilder.team_history`
+plus a statistics query per historical match, `_recent_finished`,
+`_recent_finished_at_venue`, `_rest_days` and one Elo query per recent
+opponent in `match_outcome_features`, and `_team_prior` in
+`next_event_features`. `team_form_snapshots` persists those aggregates once
+per team per finished fixture:
+
+- A row for (team, match) is the team's context over every finished match
+  up to and including that kickoff (`as_of`), i.e. the pre-kickoff context
+  of whatever the team plays next. `latest_team_form(db, team, kickoff)`
+  is one indexed lookup on ``(team_id, as_of)``.
+- The scheduler's `refresh_derived_data` job calls `refresh_team_form`
+  once a sync that stores a result has committed; it recomputes the
+  affected teams' rows from the earliest changed kickoff on, so late or
+  corrected results are handled too. `rebuild_team_form_store`
+  (``python -m ai.team_form_store``) rebuilds everything, e.g. after
+  `build_elo_history` or a seed script.
+- Every value is computed by the same helpers the models use, so a store
+  read is exactly what the ad-hoc queries would return. When no row
+  precedes kickoff (new team, store not backfilled, table missing,
+  ``TEAM_FORM_STORE_ENABLED=0``) readers fall back to their own queries.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import weakref
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+try:
+    from backend.models import Match, TeamFormSnapshot
+except ImportError:
+    from models import Match, TeamFormSnapshot  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("TEAM_FORM_STORE_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+
+# History window of the stored xG context; readers asking for another
+# window (an artifact trained with a different `history_window`) fall back
+# to the builder.
+XG_WINDOW = 12
+
+# Snapshots cover every match with a kickoff at or before `as_of`.
+_AS_OF_EPSILON = datetime.timedelta(microseconds=1)
+
+_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+
+def _store_available(db: Session) -> bool:
+    if not ENABLED:
+        return False
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    present = _table_present.get(engine)
+    if present is None:
+        present = sa_inspect(db.connection()).has_table(TeamFormSnapshot.__tablename__)
+        _table_present[engine] = present
+    return present
+
+
+def latest_team_form(
+    db: Session,
+    team_id: Optional[int],
+    before: Optional[datetime.datetime],
+) -> Optional[TeamFormSnapshot]:
+    """The team's context for a kickoff at `before`, or None to fall back."""
+    if team_id is None or before is None or not _store_available(db):
+        return None
+    return (
+        db.query(TeamFormSnapshot)
+        .filter(TeamFormSnapshot.team_id == team_id, TeamFormSnapshot.as_of < before)
+        .order_by(TeamFormSnapshot.as_of.desc(), TeamFormSnapshot.match_id.desc())
+        .first()
+    )
+
+
+# ── Writing ─────────────────────────────────────────────────────────────────
+
+
+def compute_team_form_snapshots(
+    db: Session,
+    since_by_team: Mapping[int, Optional[datetime.datetime]],
+) -> List[TeamFormSnapshot]:
+    """Snapshot rows for each team's finished matches kicking off at or after its `since`.
+
+    ``since=None`` means the team's whole history. Reads the teams'
+    matches, statistics and Elo snapshots in bulk (`TeamMatchHistory`,
+    `XGTeamHistoryIndex`).
+    """
+    # Imported here: both modules read from this one.
+    try:
+        from backend.ai import match_outcome_features as outcome
+        from backend.ai.xg_model import XGTeamHistoryIndex, _safe_float
+    except ImportError:
+        from ai import match_outcome_features as outcome  # type: ignore[no-redef]
+        from ai.xg_model import XGTeamHistoryIndex, _safe_float  # type: ignore[no-redef]
+
+    team_ids = [team_id for team_id in since_by_team if team_id is not None]
+    if not team_ids:
+        return []
+
+    history = outcome.TeamMatchHistory(db, team_ids)
+    xg_index = XGTeamHistoryIndex(db, team_ids=team_ids)
+    now = datetime.datetime.utcnow()
+
+    snapshots: List[TeamFormSnapshot] = []
+    for team_id in team_ids:
+        since = since_by_team[team_id]
+
+        for match in history.finished_matches(team_id):
+            if since is not None and match.start_time < since:
+                continue
+
+            as_of = match.start_time
+            cutoff = as_of + _AS_OF_EPSILON
+            form = history.team_form(team_id, cutoff, venue_is_home=True)
+            away_form_5 = outcome._form_points(
+                history.recent(team_id, cutoff, 5, keep=lambda m, _t=team_id: m.away_team_id == _t), team_id
+            )
+
+            goals_for_15 = 0.0
+            goals_against_15 = 0.0
+            points_15 = 0.0
+            recent_15 = history.recent(team_id, cutoff, 15)
+            for row in recent_15:
+                is_home = row.home_team_id == team_id
+                team_goals = _safe_float(row.home_score if is_home else row.away_score)
+                opp_goals = _safe_float(row.away_score if is_home else row.home_score)
+                goals_for_15 += team_goals
+                goals_against_15 += opp_goals
+                if team_goals > opp_goals:
+                    points_15 += 3.0
+                elif team_goals == opp_goals:
+                    points_15 += 1.0
+
+            xg_context = xg_index._aggregate_team_context(team_id, cutoff, XG_WINDOW)
+
+            snapshots.append(
+                TeamFormSnapshot(
+                    team_id=team_id,
+                    match_id=match.id,
+                    as_of=as_of,
+                    elo=form["latest_elo"],
+                    form_points_5=form["form_5"],
+                    home_form_5=form["venue_form_5"],
+                    away_form_5=away_form_5,
+                    goals_for_avg_10=form["goals_for"],
+                    goals_against_avg_10=form["goals_against"],
+                    btts_rate_10=form["btts"],
+                    form_vs_strong_5=form["strong"],
+                    matches_15=len(recent_15),
+                    goals_for_15=goals_for_15,
+                    goals_against_15=goals_against_15,
+                    points_15=points_15,
+                    xg_window=XG_WINDOW,
+                    xg_matches=float(xg_context["matches"]),
+                    xg_points_per_match=xg_context["points_per_match"],
+                    xg_goals_for_avg=xg_context["goals_for_avg"],
+                    xg_goals_against_avg=xg_context["goals_against_avg"],
+                    xg_shots_on_avg=xg_context["shots_on_avg"],
+                    xg_shots_off_avg=xg_context["shots_off_avg"],
+                    xg_possession_avg=xg_context["possession_avg"],
+                    xg_corners_avg=xg_context["corners_avg"],
+                    xg_form_points_last5=xg_context["form_points_last5"],
+                    xg_stats_coverage=xg_context["stats_coverage"],
+                    xg_last_match_at=xg_index.latest_history_start(team_id, cutoff, XG_WINDOW),
+                    updated_at=now,
+                )
+            )
+
+    return snapshots
+
+
+def _replace_snapshots(db: Session, since_by_team: Mapping[int, Optional[datetime.datetime]]) -> int:
+    snapshots = compute_team_form_snapshots(db, since_by_team)
+    for team_id, since in since_by_team.items():
+        stale = db.query(TeamFormSnapshot).filter(TeamFormSnapshot.team_id == team_id)
+        if since is not None:
+            stale = stale.filter(TeamFormSnapshot.as_of >= since)
+        stale.delete(synchronize_session=False)
+    db.add_all(snapshots)
+    db.flush()
+    return len(snapshots)
+
+
+def refresh_team_form(db: Session, since_by_team: Mapping[int, Optional[datetime.datetime]]) -> None:
+    """Recompute team snapshots from the given kickoffs on, inside the caller's transaction.
+
+    Runs in a SAVEPOINT so a missing ``team_form_snapshots`` table
+    (migration not applied yet) can't abort the caller's transaction.
+    """
+    since_by_team = {team_id: since for team_id, since in since_by_team.items() if team_id is not None}
+    if not since_by_team or not ENABLED:
+        return
+    try:
+        with db.begin_nested():
+            count = _replace_snapshots(db, since_by_team)
+        logger.debug("Refreshed %s team form snapshots for %s teams", count, len(since_by_team))
+    except Exception:
+        logger.warning("Could not refresh team form snapshots; readers fall back to live queries", exc_info=True)
+
+
+def naive_utc(value: datetime.datetime) -> datetime.datetime:
+    """Kickoffs are stored as naive UTC; providers hand out aware datetimes."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def note_form_change(
+    since_by_team: Dict[int, datetime.datetime],
+    team_ids: Iterable[Optional[int]],
+    *start_times: Optional[datetime.datetime],
+) -> None:
+    """Record that `team_ids`' form changes from the earliest of `start_times` on."""
+    known = [naive_utc(start) for start in start_times if start is not None]
+    if not known:
+        return
+    since = min(known)
+    for team_id in team_ids:
+        if team_id is None:
+            continue
+        current = since_by_team.get(team_id)
+        if current is None or since < current:
+            since_by_team[team_id] = since
+
+
+def rebuild_team_form_store(db: Session) -> int:
+    """Replace every snapshot. Returns the number of rows written."""
+    team_ids = {
+        team_id
+        for pair in db.query(Match.home_team_id, Match.away_team_id)
+        .filter(Match.status.in_(list(FINISHED_STATUSES)))
+        .distinct()
+        for team_id in pair
+        if team_id is not None
+    }
+    db.query(TeamFormSnapshot).delete(synchronize_session=False)
+    snapshots = compute_team_form_snapshots(db, {team_id: None for team_id in sorted(team_ids)})
+
+    # Insert in chunks so we don't overwhelm the Supabase pooler with one
+    # giant INSERT.
+    batch_size = 500
+    for i in range(0, len(snapshots), batch_size):
+        db.bulk_save_objects(snapshots[i : i + batch_size])
+    return len(snapshots)
+
+
+def main() -> None:
+    try:
+        from backend.database import SessionLocal
+    except ImportError:
+        from database import SessionLocal  # type: ignore[no-redef]
+
+    db = SessionLocal()
+    try:
+        count = rebuild_team_form_store(db)
+        db.commit()
+        print(f"Persisted {count} team form snapshots.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
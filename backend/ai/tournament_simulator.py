@@ -0,0 +1,522 @@
+"""Monte Carlo projection of a tournament: each team's odds of reaching every round.
+
+`get_league_bracket` and `_compute_tournament_standings` only show where a
+World Cup / Champions League stands now. This module plays the rest of the
+tournament `n_simulations` times, all at once in NumPy:
+
+- Group stage: the finished group results (`Match.group_name`) give the
+  current tables; every remaining group fixture is decided by its stored
+  `Prediction` or, failing that, Elo (see
+  `season_simulator.fixture_probabilities`). As in the season simulator,
+  goals are not simulated: teams level on points keep their current order
+  (goal difference, goals scored, name).
+- Qualification: the bracket size comes from the first knockout stage in
+  `Match.stage` (LAST_32 -> 32 teams, ...), or, before the draw, the
+  smallest power of two that holds every group's top two. Slots whose team
+  is already known keep it; the others go to the best remaining teams
+  (group winners and runners-up first, then the best third-placed teams)
+  in a random order, since the draw rules aren't in the data.
+- Knockout rounds: ties of a round are ordered by kickoff, then id; the
+  winners of ties 2k and 2k+1 meet in tie k of the next round, except
+  where the provider already lists a later tie's teams. Finished ties keep
+  their winner. Open ties use the stored prediction when both teams are
+  known, otherwise neutral-venue Elo. A draw goes to extra time, won
+  outright `EXTRA_TIME_DECISIVE_RATE` of the time (in proportion to the
+  sides' win probabilities), else to a 50/50 shoot-out.
+
+The scheduler recomputes a league's projection whenever one of its results
+is stored (`refresh_tournament_projections`, same transaction) and keeps it
+in `tournament_projections`; the API only reads that row, so the bracket
+page never runs a simulation. ``python -m ai.tournament_simulator``
+recomputes every tournament (backfill after the migration).
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+try:
+    from backend.ai.elo import DEFAULT_RATING, HOME_ADVANTAGE
+    from backend.ai.elo_updater import current_ratings
+    from backend.ai.season_simulator import REMAINING_STATUSES, elo_fixture_probabilities, fixture_probabilities
+    from backend.models import Match, Prediction, Team, TournamentProjection
+except ImportError:
+    from ai.elo import DEFAULT_RATING, HOME_ADVANTAGE  # type: ignore[no-redef]
+    from ai.elo_updater import current_ratings  # type: ignore[no-redef]
+    from ai.season_simulator import (  # type: ignore[no-redef]
+        REMAINING_STATUSES,
+        elo_fixture_probabilities,
+        fixture_probabilities,
+    )
+    from models import Match, Prediction, Team, TournamentProjection  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+
+# (stage, display name, teams in the round); THIRD_PLACE decides nothing.
+KNOCKOUT_ROUNDS = (
+    ("LAST_32", "Round of 32", 32),
+    ("LAST_16", "Round of 16", 16),
+    ("QUARTER_FINALS", "Quarter-Finals", 8),
+    ("SEMI_FINALS", "Semi-Finals", 4),
+    ("FINAL", "Final", 2),
+)
+WINNER = "WINNER"
+
+# Share of drawn knockout ties settled in extra time rather than on penalties.
+EXTRA_TIME_DECISIVE_RATE = 0.45
+
+DEFAULT_SIMULATIONS = int(os.getenv("TOURNAMENT_SIM_SIMULATIONS", "20000"))
+
+# Tournaments per vectorised chunk; bounds peak memory to a few MB.
+CHUNK_SIZE = 20000
+
+_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class KnockoutRound:
+    """One round's bracket: two slots per tie, in tie order."""
+
+    stage: str
+    fixed_slots: np.ndarray  # (2 * ties,) team index, -1 when not known yet
+    feeders: np.ndarray  # (2 * ties,) previous round's tie whose winner fills the slot, -1 if fixed
+    winners: np.ndarray  # (ties,) team index of a finished tie's winner, else -1
+    probabilities: np.ndarray  # (ties, 3) stored home/draw/away odds, NaN rows use Elo
+
+
+@dataclass(frozen=True)
+class TournamentState:
+    """Everything a simulation needs, as arrays."""
+
+    team_ids: Tuple[int, ...]
+    group_index: np.ndarray  # (teams,) index into group_names, -1 without a group
+    group_names: Tuple[str, ...]
+    points: np.ndarray  # (teams,) group points so far
+    table_order: np.ndarray  # (teams,) in (0, 1): current tiebreak, higher is better
+    home_index: np.ndarray  # (fixtures,) remaining group fixtures
+    away_index: np.ndarray
+    fixture_probabilities: np.ndarray  # (fixtures, 3)
+    knockout_probabilities: np.ndarray  # (teams, teams, 3) neutral-venue Elo, row team first
+    rounds: Tuple[KnockoutRound, ...]
+
+
+# ── State ───────────────────────────────────────────────────────────────────
+
+
+def _bracket_size(stages: Iterable[str], n_groups: int) -> Optional[int]:
+    present = set(stages)
+    for stage, _name, size in KNOCKOUT_ROUNDS:
+        if stage in present:
+            return size
+    for _stage, _name, size in reversed(KNOCKOUT_ROUNDS):
+        if size >= 2 * n_groups:
+            return size
+    return None
+
+
+def _decided_winner(match: Match, later_teams: set) -> Optional[int]:
+    if match.home_score is None or match.away_score is None:
+        return None
+    if match.home_score != match.away_score:
+        return match.home_team_id if match.home_score > match.away_score else match.away_team_id
+    # Level after extra time: the shoot-out winner is whoever plays on.
+    for team_id in (match.home_team_id, match.away_team_id):
+        if team_id in later_teams:
+            return team_id
+    return None
+
+
+def build_tournament_state(db: Session, league_id: int) -> Optional[TournamentState]:
+    """Group tables, remaining fixtures and bracket of a tournament; None if it has no groups."""
+    group_rows = (
+        db.query(Match, Prediction)
+        .outerjoin(Prediction, Prediction.match_id == Match.id)
+        .filter(Match.league_id == league_id, Match.group_name.isnot(None))
+        .order_by(Match.start_time.asc(), Match.id.asc())
+        .all()
+    )
+    if not group_rows:
+        return None
+    knockout_rows = (
+        db.query(Match, Prediction)
+        .outerjoin(Prediction, Prediction.match_id == Match.id)
+        .filter(Match.league_id == league_id, Match.stage.in_([stage for stage, _, _ in KNOCKOUT_ROUNDS]))
+        .order_by(Match.start_time.asc(), Match.id.asc())
+        .all()
+    )
+
+    team_group: Dict[int, str] = {}
+    for match, _ in group_rows:
+        for team_id in (match.home_team_id, match.away_team_id):
+            if team_id is not None:
+                team_group[team_id] = match.group_name
+    group_names = tuple(sorted(set(team_group.values())))
+
+    bracket_size = _bracket_size((m.stage for m, _ in knockout_rows), len(group_names))
+    if bracket_size is None:
+        return None
+    stages = [stage for stage, _, size in KNOCKOUT_ROUNDS if size <= bracket_size]
+
+    team_ids = sorted(team_group)
+    team_ids += sorted(
+        {t for m, _ in knockout_rows for t in (m.home_team_id, m.away_team_id) if t is not None} - set(team_group)
+    )
+    index = {team_id: i for i, team_id in enumerate(team_ids)}
+    n_teams = len(team_ids)
+
+    # Current group tables (the `_compute_tournament_standings` tiebreakers).
+    points = np.zeros(n_teams, dtype=np.float32)
+    goal_difference = np.zeros(n_teams)
+    goals_for = np.zeros(n_teams)
+    remaining = []
+    for match, prediction in group_rows:
+        if match.home_team_id is None or match.away_team_id is None:
+            continue
+        home, away = index[match.home_team_id], index[match.away_team_id]
+        if match.status in FINISHED_STATUSES and match.home_score is not None and match.away_score is not None:
+            goal_difference[home] += match.home_score - match.away_score
+            goal_difference[away] += match.away_score - match.home_score
+            goals_for[home] += match.home_score
+            goals_for[away] += match.away_score
+            if match.home_score > match.away_score:
+                points[home] += 3
+            elif match.home_score < match.away_score:
+                points[away] += 3
+            else:
+                points[home] += 1
+                points[away] += 1
+        elif match.status in REMAINING_STATUSES:
+            remaining.append((match, prediction))
+
+    names = {team_id: name for team_id, name in db.query(Team.id, Team.name).filter(Team.id.in_(team_ids))}
+    ranked = sorted(
+        range(n_teams),
+        key=lambda i: (-points[i], -goal_difference[i], -goals_for[i], names.get(team_ids[i], "")),
+    )
+    table_order = np.zeros(n_teams, dtype=np.float32)
+    table_order[ranked] = np.arange(n_teams, 0, -1, dtype=np.float32) / (n_teams + 1)
+
+    ratings = current_ratings(db, team_ids)
+    elo = np.asarray([ratings.get(team_id, DEFAULT_RATING) for team_id in team_ids], dtype=np.float64)
+    home_elo, away_elo = np.meshgrid(elo - HOME_ADVANTAGE, elo, indexing="ij")
+    knockout_probabilities = elo_fixture_probabilities(home_elo.ravel(), away_elo.ravel()).reshape(n_teams, n_teams, 3)
+
+    by_stage: Dict[str, List[Tuple[Match, Optional[Prediction]]]] = {}
+    for match, prediction in knockout_rows:
+        by_stage.setdefault(match.stage, []).append((match, prediction))
+
+    rounds: List[KnockoutRound] = []
+    previous_slots: Optional[np.ndarray] = None
+    for position, stage in enumerate(stages):
+        n_ties = bracket_size // 2 ** (position + 1)
+        ties = by_stage.get(stage, [])[:n_ties]
+        later_teams = {
+            t for later in stages[position + 1 :] for m, _ in by_stage.get(later, []) for t in (m.home_team_id, m.away_team_id)
+        }
+
+        fixed_slots = np.full(2 * n_ties, -1, dtype=np.int64)
+        winners = np.full(n_ties, -1, dtype=np.int64)
+        probabilities = np.full((n_ties, 3), np.nan)
+        for tie, (match, prediction) in enumerate(ties):
+            for slot, team_id in ((2 * tie, match.home_team_id), (2 * tie + 1, match.away_team_id)):
+                if team_id is not None:
+                    fixed_slots[slot] = index[team_id]
+            if match.home_team_id is None or match.away_team_id is None:
+                continue
+            if match.status in FINISHED_STATUSES:
+                winner = _decided_winner(match, later_teams)
+                if winner is not None:
+                    winners[tie] = index[winner]
+                else:
+                    probabilities[tie] = (0.5, 0.0, 0.5)
+            elif prediction is not None:
+                probabilities[tie] = fixture_probabilities(db, [(match, prediction)])[0]
+
+        # Later rounds: a known team's slot takes over its previous tie, the
+        # unknown slots take the remaining previous ties in order.
+        feeders = np.full(2 * n_ties, -1, dtype=np.int64)
+        if previous_slots is not None:
+            previous_tie = {int(team): slot // 2 for slot, team in enumerate(previous_slots) if team >= 0}
+            claimed = {previous_tie.get(int(team)) for team in fixed_slots if team >= 0}
+            open_ties = iter(tie for tie in range(len(previous_slots) // 2) if tie not in claimed)
+            for slot in np.flatnonzero(fixed_slots < 0):
+                feeders[slot] = next(open_ties, -1)
+            if (feeders[fixed_slots < 0] < 0).any():
+                logger.warning("Inconsistent %s bracket for league %s; not projecting it", stage, league_id)
+                return None
+
+        rounds.append(KnockoutRound(stage, fixed_slots, feeders, winners, probabilities))
+        previous_slots = fixed_slots
+
+    first_round = rounds[0].fixed_slots
+    open_slots = int((first_round < 0).sum())
+    placed = set(first_round[first_round >= 0].tolist())
+    if sum(1 for i in range(len(team_group)) if i not in placed) < open_slots:
+        logger.warning("Too few group teams to fill the %s bracket of league %s", stages[0], league_id)
+        return None
+
+    group_position = {name: i for i, name in enumerate(group_names)}
+    return TournamentState(
+        team_ids=tuple(team_ids),
+        group_index=np.asarray(
+            [group_position[team_group[t]] if t in team_group else -1 for t in team_ids], dtype=np.int64
+        ),
+        group_names=group_names,
+        points=points,
+        table_order=table_order,
+        home_index=np.asarray([index[m.home_team_id] for m, _ in remaining], dtype=np.int64),
+        away_index=np.asarray([index[m.away_team_id] for m, _ in remaining], dtype=np.int64),
+        fixture_probabilities=fixture_probabilities(db, remaining),
+        knockout_probabilities=knockout_probabilities,
+        rounds=tuple(rounds),
+    )
+
+
+# ── Simulation ──────────────────────────────────────────────────────────────
+
+
+def _simulate_groups(state: TournamentState, rng: np.random.Generator, size: int) -> np.ndarray:
+    """(size, teams) qualification key: lower is better, +inf never qualifies."""
+    n_teams = len(state.team_ids)
+    n_fixtures = len(state.home_index)
+
+    points = np.broadcast_to(state.points, (size, n_teams)).astype(np.float32)
+    if n_fixtures:
+        home_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+        away_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+        home_incidence[np.arange(n_fixtures), state.home_index] = 1.0
+        away_incidence[np.arange(n_fixtures), state.away_index] = 1.0
+
+        draws = rng.random((size, n_fixtures), dtype=np.float32)
+        home_win = draws < state.fixture_probabilities[:, 0].astype(np.float32)
+        draw = ~home_win & (draws < (state.fixture_probabilities[:, 0] + state.fixture_probabilities[:, 1]).astype(np.float32))
+        away_win = ~(home_win | draw)
+        points = (
+            points
+            + (3 * home_win + draw).astype(np.float32) @ home_incidence
+            + (3 * away_win + draw).astype(np.float32) @ away_incidence
+        )
+
+    # Position within the group: sort by (group, -score), then subtract the
+    # group's first row. Teams without a group sort last.
+    grouped = state.group_index >= 0
+    group_key = np.where(grouped, state.group_index, len(state.group_names)).astype(np.float64)
+    score = points + state.table_order
+    order = np.argsort(group_key * 1000.0 - score, axis=1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(n_teams), axis=1)
+    group_start = np.searchsorted(np.sort(group_key), group_key)
+    position = rank - group_start
+
+    # Group winners and runners-up first, then third-placed teams, ...;
+    # within a tier, the better record.
+    tier = np.maximum(position, 1) - 1
+    key = tier * 1000.0 - score
+    key[:, ~grouped] = np.inf
+    return key
+
+
+def _play_round(
+    state: TournamentState,
+    knockout: KnockoutRound,
+    slots: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Winners (size, ties) of one round given its (size, 2 * ties) slots."""
+    home, away = slots[:, 0::2], slots[:, 1::2]
+    probabilities = state.knockout_probabilities[home, away]  # (size, ties, 3)
+    stored = ~np.isnan(knockout.probabilities[:, 0])
+    probabilities[:, stored] = knockout.probabilities[stored]
+
+    p_home, p_draw, p_away = probabilities[..., 0], probabilities[..., 1], probabilities[..., 2]
+    outcome = rng.random(home.shape)
+    extra_time = rng.random(home.shape)
+    decider = rng.random(home.shape)
+
+    decisive = p_home + p_away
+    home_share = np.divide(p_home, decisive, out=np.full_like(p_home, 0.5), where=decisive > 0)
+    home_wins = np.where(
+        outcome < p_home,
+        True,
+        np.where(
+            outcome < p_home + p_draw,
+            np.where(extra_time < EXTRA_TIME_DECISIVE_RATE, decider < home_share, decider < 0.5),
+            False,
+        ),
+    )
+    winners = np.where(home_wins, home, away)
+
+    decided = knockout.winners >= 0
+    winners[:, decided] = knockout.winners[decided]
+    return winners
+
+
+def _simulate_chunk(state: TournamentState, size: int, rng: np.random.Generator) -> np.ndarray:
+    """(rounds + 1, teams) counts of reaching each round, and winning."""
+    n_teams = len(state.team_ids)
+    counts = np.zeros((len(state.rounds) + 1, n_teams), dtype=np.int64)
+
+    first = state.rounds[0]
+    slots = np.broadcast_to(first.fixed_slots, (size, len(first.fixed_slots))).copy()
+    open_slots = np.flatnonzero(first.fixed_slots < 0)
+    if len(open_slots):
+        key = _simulate_groups(state, rng, size)
+        key[:, first.fixed_slots[first.fixed_slots >= 0]] = np.inf
+        qualified = np.argsort(key, axis=1, kind="stable")[:, : len(open_slots)]
+        # Random draw of the qualifiers into the open slots.
+        draw = np.argsort(rng.random(qualified.shape), axis=1)
+        slots[:, open_slots] = np.take_along_axis(qualified, draw, axis=1)
+
+    for position, knockout in enumerate(state.rounds):
+        if position:
+            open_slots = knockout.fixed_slots < 0
+            slots = np.broadcast_to(knockout.fixed_slots, (size, len(knockout.fixed_slots))).copy()
+            slots[:, open_slots] = winners[:, knockout.feeders[open_slots]]
+        counts[position] += np.bincount(slots.ravel(), minlength=n_teams)
+        winners = _play_round(state, knockout, slots, rng)
+
+    counts[-1] += np.bincount(winners.ravel(), minlength=n_teams)
+    return counts
+
+
+def simulate_tournament(state: TournamentState, n_simulations: int, seed: Optional[int] = None) -> np.ndarray:
+    """(rounds + 1, teams) counts over `n_simulations` tournaments; the last row is the title."""
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((len(state.rounds) + 1, len(state.team_ids)), dtype=np.int64)
+    remaining = n_simulations
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        remaining -= size
+        counts += _simulate_chunk(state, size, rng)
+    return counts
+
+
+def project_tournament(db: Session, league_id: int, n_simulations: int = DEFAULT_SIMULATIONS) -> Optional[Dict[str, Any]]:
+    """Each team's probability of reaching every knockout round; None if not a group tournament.
+
+    Seeded by the league id, so the same data always gives the same body.
+    """
+    state = build_tournament_state(db, league_id)
+    if state is None:
+        return None
+    probabilities = simulate_tournament(state, n_simulations, seed=league_id) / float(n_simulations)
+
+    round_names = {stage: name for stage, name, _ in KNOCKOUT_ROUNDS}
+    stages = [knockout.stage for knockout in state.rounds] + [WINNER]
+    teams_by_id = {team.id: team for team in db.query(Team).filter(Team.id.in_(state.team_ids))}
+    teams: List[Dict[str, Any]] = []
+    for i, team_id in enumerate(state.team_ids):
+        team = teams_by_id.get(team_id)
+        group = state.group_index[i]
+        teams.append({
+            "team_id": team_id,
+            "team_name": team.name if team else f"Team {team_id}",
+            "team_logo": team.logo_url if team else "",
+            "group": state.group_names[group] if group >= 0 else None,
+            "rounds": {stage: round(float(p), 4) for stage, p in zip(stages, probabilities[:, i])},
+        })
+    teams.sort(key=lambda team: tuple(-team["rounds"][stage] for stage in reversed(stages)) + (team["team_name"],))
+
+    return {
+        "league_id": league_id,
+        "simulations": n_simulations,
+        "remaining_group_fixtures": int(len(state.home_index)),
+        "rounds": [{"stage": stage, "name": round_names.get(stage, "Winner")} for stage in stages],
+        "teams": teams,
+    }
+
+
+# ── Storage ─────────────────────────────────────────────────────────────────
+
+
+def _projections_table_available(db: Session) -> bool:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    present = _table_present.get(engine)
+    if present is None:
+        present = sa_inspect(db.connection()).has_table(TournamentProjection.__tablename__)
+        _table_present[engine] = present
+    return present
+
+
+def store_projection(db: Session, league_id: int, n_simulations: int = DEFAULT_SIMULATIONS) -> bool:
+    """Recompute and store a league's projection; drops the row if it isn't a tournament."""
+    payload = project_tournament(db, league_id, n_simulations)
+    existing = db.get(TournamentProjection, league_id)
+    if payload is None:
+        if existing is not None:
+            db.delete(existing)
+        return False
+
+    now = datetime.datetime.utcnow()
+    payload["computed_at"] = now.isoformat()
+    if existing is None:
+        db.add(TournamentProjection(league_id=league_id, simulations=n_simulations, payload=payload, computed_at=now))
+    else:
+        existing.simulations = n_simulations
+        existing.payload = payload
+        existing.computed_at = now
+    db.flush()
+    return True
+
+
+def refresh_tournament_projections(db: Session, league_ids: Iterable[int]) -> None:
+    """Recompute the projections of `league_ids` inside the caller's transaction.
+
+    Each league runs in its own SAVEPOINT, so a missing table (migration not
+    applied yet) or a bad bracket can't abort the caller's transaction.
+    """
+    league_ids = sorted(set(league_ids))
+    if not league_ids or not _projections_table_available(db):
+        return
+    for league_id in league_ids:
+        try:
+            with db.begin_nested():
+                store_projection(db, league_id)
+        except Exception:
+            logger.warning("Could not project tournament %s", league_id, exc_info=True)
+
+
+def stored_projection(db: Session, league_id: int) -> Optional[Dict[str, Any]]:
+    """The precomputed projection of a league, or None (never simulates)."""
+    if not _projections_table_available(db):
+        return None
+    row = db.get(TournamentProjection, league_id)
+    return row.payload if row is not None else None
+
+
+def main() -> None:
+    try:
+        from backend.database import SessionLocal
+    except ImportError:
+        from database import SessionLocal  # type: ignore[no-redef]
+
+    db = SessionLocal()
+    try:
+        league_ids = [
+            league_id
+            for (league_id,) in db.query(Match.league_id)
+            .filter(Match.group_name.isnot(None), Match.league_id.isnot(None))
+            .distinct()
+        ]
+        stored = sum(store_projection(db, league_id) for league_id in league_ids)
+        db.commit()
+        print(f"Stored projections for {stored} of {len(league_ids)} tournaments.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
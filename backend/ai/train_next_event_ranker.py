@@ -6,6 +6,9 @@ Train baseline ranking models for:
 Outputs:
 - ai/artifacts/next_event_ranker.pkl
 - ai/artifacts/next_event_metrics.json
+
+Training frames are built in parallel from one bulk load and cached in
+ai/artifacts/cache/ until the data changes (see ai/next_event_training_data.py).
 """
 
 import argparse
@@ -14,22 +17,24 @@ from pathlib import Path
 
 try:
     from backend.database import SessionLocal
-    from backend.ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from backend.ai.next_event_features import FEATURE_COLUMNS
     from backend.ai.next_event_ranker import (
         DEFAULT_ARTIFACT_PATH,
         DEFAULT_METRICS_PATH,
         save_artifact,
         train_next_event_models,
     )
+    from backend.ai.next_event_training_data import CACHE_DIR, WORKERS, cached_training_frames
 except ImportError:
     from database import SessionLocal
-    from ai.next_event_features import FEATURE_COLUMNS, NextEventFeatureBuilder
+    from ai.next_event_features import FEATURE_COLUMNS
     from ai.next_event_ranker import (
         DEFAULT_ARTIFACT_PATH,
         DEFAULT_METRICS_PATH,
         save_artifact,
         train_next_event_models,
     )
+    from ai.next_event_training_data import CACHE_DIR, WORKERS, cached_training_frames
 
 
 def _to_serializable(obj):
@@ -67,6 +72,9 @@ def main():
     parser.add_argument("--artifact", type=str, default=str(DEFAULT_ARTIFACT_PATH))
     parser.add_argument("--metrics", type=str, default=str(DEFAULT_METRICS_PATH))
     parser.add_argument("--test-ratio", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--cache-dir", type=str, default=str(CACHE_DIR))
+    parser.add_argument("--rebuild-frames", action="store_true", help="Ignore cached training frames")
     args = parser.parse_args()
 
     artifact_path = Path(args.artifact)
@@ -74,14 +82,16 @@ def main():
 
     db = SessionLocal()
     try:
-        builder = NextEventFeatureBuilder(db)
-
-        print("Building goal training frame...")
-        goal_frame = builder.build_training_frame("goal")
+        print(f"Building training frames ({args.workers} workers)...")
+        frames = cached_training_frames(
+            db,
+            workers=args.workers,
+            cache_dir=Path(args.cache_dir),
+            rebuild=args.rebuild_frames,
+        )
+        goal_frame = frames["goal"]
+        assist_frame = frames["assist"]
         print(f"Goal training rows: {len(goal_frame)}")
-
-        print("Building assist training frame...")
-        assist_frame = builder.build_training_frame("assist")
         print(f"Assist training rows: {len(assist_frame)}")
 
         if goal_frame.empty and assist_frame.empty:
@@ -1,10 +1,15 @@
+import bisect
+import collections
 import datetime
 import math
+import os
 import pickle
 import random
+import threading
+import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -13,11 +18,13 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
-from sqlalchemy import inspect, or_, text
+from sqlalchemy import func, inspect, or_, text
 from sqlalchemy.orm import Session
 
 try:
     from backend.models import League, Match, MatchEvent, MatchStatistics, Team
+    from backend.ai import team_form_store
+    from backend.services.team_matches import recent_team_matches
     from backend.ai.next_event_common import is_card_event, is_goal_event, is_red_card_detail, is_supported_league, normalize_text
     from backend.ai.xg_common import (
         OPTIONAL_TRUE_XG_COLUMNS,
@@ -28,6 +35,8 @@ try:
     )
 except ImportError:
     from models import League, Match, MatchEvent, MatchStatistics, Team
+    from ai import team_form_store
+    from services.team_matches import recent_team_matches
     from ai.next_event_common import is_card_event, is_goal_event, is_red_card_detail, is_supported_league, normalize_text
     from ai.xg_common import (
         OPTIONAL_TRUE_XG_COLUMNS,
@@ -47,6 +56,11 @@ DEFAULT_XG_FEATURE_DOC_PATH = ARTIFACT_DIR / "xg_feature_docs.md"
 LIVE_MATCH_STATUSES = {"LIVE", "HT", "1H", "2H", "ET", "P"}
 FINISHED_MATCH_STATUSES = {"FT", "AET", "PEN"}
 
+# Shared live xG states (see `LiveXGState`): how often one is re-read from
+# the database while callers keep asking, and how many matches are kept.
+LIVE_XG_REFRESH_SECONDS = float(os.getenv("LIVE_XG_REFRESH_SECONDS", "10"))
+LIVE_XG_MAX_STATES = int(os.getenv("LIVE_XG_MAX_STATES", "256"))
+
 PROXY_FEATURE_COLUMNS = [
     "is_home",
     "team_points_per_match",
@@ -249,9 +263,88 @@ def _serialize(obj: Any) -> Any:
     return obj
 
 
+def _empty_team_context() -> Dict[str, float]:
+    return {
+        "matches": 0,
+        "points_per_match": 1.0,
+        "goals_for_avg": 1.1,
+        "goals_against_avg": 1.1,
+        "shots_on_avg": 4.0,
+        "shots_off_avg": 4.5,
+        "possession_avg": 50.0,
+        "corners_avg": 4.0,
+        "form_points_last5": 6.0,
+        "rest_days": 7.0,
+        "stats_coverage": 0.0,
+    }
+
+
+def _team_context_from_snapshot(snapshot: Any, before_time: datetime.datetime) -> Dict[str, float]:
+    if snapshot.xg_last_match_at is None:
+        return _empty_team_context()
+
+    rest_days = max(0.0, min(14.0, (before_time - snapshot.xg_last_match_at).total_seconds() / 86400.0))
+    return {
+        "matches": snapshot.xg_matches,
+        "points_per_match": snapshot.xg_points_per_match,
+        "goals_for_avg": snapshot.xg_goals_for_avg,
+        "goals_against_avg": snapshot.xg_goals_against_avg,
+        "shots_on_avg": snapshot.xg_shots_on_avg,
+        "shots_off_avg": snapshot.xg_shots_off_avg,
+        "possession_avg": snapshot.xg_possession_avg,
+        "corners_avg": snapshot.xg_corners_avg,
+        "form_points_last5": snapshot.xg_form_points_last5,
+        "rest_days": round(rest_days, 4),
+        "stats_coverage": snapshot.xg_stats_coverage,
+    }
+
+
+def _feature_row(
+    is_home: float,
+    team_context: Dict[str, float],
+    opponent_context: Dict[str, float],
+    is_ucl: float,
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    features = {
+        "is_home": is_home,
+        "team_points_per_match": team_context["points_per_match"],
+        "team_goals_for_avg": team_context["goals_for_avg"],
+        "team_goals_against_avg": team_context["goals_against_avg"],
+        "team_shots_on_avg": team_context["shots_on_avg"],
+        "team_shots_off_avg": team_context["shots_off_avg"],
+        "team_possession_avg": team_context["possession_avg"],
+        "team_corners_avg": team_context["corners_avg"],
+        "team_form_points_last5": team_context["form_points_last5"],
+        "team_rest_days": team_context["rest_days"],
+        "opp_points_per_match": opponent_context["points_per_match"],
+        "opp_goals_for_avg": opponent_context["goals_for_avg"],
+        "opp_goals_against_avg": opponent_context["goals_against_avg"],
+        "opp_shots_on_avg": opponent_context["shots_on_avg"],
+        "opp_shots_off_avg": opponent_context["shots_off_avg"],
+        "opp_possession_avg": opponent_context["possession_avg"],
+        "opp_corners_avg": opponent_context["corners_avg"],
+        "opp_form_points_last5": opponent_context["form_points_last5"],
+        "opp_rest_days": opponent_context["rest_days"],
+        "is_ucl_match": is_ucl,
+        "team_stats_coverage": team_context["stats_coverage"],
+        "opp_stats_coverage": opponent_context["stats_coverage"],
+    }
+
+    diagnostics = {
+        "team_history_matches": team_context["matches"],
+        "opponent_history_matches": opponent_context["matches"],
+        "team_stats_coverage": team_context["stats_coverage"],
+        "opponent_stats_coverage": opponent_context["stats_coverage"],
+    }
+
+    return features, diagnostics
+
+
 class XGFeatureBuilder:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, use_feature_store: bool = False):
+        """`use_feature_store` reads team contexts from `ai.team_form_store` when it can (inference)."""
         self.db = db
+        self.use_feature_store = use_feature_store
         self._team_cache: Dict[int, Optional[Team]] = {}
         self._league_cache: Dict[int, Optional[League]] = {}
         self._stats_cache: Dict[int, Optional[MatchStatistics]] = {}
@@ -309,18 +402,8 @@ class XGFeatureBuilder:
         return self._events_cache[match_id]
 
     def team_history(self, team_id: int, before_time: datetime.datetime, limit: int = 40) -> List[Match]:
-        candidate_matches = (
-            self.db.query(Match)
-            .filter(
-                Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-                Match.home_score.isnot(None),
-                Match.away_score.isnot(None),
-                Match.start_time < before_time,
-                or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
-            )
-            .order_by(Match.start_time.desc())
-            .limit(max(1, limit * 3))
-            .all()
+        candidate_matches = recent_team_matches(
+            self.db, team_id, before_time, max(1, limit * 3), statuses=FINISHED_MATCH_STATUSES, scored=True
         )
 
         supported = [row for row in candidate_matches if self.is_supported_match(row)]
@@ -332,22 +415,15 @@ class XGFeatureBuilder:
         before_time: datetime.datetime,
         history_window: int,
     ) -> Dict[str, float]:
+        if self.use_feature_store and history_window == team_form_store.XG_WINDOW:
+            snapshot = team_form_store.latest_team_form(self.db, team_id, before_time)
+            if snapshot is not None:
+                return _team_context_from_snapshot(snapshot, before_time)
+
         history = self.team_history(team_id, before_time=before_time, limit=max(5, history_window))
 
         if not history:
-            return {
-                "matches": 0,
-                "points_per_match": 1.0,
-                "goals_for_avg": 1.1,
-                "goals_against_avg": 1.1,
-                "shots_on_avg": 4.0,
-                "shots_off_avg": 4.5,
-                "possession_avg": 50.0,
-                "corners_avg": 4.0,
-                "form_points_last5": 6.0,
-                "rest_days": 7.0,
-                "stats_coverage": 0.0,
-            }
+            return _empty_team_context()
 
         rows = history[:history_window]
 
@@ -436,195 +512,422 @@ class XGFeatureBuilder:
 
         is_ucl = 1.0 if _is_ucl_name(getattr(home_league, "name", "")) or _is_ucl_name(getattr(away_league, "name", "")) else 0.0
 
-        features = {
-            "is_home": is_home,
-            "team_points_per_match": team_context["points_per_match"],
-            "team_goals_for_avg": team_context["goals_for_avg"],
-            "team_goals_against_avg": team_context["goals_against_avg"],
-            "team_shots_on_avg": team_context["shots_on_avg"],
-            "team_shots_off_avg": team_context["shots_off_avg"],
-            "team_possession_avg": team_context["possession_avg"],
-            "team_corners_avg": team_context["corners_avg"],
-            "team_form_points_last5": team_context["form_points_last5"],
-            "team_rest_days": team_context["rest_days"],
-            "opp_points_per_match": opponent_context["points_per_match"],
-            "opp_goals_for_avg": opponent_context["goals_for_avg"],
-            "opp_goals_against_avg": opponent_context["goals_against_avg"],
-            "opp_shots_on_avg": opponent_context["shots_on_avg"],
-            "opp_shots_off_avg": opponent_context["shots_off_avg"],
-            "opp_possession_avg": opponent_context["possession_avg"],
-            "opp_corners_avg": opponent_context["corners_avg"],
-            "opp_form_points_last5": opponent_context["form_points_last5"],
-            "opp_rest_days": opponent_context["rest_days"],
-            "is_ucl_match": is_ucl,
-            "team_stats_coverage": team_context["stats_coverage"],
-            "opp_stats_coverage": opponent_context["stats_coverage"],
-        }
+        return _feature_row(is_home, team_context, opponent_context, is_ucl)
 
-        diagnostics = {
-            "team_history_matches": team_context["matches"],
-            "opponent_history_matches": opponent_context["matches"],
-            "team_stats_coverage": team_context["stats_coverage"],
-            "opponent_stats_coverage": opponent_context["stats_coverage"],
+    def build_proxy_training_frame(self, config: XGTrainingConfig) -> pd.DataFrame:
+        """Proxy training rows for every supported finished match.
+
+        Reads matches, teams, leagues and statistics once through
+        `XGTeamHistoryIndex`; produces exactly the rows of
+        `build_proxy_training_frame_rowwise`.
+        """
+        index = XGTeamHistoryIndex(self.db)
+        return _proxy_training_frame(
+            index.supported_finished_matches(),
+            lambda match, team_id: index.build_feature_row(match, team_id, config.history_window),
+        )
+
+    def build_proxy_training_frame_rowwise(self, config: XGTrainingConfig) -> pd.DataFrame:
+        """Reference implementation: two history queries plus one stats query per row."""
+        return _proxy_training_frame(
+            self.supported_finished_matches(),
+            lambda match, team_id: self.build_feature_row(match, team_id, config.history_window),
+        )
+
+    def infer_live_minute(self, match: Match, minute_override: Optional[int] = None) -> int:
+        events = self.events_for_match(match.id)
+        latest_event_minute = (
+            max(_safe_int(event.minute, default=1) for event in events) if events else None
+        )
+        return _infer_live_minute(match.status, latest_event_minute, minute_override)
+
+    def event_signals_until(self, match: Match, minute: int) -> Dict[str, float]:
+        events = self.events_for_match(match.id)
+        minute = max(0, minute)
+
+        totals = [0.0, 0.0, 0, 0, 0, 0]
+        for event in events:
+            if _safe_int(event.minute, default=0) > minute:
+                break
+            for i, value in enumerate(_event_contribution(match, event)):
+                totals[i] += value
+
+        return _event_signals(totals)
+
+    def stats_signals_until(self, match: Match, minute: int) -> Dict[str, float]:
+        return _scaled_stats_signals(_stats_signals(self.stats_for_match(match.id)), minute)
+
+
+def _infer_live_minute(status_value: Optional[str], latest_event_minute: Optional[int], minute_override: Optional[int]) -> int:
+    if minute_override is not None:
+        return int(_clamp(float(minute_override), 0.0, 130.0))
+
+    status = normalize_text(status_value)
+    if status in {"ns", "tbd"}:
+        return 0
+    if status == "ht":
+        return 45
+    if status in {"ft", "aet", "pen"}:
+        return 90
+
+    if latest_event_minute is not None:
+        return int(_clamp(float(latest_event_minute), 1.0, 130.0))
+
+    if status_value in LIVE_MATCH_STATUSES:
+        return 1
+
+    return 0
+
+
+def _event_contribution(match: Match, event: MatchEvent) -> Tuple[float, float, int, int, int, int]:
+    """(home_bonus, away_bonus, home_goals, away_goals, home_red_cards, away_red_cards) added by one event."""
+    team_id = event.team_id
+    event_type = event.event_type or ""
+    detail = event.detail or ""
+    is_home = team_id == match.home_team_id
+    is_away = team_id == match.away_team_id
+
+    if is_goal_event(event_type):
+        if is_home:
+            return 0.33, 0.0, 1, 0, 0, 0
+        if is_away:
+            return 0.0, 0.33, 0, 1, 0, 0
+        return 0.0, 0.0, 0, 0, 0, 0
+
+    if "assist" in normalize_text(event_type):
+        if is_home:
+            return 0.06, 0.0, 0, 0, 0, 0
+        if is_away:
+            return 0.0, 0.06, 0, 0, 0, 0
+        return 0.0, 0.0, 0, 0, 0, 0
+
+    if is_card_event(event_type):
+        if is_red_card_detail(detail):
+            if is_home:
+                return 0.0, 0.08, 0, 0, 1, 0
+            if is_away:
+                return 0.08, 0.0, 0, 0, 0, 1
+        else:
+            if is_home:
+                return 0.0, 0.025, 0, 0, 0, 0
+            if is_away:
+                return 0.025, 0.0, 0, 0, 0, 0
+
+    return 0.0, 0.0, 0, 0, 0, 0
+
+
+def _event_signals(totals: Sequence[float]) -> Dict[str, float]:
+    home_bonus, away_bonus, home_goals, away_goals, red_cards_home, red_cards_away = totals
+    return {
+        "home_bonus": round(home_bonus, 4),
+        "away_bonus": round(away_bonus, 4),
+        "home_goal_events": float(home_goals),
+        "away_goal_events": float(away_goals),
+        "home_red_cards": float(red_cards_home),
+        "away_red_cards": float(red_cards_away),
+    }
+
+
+def _stats_signals(stats: Optional[MatchStatistics]) -> Optional[Tuple[float, float]]:
+    """Full-match (home, away) stats signal, before scaling by the minute."""
+    if not stats:
+        return None
+
+    home_signal = (
+        0.14 * _safe_float(stats.shots_on_home)
+        + 0.055 * _safe_float(stats.shots_off_home)
+        + 0.03 * _safe_float(stats.corners_home)
+        + 0.004 * max(_safe_float(stats.possession_home) - 50.0, 0.0)
+    )
+
+    away_signal = (
+        0.14 * _safe_float(stats.shots_on_away)
+        + 0.055 * _safe_float(stats.shots_off_away)
+        + 0.03 * _safe_float(stats.corners_away)
+        + 0.004 * max(_safe_float(stats.possession_away) - 50.0, 0.0)
+    )
+    return home_signal, away_signal
+
+
+def _scaled_stats_signals(signals: Optional[Tuple[float, float]], minute: int) -> Dict[str, float]:
+    if signals is None:
+        return {
+            "home_signal": 0.0,
+            "away_signal": 0.0,
+            "stats_available": 0.0,
         }
 
-        return features, diagnostics
+    scale = _clamp(minute / 90.0 if minute > 0 else 0.0, 0.0, 1.0)
+    return {
+        "home_signal": round(signals[0] * scale, 4),
+        "away_signal": round(signals[1] * scale, 4),
+        "stats_available": 1.0,
+    }
 
-    def build_proxy_training_frame(self, config: XGTrainingConfig) -> pd.DataFrame:
-        matches = self.supported_finished_matches()
-        rows: List[Dict[str, Any]] = []
 
-        for match in matches:
-            home_features, home_diag = self.build_feature_row(match, match.home_team_id, config.history_window)
-            away_features, away_diag = self.build_feature_row(match, match.away_team_id, config.history_window)
+class _TeamHistory:
+    """One team's finished matches, oldest first, as parallel arrays."""
 
-            if min(home_diag["team_history_matches"], home_diag["opponent_history_matches"]) < 3:
-                continue
-            if min(away_diag["team_history_matches"], away_diag["opponent_history_matches"]) < 3:
-                continue
+    __slots__ = (
+        "start_times",
+        "supported",
+        "goals_for",
+        "goals_against",
+        "has_stats",
+        "shots_on",
+        "shots_off",
+        "possession",
+        "corners",
+    )
 
-            rows.append(
-                {
-                    "match_id": match.id,
-                    "team_id": match.home_team_id,
-                    "sample_time": match.start_time,
-                    "target_goals": _safe_float(match.home_score),
-                    "target_scored": 1.0 if _safe_float(match.home_score) > 0 else 0.0,
-                    "actual_goals": _safe_float(match.home_score),
-                    **home_features,
-                }
-            )
+    def __init__(self, columns: Dict[str, list]):
+        self.start_times: List[datetime.datetime] = columns["start_times"]
+        self.supported = np.asarray(columns["supported"], dtype=bool)
+        self.goals_for = np.asarray(columns["goals_for"], dtype=float)
+        self.goals_against = np.asarray(columns["goals_against"], dtype=float)
+        self.has_stats = np.asarray(columns["has_stats"], dtype=bool)
+        self.shots_on = np.asarray(columns["shots_on"], dtype=float)
+        self.shots_off = np.asarray(columns["shots_off"], dtype=float)
+        self.possession = np.asarray(columns["possession"], dtype=float)
+        self.corners = np.asarray(columns["corners"], dtype=float)
+
+
+class XGTeamHistoryIndex:
+    """Bulk-loaded equivalent of `XGFeatureBuilder`'s per-match history lookups.
+
+    `XGFeatureBuilder.team_history` and `stats_for_match` cost one round-trip
+    per call, i.e. several per training row. This index reads every finished
+    match, team, league and `MatchStatistics` row once, keeps each team's
+    matches as NumPy arrays sorted by kickoff, and answers "the last N
+    supported matches before t" with a binary search. Window semantics are
+    the builder's, including the ``limit * 3`` candidate cut applied before
+    the supported-league filter, so the features are identical.
+    """
+
+    def __init__(self, db: Session, team_ids: Optional[Iterable[int]] = None):
+        """Index every finished match, or only those involving `team_ids`."""
+        leagues = {league.id: league for league in db.query(League).all()}
+        self._league_by_team: Dict[int, Optional[League]] = {
+            team_id: (leagues.get(league_id) if league_id else None)
+            for team_id, league_id in db.query(Team.id, Team.league_id).all()
+        }
 
-            rows.append(
-                {
-                    "match_id": match.id,
-                    "team_id": match.away_team_id,
-                    "sample_time": match.start_time,
-                    "target_goals": _safe_float(match.away_score),
-                    "target_scored": 1.0 if _safe_float(match.away_score) > 0 else 0.0,
-                    "actual_goals": _safe_float(match.away_score),
-                    **away_features,
-                }
+        finished = [
+            Match.status.in_(list(FINISHED_MATCH_STATUSES)),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None),
+        ]
+        if team_ids is not None:
+            team_ids = list(team_ids)
+            finished.append(or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)))
+        self._matches = (
+            db.query(
+                Match.id,
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.start_time,
+                Match.home_score,
+                Match.away_score,
             )
+            .filter(*finished)
+            .order_by(Match.start_time.asc(), Match.id.asc())
+            .all()
+        )
+        stats_by_match = {
+            stats.match_id: stats
+            for stats in db.query(MatchStatistics).join(Match, Match.id == MatchStatistics.match_id).filter(*finished)
+        }
 
-        if not rows:
-            return pd.DataFrame(columns=["match_id", "team_id", "sample_time", "target_goals", "target_scored", "actual_goals", *PROXY_FEATURE_COLUMNS])
+        self._supported = {match.id: self.is_supported_match(match) for match in self._matches}
+        self._histories = self._index_by_team(stats_by_match)
+        self._context_cache: Dict[Tuple[int, datetime.datetime, int], Dict[str, float]] = {}
+
+    def _index_by_team(self, stats_by_match: Dict[int, MatchStatistics]) -> Dict[int, _TeamHistory]:
+        columns: Dict[int, Dict[str, list]] = {}
+
+        # `team_history` filters on start_time < t, which never matches NULL.
+        dated = [match for match in self._matches if match.start_time is not None]
+        dated.sort(key=lambda match: (match.start_time, match.id))
+
+        for match in dated:
+            stats = stats_by_match.get(match.id)
+            for team_id, side in ((match.home_team_id, "home"), (match.away_team_id, "away")):
+                is_home = side == "home"
+                team_columns = columns.setdefault(team_id, {name: [] for name in _TeamHistory.__slots__})
+                team_columns["start_times"].append(match.start_time)
+                team_columns["supported"].append(self._supported[match.id])
+                team_columns["goals_for"].append(_safe_float(match.home_score if is_home else match.away_score))
+                team_columns["goals_against"].append(_safe_float(match.away_score if is_home else match.home_score))
+                team_columns["has_stats"].append(stats is not None)
+                team_columns["shots_on"].append(_safe_float(getattr(stats, f"shots_on_{side}", None), default=0.0))
+                team_columns["shots_off"].append(_safe_float(getattr(stats, f"shots_off_{side}", None), default=0.0))
+                team_columns["possession"].append(_safe_float(getattr(stats, f"possession_{side}", None), default=50.0))
+                team_columns["corners"].append(_safe_float(getattr(stats, f"corners_{side}", None), default=4.0))
+
+        return {team_id: _TeamHistory(team_columns) for team_id, team_columns in columns.items()}
 
-        frame = pd.DataFrame(rows)
-        return frame
+    def _league_for_team(self, team_id: int) -> Optional[League]:
+        return self._league_by_team.get(team_id)
 
-    def infer_live_minute(self, match: Match, minute_override: Optional[int] = None) -> int:
-        if minute_override is not None:
-            return int(_clamp(float(minute_override), 0.0, 130.0))
+    def is_supported_match(self, match: Any) -> bool:
+        home_league = self._league_for_team(match.home_team_id)
+        away_league = self._league_for_team(match.away_team_id)
+        return bool(is_supported_league(home_league) or is_supported_league(away_league))
 
-        status = normalize_text(match.status)
-        if status in {"ns", "tbd"}:
-            return 0
-        if status == "ht":
-            return 45
-        if status in {"ft", "aet", "pen"}:
-            return 90
+    def supported_finished_matches(self) -> List[Any]:
+        """Same rows and order as `XGFeatureBuilder.supported_finished_matches`, as column tuples."""
+        return [match for match in self._matches if self._supported[match.id]]
 
-        events = self.events_for_match(match.id)
-        if events:
-            return int(_clamp(float(max(_safe_int(event.minute, default=1) for event in events)), 1.0, 130.0))
+    @staticmethod
+    def _history_rows(
+        history: Optional[_TeamHistory],
+        before_time: Optional[datetime.datetime],
+        history_window: int,
+    ) -> Optional[np.ndarray]:
+        """Positions in `history` of the rows the builder would aggregate, newest first.
 
-        if match.status in LIVE_MATCH_STATUSES:
-            return 1
+        None when `team_history` would come back empty (the default context).
+        """
+        if history is None or before_time is None:
+            return None
 
-        return 0
+        limit = max(5, history_window)
+        end = bisect.bisect_left(history.start_times, before_time)
+        candidates = np.arange(end - 1, max(-1, end - 1 - max(1, limit * 3)), -1)
+        selected = candidates[history.supported[candidates]][:limit]
+        if selected.size == 0:
+            return None
+        return selected[:history_window]
 
-    def event_signals_until(self, match: Match, minute: int) -> Dict[str, float]:
-        events = self.events_for_match(match.id)
-        minute = max(0, minute)
+    def latest_history_start(
+        self,
+        team_id: int,
+        before_time: Optional[datetime.datetime],
+        history_window: int,
+    ) -> Optional[datetime.datetime]:
+        """Kickoff of the newest match behind the team's context (its rest-days anchor)."""
+        history = self._histories.get(team_id)
+        rows = self._history_rows(history, before_time, history_window)
+        if rows is None:
+            return None
+        return history.start_times[int(rows[0])]
 
-        home_bonus = 0.0
-        away_bonus = 0.0
+    def _aggregate_team_context(
+        self,
+        team_id: int,
+        before_time: Optional[datetime.datetime],
+        history_window: int,
+    ) -> Dict[str, float]:
+        key = (team_id, before_time, history_window)
+        if key not in self._context_cache:
+            self._context_cache[key] = self._compute_team_context(team_id, before_time, history_window)
+        return self._context_cache[key]
 
-        home_goals = 0
-        away_goals = 0
-        red_cards_home = 0
-        red_cards_away = 0
+    def _compute_team_context(
+        self,
+        team_id: int,
+        before_time: Optional[datetime.datetime],
+        history_window: int,
+    ) -> Dict[str, float]:
+        history = self._histories.get(team_id)
+        rows = self._history_rows(history, before_time, history_window)
+        if rows is None:
+            return _empty_team_context()
 
-        for event in events:
-            event_minute = _safe_int(event.minute, default=0)
-            if event_minute > minute:
-                break
+        goals_for = history.goals_for[rows]
+        goals_against = history.goals_against[rows]
+        points = np.where(goals_for > goals_against, 3.0, np.where(goals_for == goals_against, 1.0, 0.0))
 
-            team_id = event.team_id
-            event_type = event.event_type or ""
-            detail = event.detail or ""
-
-            if is_goal_event(event_type):
-                if team_id == match.home_team_id:
-                    home_bonus += 0.33
-                    home_goals += 1
-                elif team_id == match.away_team_id:
-                    away_bonus += 0.33
-                    away_goals += 1
-                continue
+        with_stats = rows[history.has_stats[rows]]
+        shots_on = history.shots_on[with_stats]
+        shots_off = history.shots_off[with_stats]
+        possessions = history.possession[with_stats]
+        corners = history.corners[with_stats]
 
-            normalized_type = normalize_text(event_type)
-            if "assist" in normalized_type:
-                if team_id == match.home_team_id:
-                    home_bonus += 0.06
-                elif team_id == match.away_team_id:
-                    away_bonus += 0.06
-                continue
+        newest_start = history.start_times[int(rows[0])]
+        rest_days = max(0.0, min(14.0, (before_time - newest_start).total_seconds() / 86400.0))
 
-            if is_card_event(event_type):
-                if is_red_card_detail(detail):
-                    if team_id == match.home_team_id:
-                        away_bonus += 0.08
-                        red_cards_home += 1
-                    elif team_id == match.away_team_id:
-                        home_bonus += 0.08
-                        red_cards_away += 1
-                else:
-                    if team_id == match.home_team_id:
-                        away_bonus += 0.025
-                    elif team_id == match.away_team_id:
-                        home_bonus += 0.025
+        matches_count = len(rows)
+        stats_coverage = float(with_stats.size / matches_count)
 
         return {
-            "home_bonus": round(home_bonus, 4),
-            "away_bonus": round(away_bonus, 4),
-            "home_goal_events": float(home_goals),
-            "away_goal_events": float(away_goals),
-            "home_red_cards": float(red_cards_home),
-            "away_red_cards": float(red_cards_away),
+            "matches": float(matches_count),
+            "points_per_match": round(float(points.sum()) / matches_count, 4),
+            "goals_for_avg": round(float(np.mean(goals_for)), 4),
+            "goals_against_avg": round(float(np.mean(goals_against)), 4),
+            "shots_on_avg": round(float(np.mean(shots_on)) if shots_on.size else 4.0, 4),
+            "shots_off_avg": round(float(np.mean(shots_off)) if shots_off.size else 4.5, 4),
+            "possession_avg": round(float(np.mean(possessions)) if possessions.size else 50.0, 4),
+            "corners_avg": round(float(np.mean(corners)) if corners.size else 4.0, 4),
+            "form_points_last5": round(float(points[:5].sum()), 4),
+            "rest_days": round(rest_days, 4),
+            "stats_coverage": round(stats_coverage, 4),
         }
 
-    def stats_signals_until(self, match: Match, minute: int) -> Dict[str, float]:
-        stats = self.stats_for_match(match.id)
-        if not stats:
-            return {
-                "home_signal": 0.0,
-                "away_signal": 0.0,
-                "stats_available": 0.0,
-            }
+    def build_feature_row(
+        self,
+        match: Any,
+        team_id: int,
+        history_window: int,
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        opponent_id = match.away_team_id if team_id == match.home_team_id else match.home_team_id
+        is_home = 1.0 if team_id == match.home_team_id else 0.0
 
-        scale = _clamp(minute / 90.0 if minute > 0 else 0.0, 0.0, 1.0)
+        team_context = self._aggregate_team_context(team_id, match.start_time, history_window)
+        opponent_context = self._aggregate_team_context(opponent_id, match.start_time, history_window)
+
+        home_league = self._league_for_team(match.home_team_id)
+        away_league = self._league_for_team(match.away_team_id)
 
-        home_signal = (
-            0.14 * _safe_float(stats.shots_on_home)
-            + 0.055 * _safe_float(stats.shots_off_home)
-            + 0.03 * _safe_float(stats.corners_home)
-            + 0.004 * max(_safe_float(stats.possession_home) - 50.0, 0.0)
+        is_ucl = 1.0 if _is_ucl_name(getattr(home_league, "name", "")) or _is_ucl_name(getattr(away_league, "name", "")) else 0.0
+
+        return _feature_row(is_home, team_context, opponent_context, is_ucl)
+
+
+def _proxy_training_frame(
+    matches: List[Any],
+    feature_row: Callable[[Any, int], Tuple[Dict[str, float], Dict[str, float]]],
+) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+
+    for match in matches:
+        home_features, home_diag = feature_row(match, match.home_team_id)
+        away_features, away_diag = feature_row(match, match.away_team_id)
+
+        if min(home_diag["team_history_matches"], home_diag["opponent_history_matches"]) < 3:
+            continue
+        if min(away_diag["team_history_matches"], away_diag["opponent_history_matches"]) < 3:
+            continue
+
+        rows.append(
+            {
+                "match_id": match.id,
+                "team_id": match.home_team_id,
+                "sample_time": match.start_time,
+                "target_goals": _safe_float(match.home_score),
+                "target_scored": 1.0 if _safe_float(match.home_score) > 0 else 0.0,
+                "actual_goals": _safe_float(match.home_score),
+                **home_features,
+            }
         )
 
-        away_signal = (
-            0.14 * _safe_float(stats.shots_on_away)
-            + 0.055 * _safe_float(stats.shots_off_away)
-            + 0.03 * _safe_float(stats.corners_away)
-            + 0.004 * max(_safe_float(stats.possession_away) - 50.0, 0.0)
+        rows.append(
+            {
+                "match_id": match.id,
+                "team_id": match.away_team_id,
+                "sample_time": match.start_time,
+                "target_goals": _safe_float(match.away_score),
+                "target_scored": 1.0 if _safe_float(match.away_score) > 0 else 0.0,
+                "actual_goals": _safe_float(match.away_score),
+                **away_features,
+            }
         )
 
-        return {
-            "home_signal": round(home_signal * scale, 4),
-            "away_signal": round(away_signal * scale, 4),
-            "stats_available": 1.0,
-        }
+    if not rows:
+        return pd.DataFrame(columns=["match_id", "team_id", "sample_time", "target_goals", "target_scored", "actual_goals", *PROXY_FEATURE_COLUMNS])
+
+    frame = pd.DataFrame(rows)
+    return frame
 
 
 def _split_training_frame_chronologically(
@@ -841,9 +1144,9 @@ def _build_training_frame_from_target_map(
     target_map: Dict[Tuple[int, int], float],
 ) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
-    matches = builder.supported_finished_matches()
+    index = XGTeamHistoryIndex(builder.db)
 
-    for match in matches:
+    for match in index.supported_finished_matches():
         for team_id, actual_goals in (
             (match.home_team_id, _safe_float(match.home_score)),
             (match.away_team_id, _safe_float(match.away_score)),
@@ -852,7 +1155,7 @@ def _build_training_frame_from_target_map(
             if key not in target_map:
                 continue
 
-            features, diagnostics = builder.build_feature_row(match, team_id, history_window=config.history_window)
+            features, diagnostics = index.build_feature_row(match, team_id, history_window=config.history_window)
             if min(diagnostics["team_history_matches"], diagnostics["opponent_history_matches"]) < 3:
                 continue
 
@@ -1218,11 +1521,203 @@ def _live_cumulative_xg(
     return float(_clamp(value, 0.0, 8.0))
 
 
+class LiveXGState:
+    """Live xG inputs of one match, kept in memory and advanced incrementally.
+
+    Holds the pre-match baseline (recomputed only when the artifact changes),
+    the match's events as per-event contributions in feed order (minute,
+    then id) with running totals, and the full-match stats signal.
+    `advance` reads only what is new: one aggregate over the match's events,
+    the new rows when there are any (all of them again if rows were deleted
+    or replaced) and the stats row. `render` then builds the same payload
+    `predict_live` always returned for any minute from these totals,
+    without touching the database.
+    """
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.lock = threading.Lock()
+        self.pre_match: Optional[Dict[str, Any]] = None
+        self.rendered: Optional[Dict[str, Any]] = None
+        self._pre_match_key: Optional[Tuple[Any, ...]] = None
+        self._match_key: Optional[Tuple[Any, ...]] = None
+        self._advanced_at: Optional[float] = None
+        self._event_count = 0
+        self._max_event_id: Optional[int] = None
+        self._events: List[Tuple[int, int, Tuple[float, float, int, int, int, int], int]] = []
+        self._event_keys: List[Tuple[int, int]] = []
+        self._event_minutes: List[int] = []
+        self._totals: List[List[float]] = []
+        self._stats_signals: Optional[Tuple[float, float]] = None
+
+    def is_stale(self, match: Match) -> bool:
+        return (
+            self._advanced_at is None
+            or self._match_key != (match.status, match.current_minute)
+            or time.monotonic() - self._advanced_at >= LIVE_XG_REFRESH_SECONDS
+        )
+
+    def advance(self, service: "XGInferenceService", db: Session, match: Match) -> None:
+        pre_match_key = (service.artifact_mtime(), match.home_team_id, match.away_team_id, match.start_time)
+        if self.pre_match is None or pre_match_key != self._pre_match_key:
+            self.pre_match = service.predict_pre_match(db, match)
+            self._pre_match_key = pre_match_key
+            # Event contributions depend on which side is home.
+            self._reset_events()
+
+        count, max_id = (
+            db.query(func.count(MatchEvent.id), func.max(MatchEvent.id))
+            .filter(MatchEvent.match_id == match.id)
+            .one()
+        )
+        if (count, max_id) != (self._event_count, self._max_event_id):
+            new_events: List[MatchEvent] = []
+            if count > self._event_count:
+                query = db.query(MatchEvent).filter(MatchEvent.match_id == match.id)
+                if self._max_event_id is not None:
+                    query = query.filter(MatchEvent.id > self._max_event_id)
+                new_events = query.all()
+            if len(new_events) != count - self._event_count:
+                # Rows were deleted or replaced: start over.
+                self._reset_events()
+                new_events = db.query(MatchEvent).filter(MatchEvent.match_id == match.id).all()
+            self._add_events(match, new_events)
+            self._event_count, self._max_event_id = count, max_id
+
+        self._stats_signals = _stats_signals(
+            db.query(MatchStatistics).filter(MatchStatistics.match_id == match.id).first()
+        )
+        self._match_key = (match.status, match.current_minute)
+        self._advanced_at = time.monotonic()
+        self.rendered = None
+
+    def _reset_events(self) -> None:
+        self._event_count = 0
+        self._max_event_id = None
+        self._events = []
+        self._event_keys = []
+        self._event_minutes = []
+        self._totals = []
+
+    def _add_events(self, match: Match, events: Iterable[MatchEvent]) -> None:
+        first_changed = len(self._events)
+        for event in events:
+            # (feed position, contribution, minute as `infer_live_minute` reads it)
+            entry = (
+                _safe_int(event.minute, default=0),
+                event.id,
+                _event_contribution(match, event),
+                _safe_int(event.minute, default=1),
+            )
+            position = bisect.bisect_right(self._event_keys, entry[:2])
+            self._event_keys.insert(position, entry[:2])
+            self._events.insert(position, entry)
+            first_changed = min(first_changed, position)
+
+        # Running totals in feed order, summed like `event_signals_until`;
+        # only from the first new event on (usually just the new tail).
+        self._event_minutes = [entry[0] for entry in self._events]
+        del self._totals[first_changed:]
+        running = list(self._totals[-1]) if self._totals else [0.0, 0.0, 0, 0, 0, 0]
+        for entry in self._events[first_changed:]:
+            running = [total + value for total, value in zip(running, entry[2])]
+            self._totals.append(running)
+
+    def _event_signals_at(self, minute: int) -> Dict[str, float]:
+        position = bisect.bisect_right(self._event_minutes, max(0, minute))
+        return _event_signals(self._totals[position - 1] if position else [0.0, 0.0, 0, 0, 0, 0])
+
+    def render(self, match: Match, minute_override: Optional[int] = None) -> Dict[str, Any]:
+        pre_match = self.pre_match or {}
+        latest_event_minute = max((entry[3] for entry in self._events), default=None)
+        minute_context = _infer_live_minute(match.status, latest_event_minute, minute_override)
+
+        if minute_context <= 0:
+            timeline_minutes = [0]
+        else:
+            base_ticks = [0, 15, 30, 45, 60, 75, 90]
+            if minute_context < 90:
+                timeline_minutes = sorted({tick for tick in base_ticks if tick <= minute_context} | {minute_context})
+            else:
+                timeline_minutes = sorted(set(base_ticks + [minute_context]))
+
+        home_pre_xg = _safe_float(pre_match["home"]["xg"])
+        away_pre_xg = _safe_float(pre_match["away"]["xg"])
+
+        timeline = []
+        current_event_signals = self._event_signals_at(minute_context)
+        current_stats_signals = _scaled_stats_signals(self._stats_signals, minute_context)
+
+        for point_minute in timeline_minutes:
+            event_signals = self._event_signals_at(point_minute)
+            stats_signals = _scaled_stats_signals(self._stats_signals, point_minute)
+
+            home_live_xg = _live_cumulative_xg(
+                pre_match_xg=home_pre_xg,
+                minute=point_minute,
+                stat_signal=stats_signals["home_signal"],
+                event_bonus=event_signals["home_bonus"],
+            )
+            away_live_xg = _live_cumulative_xg(
+                pre_match_xg=away_pre_xg,
+                minute=point_minute,
+                stat_signal=stats_signals["away_signal"],
+                event_bonus=event_signals["away_bonus"],
+            )
+
+            timeline.append(
+                {
+                    "minute": int(point_minute),
+                    "home_xg": round(float(home_live_xg), 3),
+                    "away_xg": round(float(away_live_xg), 3),
+                }
+            )
+
+        home_current_xg = timeline[-1]["home_xg"] if timeline else 0.0
+        away_current_xg = timeline[-1]["away_xg"] if timeline else 0.0
+
+        live_disclaimers = list(pre_match.get("disclaimers", []))
+        live_disclaimers.extend(
+            [
+                "Live xG trend is updated from available match events and aggregate stats, not from shot-by-shot tracking.",
+                "Event feed delays or missing stats can temporarily distort the live trend.",
+            ]
+        )
+
+        return {
+            "match_id": match.id,
+            "scope": pre_match.get("scope", XG_SCOPE),
+            "generated_at_utc": _utc_now_iso(),
+            "model": pre_match.get("model", {}),
+            "minute_context": int(minute_context),
+            "home_current_xg": round(float(home_current_xg), 3),
+            "away_current_xg": round(float(away_current_xg), 3),
+            "timeline": timeline,
+            "pre_match_baseline": {
+                "home_xg": round(float(home_pre_xg), 3),
+                "away_xg": round(float(away_pre_xg), 3),
+            },
+            "live_signals": {
+                "home_event_boost": round(float(current_event_signals["home_bonus"]), 4),
+                "away_event_boost": round(float(current_event_signals["away_bonus"]), 4),
+                "home_stats_signal": round(float(current_stats_signals["home_signal"]), 4),
+                "away_stats_signal": round(float(current_stats_signals["away_signal"]), 4),
+                "stats_available": bool(current_stats_signals.get("stats_available", 0.0) > 0),
+                "home_goal_events": int(current_event_signals.get("home_goal_events", 0.0)),
+                "away_goal_events": int(current_event_signals.get("away_goal_events", 0.0)),
+            },
+            "disclaimers": _dedupe_notes(live_disclaimers),
+        }
+
+
 class XGInferenceService:
     def __init__(self, artifact_path: Path = DEFAULT_XG_ARTIFACT_PATH):
         self.artifact_path = artifact_path
         self._artifact: Optional[Dict[str, Any]] = None
         self._artifact_mtime: Optional[float] = None
+        # match_id -> LiveXGState shared by every caller in this process (LRU).
+        self._live_states: "collections.OrderedDict[int, LiveXGState]" = collections.OrderedDict()
+        self._live_states_lock = threading.Lock()
 
     def _refresh_artifact(self) -> Optional[Dict[str, Any]]:
         if not self.artifact_path.exists():
@@ -1253,7 +1748,7 @@ class XGInferenceService:
 
     def predict_pre_match(self, db: Session, match: Match) -> Dict[str, Any]:
         artifact = self._refresh_artifact()
-        builder = XGFeatureBuilder(db)
+        builder = XGFeatureBuilder(db, use_feature_store=True)
 
         history_window = 12
         if artifact:
@@ -1352,87 +1847,62 @@ class XGInferenceService:
         match: Match,
         minute_override: Optional[int] = None,
     ) -> Dict[str, Any]:
-        pre_match = self.predict_pre_match(db, match)
+        """Live xG from scratch (a throwaway `LiveXGState`); see `predict_live_shared`."""
+        state = LiveXGState(match.id)
+        state.advance(self, db, match)
+        return state.render(match, minute_override)
+
+    def artifact_mtime(self) -> Optional[float]:
+        self._refresh_artifact()
+        return self._artifact_mtime
+
+    def _shared_live_state(self, match_id: int) -> "LiveXGState":
+        with self._live_states_lock:
+            state = self._live_states.pop(match_id, None) or LiveXGState(match_id)
+            self._live_states[match_id] = state
+            while len(self._live_states) > LIVE_XG_MAX_STATES:
+                self._live_states.popitem(last=False)
+            return state
+
+    def predict_live_shared(
+        self,
+        db: Session,
+        match: Match,
+        minute_override: Optional[int] = None,
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """Live xG from this process's shared state for the match.
+
+        The state is advanced (new events, fresh stats) at most every
+        `LIVE_XG_REFRESH_SECONDS`, or at once when the match status or
+        minute moved; in between, every caller gets the same rendered
+        payload.
+        """
+        state = self._shared_live_state(match.id)
+        with state.lock:
+            if force_refresh or state.is_stale(match):
+                state.advance(self, db, match)
+            if minute_override is not None:
+                return state.render(match, minute_override)
+            if state.rendered is None:
+                state.rendered = state.render(match, None)
+            # Shallow copy: callers may replace top-level keys.
+            return dict(state.rendered)
+
+    def live_summaries(self, db: Session, matches: Iterable[Match]) -> Dict[int, Dict[str, Any]]:
+        """Compact current live xG per supported match, for WebSocket payloads."""
         builder = XGFeatureBuilder(db)
-
-        minute_context = builder.infer_live_minute(match, minute_override=minute_override)
-
-        if minute_context <= 0:
-            timeline_minutes = [0]
-        else:
-            base_ticks = [0, 15, 30, 45, 60, 75, 90]
-            if minute_context < 90:
-                timeline_minutes = sorted({tick for tick in base_ticks if tick <= minute_context} | {minute_context})
-            else:
-                timeline_minutes = sorted(set(base_ticks + [minute_context]))
-
-        home_pre_xg = _safe_float(pre_match["home"]["xg"])
-        away_pre_xg = _safe_float(pre_match["away"]["xg"])
-
-        timeline = []
-        current_event_signals = builder.event_signals_until(match, minute_context)
-        current_stats_signals = builder.stats_signals_until(match, minute_context)
-
-        for point_minute in timeline_minutes:
-            event_signals = builder.event_signals_until(match, point_minute)
-            stats_signals = builder.stats_signals_until(match, point_minute)
-
-            home_live_xg = _live_cumulative_xg(
-                pre_match_xg=home_pre_xg,
-                minute=point_minute,
-                stat_signal=stats_signals["home_signal"],
-                event_bonus=event_signals["home_bonus"],
-            )
-            away_live_xg = _live_cumulative_xg(
-                pre_match_xg=away_pre_xg,
-                minute=point_minute,
-                stat_signal=stats_signals["away_signal"],
-                event_bonus=event_signals["away_bonus"],
-            )
-
-            timeline.append(
-                {
-                    "minute": int(point_minute),
-                    "home_xg": round(float(home_live_xg), 3),
-                    "away_xg": round(float(away_live_xg), 3),
-                }
-            )
-
-        home_current_xg = timeline[-1]["home_xg"] if timeline else 0.0
-        away_current_xg = timeline[-1]["away_xg"] if timeline else 0.0
-
-        live_disclaimers = list(pre_match.get("disclaimers", []))
-        live_disclaimers.extend(
-            [
-                "Live xG trend is updated from available match events and aggregate stats, not from shot-by-shot tracking.",
-                "Event feed delays or missing stats can temporarily distort the live trend.",
-            ]
-        )
-
-        return {
-            "match_id": match.id,
-            "scope": pre_match.get("scope", XG_SCOPE),
-            "generated_at_utc": _utc_now_iso(),
-            "model": pre_match.get("model", {}),
-            "minute_context": int(minute_context),
-            "home_current_xg": round(float(home_current_xg), 3),
-            "away_current_xg": round(float(away_current_xg), 3),
-            "timeline": timeline,
-            "pre_match_baseline": {
-                "home_xg": round(float(home_pre_xg), 3),
-                "away_xg": round(float(away_pre_xg), 3),
-            },
-            "live_signals": {
-                "home_event_boost": round(float(current_event_signals["home_bonus"]), 4),
-                "away_event_boost": round(float(current_event_signals["away_bonus"]), 4),
-                "home_stats_signal": round(float(current_stats_signals["home_signal"]), 4),
-                "away_stats_signal": round(float(current_stats_signals["away_signal"]), 4),
-                "stats_available": bool(current_stats_signals.get("stats_available", 0.0) > 0),
-                "home_goal_events": int(current_event_signals.get("home_goal_events", 0.0)),
-                "away_goal_events": int(current_event_signals.get("away_goal_events", 0.0)),
-            },
-            "disclaimers": _dedupe_notes(live_disclaimers),
-        }
+        summaries: Dict[int, Dict[str, Any]] = {}
+        for match in matches:
+            if not builder.is_supported_match(match):
+                continue
+            payload = self.predict_live_shared(db, match, force_refresh=True)
+            summaries[match.id] = {
+                "home": payload["home_current_xg"],
+                "away": payload["away_current_xg"],
+                "minute": payload["minute_context"],
+            }
+        return summaries
 
 
 xg_inference_service = XGInferenceService()
@@ -1,39 +1,296 @@
-from typing import List
+import asyncio
+import collections
+import logging
+import os
+import time
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from fastapi import WebSocket
 
+logger = logging.getLogger(__name__)
+
+# Topic keys used by the live channel. A client subscribed to ALL_TOPIC
+# receives every update; otherwise it only receives updates whose topics
+# intersect its subscription set.
+ALL_TOPIC = "all"
+
+# Per-connection outbound buffer. When a client's backlog reaches this
+# depth it is downgraded to "latest state only" (queued messages that
+# share a coalescing key are collapsed); if it still can't keep up, or a
+# single send takes longer than the timeout, the client is evicted.
+CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", "64"))
+SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "5"))
+
+# Close code sent to evicted slow consumers (1013 = try again later).
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def match_topic(match_id) -> str:
+    return f"match:{int(match_id)}"
+
+
+def league_topic(league_id) -> str:
+    return f"league:{int(league_id)}"
+
+
+class _ClientChannel:
+    """Outbound state for one socket: bounded queue plus its writer task."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.queue: Deque[Tuple[Optional[str], str]] = collections.deque()
+        self.wakeup = asyncio.Event()
+        self.degraded = False
+        self.writer: Optional[asyncio.Task] = None
+        self.last_send_latency = 0.0
+        self.max_send_latency = 0.0
+
+    def _collapse_to_latest(self) -> None:
+        """Keep only the newest message per coalescing key, in order."""
+        latest: Dict[str, int] = {}
+        items = list(self.queue)
+        for index, (key, _message) in enumerate(items):
+            if key is not None:
+                latest[key] = index
+        self.queue = collections.deque(
+            item for index, item in enumerate(items)
+            if item[0] is None or latest[item[0]] == index
+        )
+
+    def enqueue(self, key: Optional[str], message: str) -> bool:
+        """Queue a message; returns False when the client must be evicted."""
+        if self.degraded and key is not None:
+            # Latest-state-only mode: a newer update supersedes any queued
+            # message for the same key.
+            self.queue = collections.deque(item for item in self.queue if item[0] != key)
+        elif len(self.queue) >= self.max_queue:
+            self.degraded = True
+            self._collapse_to_latest()
+            if key is not None:
+                self.queue = collections.deque(item for item in self.queue if item[0] != key)
+
+        if len(self.queue) >= self.max_queue:
+            return False
+
+        self.queue.append((key, message))
+        self.wakeup.set()
+        return True
+
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, max_queue: int = CLIENT_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT_SECONDS):
         self.active_connections: List[WebSocket] = []
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self._channels: Dict[WebSocket, _ClientChannel] = {}
+        # Topic index: topic -> sockets, plus the reverse mapping so a
+        # disconnect can clean up every topic in O(subscriptions).
+        self._topic_index: Dict[str, Set[WebSocket]] = {}
+        self._subscriptions: Dict[WebSocket, Set[str]] = {}
+        self.evicted_total = 0
+        self.evicted_by_reason: Dict[str, int] = collections.Counter()
+        self.dropped_messages = 0
+        # Closes of evicted sockets still in flight; the loop only keeps
+        # weak references to tasks.
+        self._close_tasks: Set[asyncio.Task] = set()
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._subscriptions[websocket] = set()
+
+        channel = _ClientChannel(websocket, self.max_queue)
+        channel.writer = asyncio.create_task(self._writer_loop(channel))
+        self._channels[websocket] = channel
+
+        # Legacy clients that don't speak the subscription protocol keep
+        # receiving the whole live slate.
+        self.subscribe(websocket, topics if topics is not None else [ALL_TOPIC])
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        for topic in self._subscriptions.pop(websocket, set()):
+            subscribers = self._topic_index.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self._topic_index[topic]
 
-    async def broadcast(self, message: str):
-        # Iterate over a snapshot so a disconnect mid-broadcast can't trip
-        # the loop on a mutated list.
-        for connection in list(self.active_connections):
+        channel = self._channels.pop(websocket, None)
+        if channel is not None and channel.writer is not None:
+            if channel.writer is not asyncio.current_task():
+                channel.writer.cancel()
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        current = self._subscriptions.get(websocket)
+        if current is None:
+            return set()
+        for topic in topics:
+            current.add(topic)
+            self._topic_index.setdefault(topic, set()).add(websocket)
+        return set(current)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        current = self._subscriptions.get(websocket)
+        if current is None:
+            return set()
+        for topic in topics:
+            current.discard(topic)
+            subscribers = self._topic_index.get(topic)
+            if subscribers is not None:
+                subscribers.discard(websocket)
+                if not subscribers:
+                    del self._topic_index[topic]
+        return set(current)
+
+    def subscriptions(self, websocket: WebSocket) -> Set[str]:
+        return set(self._subscriptions.get(websocket, set()))
+
+    def subscribers_for(self, topics: Iterable[str]) -> Set[WebSocket]:
+        """Union of the sockets subscribed to any of `topics` or to "all"."""
+        recipients: Set[WebSocket] = set(self._topic_index.get(ALL_TOPIC, ()))
+        for topic in topics:
+            recipients.update(self._topic_index.get(topic, ()))
+        return recipients
+
+    def _evict(self, websocket: WebSocket, reason: str) -> None:
+        if websocket not in self._channels:
+            return
+        self.evicted_total += 1
+        self.evicted_by_reason[reason] += 1
+        logger.warning("Evicting slow WebSocket consumer (%s)", reason)
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close_quietly(websocket, SLOW_CONSUMER_CLOSE_CODE))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int) -> None:
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            logger.debug("Closing WebSocket with code %s failed", code, exc_info=True)
+
+    def _enqueue(self, websocket: WebSocket, message: str, key: Optional[str]) -> bool:
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
+        if channel.enqueue(key, message):
+            return True
+        self.dropped_messages += 1
+        self._evict(websocket, "queue_full")
+        return False
+
+    async def _writer_loop(self, channel: _ClientChannel) -> None:
+        websocket = channel.websocket
+        while True:
+            if not channel.queue:
+                # Backlog fully drained: a downgraded client has caught up.
+                channel.degraded = False
+                channel.wakeup.clear()
+                await channel.wakeup.wait()
+                continue
+
+            _key, message = channel.queue.popleft()
+            started = time.monotonic()
             try:
-                await connection.send_text(message)
+                await asyncio.wait_for(websocket.send_text(message), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict(websocket, "send_timeout")
+                return
+            except asyncio.CancelledError:
+                raise
             except Exception:
                 # Drop dead connections so they don't accumulate.
-                self.disconnect(connection)
+                self.disconnect(websocket)
+                return
 
-    async def shutdown(self):
-        for connection in list(self.active_connections):
-            try:
-                await connection.close(code=1001)  # 1001 = going away
-            except Exception:
-                pass
-            self.disconnect(connection)
+            channel.last_send_latency = time.monotonic() - started
+            channel.max_send_latency = max(channel.max_send_latency, channel.last_send_latency)
 
-manager = ConnectionManager()
+    def send_personal(self, websocket: WebSocket, message: str) -> bool:
+        return self._enqueue(websocket, message, None)
+
+    def broadcast(self, message: str, key: Optional[str] = None) -> int:
+        """Enqueue a message for every connection; never awaits a socket."""
+        # Iterate over a snapshot so an eviction mid-broadcast can't trip
+        # the loop on a mutated list.
+        return sum(
+            1 for connection in list(self.active_connections)
+            if self._enqueue(connection, message, key)
+        )
+
+    def publish(self, topics: Iterable[str], message: str, key: Optional[str] = None) -> int:
+        """Enqueue an already-serialized message for the subscribers of `topics`.
+
+        `key` identifies the entity the message describes (e.g. the match
+        topic) so a downgraded client only keeps the latest one.
+        """
+        return sum(
+            1 for connection in self.subscribers_for(topics)
+            if self._enqueue(connection, message, key)
+        )
+
+    def publish_grouped(
+        self,
+        entries: Sequence[Tuple[Sequence[str], object]],
+        render: Callable[[List[object]], str],
+    ) -> int:
+        """Send each subscriber one frame holding only the entries it follows.
 
+        `entries` are `(topics, item)` pairs. Subscribers that follow the
+        same subset of entries share a single `render(...)` call, so an
+        "all" subscriber and every viewer of the same match cost one
+        serialization each.
+        """
+        wanted: Dict[WebSocket, List[int]] = {}
+        for index, (topics, _item) in enumerate(entries):
+            for connection in self.subscribers_for(topics):
+                wanted.setdefault(connection, []).append(index)
 
+        rendered: Dict[Tuple[int, ...], str] = {}
+        delivered = 0
+        for connection, indexes in wanted.items():
+            subset = tuple(indexes)
+            if subset not in rendered:
+                rendered[subset] = render([entries[index][1] for index in subset])
+            # A single-entry frame can be superseded by a newer one for the
+            # same topic when the client is in latest-state-only mode.
+            key = entries[subset[0]][0][0] if len(subset) == 1 and entries[subset[0]][0] else None
+            if self._enqueue(connection, rendered[subset], key):
+                delivered += 1
+        return delivered
 
+    def topic_counts(self) -> Dict[str, int]:
+        return {topic: len(sockets) for topic, sockets in self._topic_index.items()}
 
+    def stats(self) -> Dict[str, object]:
+        depths = sorted(len(channel.queue) for channel in self._channels.values())
+        return {
+            "connections": len(self.active_connections),
+            "topics": len(self._topic_index),
+            "queue_depth": {
+                "total": sum(depths),
+                "max": depths[-1] if depths else 0,
+                "p50": depths[len(depths) // 2] if depths else 0,
+                "limit": self.max_queue,
+            },
+            "degraded_clients": sum(1 for channel in self._channels.values() if channel.degraded),
+            "max_send_latency_ms": round(
+                max((channel.max_send_latency for channel in self._channels.values()), default=0.0) * 1000, 2
+            ),
+            "evicted_total": self.evicted_total,
+            "evicted_by_reason": dict(self.evicted_by_reason),
+            "dropped_messages": self.dropped_messages,
+        }
 
+    async def shutdown(self):
+        for connection in list(self.active_connections):
+            self.disconnect(connection)
+            await self._close_quietly(connection, 1001)  # 1001 = going away
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks)
+
+manager = ConnectionManager()
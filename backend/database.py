@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -40,6 +41,55 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional asyncio engine (SQLAlchemy asyncio + asyncpg) for the hottest
+# read endpoints, see routers/api_async.py. Sync handlers each hold a
+# threadpool thread *and* a pooled connection for their whole duration, so
+# with a 3+2 pool a burst of requests queues on `pool_timeout` and 500s
+# while the CPU idles. Async handlers wait for a connection without holding
+# a thread, so hundreds of in-flight requests can share a few connections.
+# It is a separate pool: budget DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW
+# on top of the sync pool against the Supabase client cap above.
+ASYNC_DB_ENABLED = os.getenv("DB_ASYNC", "0").strip().lower() in {"1", "true", "yes"}
+_async_pool_size = int(os.getenv("DB_ASYNC_POOL_SIZE", "2"))
+_async_max_overflow = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "1"))
+_async_pool_timeout = int(os.getenv("DB_ASYNC_POOL_TIMEOUT", "30"))
+
+async_engine = None
+AsyncSessionLocal = None
+
+
+def async_database_url(url: str) -> URL:
+    """Map the configured (sync) URL onto its asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    return parsed
+
+
+if ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = async_database_url(SQLALCHEMY_DATABASE_URL)
+    _async_engine_kwargs = {"pool_pre_ping": True, "pool_recycle": 1800}
+    if _async_url.get_backend_name() == "postgresql":
+        _async_engine_kwargs.update(
+            pool_size=_async_pool_size,
+            max_overflow=_async_max_overflow,
+            pool_timeout=_async_pool_timeout,
+            # asyncpg's equivalents of the psycopg2 connect_args above.
+            # Behind a transaction-mode pooler set
+            # DB_ASYNC_STATEMENT_CACHE_SIZE=0.
+            connect_args={
+                "timeout": 10,
+                "statement_cache_size": int(os.getenv("DB_ASYNC_STATEMENT_CACHE_SIZE", "100")),
+            },
+        )
+    async_engine = create_async_engine(_async_url, **_async_engine_kwargs)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -48,3 +98,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("The async database path is disabled; set DB_ASYNC=1")
+    async with AsyncSessionLocal() as session:
+        yield session
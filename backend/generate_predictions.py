@@ -5,19 +5,29 @@ the artifact is missing - typically before the first training run - or
 when feature extraction fails (insufficient history for a brand-new
 team), falls back to the standings-based heuristic so the UI never goes
 empty.
+
+Upcoming matches are scored as one batch: `predict_for_matches` builds the
+feature matrix from a bulk load and runs one forward pass, standings for
+the heuristic come from one `IN` query, and the predictions are written
+with a single ``INSERT ... ON CONFLICT (match_id)`` (see
+``scripts/migrations/2026_06_predictions_match_unique.sql``).
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 
 try:
-    from backend.ai.match_outcome_inference import predict_for_match
+    from backend.ai.match_outcome_inference import predict_for_match, predict_for_matches
     from backend.database import SessionLocal
     from backend.models import Match, Prediction, Standing
 except ImportError:
-    from ai.match_outcome_inference import predict_for_match  # type: ignore[no-redef]
+    from ai.match_outcome_inference import predict_for_match, predict_for_matches  # type: ignore[no-redef]
     from database import SessionLocal  # type: ignore[no-redef]
     from models import Match, Prediction, Standing  # type: ignore[no-redef]
 
@@ -25,6 +35,17 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+Probabilities = Tuple[float, float, float]
+
+_PREDICTION_COLUMNS = ("home_win_prob", "draw_prob", "away_win_prob", "confidence_score")
+
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Rows per INSERT statement; keeps the bind-parameter count well under
+# the Postgres limit for a full season of fixtures.
+_UPSERT_BATCH_SIZE = 1000
+
+
 def _heuristic_probabilities(
     home_standing: Optional[Standing], away_standing: Optional[Standing]
 ) -> Tuple[float, float, float]:
@@ -52,60 +73,119 @@ def _heuristic_probabilities(
     return round(home_prob / s, 4), round(draw_prob / s, 4), round(away_prob / s, 4)
 
 
+def _model_probabilities(db: Session, matches: Sequence[Match]) -> Dict[int, Probabilities]:
+    """ML probabilities keyed by match id; matches the model can't score are absent."""
+    try:
+        return predict_for_matches(db, matches)
+    except Exception:
+        logger.exception("Batch ML inference failed; scoring matches one by one")
+
+    results: Dict[int, Probabilities] = {}
+    for match in matches:
+        try:
+            ml_result = predict_for_match(db, match)
+        except Exception:
+            logger.exception("ML inference failed for match=%s", match.id)
+            continue
+        if ml_result is not None:
+            results[match.id] = ml_result
+    return results
+
+
+def _standings_by_team(db: Session, team_ids: Sequence[Optional[int]]) -> Dict[int, Standing]:
+    """First standing row per team (the one `.first()` used to return), in one query."""
+    wanted = {team_id for team_id in team_ids if team_id is not None}
+    if not wanted:
+        return {}
+    standings: Dict[int, Standing] = {}
+    for standing in db.query(Standing).filter(Standing.team_id.in_(wanted)).order_by(Standing.id):
+        standings.setdefault(standing.team_id, standing)
+    return standings
+
+
+def _upsert_predictions(db: Session, rows: List[Dict[str, float]]) -> None:
+    """Write one prediction per match: a single upsert statement where the dialect allows.
+
+    Falls back to one lookup query plus ORM updates/inserts when the
+    dialect has no ``ON CONFLICT`` or the unique index on
+    ``predictions.match_id`` hasn't been created yet.
+    """
+    if not rows:
+        return
+
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        try:
+            with db.begin_nested():
+                for i in range(0, len(rows), _UPSERT_BATCH_SIZE):
+                    statement = insert(Prediction).values(rows[i : i + _UPSERT_BATCH_SIZE])
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[Prediction.match_id],
+                        set_={column: statement.excluded[column] for column in _PREDICTION_COLUMNS},
+                    )
+                    db.execute(statement)
+            return
+        except Exception:
+            logger.warning(
+                "Prediction upsert failed (apply scripts/migrations/2026_06_predictions_match_unique.sql); "
+                "falling back to per-row writes",
+                exc_info=True,
+            )
+
+    existing: Dict[int, Prediction] = {}
+    for prediction in (
+        db.query(Prediction)
+        .filter(Prediction.match_id.in_([row["match_id"] for row in rows]))
+        .order_by(Prediction.id)
+    ):
+        existing.setdefault(prediction.match_id, prediction)
+
+    for row in rows:
+        prediction = existing.get(row["match_id"])
+        if prediction is None:
+            db.add(Prediction(**row))
+            continue
+        for column in _PREDICTION_COLUMNS:
+            setattr(prediction, column, row[column])
+
+
 def generate_predictions() -> None:
     db = SessionLocal()
     try:
         matches = db.query(Match).filter(Match.status.in_(["NS", "TBD"])).all()
         logger.info("generate_predictions: %s upcoming match(es) to score", len(matches))
 
-        ml_used = 0
-        heuristic_used = 0
+        ml_results = _model_probabilities(db, matches)
+        heuristic_matches = [match for match in matches if match.id not in ml_results]
+        standings = _standings_by_team(
+            db,
+            [team_id for match in heuristic_matches for team_id in (match.home_team_id, match.away_team_id)],
+        )
 
+        rows: List[Dict[str, float]] = []
         for match in matches:
-            existing = db.query(Prediction).filter(Prediction.match_id == match.id).first()
-
-            ml_result = None
-            try:
-                ml_result = predict_for_match(db, match)
-            except Exception:
-                logger.exception("ML inference failed for match=%s", match.id)
-
+            ml_result = ml_results.get(match.id)
             if ml_result is not None:
                 home_prob, draw_prob, away_prob = ml_result
-                ml_used += 1
             else:
-                home_standing = (
-                    db.query(Standing).filter(Standing.team_id == match.home_team_id).first()
+                home_prob, draw_prob, away_prob = _heuristic_probabilities(
+                    standings.get(match.home_team_id), standings.get(match.away_team_id)
                 )
-                away_standing = (
-                    db.query(Standing).filter(Standing.team_id == match.away_team_id).first()
-                )
-                home_prob, draw_prob, away_prob = _heuristic_probabilities(home_standing, away_standing)
-                heuristic_used += 1
-
-            confidence = max(home_prob, draw_prob, away_prob)
 
-            if existing:
-                existing.home_win_prob = home_prob
-                existing.draw_prob = draw_prob
-                existing.away_win_prob = away_prob
-                existing.confidence_score = confidence
-            else:
-                db.add(
-                    Prediction(
-                        match_id=match.id,
-                        home_win_prob=home_prob,
-                        draw_prob=draw_prob,
-                        away_win_prob=away_prob,
-                        confidence_score=confidence,
-                    )
-                )
+            rows.append({
+                "match_id": match.id,
+                "home_win_prob": home_prob,
+                "draw_prob": draw_prob,
+                "away_win_prob": away_prob,
+                "confidence_score": max(home_prob, draw_prob, away_prob),
+            })
 
+        _upsert_predictions(db, rows)
         db.commit()
         logger.info(
             "generate_predictions: ml=%s heuristic=%s",
-            ml_used,
-            heuristic_used,
+            len(matches) - len(heuristic_matches),
+            len(heuristic_matches),
         )
     except Exception:
         db.rollback()
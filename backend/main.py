@@ -2,7 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="TerraBall")
-scheduler_instance = None
+scheduler_lease = None
 
 # CORS
 app.add_middleware(
@@ -11,21 +11,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 try:
     from backend.routers import api, ws, standings, auth_router, user_router, fantasy_router, search_router, news_router
+    from backend.database import ASYNC_DB_ENABLED, async_engine
     from backend.scheduler import start_scheduler
+    from backend.services.scheduler_lease import SchedulerLease
     from backend.connection_manager import manager as ws_manager
     from backend.services.live_broadcaster import start_consumer as start_live_consumer
     from backend.services.live_broadcaster import stop_consumer as stop_live_consumer
 except ImportError:
     from routers import api, ws, standings, auth_router, user_router, fantasy_router, search_router, news_router
+    from database import ASYNC_DB_ENABLED, async_engine
     from scheduler import start_scheduler
+    from services.scheduler_lease import SchedulerLease
     from connection_manager import manager as ws_manager
     from services.live_broadcaster import start_consumer as start_live_consumer
     from services.live_broadcaster import stop_consumer as stop_live_consumer
 
+if ASYNC_DB_ENABLED:
+    # Must come first: its async handlers shadow the same paths in api.router.
+    try:
+        from backend.routers import api_async
+    except ImportError:
+        from routers import api_async
+    app.include_router(api_async.router)
 app.include_router(api.router)
 app.include_router(ws.router)
 app.include_router(standings.router)
@@ -37,26 +49,38 @@ app.include_router(news_router.router)
 
 @app.on_event("startup")
 async def startup_event():
-    global scheduler_instance
+    global scheduler_lease
     # Start the WS broadcast consumer FIRST so any updates the scheduler
     # publishes in its initial run can be delivered as soon as a client
     # connects.
     start_live_consumer()
-    if scheduler_instance is None:
-        scheduler_instance = start_scheduler()
+    # Every worker competes for the lease; only the holder runs the jobs.
+    if scheduler_lease is None:
+        scheduler_lease = SchedulerLease(start_scheduler)
+        scheduler_lease.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    global scheduler_instance
+    global scheduler_lease
     # Close any open WebSocket connections so uvicorn --reload doesn't hang
     # waiting for them to drain.
     await ws_manager.shutdown()
     await stop_live_consumer()
-    if scheduler_instance is not None:
-        scheduler_instance.shutdown(wait=False)
-        scheduler_instance = None
+    if scheduler_lease is not None:
+        scheduler_lease.stop()
+        scheduler_lease = None
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 def read_root():
     return {"message": "TerraBall Backend is running"}
+
+
+@app.get("/scheduler/lease")
+def get_scheduler_lease():
+    """Which process currently owns the background jobs."""
+    if scheduler_lease is None:
+        return {"is_leader": False, "holder": None}
+    return scheduler_lease.status()
@@ -8,7 +8,10 @@ from sqlalchemy import (
     Float,
     Numeric,
     Date,
+    Index,
+    JSON,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 try:
@@ -40,7 +43,7 @@ class Player(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     position = Column(String)
-    team_id = Column(Integer, ForeignKey("teams.id"))
+    team_id = Column(Integer, ForeignKey("teams.id"), index=True)
     height = Column(String)
     nationality = Column(String)
     team = relationship("Team", back_populates="players")
@@ -70,6 +73,20 @@ class Player(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Listings by status (live / upcoming / finished) within a window,
+        # and a league's fixtures in kickoff order.
+        Index("ix_matches_status_start", "status", "start_time"),
+        Index("ix_matches_league_start", "league_id", "start_time"),
+        # Cursor pages of the match listings, keyed on (start_time, id).
+        Index("ix_matches_start_id", "start_time", "id"),
+        # The live poll: a handful of rows out of the whole history.
+        Index(
+            "ix_matches_live_start",
+            "start_time",
+            postgresql_where=text("status IN ('LIVE', 'HT', 'ET', 'P', '1H', '2H')"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"), nullable=True)
     home_team_id = Column(Integer, ForeignKey("teams.id"))
@@ -90,6 +107,11 @@ class Match(Base):
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (
+        # One row per match: generate_predictions upserts ON CONFLICT (match_id).
+        Index("uq_predictions_match_id", "match_id", unique=True),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     match_id = Column(Integer, ForeignKey("matches.id"))
     home_win_prob = Column(Float)
@@ -100,6 +122,10 @@ class Prediction(Base):
 
 class MatchEvent(Base):
     __tablename__ = "match_events"
+    __table_args__ = (
+        # Timelines are read per match, in minute order.
+        Index("ix_match_events_match_minute", "match_id", "minute", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     match_id = Column(Integer, ForeignKey("matches.id"))
     minute = Column(Integer)
@@ -131,6 +157,10 @@ class MatchStatistics(Base):
 
 class Standing(Base):
     __tablename__ = "standings"
+    __table_args__ = (
+        Index("ix_standings_league_id", "league_id"),
+        Index("ix_standings_team_id", "team_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"))
     team_id = Column(Integer, ForeignKey("teams.id"))
@@ -393,6 +423,10 @@ class TeamEloSnapshot(Base):
     __tablename__ = "team_elo_snapshots"
     __table_args__ = (
         UniqueConstraint("team_id", "match_id", name="uq_team_elo_match"),
+        # A team's latest rating before a kickoff (2026_05_team_elo.sql).
+        Index("ix_team_elo_team_time", "team_id", "snapshot_at"),
+        # Incremental Elo replays start from a kickoff across all teams.
+        Index("ix_team_elo_snapshot_at", "snapshot_at"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -402,3 +436,155 @@ class TeamEloSnapshot(Base):
     post_match_elo = Column(Float, nullable=False)
     is_home = Column(Boolean, nullable=False)
     snapshot_at = Column(DateTime, nullable=False)
+
+
+class TeamEloRating(Base):
+    """Current Elo per team: its latest `team_elo_snapshots` row, materialised.
+
+    Maintained by `ai.elo_updater` together with the snapshots.
+    """
+
+    __tablename__ = "team_elo_ratings"
+
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    rating = Column(Float, nullable=False)
+    last_match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
+    last_match_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class TeamFormSnapshot(Base):
+    """Rolling team context as of a finished fixture (see `ai.team_form_store`).
+
+    A row for (team, match) holds the team's form over every finished match
+    up to and including `as_of` (that match's kickoff). It is therefore the
+    pre-kickoff context of any later fixture the team plays before its next
+    result: inference reads the newest row with `as_of` before kickoff.
+    Columns are grouped by the model that consumes them.
+    """
+
+    __tablename__ = "team_form_snapshots"
+    __table_args__ = (
+        UniqueConstraint("team_id", "match_id", name="uq_team_form_match"),
+        Index("ix_team_form_team_as_of", "team_id", "as_of"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
+    as_of = Column(DateTime, nullable=False)
+    elo = Column(Float, nullable=False)
+
+    # Match-outcome model (all competitions).
+    form_points_5 = Column(Float, nullable=False)
+    home_form_5 = Column(Float, nullable=False)
+    away_form_5 = Column(Float, nullable=False)
+    goals_for_avg_10 = Column(Float, nullable=False)
+    goals_against_avg_10 = Column(Float, nullable=False)
+    btts_rate_10 = Column(Float, nullable=False)
+    form_vs_strong_5 = Column(Float, nullable=False)
+
+    # Next-event team prior (last 15, all competitions).
+    matches_15 = Column(Integer, nullable=False)
+    goals_for_15 = Column(Float, nullable=False)
+    goals_against_15 = Column(Float, nullable=False)
+    points_15 = Column(Float, nullable=False)
+
+    # xG proxy context (supported leagues, `xg_window` matches).
+    xg_window = Column(Integer, nullable=False)
+    xg_matches = Column(Float, nullable=False)
+    xg_points_per_match = Column(Float, nullable=False)
+    xg_goals_for_avg = Column(Float, nullable=False)
+    xg_goals_against_avg = Column(Float, nullable=False)
+    xg_shots_on_avg = Column(Float, nullable=False)
+    xg_shots_off_avg = Column(Float, nullable=False)
+    xg_possession_avg = Column(Float, nullable=False)
+    xg_corners_avg = Column(Float, nullable=False)
+    xg_form_points_last5 = Column(Float, nullable=False)
+    xg_stats_coverage = Column(Float, nullable=False)
+    xg_last_match_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+class TournamentProjection(Base):
+    """Simulated round-reaching odds for a tournament (see `ai.tournament_simulator`).
+
+    One row per league, rewritten by the scheduler's `refresh_derived_data`
+    job after a result in it is stored, so the bracket endpoints only ever
+    read it.
+    """
+
+    __tablename__ = "tournament_projections"
+
+    league_id = Column(Integer, ForeignKey("leagues.id"), primary_key=True)
+    simulations = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+
+class LeagueTableEntry(Base):
+    """A team's row in one season's league table, from the finished matches stored so far.
+
+    Maintained by `services.league_tables`: the scheduler applies each
+    result's contribution (and takes back a corrected one) in the same
+    transaction that stores it, so the standings endpoints read a whole
+    table with one lookup on the primary key's ``(league_id, season)``
+    prefix. ``season`` is the year the season starts in (2025 for
+    2025/26); ``group_name`` is set for tournament group tables.
+    """
+
+    __tablename__ = "league_table_entries"
+
+    league_id = Column(Integer, ForeignKey("leagues.id"), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    group_name = Column(String, nullable=True)
+    played = Column(Integer, nullable=False, default=0)
+    won = Column(Integer, nullable=False, default=0)
+    drawn = Column(Integer, nullable=False, default=0)
+    lost = Column(Integer, nullable=False, default=0)
+    goals_for = Column(Integer, nullable=False, default=0)
+    goals_against = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    # Last five results, oldest first (e.g. "WDLWW").
+    form = Column(String, nullable=False, default="")
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+class TeamMatch(Base):
+    """One row per team per match: `matches` seen from each side.
+
+    A team's history filtered on ``home_team_id OR away_team_id`` can't be
+    read off one index; here it is a range scan of ``(team_id, start_time
+    DESC)``. Kept in step with `matches` by `services.team_matches`.
+    """
+
+    __tablename__ = "team_matches"
+    __table_args__ = (
+        Index("ix_team_matches_team_start", "team_id", text("start_time DESC"), text("match_id DESC")),
+    )
+
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    is_home = Column(Boolean, nullable=False)
+    start_time = Column(DateTime)
+    status = Column(String)
+    goals_for = Column(Integer, nullable=True)
+    goals_against = Column(Integer, nullable=True)
+    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=True)
+
+
+class DataVersion(Base):
+    """Monotonic counter per data scope, bumped when derived views go stale.
+
+    The scheduler bumps the ``matches`` scope in the same transaction that
+    persists a new result, score or status, so every API worker's response
+    cache (see `services.response_cache`) can tell its entries are stale.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from typing import Any, Dict, List, Optional
 import re
 try:
@@ -17,6 +17,11 @@ try:
     from backend.services import apisports as apisports_client
     from backend.services.apisports import ApisportsQuotaExceeded
     from backend.services import fpl as fpl_client
+    from backend.services.reference_cache import reference_cache
+    from backend.services.response_cache import cached_response, response_cache
+    from backend.services import league_tables, pagination, read_queries
+    from backend.services.team_matches import recent_team_matches
+    from backend.database import ASYNC_DB_ENABLED
 except ImportError:
     from database import get_db
     from models import Match, League, Team, Prediction, Player, MatchEvent, MatchStatistics, ProviderIdMap
@@ -31,6 +36,11 @@ except ImportError:
     from services import apisports as apisports_client
     from services.apisports import ApisportsQuotaExceeded
     from services import fpl as fpl_client
+    from services.reference_cache import reference_cache
+    from services.response_cache import cached_response, response_cache
+    from services import league_tables, pagination, read_queries
+    from services.team_matches import recent_team_matches
+    from database import ASYNC_DB_ENABLED
 import datetime
 import logging
 from services.data_aggregator import data_aggregator
@@ -46,6 +56,11 @@ try:
 except ImportError:
     from ai.xg_model import xg_inference_service
 
+try:
+    from backend.ai import season_simulator, tournament_simulator
+except ImportError:
+    from ai import season_simulator, tournament_simulator
+
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
 logger = logging.getLogger(__name__)
@@ -136,14 +151,14 @@ def _get_league_for_team(team, db: Session, league_cache):
         return None
 
     if team.league_id not in league_cache:
-        league_cache[team.league_id] = db.query(League).filter(League.id == team.league_id).first()
+        league_cache[team.league_id] = reference_cache.get_league(db, team.league_id)
 
     return league_cache[team.league_id]
 
 
 def _get_cached_team(team_id, db: Session, team_cache):
     if team_id not in team_cache:
-        team_cache[team_id] = db.query(Team).filter(Team.id == team_id).first()
+        team_cache[team_id] = reference_cache.get_team(db, team_id)
 
     return team_cache[team_id]
 
@@ -164,16 +179,8 @@ def _resolve_competition(home_league, away_league):
 
 
 def _build_recent_form(team_id, current_match_id, db: Session, team_cache, league_cache):
-    recent_matches = (
-        db.query(Match)
-        .filter(
-            Match.id != current_match_id,
-            Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-            or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
-        )
-        .order_by(Match.start_time.desc())
-        .limit(30)
-        .all()
+    recent_matches = recent_team_matches(
+        db, team_id, limit=30, statuses=FINISHED_MATCH_STATUSES, exclude_match_id=current_match_id
     )
 
     results = []
@@ -310,16 +317,7 @@ def _build_player_performance_snapshot(player, db: Session, team_cache, league_c
             "matches_considered": 0,
         }
 
-    candidate_matches = (
-        db.query(Match)
-        .filter(
-            Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-            or_(Match.home_team_id == player.team_id, Match.away_team_id == player.team_id),
-        )
-        .order_by(Match.start_time.desc())
-        .limit(80)
-        .all()
-    )
+    candidate_matches = recent_team_matches(db, player.team_id, limit=80, statuses=FINISHED_MATCH_STATUSES)
 
     supported_matches = []
     for match in candidate_matches:
@@ -701,18 +699,7 @@ def _build_player_availability_score(player):
 
 
 def _build_supported_team_match_history(team_id, db: Session, team_cache, league_cache):
-    candidate_matches = (
-        db.query(Match)
-        .filter(
-            Match.status.in_(list(FINISHED_MATCH_STATUSES)),
-            Match.home_score.isnot(None),
-            Match.away_score.isnot(None),
-            or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
-        )
-        .order_by(Match.start_time.desc())
-        .limit(120)
-        .all()
-    )
+    candidate_matches = recent_team_matches(db, team_id, limit=120, statuses=FINISHED_MATCH_STATUSES, scored=True)
 
     history = []
 
@@ -1027,13 +1014,21 @@ def _build_squad_depth_metrics(team_id, db: Session):
         "fallback_notes": fallback_notes,
     }
 
-@router.get("/leagues")
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Hit/miss counters for this process's reference-data and response caches"""
+    return {**reference_cache.stats(), "responses": response_cache.stats()}
+
+# With DB_ASYNC=1 these four paths are served by routers/api_async.py,
+# mounted in front of this router; the sync handlers stay as the fallback.
+_SYNC_HOT_PATHS_IN_SCHEMA = not ASYNC_DB_ENABLED
+
+@router.get("/leagues", include_in_schema=_SYNC_HOT_PATHS_IN_SCHEMA)
 def get_leagues(db: Session = Depends(get_db)):
     """Get all available leagues"""
-    leagues = db.query(League).all()
-    return leagues
+    return db.execute(read_queries.leagues_statement()).scalars().all()
 
-@router.get("/live-matches")
+@router.get("/live-matches", include_in_schema=_SYNC_HOT_PATHS_IN_SCHEMA)
 def get_live_matches(
     db: Session = Depends(get_db),
     league_id: Optional[int] = Query(None, description="Filter to a specific league id"),
@@ -1051,6 +1046,8 @@ def get_live_matches(
     limit: int = Query(30, ge=1, le=200, description="Page size, default 30, max 200"),
     offset: int = Query(0, ge=0, description="Number of rows to skip for pagination"),
     order: str = Query("asc", pattern="^(asc|desc)$", description="Sort by kickoff: asc or desc"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page; replaces offset"),
+    include_total: bool = Query(True, description="Include `total` (cached per filter for a few seconds)"),
 ):
     """
     Return matches for the configured leagues, paginated.
@@ -1059,161 +1056,69 @@ def get_live_matches(
     `status` argument accepts the friendly groups `live`, `upcoming`,
     `finished`, or a raw comma-separated list of status codes.
 
+    Infinite-scroll clients should pass the previous page's `next_cursor`
+    as `cursor` instead of growing `offset`: the page then starts from an
+    index range on (kickoff, id), so every page costs the same. `total` is
+    cached per filter for ``PAGINATION_TOTAL_TTL_SECONDS``; pass
+    `include_total=false` to skip it (`total` is then null).
+
     Response shape:
         {
             "items": [Match, ...],
             "total": 1234,
             "limit": 30,
             "offset": 0,
-            "has_more": true
+            "has_more": true,
+            "next_cursor": "WyIyMDI2LTA1LTAxVDE1OjAwOjAwIiwxMl0"
         }
     """
-    status_groups = {
-        "live": ["LIVE", "HT", "ET", "P", "1H", "2H"],
-        "upcoming": ["NS", "TBD", "PST", "SUSP"],
-        "finished": ["FT", "AET", "PEN"],
-    }
-    all_known_statuses = ["LIVE", "HT", "ET", "P", "1H", "2H", "NS", "TBD", "PST", "SUSP", "FT", "AET", "PEN"]
-
-    if status:
-        normalized = status.strip().lower()
-        if normalized in status_groups:
-            wanted_statuses = status_groups[normalized]
-        else:
-            wanted_statuses = [s.strip().upper() for s in status.split(",") if s.strip()]
-    else:
-        wanted_statuses = all_known_statuses
-
-    query = db.query(Match).filter(Match.status.in_(wanted_statuses))
-
-    # Resolve the requested time window. No defaults: caller decides whether
-    # to narrow by date. The pagination keeps the response cheap regardless.
-    window_start = None
-    window_end = None
-    now_utc = datetime.datetime.utcnow()
-
-    if days_back is not None:
-        window_start = now_utc - datetime.timedelta(days=days_back)
-    if days_forward is not None:
-        window_end = now_utc + datetime.timedelta(days=days_forward)
-
-    if date_from:
-        try:
-            window_start = datetime.datetime.strptime(date_from, "%Y-%m-%d")
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid date_from: {exc}")
-    if date_to:
-        try:
-            # Make date_to inclusive of the entire day.
-            window_end = datetime.datetime.strptime(date_to, "%Y-%m-%d") + datetime.timedelta(days=1)
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid date_to: {exc}")
-
-    if window_start is not None:
-        query = query.filter(Match.start_time >= window_start)
-    if window_end is not None:
-        query = query.filter(Match.start_time <= window_end)
-
-    if league_id is not None:
-        # Match either explicit league_id on Match or via home team membership.
-        query = query.outerjoin(Team, Team.id == Match.home_team_id).filter(
-            or_(Match.league_id == league_id, Team.league_id == league_id)
-        )
-
-    total = query.with_entities(Match.id).count()
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both.")
+    page_statement, total_statement = read_queries.live_matches_statements(
+        league_id, status, date_from, date_to, days_back, days_forward, limit, offset, order, cursor
+    )
 
-    sort_column = Match.start_time.asc() if order == "asc" else Match.start_time.desc()
-    matches = (
-        query.order_by(sort_column, Match.id.asc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    total = None
+    if include_total:
+        total = pagination.totals.get(total_statement)
+        if total is None:
+            total = db.execute(total_statement).scalar_one()
+            pagination.totals.put(total_statement, total)
+    matches, has_more, next_cursor = read_queries.split_match_page(
+        db.execute(page_statement).scalars().all(), limit
     )
 
     if not matches:
-        return {
-            "items": [],
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "has_more": False,
-        }
+        return read_queries.live_matches_page([], total, limit, offset, False, None)
 
     # Bulk-fetch every team referenced by the matches in a single query
     # instead of doing 2 round-trips per match (N+1). With a remote Supabase
     # pooler this is the difference between sub-second and 30+ seconds.
-    team_ids = set()
-    for match in matches:
-        if match.home_team_id is not None:
-            team_ids.add(match.home_team_id)
-        if match.away_team_id is not None:
-            team_ids.add(match.away_team_id)
-
+    teams_statement = read_queries.teams_by_id_statement(matches)
     teams_by_id = {
-        team.id: team
-        for team in db.query(Team).filter(Team.id.in_(team_ids)).all()
-    } if team_ids else {}
-
-    items = []
-    for match in matches:
-        home_team = teams_by_id.get(match.home_team_id)
-        away_team = teams_by_id.get(match.away_team_id)
-
-        items.append({
-            "id": match.id,
-            "start_time": match.start_time,
-            "status": match.status,
-            "home_score": match.home_score,
-            "away_score": match.away_score,
-            "home_team_id": match.home_team_id,
-            "away_team_id": match.away_team_id,
-            "home_team_name": home_team.name if home_team else f"Team {match.home_team_id}",
-            "away_team_name": away_team.name if away_team else f"Team {match.away_team_id}",
-            "home_team_logo": home_team.logo_url if home_team else None,
-            "away_team_logo": away_team.logo_url if away_team else None,
-            "league_id": match.league_id if match.league_id else (home_team.league_id if home_team else None),
-            "prediction": match.prediction,
-        })
+        team.id: team for team in db.execute(teams_statement).scalars()
+    } if teams_statement is not None else {}
 
-    return {
-        "items": items,
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-        "has_more": offset + len(items) < total,
-    }
+    items = [read_queries.live_match_item(match, teams_by_id, match.prediction) for match in matches]
+    return read_queries.live_matches_page(items, total, limit, offset, has_more, next_cursor)
 
-@router.get("/match/{match_id}/details")
+@router.get("/match/{match_id}/details", include_in_schema=_SYNC_HOT_PATHS_IN_SCHEMA)
 def get_match_details(match_id: int, db: Session = Depends(get_db)):
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = db.execute(read_queries.match_statement(match_id)).scalars().first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
     # Get team details
-    home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-    away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
+    home_team = reference_cache.get_team(db, match.home_team_id)
+    away_team = reference_cache.get_team(db, match.away_team_id)
     
     # Get players for each team
-    home_players = db.query(Player).filter(Player.team_id == match.home_team_id).limit(11).all()
-    away_players = db.query(Player).filter(Player.team_id == match.away_team_id).limit(11).all()
+    home_players = db.execute(read_queries.squad_preview_statement(match.home_team_id)).scalars().all()
+    away_players = db.execute(read_queries.squad_preview_statement(match.away_team_id)).scalars().all()
     
-    return {
-        "id": match.id,
-        "start_time": match.start_time,
-        "status": match.status,
-        "home_score": match.home_score,
-        "away_score": match.away_score,
-        "home_team_id": match.home_team_id,
-        "away_team_id": match.away_team_id,
-        "home_team_name": home_team.name if home_team else f"Team {match.home_team_id}",
-        "away_team_name": away_team.name if away_team else f"Team {match.away_team_id}",
-        "home_team_logo": home_team.logo_url if home_team else None,
-        "away_team_logo": away_team.logo_url if away_team else None,
-        "home_team_stadium": home_team.stadium if home_team else None,
-        "home_players": [{"name": p.name, "position": p.position} for p in home_players],
-        "away_players": [{"name": p.name, "position": p.position} for p in away_players],
-        "prediction": match.prediction
-    }
+    return read_queries.match_details_payload(
+        match, home_team, away_team, home_players, away_players, match.prediction
+    )
 
 
 @router.get("/match/{match_id}/experience", response_model=MatchExperienceSchema)
@@ -1514,7 +1419,7 @@ def get_match_xg_live(
             detail="Live xG updates are limited to Top 5 leagues + UCL matches.",
         )
 
-    payload = xg_inference_service.predict_live(db=db, match=match, minute_override=minute)
+    payload = xg_inference_service.predict_live_shared(db=db, match=match, minute_override=minute)
 
     if minute is None and _normalize_text(match.status) not in {_normalize_text(status) for status in IN_PLAY_MATCH_STATUSES}:
         payload_disclaimers = list(payload.get("disclaimers", []))
@@ -1892,7 +1797,7 @@ def _try_apisports_for_match(db: Session, match: Match, provider: str) -> int:
     return inserted
 
 
-@router.get("/match-events/bulk")
+@router.get("/match-events/bulk", include_in_schema=_SYNC_HOT_PATHS_IN_SCHEMA)
 def get_match_events_bulk(
     match_ids: str = Query(..., description="Comma-separated list of match ids, e.g. '538149,538150'"),
     db: Session = Depends(get_db),
@@ -1912,46 +1817,12 @@ def get_match_events_bulk(
             ...
         }
     """
-    parsed_ids: List[int] = []
-    for raw in (match_ids or "").split(","):
-        raw = raw.strip()
-        if not raw:
-            continue
-        try:
-            parsed_ids.append(int(raw))
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid match id: {raw!r}")
-
-    # De-duplicate and cap so a runaway client can't ask for the whole DB.
-    unique_ids = list({mid for mid in parsed_ids})
+    unique_ids = read_queries.parse_match_ids(match_ids)
     if not unique_ids:
         return {}
-    if len(unique_ids) > 200:
-        raise HTTPException(status_code=400, detail="Too many match_ids (max 200).")
 
-    rows = (
-        db.query(MatchEvent)
-        .filter(MatchEvent.match_id.in_(unique_ids))
-        .order_by(MatchEvent.match_id.asc(), MatchEvent.minute.asc().nullslast(), MatchEvent.id.asc())
-        .all()
-    )
-
-    grouped: Dict[int, List[Dict[str, Any]]] = {mid: [] for mid in unique_ids}
-    for row in rows:
-        grouped.setdefault(row.match_id, []).append({
-            "id": row.id,
-            "minute": row.minute,
-            "event_type": row.event_type,
-            "team_id": row.team_id,
-            "player_id": row.player_id,
-            "player_name": row.player_name,
-            "assist_player_id": row.assist_player_id,
-            "assist_player_name": row.assist_player_name,
-            "detail": row.detail,
-        })
-
-    # Stringify keys so the JSON response is predictable from the frontend.
-    return {str(mid): grouped[mid] for mid in unique_ids}
+    rows = db.execute(read_queries.match_events_statement(unique_ids)).scalars().all()
+    return read_queries.group_match_events(unique_ids, rows)
 
 
 @router.get("/match/{match_id}/statistics")
@@ -1963,22 +1834,102 @@ def get_match_statistics(match_id: int, db: Session = Depends(get_db)):
     return stats
 
 @router.get("/league/{league_id}/standings")
-def get_league_standings(league_id: int, db: Session = Depends(get_db)):
-    """Compute standings from finished matches. Tournament-aware: returns grouped tables for WC."""
+@cached_response
+def get_league_standings(
+    league_id: int,
+    live: bool = Query(False, description="Apply in-play scores as if they were final"),
+    db: Session = Depends(get_db),
+):
+    """League standings. Tournament-aware: returns grouped tables for WC.
 
-    # Detect tournament: check if any match for this league has group_name set
-    is_tournament = (
-        db.query(Match.id)
-        .filter(Match.league_id == league_id, Match.group_name.isnot(None))
-        .first()
-    ) is not None
+    Served from the materialized table (`services.league_tables`); computed
+    from finished matches when the store has no rows for the league.
+    """
+    rows = league_tables.stored_league_table(db, league_id)
+    if rows is not None:
+        if live:
+            rows = league_tables.with_live_results(db, league_id, rows)
+        return _format_stored_standings(rows)
 
-    if is_tournament:
+    if _is_tournament_league(league_id, db):
         return _compute_tournament_standings(league_id, db)
 
     return _compute_league_standings(league_id, db)
 
 
+def _format_stored_standings(rows: List[Dict[str, Any]]):
+    """Stored table rows in the shape `_compute_*_standings` return."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        row.pop("season")
+        group_name = row.pop("group_name")
+        if group_name is not None:
+            groups.setdefault(group_name, []).append(row)
+
+    if not groups:
+        table = league_tables.sort_table(rows)
+        for idx, row in enumerate(table, start=1):
+            row["rank"] = idx
+        return table
+
+    result_groups = []
+    for name in sorted(groups):
+        table = league_tables.sort_table(groups[name])
+        for idx, row in enumerate(table, start=1):
+            row["position"] = idx
+            row["form"] = row["form"][-3:]
+        result_groups.append({"name": name, "table": table})
+    return {"type": "tournament", "groups": result_groups}
+
+
+@router.get("/league/{league_id}/projections")
+@cached_response
+def get_league_projections(league_id: int, db: Session = Depends(get_db)):
+    """Monte Carlo projection of the final table: title, top-4 and relegation odds per team.
+
+    Always `season_simulator.DEFAULT_SIMULATIONS` seasons: the count is not
+    a client parameter, so every request for a league shares one cached
+    body and no caller can ask for an arbitrarily large run.
+    """
+    if _is_tournament_league(league_id, db):
+        raise HTTPException(status_code=404, detail="Projections are only available for league tables")
+
+    season, table = _current_season_table(league_id, db)
+    if not table:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    return season_simulator.project_league(
+        db, league_id, season, table, n_simulations=season_simulator.DEFAULT_SIMULATIONS
+    )
+
+
+def _current_season_table(league_id: int, db: Session):
+    """`(season, ranked table)` of the league's latest season.
+
+    The materialized table when it has the league, else computed from that
+    season's league fixtures; ``(None, [])`` for a league without fixtures.
+    """
+    rows = league_tables.stored_league_table(db, league_id)
+    if rows is not None:
+        season = rows[0]["season"]
+        return season, _format_stored_standings(rows)
+
+    latest_kickoff = db.query(func.max(Match.start_time)).filter(Match.league_id == league_id).scalar()
+    if latest_kickoff is None:
+        return None, []
+    season = league_tables.season_of(latest_kickoff)
+    return season, _compute_league_standings(league_id, db, season=season)
+
+
+def _is_tournament_league(league_id: int, db: Session) -> bool:
+    # A tournament has group-stage fixtures (group_name set).
+    return (
+        db.query(Match.id)
+        .filter(Match.league_id == league_id, Match.group_name.isnot(None))
+        .first()
+    ) is not None
+
+
 def _compute_tournament_standings(league_id: int, db: Session):
     """Compute group-stage standings for a tournament (e.g. World Cup)."""
     from collections import defaultdict
@@ -2078,8 +2029,11 @@ def _compute_tournament_standings(league_id: int, db: Session):
     return {"type": "tournament", "groups": result_groups}
 
 
-def _compute_league_standings(league_id: int, db: Session):
-    """Compute flat standings for a regular league."""
+def _compute_league_standings(league_id: int, db: Session, season: Optional[int] = None):
+    """Compute flat standings for a regular league.
+
+    With `season`, only that season's fixtures of `league_id` count.
+    """
     teams = db.query(Team).filter(Team.league_id == league_id).all()
     if not teams:
         return []
@@ -2095,18 +2049,20 @@ def _compute_league_standings(league_id: int, db: Session):
         for team_id in team_ids
     }
 
-    matches = (
-        db.query(Match)
-        .filter(
-            Match.home_team_id.in_(team_ids),
-            Match.away_team_id.in_(team_ids),
-            Match.status == "FT",
-            Match.home_score.isnot(None),
-            Match.away_score.isnot(None),
-        )
-        .order_by(Match.start_time.asc())
-        .all()
+    matches = db.query(Match).filter(
+        Match.home_team_id.in_(team_ids),
+        Match.away_team_id.in_(team_ids),
+        Match.status == "FT",
+        Match.home_score.isnot(None),
+        Match.away_score.isnot(None),
     )
+    if season is not None:
+        matches = matches.filter(
+            Match.league_id == league_id,
+            Match.start_time >= league_tables.season_start(season),
+            Match.start_time < league_tables.season_start(season + 1),
+        )
+    matches = matches.order_by(Match.start_time.asc()).all()
 
     for match in matches:
         home_id = match.home_team_id
@@ -2187,6 +2143,7 @@ def _compute_league_standings(league_id: int, db: Session):
 
 
 @router.get("/league/{league_id}/bracket")
+@cached_response
 def get_league_bracket(league_id: int, db: Session = Depends(get_db)):
     """Return knockout bracket for a tournament league (e.g. World Cup)."""
 
@@ -2262,6 +2219,16 @@ def get_league_bracket(league_id: int, db: Session = Depends(get_db)):
     return {"rounds": rounds}
 
 
+@router.get("/league/{league_id}/bracket/projections")
+@cached_response
+def get_league_bracket_projections(league_id: int, db: Session = Depends(get_db)):
+    """Each team's odds of reaching every knockout round, as precomputed after the last result."""
+    projection = tournament_simulator.stored_projection(db, league_id)
+    if projection is None:
+        raise HTTPException(status_code=404, detail="No projections for this league")
+    return projection
+
+
 # Mapping from football-data.org league IDs to competition codes (for scorers API)
 _LEAGUE_ID_TO_FD_CODE = {
     2021: "PL", 2014: "PD", 2002: "BL1", 2019: "SA", 2015: "FL1",
@@ -2305,13 +2272,21 @@ def get_league_scorers(league_id: int):
 
 @router.get("/teams")
 def get_teams(
+    response: Response,
     league_id: int = Query(None, description="Filter by league ID"),
     search: str = Query(None, description="Search team name"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip"),
     db: Session = Depends(get_db)
 ):
-    """Get all teams with optional filtering"""
+    """Get all teams with optional filtering, by name.
+
+    When there are more rows, the `X-Next-Cursor` header holds the `cursor`
+    for the next page.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both.")
     query = db.query(Team)
     
     if league_id:
@@ -2320,12 +2295,17 @@ def get_teams(
     if search:
         query = query.filter(Team.name.ilike(f"%{search}%"))
     
-    teams = query.offset(skip).limit(limit).all()
+    query = pagination.keyset_page(query, (Team.name, Team.id), descending=False, cursor=cursor, limit=limit)
+    if not cursor:
+        query = query.offset(skip)
+    teams, _has_more, next_cursor = pagination.split_page(query.all(), limit, ("name", "id"))
+    pagination.set_next_cursor(response, next_cursor)
     
     # Enrich with league data
+    leagues = reference_cache.get_leagues(db, (team.league_id for team in teams))
     result = []
     for team in teams:
-        league = db.query(League).filter(League.id == team.league_id).first()
+        league = leagues.get(team.league_id)
         player_count = db.query(Player).filter(Player.team_id == team.id).count()
         
         result.append({
@@ -2351,7 +2331,7 @@ def get_team_details(team_id: int, db: Session = Depends(get_db)):
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    league = db.query(League).filter(League.id == team.league_id).first()
+    league = reference_cache.get_league(db, team.league_id)
     players = db.query(Player).filter(Player.team_id == team_id).all()
     
     # Group players by position
@@ -2403,15 +2383,23 @@ def get_team_details(team_id: int, db: Session = Depends(get_db)):
 
 @router.get("/players")
 def get_players(
+    response: Response,
     team_id: int = Query(None, description="Filter by team ID"),
     position: str = Query(None, description="Filter by position"),
     search: str = Query(None, description="Search player name"),
     supported_only: bool = Query(False, description="Restrict players to Top 5 leagues + UCL"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip"),
     db: Session = Depends(get_db)
 ):
-    """Get all players with optional filtering"""
+    """Get all players with optional filtering, by name.
+
+    When there are more rows, the `X-Next-Cursor` header holds the `cursor`
+    for the next page.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both.")
     query = db.query(Player)
 
     if supported_only:
@@ -2437,13 +2425,19 @@ def get_players(
     if search:
         query = query.filter(Player.name.ilike(f"%{search}%"))
     
-    players = query.offset(skip).limit(limit).all()
+    query = pagination.keyset_page(query, (Player.name, Player.id), descending=False, cursor=cursor, limit=limit)
+    if not cursor:
+        query = query.offset(skip)
+    players, _has_more, next_cursor = pagination.split_page(query.all(), limit, ("name", "id"))
+    pagination.set_next_cursor(response, next_cursor)
     
     # Enrich with team data
+    teams = reference_cache.get_teams(db, (player.team_id for player in players))
+    leagues = reference_cache.get_leagues(db, (team.league_id for team in teams.values()))
     result = []
     for player in players:
-        team = db.query(Team).filter(Team.id == player.team_id).first()
-        league = db.query(League).filter(League.id == team.league_id).first() if team else None
+        team = teams.get(player.team_id)
+        league = leagues.get(team.league_id) if team else None
         
         result.append({
             "id": player.id,
@@ -2475,8 +2469,8 @@ def get_player_details(player_id: int, db: Session = Depends(get_db)):
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    team = db.query(Team).filter(Team.id == player.team_id).first()
-    league = db.query(League).filter(League.id == team.league_id).first() if team else None
+    team = reference_cache.get_team(db, player.team_id)
+    league = reference_cache.get_league(db, team.league_id) if team else None
     
     return {
         "id": player.id,
@@ -2499,6 +2493,7 @@ def get_player_details(player_id: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/players/{player_id}/enhanced")
+@cached_response
 def get_player_enhanced(player_id: int, db: Session = Depends(get_db)):
     """Get player details enriched with external API data"""
     player = db.query(Player).filter(Player.id == player_id).first()
@@ -2574,7 +2569,7 @@ def get_player_enhanced(player_id: int, db: Session = Depends(get_db)):
         enriched["stats"] = player_dict["stats"]
 
     # Get team info
-    team = db.query(Team).filter(Team.id == player.team_id).first()
+    team = reference_cache.get_team(db, player.team_id)
     enriched['team'] = {
         "id": team.id,
         "name": team.name,
@@ -2801,6 +2796,7 @@ def _compute_heuristic_rating(player: Player, pos_group: str) -> float:
     return baseline + minutes_bonus + goals_bonus + assists_bonus
 
 @router.get("/teams/{team_id}/statistics")
+@cached_response
 def get_team_statistics(team_id: int, db: Session = Depends(get_db)):
     """Get team analysis metrics for Top 5 leagues + UEFA Champions League teams."""
     team = db.query(Team).filter(Team.id == team_id).first()
@@ -2867,6 +2863,7 @@ def get_team_statistics(team_id: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/teams/{team1_id}/vs/{team2_id}")
+@cached_response
 def get_head_to_head(team1_id: int, team2_id: int, db: Session = Depends(get_db)):
     """Get head-to-head statistics between two teams"""
     team1 = db.query(Team).filter(Team.id == team1_id).first()
@@ -0,0 +1,118 @@
+"""Async (``DB_ASYNC=1``) versions of the hottest read endpoints.
+
+Same paths, parameters and response shapes as their sync counterparts in
+`routers/api.py`; `main.py` mounts this router in front of `api.router`
+when the async engine is enabled, so these handlers take precedence and
+the sync ones stay as the fallback. Statements and row shaping come from
+`services.read_queries`, shared with the sync handlers.
+
+Lazy loads are not available on an `AsyncSession`; the shared statements
+already eager-load what the payloads render (`read_queries.MATCH_CARD_LOADS`).
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    from backend.database import get_async_db
+    from backend.services import pagination, read_queries
+    from backend.services.reference_cache import reference_cache
+except ImportError:
+    from database import get_async_db
+    from services import pagination, read_queries
+    from services.reference_cache import reference_cache
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+
+@router.get("/leagues")
+async def get_leagues(db: AsyncSession = Depends(get_async_db)):
+    """Get all available leagues"""
+    result = await db.execute(read_queries.leagues_statement())
+    return result.scalars().all()
+
+
+@router.get("/live-matches")
+async def get_live_matches(
+    db: AsyncSession = Depends(get_async_db),
+    league_id: Optional[int] = Query(None, description="Filter to a specific league id"),
+    status: Optional[str] = Query(
+        None,
+        description=(
+            "Filter by status group: 'live', 'upcoming', 'finished', or a comma-"
+            "separated list of raw codes (e.g. 'FT,AET'). Default returns all."
+        ),
+    ),
+    date_from: Optional[str] = Query(None, description="Inclusive lower bound, YYYY-MM-DD"),
+    date_to: Optional[str] = Query(None, description="Inclusive upper bound, YYYY-MM-DD"),
+    days_back: Optional[int] = Query(None, ge=0, description="Shortcut: include matches from N days ago"),
+    days_forward: Optional[int] = Query(None, ge=0, description="Shortcut: include matches up to N days ahead"),
+    limit: int = Query(30, ge=1, le=200, description="Page size, default 30, max 200"),
+    offset: int = Query(0, ge=0, description="Number of rows to skip for pagination"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort by kickoff: asc or desc"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page; replaces offset"),
+    include_total: bool = Query(True, description="Include `total` (cached per filter for a few seconds)"),
+):
+    """Return matches for the configured leagues, paginated (see the sync handler)."""
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both.")
+    page_statement, total_statement = read_queries.live_matches_statements(
+        league_id, status, date_from, date_to, days_back, days_forward, limit, offset, order, cursor
+    )
+
+    total = None
+    if include_total:
+        total = pagination.totals.get(total_statement)
+        if total is None:
+            total = (await db.execute(total_statement)).scalar_one()
+            pagination.totals.put(total_statement, total)
+    matches, has_more, next_cursor = read_queries.split_match_page(
+        (await db.execute(page_statement)).scalars().all(), limit
+    )
+
+    if not matches:
+        return read_queries.live_matches_page([], total, limit, offset, False, None)
+
+    teams_statement = read_queries.teams_by_id_statement(matches)
+    teams_by_id = {}
+    if teams_statement is not None:
+        teams_by_id = {team.id: team for team in (await db.execute(teams_statement)).scalars()}
+
+    items = [read_queries.live_match_item(match, teams_by_id, match.prediction) for match in matches]
+    return read_queries.live_matches_page(items, total, limit, offset, has_more, next_cursor)
+
+
+@router.get("/match/{match_id}/details")
+async def get_match_details(match_id: int, db: AsyncSession = Depends(get_async_db)):
+    match = (await db.execute(read_queries.match_statement(match_id))).scalars().first()
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+
+    teams = await reference_cache.get_teams_async(db, (match.home_team_id, match.away_team_id))
+    home_players = (await db.execute(read_queries.squad_preview_statement(match.home_team_id))).scalars().all()
+    away_players = (await db.execute(read_queries.squad_preview_statement(match.away_team_id))).scalars().all()
+
+    return read_queries.match_details_payload(
+        match,
+        teams.get(match.home_team_id),
+        teams.get(match.away_team_id),
+        home_players,
+        away_players,
+        match.prediction,
+    )
+
+
+@router.get("/match-events/bulk")
+async def get_match_events_bulk(
+    match_ids: str = Query(..., description="Comma-separated list of match ids, e.g. '538149,538150'"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Bulk-fetch already-stored MatchEvent rows for a set of match ids (see the sync handler)."""
+    unique_ids = read_queries.parse_match_ids(match_ids)
+    if not unique_ids:
+        return {}
+
+    rows = (await db.execute(read_queries.match_events_statement(unique_ids))).scalars().all()
+    return read_queries.group_match_events(unique_ids, rows)
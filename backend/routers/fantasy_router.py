@@ -61,6 +61,7 @@ try:
         validate_squad,
         validate_transfer_batch,
     )
+    from backend.services.reference_cache import reference_cache
 except ImportError:
     from auth import get_current_user
     from database import get_db
@@ -115,6 +116,7 @@ except ImportError:
         validate_squad,
         validate_transfer_batch,
     )
+    from services.reference_cache import reference_cache
 
 router = APIRouter(prefix="/api/v1/fantasy", tags=["fantasy"])
 
@@ -154,8 +156,8 @@ def get_my_teams(
         .all()
     )
 
-    teams = [db.query(Team).filter(Team.id == sel.team_id).first() for sel in selections]
-    return [team for team in teams if team is not None]
+    teams = reference_cache.get_teams(db, (sel.team_id for sel in selections))
+    return [teams[sel.team_id] for sel in selections if sel.team_id in teams]
 
 
 @router.post("/select-teams")
@@ -265,11 +267,8 @@ def get_leaderboard(db: Session = Depends(get_db)):
 
         team_ids = [selection.team_id for selection in selections]
 
-        team_names: List[str] = []
-        for team_id in team_ids:
-            team = db.query(Team).filter(Team.id == team_id).first()
-            if team:
-                team_names.append(team.name)
+        teams = reference_cache.get_teams(db, team_ids)
+        team_names: List[str] = [teams[team_id].name for team_id in team_ids if team_id in teams]
 
         total_points = 0
         for team_id in team_ids:
@@ -691,9 +690,7 @@ def _compute_and_persist_matchday_points(
             )
             captain_player = None
             if captain_player_id:
-                captain_player = (
-                    db.query(Player).filter(Player.id == captain_player_id).first()
-                )
+                captain_player = reference_cache.get_player(db, captain_player_id)
 
             return {
                 "matchday_key": matchday_date,
@@ -831,9 +828,7 @@ def _compute_and_persist_matchday_points(
 
     captain_player = None
     if captain_pick:
-        captain_player = (
-            db.query(Player).filter(Player.id == captain_pick.player_id).first()
-        )
+        captain_player = reference_cache.get_player(db, captain_pick.player_id)
 
     return {
         "matchday_key": matchday_date,
@@ -1330,9 +1325,7 @@ def get_matchday_points(
 
     captain_player = None
     if summary.captain_player_id:
-        captain_player = (
-            db.query(Player).filter(Player.id == summary.captain_player_id).first()
-        )
+        captain_player = reference_cache.get_player(db, summary.captain_player_id)
 
     return {
         "matchday_key": matchday_date,
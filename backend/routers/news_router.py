@@ -5,20 +5,28 @@ from __future__ import annotations
 import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 try:
     from backend.database import get_db
-    from backend.models import League, Match, NewsArticle, Team
+    from backend.models import Match, NewsArticle
+    from backend.services import pagination
+    from backend.services.reference_cache import reference_cache
 except ImportError:
     from database import get_db  # type: ignore[no-redef]
-    from models import League, Match, NewsArticle, Team  # type: ignore[no-redef]
+    from models import Match, NewsArticle  # type: ignore[no-redef]
+    from services import pagination  # type: ignore[no-redef]
+    from services.reference_cache import reference_cache  # type: ignore[no-redef]
 
 
 router = APIRouter(prefix="/api/v1/editorial", tags=["news"])
 
+# Newest first; the cursor of a page is its last article's key.
+PAGE_KEY = (NewsArticle.created_at, NewsArticle.id)
+PAGE_KEY_ATTRS = ("created_at", "id")
+
 
 # ---------------------------------------------------------------------------
 # Schemas
@@ -69,21 +77,10 @@ class NewsArticleFull(NewsArticleSummary):
 
 
 def _to_full(article: NewsArticle, db: Session) -> NewsArticleFull:
-    league = (
-        db.query(League).filter(League.id == article.league_id).one_or_none()
-        if article.league_id
-        else None
-    )
-    home = (
-        db.query(Team).filter(Team.id == article.home_team_id).one_or_none()
-        if article.home_team_id
-        else None
-    )
-    away = (
-        db.query(Team).filter(Team.id == article.away_team_id).one_or_none()
-        if article.away_team_id
-        else None
-    )
+    league = reference_cache.get_league(db, article.league_id)
+    teams = reference_cache.get_teams(db, (article.home_team_id, article.away_team_id))
+    home = teams.get(article.home_team_id)
+    away = teams.get(article.away_team_id)
 
     return NewsArticleFull(
         id=article.id,
@@ -106,34 +103,37 @@ def _to_full(article: NewsArticle, db: Session) -> NewsArticleFull:
 
 @router.get("", response_model=List[NewsArticleFull])
 def list_news(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     news_type: Optional[str] = Query(None, pattern="^(post_match|pre_derby)$"),
     league_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     db: Session = Depends(get_db),
 ):
-    """Return the most recent published articles."""
+    """Return the most recent published articles (older pages via `cursor`)."""
     q = db.query(NewsArticle).filter(NewsArticle.is_published.is_(True))
     if news_type:
         q = q.filter(NewsArticle.news_type == news_type)
     if league_id:
         q = q.filter(NewsArticle.league_id == league_id)
-    rows = q.order_by(NewsArticle.created_at.desc()).limit(limit).all()
+    q = pagination.keyset_page(q, PAGE_KEY, descending=True, cursor=cursor, limit=limit)
+    rows, _has_more, next_cursor = pagination.split_page(q.all(), limit, PAGE_KEY_ATTRS)
+    pagination.set_next_cursor(response, next_cursor)
     return [_to_full(r, db) for r in rows]
 
 
 @router.get("/feed", response_model=List[NewsArticleSummary])
 def news_feed(
+    response: Response,
     limit: int = Query(15, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     db: Session = Depends(get_db),
 ):
     """Slim feed for the top-of-page scrolling bar."""
-    rows = (
-        db.query(NewsArticle)
-        .filter(NewsArticle.is_published.is_(True))
-        .order_by(NewsArticle.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+    q = db.query(NewsArticle).filter(NewsArticle.is_published.is_(True))
+    q = pagination.keyset_page(q, PAGE_KEY, descending=True, cursor=cursor, limit=limit)
+    rows, _has_more, next_cursor = pagination.split_page(q.all(), limit, PAGE_KEY_ATTRS)
+    pagination.set_next_cursor(response, next_cursor)
     return [
         NewsArticleSummary(
             id=r.id,
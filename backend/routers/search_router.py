@@ -4,10 +4,12 @@ from typing import List, Optional
 
 try:
     from backend.database import get_db
-    from backend.models import Team, Player, League
+    from backend.models import Team, Player
+    from backend.services.reference_cache import reference_cache
 except ImportError:
     from database import get_db
-    from models import Team, Player, League
+    from models import Team, Player
+    from services.reference_cache import reference_cache
 
 router = APIRouter(prefix="/api/v1/search", tags=["search"])
 
@@ -30,9 +32,10 @@ def search_teams(
     teams = query.limit(20).all()
     
     # Enrich with league information
+    leagues = reference_cache.get_leagues(db, (team.league_id for team in teams))
     results = []
     for team in teams:
-        league = db.query(League).filter(League.id == team.league_id).first()
+        league = leagues.get(team.league_id)
         results.append({
             "id": team.id,
             "name": team.name,
@@ -71,9 +74,10 @@ def search_players(
     players = query.limit(20).all()
     
     # Enrich with team information
+    teams = reference_cache.get_teams(db, (player.team_id for player in players))
     results = []
     for player in players:
-        team = db.query(Team).filter(Team.id == player.team_id).first()
+        team = teams.get(player.team_id)
         results.append({
             "id": player.id,
             "name": player.name,
@@ -98,9 +102,10 @@ def search_all(
  
     # Search teams
     teams_query = db.query(Team).filter(Team.name.ilike(f"%{q}%")).limit(5).all()
+    leagues = reference_cache.get_leagues(db, (team.league_id for team in teams_query))
     teams_results = []
     for team in teams_query:
-        league = db.query(League).filter(League.id == team.league_id).first()
+        league = leagues.get(team.league_id)
         teams_results.append({
             "id": team.id,
             "name": team.name,
@@ -116,9 +121,10 @@ def search_all(
     
     # Search players
     players_query = db.query(Player).filter(Player.name.ilike(f"%{q}%")).limit(5).all()
+    player_teams = reference_cache.get_teams(db, (player.team_id for player in players_query))
     players_results = []
     for player in players_query:
-        team = db.query(Team).filter(Team.id == player.team_id).first()
+        team = player_teams.get(player.team_id)
         players_results.append({
             "id": player.id,
             "name": player.name,
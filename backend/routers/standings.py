@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from typing import List
@@ -10,9 +10,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from backend.database import get_db
     from backend.models import Match, Team, League
+    from backend.services import league_tables
 except ImportError:
     from database import get_db
     from models import Match, Team, League
+    from services import league_tables
 
 from pydantic import BaseModel
 from typing import Optional
@@ -37,8 +39,34 @@ class TeamStanding(BaseModel):
         from_attributes = True
 
 @router.get("/league/{league_id}/standings", response_model=List[TeamStanding])
-def get_league_standings(league_id: int, db: Session = Depends(get_db)):
-    """Calculate and return league standings"""
+def get_league_standings(
+    league_id: int,
+    live: bool = Query(False, description="Apply in-play scores as if they were final"),
+    db: Session = Depends(get_db),
+):
+    """Return league standings, from the materialized table when it has the league"""
+    rows = league_tables.stored_league_table(db, league_id)
+    if rows is not None:
+        if live:
+            rows = league_tables.with_live_results(db, league_id, rows)
+        return [
+            TeamStanding(
+                position=position,
+                team_id=row["team_id"],
+                team_name=row["team_name"],
+                played=row["played"],
+                won=row["won"],
+                drawn=row["drawn"],
+                lost=row["lost"],
+                goals_for=row["goals_for"],
+                goals_against=row["goals_against"],
+                goal_difference=row["goal_difference"],
+                points=row["points"],
+                form=row["form"],
+            )
+            for position, row in enumerate(league_tables.sort_table(rows), start=1)
+        ]
+
     season_window_start = datetime.datetime.utcnow() - datetime.timedelta(days=365)
     
     # Get all teams in the league
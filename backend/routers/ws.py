@@ -4,47 +4,168 @@ Clients open a single connection to `/ws/live` and receive JSON payloads
 of the form:
 
     {
-        "type": "match_update",
-        "data": {
-            "match_id": <int>,
-            "status": <str>,           # NS / LIVE / HT / FT / ...
-            "home_score": <int|null>,
-            "away_score": <int|null>,
-            "current_minute": <int|null>
-        }
+        "type": "match_updates",
+        "data": [
+            {
+                "match_id": <int>,
+                "league_id": <int|null>,
+                "status": <str>,           # NS / LIVE / HT / FT / ...
+                "home_score": <int|null>,
+                "away_score": <int|null>,
+                "current_minute": <int|null>,
+                "xg": {"home": <float>, "away": <float>, "minute": <int>},
+                "seq": <int>
+            },
+            ...
+        ]
     }
 
+Each frame carries the latest state of every subscribed match that
+changed during one broadcaster tick. `xg` (current live xG, the same
+numbers as `/match/{id}/xg/live`) is only present for in-play and
+just-finished Top 5 league / UCL matches.
+
+Subscriptions
+-------------
+Each connection is subscribed to a set of topics: `all`, `match:<id>` or
+`league:<id>`. Initial topics can be passed on the URL
+(`/ws/live?match_id=12&league_id=2021`); without any, the connection is
+subscribed to `all` so older clients keep receiving the whole slate.
+
+Clients change their subscriptions with inbound frames:
+
+    {"action": "subscribe",   "match_ids": [12], "league_ids": [2021], "all": false}
+    {"action": "unsubscribe", "match_ids": [12], "all": true}
+
+and get the resulting topic set back as
+`{"type": "subscriptions", "data": {"topics": [...]}}`.
+
+Every match payload carries a per-match `seq` that increases by one per
+broadcast state change. A client that sees a gap sends
+`{"action": "resync", "match_ids": [12]}` and receives
+`{"type": "match_snapshot", "data": [<latest payload>, ...]}`; matches
+this worker hasn't broadcast yet are omitted (fall back to the REST API).
+
 The actual fan-out is driven by `services.live_broadcaster`, which
 consumes updates emitted by APScheduler jobs after each provider sync.
-This handler is intentionally minimal: accept the connection, keep it
-open, and let the broadcaster push messages.
+Sends never happen on the broadcaster's path: each connection has its
+own bounded queue drained by a writer task (see `ConnectionManager`),
+and `/ws/stats` reports queue depths and slow-consumer evictions.
 """
 
 import asyncio
+import json
 import logging
+from typing import List, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 try:
-    from backend.connection_manager import manager
+    from backend.connection_manager import ALL_TOPIC, league_topic, manager, match_topic
+    from backend.services import live_broadcaster
 except ImportError:
-    from connection_manager import manager
+    from connection_manager import ALL_TOPIC, league_topic, manager, match_topic
+    from services import live_broadcaster
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+SUBSCRIPTION_ACTIONS = {"subscribe", "unsubscribe"}
+RESYNC_ACTION = "resync"
+
+
+def _parse_id_list(raw) -> List[int]:
+    """Accept `12`, `"12,13"` or `[12, "13"]`; silently skip junk."""
+    if raw is None:
+        return []
+    if isinstance(raw, (list, tuple)):
+        values = raw
+    else:
+        values = str(raw).split(",")
+
+    ids = []
+    for value in values:
+        try:
+            ids.append(int(str(value).strip()))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def _topics_from_spec(match_ids, league_ids, include_all: bool) -> List[str]:
+    topics = [match_topic(match_id) for match_id in _parse_id_list(match_ids)]
+    topics.extend(league_topic(league_id) for league_id in _parse_id_list(league_ids))
+    if include_all:
+        topics.append(ALL_TOPIC)
+    return topics
+
+
+def _initial_topics(websocket: WebSocket) -> Optional[List[str]]:
+    params = websocket.query_params
+    match_ids = ",".join(params.getlist("match_id")) or None
+    league_ids = ",".join(params.getlist("league_id")) or None
+    include_all = (params.get("all") or "").strip().lower() in {"1", "true", "yes"}
+
+    if match_ids is None and league_ids is None and not include_all:
+        return None
+    return _topics_from_spec(match_ids, league_ids, include_all)
+
+
+def _subscriptions_message(topics) -> str:
+    return json.dumps({"type": "subscriptions", "data": {"topics": sorted(topics)}})
+
+
+def _error_message(message: str) -> str:
+    return json.dumps({"type": "error", "data": {"message": message}})
+
+
+def _handle_client_message(websocket: WebSocket, raw: str) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        manager.send_personal(websocket, _error_message("Invalid JSON"))
+        return
+
+    action = message.get("action") if isinstance(message, dict) else None
+    if action == RESYNC_ACTION:
+        match_ids = _parse_id_list(message.get("match_ids", message.get("match_id")))
+        manager.send_personal(
+            websocket,
+            json.dumps({"type": "match_snapshot", "data": live_broadcaster.snapshot(match_ids)}),
+        )
+        return
+    if action not in SUBSCRIPTION_ACTIONS:
+        manager.send_personal(websocket, _error_message(f"Unknown action: {action!r}"))
+        return
+
+    topics = _topics_from_spec(
+        message.get("match_ids", message.get("match_id")),
+        message.get("league_ids", message.get("league_id")),
+        bool(message.get("all")),
+    )
+    if action == "subscribe":
+        current = manager.subscribe(websocket, topics)
+    else:
+        current = manager.unsubscribe(websocket, topics)
+
+    manager.send_personal(websocket, _subscriptions_message(current))
+
+
+@router.get("/ws/stats")
+def get_live_channel_stats():
+    """Connection, queue-depth and eviction metrics for `/ws/live`."""
+    return manager.stats()
+
 
 @router.websocket("/ws/live")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    await manager.connect(websocket, _initial_topics(websocket))
     try:
-        # We don't expect inbound traffic on this channel today, but we
-        # still need to await something so the connection stays open.
         # `receive_text()` raises WebSocketDisconnect on close, which is
         # exactly the signal we want.
         while True:
             try:
-                await websocket.receive_text()
+                raw = await websocket.receive_text()
             except WebSocketDisconnect:
                 raise
             except asyncio.CancelledError:
@@ -52,6 +173,8 @@ async def websocket_endpoint(websocket: WebSocket):
             except Exception:
                 logger.exception("Unexpected error on /ws/live receive loop")
                 break
+
+            _handle_client_message(websocket, raw)
     except WebSocketDisconnect:
         pass
     finally:
@@ -1,10 +1,15 @@
+import collections
 import logging
 import os
 import datetime
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Set
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import event, insert as sa_insert, or_, select, update as sa_update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 try:
     from backend.database import SessionLocal
     from backend.services.football_data_org import (
@@ -16,6 +21,14 @@ try:
     from backend.generate_predictions import generate_predictions
     from backend.services.news_triggers import run_post_match_news, run_pre_derby_news
     from backend.services.live_broadcaster import enqueue_match_updates
+    from backend.services.reference_cache import note_reference_writes
+    from backend.services.response_cache import bump_data_version
+    from backend.services.league_tables import MATCH_COLUMNS as TABLE_COLUMNS, refresh_league_tables
+    from backend.services.team_matches import sync_team_matches
+    from backend.ai.team_form_store import FINISHED_STATUSES, naive_utc, note_form_change, refresh_team_form
+    from backend.ai.elo_updater import refresh_elo
+    from backend.ai.xg_model import xg_inference_service
+    from backend.ai.tournament_simulator import KNOCKOUT_ROUNDS, refresh_tournament_projections
 except ImportError:
     from database import SessionLocal
     from services.football_data_org import (
@@ -27,6 +40,14 @@ except ImportError:
     from generate_predictions import generate_predictions
     from services.news_triggers import run_post_match_news, run_pre_derby_news
     from services.live_broadcaster import enqueue_match_updates
+    from services.reference_cache import note_reference_writes
+    from services.response_cache import bump_data_version
+    from services.league_tables import MATCH_COLUMNS as TABLE_COLUMNS, refresh_league_tables
+    from services.team_matches import sync_team_matches
+    from ai.team_form_store import FINISHED_STATUSES, naive_utc, note_form_change, refresh_team_form
+    from ai.elo_updater import refresh_elo
+    from ai.xg_model import xg_inference_service
+    from ai.tournament_simulator import KNOCKOUT_ROUNDS, refresh_tournament_projections
 import pytz
 
 # Configure logging
@@ -38,6 +59,8 @@ COMPETITIONS_TO_REFRESH = [
     for code in os.getenv("FOOTBALL_DATA_COMPETITIONS", "PL,PD,BL1,SA,FL1,WC").split(",")
     if code.strip()
 ]
+# How often `refresh_derived_data` picks up the results the syncs committed.
+DERIVED_DATA_REFRESH_SECONDS = int(os.getenv("DERIVED_DATA_REFRESH_SECONDS", "60"))
 
 
 def _parse_fixture_datetime(raw_date: str) -> datetime.datetime:
@@ -49,51 +72,136 @@ def _parse_fixture_datetime(raw_date: str) -> datetime.datetime:
         return datetime.datetime.now(tz=pytz.UTC)
 
 
-def _upsert_league(db, league_data):
-    league = db.query(League).filter(League.id == league_data["id"]).first()
+# Rows per INSERT ... ON CONFLICT statement and per prefetch ``IN`` list;
+# keeps the bind-parameter count well under the Postgres limit for a full
+# season of fixtures.
+_UPSERT_BATCH_SIZE = 1000
 
-    if not league:
-        league = League(
-            id=league_data["id"],
-            name=league_data.get("name") or f"League {league_data['id']}",
-            country="Unknown",
-            logo_url=""
-        )
-        db.add(league)
-        return league
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Columns written on insert, and the subset a sync may change afterwards.
+_LEAGUE_COLUMNS = ("name", "country", "logo_url")
+_LEAGUE_UPDATE_COLUMNS = ("name",)
+_TEAM_COLUMNS = ("name", "logo_url", "stadium", "league_id")
+_TEAM_UPDATE_COLUMNS = ("name", "logo_url", "league_id")
+_MATCH_COLUMNS = (
+    "home_team_id", "away_team_id", "league_id", "start_time", "status",
+    "home_score", "away_score", "current_minute", "stage", "group_name",
+)
+
+
+def _chunks(items: List, size: int = _UPSERT_BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
-    if league_data.get("name") and league.name != league_data["name"]:
-        league.name = league_data["name"]
 
-    return league
+def _prefetch_rows(db, model, columns, ids) -> Dict[int, Dict[str, object]]:
+    """Current `columns` of the `ids` rows of `model` that exist, one ``IN`` query per batch."""
+    rows: Dict[int, Dict[str, object]] = {}
+    table_columns = [model.id] + [getattr(model, column) for column in columns]
+    for chunk in _chunks(sorted(ids)):
+        for row in db.execute(select(*table_columns).where(model.id.in_(chunk))):
+            rows[row[0]] = dict(zip(("id",) + tuple(columns), row))
+    return rows
 
 
-def _upsert_team(db, team_data, league_id: int):
-    team = db.query(Team).filter(Team.id == team_data["id"]).first()
+def _upsert_rows(db, model, new_rows: List[Dict], changed_rows: List[Dict], update_columns) -> None:
+    """Write new and changed rows in one ``INSERT ... ON CONFLICT (id) DO UPDATE`` per batch.
 
-    if not team:
-        team = Team(
-            id=team_data["id"],
-            name=team_data.get("name") or f"Team {team_data['id']}",
-            logo_url=team_data.get("logo") or "",
-            stadium="Unknown",
-            league_id=league_id
+    The ``WHERE`` skips rows another writer already brought to the same
+    values. Dialects without ``ON CONFLICT`` get a bulk insert plus a bulk
+    update by primary key.
+    """
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        if new_rows:
+            db.execute(sa_insert(model), new_rows)
+        if changed_rows:
+            db.execute(sa_update(model), [
+                {"id": row["id"], **{column: row[column] for column in update_columns}} for row in changed_rows
+            ])
+        return
+
+    for chunk in _chunks(new_rows + changed_rows):
+        statement = insert(model).values(chunk)
+        statement = statement.on_conflict_do_update(
+            index_elements=[model.id],
+            set_={column: statement.excluded[column] for column in update_columns},
+            where=or_(*[
+                getattr(model, column).is_distinct_from(statement.excluded[column]) for column in update_columns
+            ]),
         )
-        db.add(team)
-        return team
+        db.execute(statement)
+
+
+def _upsert_leagues(db, leagues_data: List[Dict]) -> None:
+    """Create missing leagues and apply renames, one league per fixture in feed order."""
+    existing = _prefetch_rows(db, League, _LEAGUE_COLUMNS, {league_data["id"] for league_data in leagues_data})
+    new_rows: Dict[int, Dict] = {}
+    changed_rows: Dict[int, Dict] = {}
+
+    for league_data in leagues_data:
+        league = existing.get(league_data["id"])
+        if league is None:
+            league = {
+                "id": league_data["id"],
+                "name": league_data.get("name") or f"League {league_data['id']}",
+                "country": "Unknown",
+                "logo_url": "",
+            }
+            existing[league["id"]] = new_rows[league["id"]] = league
+            continue
 
-    if team_data.get("name"):
-        team.name = team_data["name"]
-    if team_data.get("logo"):
-        team.logo_url = team_data["logo"]
-    if team.league_id != league_id:
-        team.league_id = league_id
+        if league_data.get("name") and league["name"] != league_data["name"]:
+            league["name"] = league_data["name"]
+            if league["id"] not in new_rows:
+                changed_rows[league["id"]] = league
+
+    _upsert_rows(db, League, list(new_rows.values()), list(changed_rows.values()), _LEAGUE_UPDATE_COLUMNS)
+    note_reference_writes(db, "league", list(new_rows) + list(changed_rows))
+
+
+def _upsert_teams(db, teams_data: List[tuple]) -> None:
+    """Create missing teams and apply name/crest/league changes from `(team_data, league_id)` pairs."""
+    existing = _prefetch_rows(db, Team, _TEAM_COLUMNS, {team_data["id"] for team_data, _league_id in teams_data})
+    new_rows: Dict[int, Dict] = {}
+    changed_rows: Dict[int, Dict] = {}
+
+    for team_data, league_id in teams_data:
+        team = existing.get(team_data["id"])
+        if team is None:
+            team = {
+                "id": team_data["id"],
+                "name": team_data.get("name") or f"Team {team_data['id']}",
+                "logo_url": team_data.get("logo") or "",
+                "stadium": "Unknown",
+                "league_id": league_id,
+            }
+            existing[team["id"]] = new_rows[team["id"]] = team
+            continue
+
+        before = tuple(team[column] for column in _TEAM_UPDATE_COLUMNS)
+        if team_data.get("name"):
+            team["name"] = team_data["name"]
+        if team_data.get("logo"):
+            team["logo_url"] = team_data["logo"]
+        team["league_id"] = league_id
+        if team["id"] not in new_rows and tuple(team[column] for column in _TEAM_UPDATE_COLUMNS) != before:
+            changed_rows[team["id"]] = team
 
-    return team
+    _upsert_rows(db, Team, list(new_rows.values()), list(changed_rows.values()), _TEAM_UPDATE_COLUMNS)
+    note_reference_writes(db, "team", list(new_rows) + list(changed_rows))
 
 
 LIVE_STATUSES = {"LIVE", "HT", "ET", "P", "1H", "2H"}
 
+KNOCKOUT_STAGES = {stage for stage, _name, _size in KNOCKOUT_ROUNDS}
+
+
+def _affects_bracket(stage: Optional[str], group_name: Optional[str]) -> bool:
+    """Whether a match feeds a tournament projection (group or knockout tie)."""
+    return group_name is not None or stage in KNOCKOUT_STAGES
+
 
 def _derive_live_minute(start_time: datetime.datetime) -> Optional[int]:
     """
@@ -112,25 +220,203 @@ def _derive_live_minute(start_time: datetime.datetime) -> Optional[int]:
     return max(1, min(elapsed, 120))
 
 
+def _broadcast_payload(match_id, league_id, status, goals, current_minute) -> Dict[str, object]:
+    return {
+        "match_id": match_id,
+        "league_id": league_id,
+        "status": status,
+        "home_score": goals["home"],
+        "away_score": goals["away"],
+        "current_minute": current_minute,
+    }
+
+
+# Last state actually pushed to WebSocket clients, keyed by match id, plus
+# a per-match sequence number. Every sync re-reads the whole live window,
+# so without this each quiet minute of every live match would be sent
+# again; only payloads whose visible state differs go out, and `seq` lets
+# clients spot a missed update and resync. Kept as an LRU of the
+# ``LIVE_BROADCAST_STATE_MAX`` most recently broadcast matches: finished
+# matches drop out of the sync window and are evicted in turn.
+_BROADCAST_STATE_FIELDS = ("status", "home_score", "away_score", "current_minute", "xg")
+_BROADCAST_STATE_MAX = int(os.getenv("LIVE_BROADCAST_STATE_MAX", "2048"))
+# match_id -> (last broadcast state, seq)
+_last_broadcast_state: "collections.OrderedDict[int, tuple]" = collections.OrderedDict()
+_broadcast_state_lock = threading.Lock()
+
+
+def _select_changed_broadcasts(payloads: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Drop payloads identical to the last broadcast and stamp `seq` on the rest."""
+    changed: List[Dict[str, object]] = []
+    with _broadcast_state_lock:
+        for payload in payloads:
+            match_id = payload["match_id"]
+            state = tuple(payload.get(field) for field in _BROADCAST_STATE_FIELDS)
+            last_state, seq = _last_broadcast_state.get(match_id, (None, 0))
+            _last_broadcast_state[match_id] = (state, seq if last_state == state else seq + 1)
+            _last_broadcast_state.move_to_end(match_id)
+            if last_state != state:
+                changed.append({**payload, "seq": seq + 1})
+        while len(_last_broadcast_state) > _BROADCAST_STATE_MAX:
+            _last_broadcast_state.popitem(last=False)
+    return changed
+
+
+def _attach_live_xg(db, payloads: List[Dict[str, object]]) -> None:
+    """Add the current live xG (`{"home", "away", "minute"}`) to in-play and
+    just-finished payloads of supported matches.
+
+    Computed once per sync from the shared per-match state in
+    `ai.xg_model`, so every WebSocket viewer gets it without polling
+    `/match/{id}/xg/live`.
+    """
+    match_ids = {
+        payload["match_id"]
+        for payload in payloads
+        if payload.get("status") in LIVE_STATUSES or payload.get("status") in FINISHED_STATUSES
+    }
+    if not match_ids:
+        return
+    matches = db.query(Match).filter(Match.id.in_(match_ids)).all()
+    summaries = xg_inference_service.live_summaries(db, matches)
+    for payload in payloads:
+        summary = summaries.get(payload["match_id"])
+        if summary is not None:
+            payload["xg"] = summary
+
+
+# Derived data a committed sync made stale, recomputed by
+# `refresh_derived_data` in its own session so the sync transaction (and
+# its pooled connection) is not held for the Elo replay or the simulations.
+# A session's changes are queued when it commits and dropped when it rolls
+# back.
+_DERIVED_CHANGES_KEY = "derived_changes"
+_derived_changes_lock = threading.Lock()
+# team_id -> earliest kickoff whose result was added, changed or removed.
+_stale_form: Dict[int, datetime.datetime] = {}
+_stale_tournaments: Set[int] = set()
+
+
+def _merge_form_changes(target: Dict[int, datetime.datetime], changes: Dict[int, datetime.datetime]) -> None:
+    for team_id, since in changes.items():
+        note_form_change(target, (team_id,), since)
+
+
+def _note_derived_changes(db, form_changes: Dict[int, datetime.datetime], tournament_changes: Set[int]) -> None:
+    """Queue derived-data refreshes for when `db` commits."""
+    if not form_changes and not tournament_changes:
+        return
+    if not event.contains(db, "after_commit", _queue_derived_changes):
+        event.listen(db, "after_commit", _queue_derived_changes)
+        event.listen(db, "after_rollback", _discard_derived_changes)
+    pending = db.info.setdefault(_DERIVED_CHANGES_KEY, {"form": {}, "tournaments": set()})
+    _merge_form_changes(pending["form"], form_changes)
+    pending["tournaments"].update(tournament_changes)
+
+
+def _queue_derived_changes(db) -> None:
+    pending = db.info.pop(_DERIVED_CHANGES_KEY, None)
+    if pending:
+        with _derived_changes_lock:
+            _merge_form_changes(_stale_form, pending["form"])
+            _stale_tournaments.update(pending["tournaments"])
+
+
+def _discard_derived_changes(db) -> None:
+    db.info.pop(_DERIVED_CHANGES_KEY, None)
+
+
+def refresh_derived_data():
+    """Recompute what the committed syncs since the last run made stale.
+
+    Runs as its own scheduler job, in a fresh session: Elo and team form
+    first (form snapshots carry the ratings, and the ratings price the
+    knockout ties), committed, then the bracket odds of each tournament
+    with a changed result. A step that fails is queued again for the next
+    run.
+    """
+    with _derived_changes_lock:
+        form_changes = dict(_stale_form)
+        tournaments = set(_stale_tournaments)
+        _stale_form.clear()
+        _stale_tournaments.clear()
+    if not form_changes and not tournaments:
+        return
+
+    db = SessionLocal()
+    try:
+        if form_changes:
+            try:
+                # A late or corrected result moves the ratings of later
+                # opponents too.
+                elo_changes = refresh_elo(db, min(form_changes.values()))
+                for team_id, since in elo_changes.items():
+                    note_form_change(form_changes, (team_id,), since)
+                refresh_team_form(db, form_changes)
+                bump_data_version(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with _derived_changes_lock:
+                    _merge_form_changes(_stale_form, form_changes)
+                logger.exception("Failed to refresh Elo and team form for %s teams", len(form_changes))
+
+        if tournaments:
+            try:
+                refresh_tournament_projections(db, tournaments)
+                bump_data_version(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with _derived_changes_lock:
+                    _stale_tournaments.update(tournaments)
+                logger.exception("Failed to refresh tournament projections %s", sorted(tournaments))
+    finally:
+        db.close()
+
+
 def _persist_matches(db, matches_data):
+    """Upsert a batch of provider fixtures, plus their leagues and teams.
+
+    Existing rows are prefetched with one ``IN`` query per table, the
+    changes are worked out in memory (fixture by fixture, in feed order, so
+    a fixture listed twice behaves as two consecutive syncs), and only new
+    or changed rows are written, with one ``INSERT ... ON CONFLICT``
+    statement per table and batch. A full-season sync that changes nothing
+    costs three SELECTs. Elo, team form and tournament projections are left
+    to `refresh_derived_data`, after the caller commits.
+    """
     scanned_count = len(matches_data)
     inserted_count = 0
     updated_count = 0
+    results_changed = False
+    # team_id -> earliest kickoff whose result was added, changed or removed.
+    form_changes: Dict[int, datetime.datetime] = {}
+    # Tournaments whose projected bracket odds a change invalidates.
+    tournament_changes: Set[int] = set()
+    # match_id -> its table-relevant state before this batch (None if new).
+    table_baselines: Dict[int, Optional[Dict[str, object]]] = {}
     broadcast_payloads: List[Dict[str, object]] = []
 
-    for match_data in matches_data:
-        parsed = parse_match_from_fd(match_data)
+    parsed_matches = [parse_match_from_fd(match_data) for match_data in matches_data]
+    _upsert_leagues(db, [parsed["league"] for parsed in parsed_matches])
+    _upsert_teams(db, [
+        (parsed["teams"][side], parsed["league"]["id"]) for parsed in parsed_matches for side in ("home", "away")
+    ])
+
+    existing_matches = _prefetch_rows(db, Match, _MATCH_COLUMNS, {parsed["fixture"]["id"] for parsed in parsed_matches})
+    new_rows: Dict[int, Dict[str, object]] = {}
+    changed_rows: Dict[int, Dict[str, object]] = {}
 
+    for parsed in parsed_matches:
         fixture = parsed["fixture"]
         goals = parsed["goals"]
         teams = parsed["teams"]
-        league_data = parsed["league"]
-
-        league = _upsert_league(db, league_data)
-        _upsert_team(db, teams["home"], league.id)
-        _upsert_team(db, teams["away"], league.id)
+        league_id = parsed["league"]["id"]
 
-        start_time = _parse_fixture_datetime(fixture["date"])
+        # Stored kickoffs are naive UTC: compared as such, an unchanged
+        # kickoff is not a change.
+        start_time = naive_utc(_parse_fixture_datetime(fixture["date"]))
         status = fixture["status"]["short"]
         provider_minute = fixture.get("minute")
 
@@ -143,94 +429,112 @@ def _persist_matches(db, matches_data):
         else:
             current_minute = None
 
-        existing_match = db.query(Match).filter(Match.id == fixture["id"]).first()
+        existing_match = existing_matches.get(fixture["id"])
 
         if not existing_match:
-            db.add(
-                Match(
-                    id=fixture["id"],
-                    home_team_id=teams["home"]["id"],
-                    away_team_id=teams["away"]["id"],
-                    league_id=league.id,
-                    start_time=start_time,
-                    status=status,
-                    home_score=goals["home"],
-                    away_score=goals["away"],
-                    current_minute=current_minute,
-                    stage=fixture.get("stage"),
-                    group_name=fixture.get("group_name"),
-                )
-            )
+            existing_matches[fixture["id"]] = new_rows[fixture["id"]] = {
+                "id": fixture["id"],
+                "home_team_id": teams["home"]["id"],
+                "away_team_id": teams["away"]["id"],
+                "league_id": league_id,
+                "start_time": start_time,
+                "status": status,
+                "home_score": goals["home"],
+                "away_score": goals["away"],
+                "current_minute": current_minute,
+                "stage": fixture.get("stage"),
+                "group_name": fixture.get("group_name"),
+            }
+            table_baselines[fixture["id"]] = None
             inserted_count += 1
+            results_changed = True
+            if status in FINISHED_STATUSES:
+                note_form_change(form_changes, (teams["home"]["id"], teams["away"]["id"]), start_time)
+            if _affects_bracket(fixture.get("stage"), fixture.get("group_name")):
+                tournament_changes.add(league_id)
             if status in LIVE_STATUSES:
                 broadcast_payloads.append(
-                    {
-                        "match_id": fixture["id"],
-                        "status": status,
-                        "home_score": goals["home"],
-                        "away_score": goals["away"],
-                        "current_minute": current_minute,
-                    }
+                    _broadcast_payload(fixture["id"], league_id, status, goals, current_minute)
                 )
             continue
 
         changed = False
         score_or_status_changed = False
-
-        if existing_match.league_id != league.id:
-            existing_match.league_id = league.id
-            changed = True
-        if existing_match.home_team_id != teams["home"]["id"]:
-            existing_match.home_team_id = teams["home"]["id"]
-            changed = True
-        if existing_match.away_team_id != teams["away"]["id"]:
-            existing_match.away_team_id = teams["away"]["id"]
-            changed = True
-        if existing_match.start_time != start_time:
-            existing_match.start_time = start_time
-            changed = True
-        if existing_match.status != status:
-            existing_match.status = status
-            changed = True
-            score_or_status_changed = True
-        if existing_match.home_score != goals["home"]:
-            existing_match.home_score = goals["home"]
-            changed = True
-            score_or_status_changed = True
-        if existing_match.away_score != goals["away"]:
-            existing_match.away_score = goals["away"]
-            changed = True
-            score_or_status_changed = True
-        if existing_match.current_minute != current_minute:
-            existing_match.current_minute = current_minute
-            changed = True
-
+        was_finished = existing_match["status"] in FINISHED_STATUSES
+        previous_teams = (existing_match["home_team_id"], existing_match["away_team_id"])
+        previous_start_time = existing_match["start_time"]
+        previous_table_state = {column: existing_match[column] for column in TABLE_COLUMNS}
+
+        updates = {
+            "league_id": league_id,
+            "home_team_id": teams["home"]["id"],
+            "away_team_id": teams["away"]["id"],
+            "start_time": start_time,
+            "status": status,
+            "home_score": goals["home"],
+            "away_score": goals["away"],
+            "current_minute": current_minute,
+        }
         # Tournament metadata (stage / group) — update if provided
-        new_stage = fixture.get("stage")
-        new_group = fixture.get("group_name")
-        if new_stage and existing_match.stage != new_stage:
-            existing_match.stage = new_stage
-            changed = True
-        if new_group and existing_match.group_name != new_group:
-            existing_match.group_name = new_group
-            changed = True
+        if fixture.get("stage"):
+            updates["stage"] = fixture["stage"]
+        if fixture.get("group_name"):
+            updates["group_name"] = fixture["group_name"]
+
+        for column, value in updates.items():
+            current = existing_match[column]
+            if column == "start_time" and current is not None:
+                current = naive_utc(current)
+            if current != value:
+                existing_match[column] = value
+                changed = True
+                if column in ("status", "home_score", "away_score"):
+                    score_or_status_changed = True
 
         if changed:
+            table_baselines.setdefault(fixture["id"], previous_table_state)
             updated_count += 1
+            if fixture["id"] not in new_rows:
+                changed_rows[fixture["id"]] = existing_match
+        if score_or_status_changed:
+            results_changed = True
+
+        current_teams = (existing_match["home_team_id"], existing_match["away_team_id"])
+        if (was_finished or status in FINISHED_STATUSES) and (
+            score_or_status_changed
+            or current_teams != previous_teams
+            or previous_start_time is None
+            or start_time != naive_utc(previous_start_time)
+        ):
+            note_form_change(form_changes, previous_teams + current_teams, previous_start_time, start_time)
+            if _affects_bracket(existing_match["stage"], existing_match["group_name"]):
+                tournament_changes.add(league_id)
+        elif current_teams != previous_teams and existing_match["stage"] in KNOCKOUT_STAGES:
+            # The draw or a result elsewhere filled in a knockout tie.
+            tournament_changes.add(league_id)
 
         # Push any update for currently-live matches (so the timer ticks),
         # plus any state transition (kickoff, goal, FT) regardless of liveness.
         if status in LIVE_STATUSES or score_or_status_changed:
             broadcast_payloads.append(
-                {
-                    "match_id": fixture["id"],
-                    "status": status,
-                    "home_score": goals["home"],
-                    "away_score": goals["away"],
-                    "current_minute": current_minute,
-                }
+                _broadcast_payload(fixture["id"], league_id, status, goals, current_minute)
             )
 
+    _upsert_rows(db, Match, list(new_rows.values()), list(changed_rows.values()), _MATCH_COLUMNS)
+    sync_team_matches(db, list(new_rows.values()) + list(changed_rows.values()))
+
+    if table_baselines:
+        refresh_league_tables(
+            db, [(previous, existing_matches[match_id]) for match_id, previous in table_baselines.items()]
+        )
+
+    _note_derived_changes(db, form_changes, tournament_changes)
+
+    if results_changed or tournament_changes:
+        # Same transaction as the writes: cached standings/statistics go
+        # stale exactly when the new results become visible.
+        bump_data_version(db)
+
     return scanned_count, inserted_count, updated_count, broadcast_payloads
 
 
@@ -294,12 +598,23 @@ def update_live_matches():
             total_updated
         )
 
-        if aggregated_broadcasts:
+        try:
+            _attach_live_xg(db, aggregated_broadcasts)
+        except Exception:
+            # Live xG is extra: never let it hold back the score updates.
+            db.rollback()
+            logger.exception("Failed to compute live xG for broadcasts")
+
+        # Filter here rather than inside `_persist_matches` so only payloads
+        # that are really handed to the broadcaster update the delta cache
+        # (the full-season sync discards its payloads).
+        changed_broadcasts = _select_changed_broadcasts(aggregated_broadcasts)
+        if changed_broadcasts:
             try:
-                enqueue_match_updates(aggregated_broadcasts)
+                enqueue_match_updates(changed_broadcasts)
             except Exception:
                 # Broadcast best-effort: never let a WS issue break the sync.
-                logger.exception("Failed to enqueue %s live updates", len(aggregated_broadcasts))
+                logger.exception("Failed to enqueue %s live updates", len(changed_broadcasts))
     except Exception:
         db.rollback()
         logger.exception("Error updating live matches")
@@ -477,6 +792,10 @@ def enrich_wc_match_stats():
                 fouls_home=_stat_val(home_stats, "Fouls"),
                 fouls_away=_stat_val(away_stats, "Fouls"),
             ))
+            # Shot/possession/corner averages in the team form store include this match.
+            since_by_team: Dict[int, datetime.datetime] = {}
+            note_form_change(since_by_team, (match.home_team_id, match.away_team_id), match.start_time)
+            refresh_team_form(db, since_by_team)
             db.commit()
             logger.info("WC enrichment: stats saved for match %d", match.id)
 
@@ -543,6 +862,14 @@ def start_scheduler():
         next_run_time=datetime.datetime.now(tz=pytz.UTC) + datetime.timedelta(seconds=10),
     )
     
+    scheduler.add_job(
+        refresh_derived_data,
+        trigger=IntervalTrigger(seconds=DERIVED_DATA_REFRESH_SECONDS),
+        id='refresh_derived_data',
+        name='Refresh Derived Data',
+        replace_existing=True,
+    )
+
     scheduler.add_job(
         run_predictions,
         trigger=IntervalTrigger(hours=1),
@@ -0,0 +1,15 @@
+-- Per-scope data version counters. The scheduler bumps `matches` whenever
+-- it persists a new fixture or a score/status change; API workers compare
+-- it against the version their cached responses were computed at.
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    name        VARCHAR PRIMARY KEY,
+    version     INTEGER NOT NULL DEFAULT 0,
+    updated_at  TIMESTAMP
+);
+
+INSERT INTO data_versions (name, version, updated_at)
+VALUES ('matches', 0, NOW())
+ON CONFLICT (name) DO NOTHING;
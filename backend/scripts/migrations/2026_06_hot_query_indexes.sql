@@ -0,0 +1,46 @@
+-- Composite and partial indexes for the hot query shapes catalogued in
+-- `backend/scripts/query_plans.py` (live / upcoming / finished listings,
+-- league fixtures, match timelines, standings lookups, a team's latest Elo
+-- and squad reads). `backend/tests/test_query_plans.py` checks, against a
+-- seeded Postgres, that none of those shapes falls back to a sequential
+-- scan.
+--
+-- CONCURRENTLY keeps the tables writable while the indexes build, so run
+-- this file outside a transaction block (plain `psql -f`, not `-1`).
+--
+-- Idempotent: safe to re-run.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_matches_status_start
+    ON matches (status, start_time);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_matches_league_start
+    ON matches (league_id, start_time);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_matches_live_start
+    ON matches (start_time)
+    WHERE status IN ('LIVE', 'HT', 'ET', 'P', '1H', '2H');
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_events_match_minute
+    ON match_events (match_id, minute, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_standings_league_id
+    ON standings (league_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_standings_team_id
+    ON standings (team_id);
+
+-- A team's latest Elo is served by ix_team_elo_team_time (2026_05_team_elo.sql).
+-- An earlier revision of this file built a duplicate of it; drop that copy.
+DROP INDEX CONCURRENTLY IF EXISTS ix_team_elo_snapshots_team_at;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_players_team_id
+    ON players (team_id);
+
+-- `predictions (match_id)` is covered by uq_predictions_match_id
+-- (2026_06_predictions_match_unique.sql).
+
+ANALYZE matches;
+ANALYZE match_events;
+ANALYZE standings;
+ANALYZE team_elo_snapshots;
+ANALYZE players;
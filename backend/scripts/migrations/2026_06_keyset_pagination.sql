@@ -0,0 +1,17 @@
+-- Index for cursor (keyset) pages of the match listings: `/live-matches`
+-- with `cursor=` reads `WHERE (start_time, id) > (...) ORDER BY start_time,
+-- id LIMIT n` (or the descending mirror), a range scan of this index that
+-- costs the same on page 1 and page 1000. Team and player listings page on
+-- `(name, id)` and the news feed on `(created_at, id)`, which the existing
+-- `ix_teams_name`, `ix_players_name` and `ix_news_articles_created_at`
+-- serve.
+--
+-- CONCURRENTLY keeps `matches` writable while the index builds, so run
+-- this file outside a transaction block (plain `psql -f`, not `-1`).
+--
+-- Idempotent: safe to re-run.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_matches_start_id
+    ON matches (start_time, id);
+
+ANALYZE matches;
@@ -0,0 +1,28 @@
+-- Materialized league tables: one row per (league, season, team) with the
+-- totals of every finished table-stage match of that season stored so far.
+-- ``season`` is the year the season starts in (a fixture kicking off before
+-- July belongs to the previous year's season). The scheduler applies
+-- each new or corrected result to it in the same transaction that stores
+-- the match (see `services/league_tables.py`); the standings endpoints read
+-- the latest season's table through the primary key. Backfill once with
+-- `python -m services.league_tables` (a league with no rows yet is also
+-- rebuilt the first time one of its results changes).
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS league_table_entries (
+    league_id      INTEGER NOT NULL REFERENCES leagues(id),
+    season         INTEGER NOT NULL,
+    team_id        INTEGER NOT NULL REFERENCES teams(id),
+    group_name     VARCHAR,
+    played         INTEGER NOT NULL DEFAULT 0,
+    won            INTEGER NOT NULL DEFAULT 0,
+    drawn          INTEGER NOT NULL DEFAULT 0,
+    lost           INTEGER NOT NULL DEFAULT 0,
+    goals_for      INTEGER NOT NULL DEFAULT 0,
+    goals_against  INTEGER NOT NULL DEFAULT 0,
+    points         INTEGER NOT NULL DEFAULT 0,
+    form           VARCHAR NOT NULL DEFAULT '',
+    updated_at     TIMESTAMP,
+    PRIMARY KEY (league_id, season, team_id)
+);
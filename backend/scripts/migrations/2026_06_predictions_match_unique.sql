@@ -0,0 +1,15 @@
+-- One prediction per match. `generate_predictions` upserts every upcoming
+-- match's probabilities in a single INSERT ... ON CONFLICT (match_id)
+-- statement, which needs a unique index on `predictions.match_id`.
+--
+-- Duplicate rows (if any) keep the lowest id, which is the one the API has
+-- always served.
+--
+-- Idempotent: safe to re-run.
+
+DELETE FROM predictions p
+USING predictions q
+WHERE p.match_id = q.match_id
+  AND p.id > q.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_predictions_match_id ON predictions (match_id);
@@ -0,0 +1,16 @@
+-- Current Elo per team, i.e. the post-match rating of its latest row in
+-- `team_elo_snapshots`. The scheduler keeps both tables current as results
+-- land (`ai/elo_updater.py`). Backfill once with `python -m ai.build_elo_history`.
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS team_elo_ratings (
+    team_id        INTEGER PRIMARY KEY REFERENCES teams(id),
+    rating         DOUBLE PRECISION NOT NULL,
+    last_match_id  INTEGER NOT NULL REFERENCES matches(id),
+    last_match_at  TIMESTAMP NOT NULL,
+    updated_at     TIMESTAMP NOT NULL
+);
+
+-- Incremental replays read each team's latest snapshot before a kickoff.
+CREATE INDEX IF NOT EXISTS ix_team_elo_snapshot_at ON team_elo_snapshots (snapshot_at);
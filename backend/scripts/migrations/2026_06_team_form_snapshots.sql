@@ -0,0 +1,46 @@
+-- Rolling team context per finished fixture (the team form feature store,
+-- see backend/ai/team_form_store.py). A row for (team, match) describes the
+-- team after that match, i.e. the pre-kickoff context of its next fixture.
+-- The scheduler maintains it incrementally; backfill or rebuild it with
+-- `python -m ai.team_form_store` from backend/.
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS team_form_snapshots (
+    id                    SERIAL PRIMARY KEY,
+    team_id               INTEGER NOT NULL REFERENCES teams(id),
+    match_id              INTEGER NOT NULL REFERENCES matches(id),
+    as_of                 TIMESTAMP NOT NULL,
+    elo                   DOUBLE PRECISION NOT NULL,
+
+    form_points_5         DOUBLE PRECISION NOT NULL,
+    home_form_5           DOUBLE PRECISION NOT NULL,
+    away_form_5           DOUBLE PRECISION NOT NULL,
+    goals_for_avg_10      DOUBLE PRECISION NOT NULL,
+    goals_against_avg_10  DOUBLE PRECISION NOT NULL,
+    btts_rate_10          DOUBLE PRECISION NOT NULL,
+    form_vs_strong_5      DOUBLE PRECISION NOT NULL,
+
+    matches_15            INTEGER NOT NULL,
+    goals_for_15          DOUBLE PRECISION NOT NULL,
+    goals_against_15      DOUBLE PRECISION NOT NULL,
+    points_15             DOUBLE PRECISION NOT NULL,
+
+    xg_window             INTEGER NOT NULL,
+    xg_matches            DOUBLE PRECISION NOT NULL,
+    xg_points_per_match   DOUBLE PRECISION NOT NULL,
+    xg_goals_for_avg      DOUBLE PRECISION NOT NULL,
+    xg_goals_against_avg  DOUBLE PRECISION NOT NULL,
+    xg_shots_on_avg       DOUBLE PRECISION NOT NULL,
+    xg_shots_off_avg      DOUBLE PRECISION NOT NULL,
+    xg_possession_avg     DOUBLE PRECISION NOT NULL,
+    xg_corners_avg        DOUBLE PRECISION NOT NULL,
+    xg_form_points_last5  DOUBLE PRECISION NOT NULL,
+    xg_stats_coverage     DOUBLE PRECISION NOT NULL,
+    xg_last_match_at      TIMESTAMP,
+
+    updated_at            TIMESTAMP,
+    CONSTRAINT uq_team_form_match UNIQUE (team_id, match_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_team_form_team_as_of ON team_form_snapshots (team_id, as_of);
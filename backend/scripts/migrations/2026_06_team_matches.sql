@@ -0,0 +1,49 @@
+-- Team-centric match index: one row per team per match, so "a team's last N
+-- matches before a kickoff" is a range scan of (team_id, start_time DESC)
+-- instead of an `home_team_id = ? OR away_team_id = ?` scan of `matches`.
+-- The app keeps it in step with every match write (see
+-- `services/team_matches.py`); this script creates it and backfills or
+-- refreshes every row from `matches`. `python -m services.team_matches`
+-- does the same from `backend/`.
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS team_matches (
+    match_id       INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    team_id        INTEGER NOT NULL REFERENCES teams(id),
+    is_home        BOOLEAN NOT NULL,
+    start_time     TIMESTAMP,
+    status         VARCHAR,
+    goals_for      INTEGER,
+    goals_against  INTEGER,
+    league_id      INTEGER REFERENCES leagues(id),
+    PRIMARY KEY (match_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_team_matches_team_start
+    ON team_matches (team_id, start_time DESC, match_id DESC);
+
+-- Rows of a team that no longer plays in the match (fixture corrected).
+DELETE FROM team_matches tm
+USING matches m
+WHERE tm.match_id = m.id
+  AND tm.team_id IS DISTINCT FROM m.home_team_id
+  AND tm.team_id IS DISTINCT FROM m.away_team_id;
+
+INSERT INTO team_matches (match_id, team_id, is_home, start_time, status, goals_for, goals_against, league_id)
+SELECT id, home_team_id, TRUE, start_time, status, home_score, away_score, league_id
+FROM matches
+WHERE home_team_id IS NOT NULL
+UNION ALL
+SELECT id, away_team_id, FALSE, start_time, status, away_score, home_score, league_id
+FROM matches
+WHERE away_team_id IS NOT NULL AND away_team_id IS DISTINCT FROM home_team_id
+ON CONFLICT (match_id, team_id) DO UPDATE SET
+    is_home = EXCLUDED.is_home,
+    start_time = EXCLUDED.start_time,
+    status = EXCLUDED.status,
+    goals_for = EXCLUDED.goals_for,
+    goals_against = EXCLUDED.goals_against,
+    league_id = EXCLUDED.league_id;
+
+ANALYZE team_matches;
@@ -0,0 +1,14 @@
+-- Precomputed tournament projections: each team's probability of reaching
+-- every knockout round, simulated by `ai/tournament_simulator.py`. The
+-- scheduler rewrites a league's row whenever one of its results is stored;
+-- `GET /league/{id}/bracket/projections` only reads it. Backfill once with
+-- `python -m ai.tournament_simulator`.
+--
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS tournament_projections (
+    league_id    INTEGER PRIMARY KEY REFERENCES leagues(id),
+    simulations  INTEGER NOT NULL,
+    payload      JSON NOT NULL,
+    computed_at  TIMESTAMP NOT NULL
+);
@@ -0,0 +1,270 @@
+"""
+Catalog of the hot query shapes, and an EXPLAIN check that they use an index.
+
+Each `QueryShape` is a query the routers, the scheduler or the AI builders
+run on every request or sync, built the way production builds it (through
+`services.read_queries` where the endpoint does) with parameters sampled
+from the database. `sequential_scans` lists the tables a plan reads with a
+``Seq Scan`` among the ones the shape must reach through an index;
+`backend/tests/test_query_plans.py` runs the catalog against a seeded
+Postgres and fails on any.
+
+The indexes themselves are declared on the models and shipped in
+`scripts/migrations/2026_06_hot_query_indexes.sql`. When adding a query on a
+large table, add its shape here.
+
+Usage:
+    cd backend
+    python -m scripts.query_plans     # EXPLAIN every shape against DATABASE_URL
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+try:
+    from backend.models import (
+        LeagueTableEntry,
+        Match,
+        MatchEvent,
+        NewsArticle,
+        Player,
+        Prediction,
+        Standing,
+        TeamEloSnapshot,
+        TeamMatch,
+    )
+    from backend.services import pagination, read_queries
+except ImportError:
+    from models import (  # type: ignore[no-redef]
+        LeagueTableEntry,
+        Match,
+        MatchEvent,
+        NewsArticle,
+        Player,
+        Prediction,
+        Standing,
+        TeamEloSnapshot,
+        TeamMatch,
+    )
+    from services import pagination, read_queries  # type: ignore[no-redef]
+
+
+FINISHED_STATUSES = ("FT", "AET", "PEN")
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Representative parameters: the newest finished match, its league and home team."""
+
+    league_id: int
+    team_id: int
+    kickoff: datetime.datetime
+    match_ids: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    name: str
+    source: str  # where production runs it
+    tables: Tuple[str, ...]  # tables the plan must not read sequentially
+    build: Callable[[Sample], Any]
+
+
+def _live_matches(
+    status: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    order: str = "asc",
+    cursor: Optional[str] = None,
+):
+    return read_queries.live_matches_statements(None, status, date_from, date_to, None, None, 50, 0, order, cursor)
+
+
+def _finished_window(sample: Sample):
+    date_from = (sample.kickoff - datetime.timedelta(days=7)).strftime("%Y-%m-%d")
+    return _live_matches("finished", date_from, sample.kickoff.strftime("%Y-%m-%d"), order="desc")[0]
+
+
+SHAPES: Sequence[QueryShape] = (
+    QueryShape(
+        "live_matches_page", "GET /live-matches?status=live", ("matches",),
+        lambda sample: _live_matches("live")[0],
+    ),
+    QueryShape(
+        "live_matches_total", "GET /live-matches?status=live (count)", ("matches",),
+        lambda sample: _live_matches("live")[1],
+    ),
+    QueryShape(
+        "finished_matches_window", "GET /live-matches?status=finished&date_from&date_to", ("matches",),
+        _finished_window,
+    ),
+    QueryShape(
+        "finished_matches_cursor_page", "GET /live-matches?status=finished&order=desc&cursor", ("matches",),
+        lambda sample: _live_matches(
+            "finished", order="desc", cursor=pagination.encode_cursor([sample.kickoff, sample.match_ids[-1]])
+        )[0],
+    ),
+    QueryShape(
+        "upcoming_matches", "generate_predictions", ("matches",),
+        lambda sample: select(Match).where(Match.status.in_(["NS", "TBD"])),
+    ),
+    QueryShape(
+        "league_knockout_fixtures", "GET /league/{id}/bracket", ("matches",),
+        lambda sample: select(Match)
+        .where(Match.league_id == sample.league_id, Match.stage.isnot(None), Match.stage != "GROUP_STAGE")
+        .order_by(Match.start_time.asc()),
+    ),
+    QueryShape(
+        "team_recent_matches", "services.team_matches.recent_team_matches", ("team_matches", "matches"),
+        lambda sample: select(Match)
+        .join(TeamMatch, TeamMatch.match_id == Match.id)
+        .where(
+            TeamMatch.team_id == sample.team_id,
+            TeamMatch.status.in_(FINISHED_STATUSES),
+            TeamMatch.start_time < sample.kickoff,
+            TeamMatch.goals_for.isnot(None),
+            TeamMatch.goals_against.isnot(None),
+        )
+        .order_by(TeamMatch.start_time.desc(), TeamMatch.match_id.desc())
+        .limit(15),
+    ),
+    QueryShape(
+        "match_events_bulk", "GET /match-events/bulk, next-event player form", ("match_events",),
+        lambda sample: read_queries.match_events_statement(list(sample.match_ids)),
+    ),
+    QueryShape(
+        "match_events_timeline", "GET /match/{id}/details, live xG", ("match_events",),
+        lambda sample: select(MatchEvent)
+        .where(MatchEvent.match_id == sample.match_ids[0])
+        .order_by(MatchEvent.minute.asc(), MatchEvent.id.asc()),
+    ),
+    QueryShape(
+        "predictions_for_matches", "match cards (selectinload), generate_predictions upsert", ("predictions",),
+        lambda sample: select(Prediction).where(Prediction.match_id.in_(list(sample.match_ids))),
+    ),
+    QueryShape(
+        "standings_by_league", "seed scripts, standings heuristics", ("standings",),
+        lambda sample: select(Standing).where(Standing.league_id == sample.league_id),
+    ),
+    QueryShape(
+        "standings_by_team", "generate_predictions._standings_by_team, next-event cold start", ("standings",),
+        lambda sample: select(Standing).where(Standing.team_id == sample.team_id).order_by(Standing.id),
+    ),
+    QueryShape(
+        "league_table", "GET /league/{id}/standings", ("league_table_entries",),
+        lambda sample: select(LeagueTableEntry).where(
+            LeagueTableEntry.league_id == sample.league_id,
+            LeagueTableEntry.season
+            == select(func.max(LeagueTableEntry.season))
+            .where(LeagueTableEntry.league_id == sample.league_id)
+            .scalar_subquery(),
+        ),
+    ),
+    QueryShape(
+        "latest_elo_before_kickoff", "match_outcome_features._team_latest_post_elo", ("team_elo_snapshots",),
+        lambda sample: select(TeamEloSnapshot)
+        .where(TeamEloSnapshot.team_id == sample.team_id, TeamEloSnapshot.snapshot_at < sample.kickoff)
+        .order_by(TeamEloSnapshot.snapshot_at.desc())
+        .limit(1),
+    ),
+    QueryShape(
+        "team_squad", "match details squad preview, next-event candidates", ("players",),
+        lambda sample: read_queries.squad_preview_statement(sample.team_id, limit=40),
+    ),
+    QueryShape(
+        "players_cursor_page", "GET /players?cursor", ("players",),
+        lambda sample: pagination.keyset_page(
+            select(Player), (Player.name, Player.id), descending=False,
+            cursor=pagination.encode_cursor(["Player 5", 0]), limit=50,
+        ),
+    ),
+    QueryShape(
+        "news_feed", "GET /news", ("news_articles",),
+        lambda sample: select(NewsArticle)
+        .where(NewsArticle.is_published.is_(True))
+        .order_by(NewsArticle.created_at.desc())
+        .limit(20),
+    ),
+    QueryShape(
+        "news_cursor_page", "GET /editorial?cursor", ("news_articles",),
+        lambda sample: pagination.keyset_page(
+            select(NewsArticle).where(NewsArticle.is_published.is_(True)),
+            (NewsArticle.created_at, NewsArticle.id), descending=True,
+            cursor=pagination.encode_cursor([sample.kickoff, 0]), limit=20,
+        ),
+    ),
+)
+
+
+def load_sample(connection: Connection) -> Sample:
+    newest = connection.execute(
+        select(Match.league_id, Match.home_team_id, Match.start_time)
+        .where(Match.status.in_(FINISHED_STATUSES))
+        .order_by(Match.start_time.desc())
+        .limit(1)
+    ).one()
+    match_ids = connection.execute(
+        select(Match.id)
+        .where(Match.league_id == newest.league_id, Match.status.in_(FINISHED_STATUSES))
+        .order_by(Match.start_time.desc())
+        .limit(20)
+    ).scalars().all()
+    return Sample(newest.league_id, newest.home_team_id, newest.start_time, tuple(match_ids))
+
+
+def explain(connection: Connection, statement) -> Dict[str, Any]:
+    """The root node of ``EXPLAIN (FORMAT JSON)`` for `statement`."""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def sequential_scans(plan: Dict[str, Any], tables: Sequence[str]) -> List[str]:
+    """The `tables` the plan reads with a sequential scan."""
+    return sorted({
+        node["Relation Name"]
+        for node in plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+    })
+
+
+def _indexes(plan: Dict[str, Any]) -> List[str]:
+    return sorted({node["Index Name"] for node in plan_nodes(plan) if node.get("Index Name")})
+
+
+def main() -> int:
+    try:
+        from backend.database import engine
+    except ImportError:
+        from database import engine  # type: ignore[no-redef]
+
+    regressions = 0
+    with engine.connect() as connection:
+        sample = load_sample(connection)
+        for shape in SHAPES:
+            plan = explain(connection, shape.build(sample))
+            scans = sequential_scans(plan, shape.tables)
+            regressions += bool(scans)
+            verdict = f"SEQ SCAN on {', '.join(scans)}" if scans else ", ".join(_indexes(plan)) or "-"
+            print(f"{shape.name:<28} {plan['Total Cost']:>12.1f}  {verdict}  [{shape.source}]")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
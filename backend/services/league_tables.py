@@ -0,0 +1,464 @@
+"""Materialized league tables, maintained incrementally as results are stored.
+
+Both standings endpoints used to rebuild a table from raw `Match` rows on
+every request. `league_table_entries` keeps one row per (league, season,
+team) instead:
+
+- A match counts towards its league's table once it is finished with both
+  scores set and is a table fixture (``stage`` unset, regular season,
+  group or league stage); knockout ties never do. Every team of a table
+  fixture has a row, with zeros until its first result.
+- A match belongs to the season its kickoff falls in; seasons start on the
+  first of ``SEASON_START_MONTH`` (July, like the ingestion's season), so
+  a 2025/26 fixture counts towards season 2025.
+- The scheduler calls `refresh_league_tables` with each stored match's
+  previous and current state, in the same transaction as the write. The
+  previous contribution is taken back and the current one applied as
+  ``ON CONFLICT`` increments, so a corrected score, a result reverted to
+  scheduled or a fixture moved to another league all reverse cleanly.
+  The form string of the touched teams is then recomputed from their
+  latest results. A league without any rows yet is rebuilt from its
+  matches instead, so the store never serves a table built from deltas
+  alone.
+- `stored_league_table` reads the league's latest season with one lookup
+  on the primary key's ``(league_id, season)`` prefix, so earlier seasons
+  (and clubs that have since left the league) never leak into it;
+  `with_live_results` lays that season's in-play scores on top of it for
+  the "live table" without persisting them.
+- `rebuild_league_tables` (``python -m services.league_tables``) rebuilds
+  everything, e.g. after a seed script. When the table is missing or a
+  league has no rows, readers fall back to computing from matches.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, inspect as sa_inspect, or_, update as sa_update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+try:
+    from backend.models import LeagueTableEntry, Match, Team
+except ImportError:
+    from models import LeagueTableEntry, Match, Team  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+LIVE_STATUSES = {"LIVE", "HT", "ET", "P", "1H", "2H"}
+
+# Stages whose results go into a table; fixtures without a stage count too.
+TABLE_STAGES = {"REGULAR_SEASON", "GROUP_STAGE", "LEAGUE_STAGE"}
+
+FORM_LENGTH = 5
+
+SEASON_START_MONTH = 7
+
+COUNTERS = ("played", "won", "drawn", "lost", "goals_for", "goals_against", "points")
+
+# The match state a table depends on; `refresh_league_tables` takes dicts
+# with these keys.
+MATCH_COLUMNS = (
+    "league_id", "home_team_id", "away_team_id", "start_time", "status", "home_score", "away_score", "stage",
+    "group_name",
+)
+
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+_UPSERT_BATCH_SIZE = 1000
+
+_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+TableKey = Tuple[int, int, int]  # (league_id, season, team_id)
+
+
+def _table_available(db: Session) -> bool:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    present = _table_present.get(engine)
+    if present is None:
+        present = sa_inspect(db.connection()).has_table(LeagueTableEntry.__tablename__)
+        _table_present[engine] = present
+    return present
+
+
+# ── Seasons ─────────────────────────────────────────────────────────────────
+
+
+def season_of(kickoff: datetime.datetime) -> int:
+    """The season a kickoff falls in, named after the year it starts."""
+    return kickoff.year if kickoff.month >= SEASON_START_MONTH else kickoff.year - 1
+
+
+def season_start(season: int) -> datetime.datetime:
+    return datetime.datetime(season, SEASON_START_MONTH, 1)
+
+
+# ── Match contributions ─────────────────────────────────────────────────────
+
+
+def _is_table_fixture(row: Mapping[str, Any]) -> bool:
+    return (
+        row["league_id"] is not None
+        and row["home_team_id"] is not None
+        and row["away_team_id"] is not None
+        and row["start_time"] is not None
+        and (row["stage"] is None or row["stage"] in TABLE_STAGES)
+    )
+
+
+def _counts(row: Mapping[str, Any], statuses: Set[str] = FINISHED_STATUSES) -> bool:
+    return (
+        _is_table_fixture(row)
+        and row["status"] in statuses
+        and row["home_score"] is not None
+        and row["away_score"] is not None
+    )
+
+
+def _contributions(row: Mapping[str, Any]) -> List[Tuple[int, Dict[str, int], str]]:
+    """``(team_id, counter deltas, result letter)`` for both sides of a scored match."""
+    lines = []
+    for team_id, scored, conceded in (
+        (row["home_team_id"], row["home_score"], row["away_score"]),
+        (row["away_team_id"], row["away_score"], row["home_score"]),
+    ):
+        won, drawn, lost = int(scored > conceded), int(scored == conceded), int(scored < conceded)
+        lines.append((
+            team_id,
+            {
+                "played": 1, "won": won, "drawn": drawn, "lost": lost,
+                "goals_for": scored, "goals_against": conceded, "points": 3 * won + drawn,
+            },
+            "W" if won else "D" if drawn else "L",
+        ))
+    return lines
+
+
+def _table_state(row: Optional[Mapping[str, Any]]) -> Optional[tuple]:
+    """What a match contributes to a table, for skipping changes that don't touch it."""
+    if row is None or not _is_table_fixture(row):
+        return None
+    scores = (row["home_score"], row["away_score"]) if _counts(row) else None
+    return (
+        row["league_id"], season_of(row["start_time"]), row["home_team_id"], row["away_team_id"],
+        row["group_name"], scores,
+    )
+
+
+def _table_fixture_filter():
+    return and_(
+        Match.start_time.isnot(None),
+        or_(Match.stage.is_(None), Match.stage.in_(list(TABLE_STAGES))),
+    )
+
+
+def _counted_filter():
+    return (
+        Match.status.in_(list(FINISHED_STATUSES)),
+        Match.home_score.isnot(None),
+        Match.away_score.isnot(None),
+        _table_fixture_filter(),
+    )
+
+
+# ── Writing ─────────────────────────────────────────────────────────────────
+
+
+def _accumulate(
+    changes: Iterable[Tuple[Optional[Mapping[str, Any]], Mapping[str, Any]]],
+    league_ids: Set[int],
+) -> Tuple[Dict[TableKey, Dict[str, int]], Dict[TableKey, str], Set[TableKey]]:
+    """Net counter deltas, group names and teams whose form moved, for `league_ids`."""
+    deltas: Dict[TableKey, Dict[str, int]] = {}
+    groups: Dict[TableKey, str] = {}
+    form_keys: Set[TableKey] = set()
+
+    for previous, current in changes:
+        for row, sign in ((previous, -1), (current, 1)):
+            if row is None or not _is_table_fixture(row) or row["league_id"] not in league_ids:
+                continue
+            league_id, season = row["league_id"], season_of(row["start_time"])
+            for team_id in (row["home_team_id"], row["away_team_id"]):
+                deltas.setdefault((league_id, season, team_id), dict.fromkeys(COUNTERS, 0))
+                if sign > 0 and row["group_name"]:
+                    groups[(league_id, season, team_id)] = row["group_name"]
+            if not _counts(row):
+                continue
+            for team_id, line, _result in _contributions(row):
+                key = (league_id, season, team_id)
+                form_keys.add(key)
+                for column, value in line.items():
+                    deltas[key][column] += sign * value
+    return deltas, groups, form_keys
+
+
+def _upsert_deltas(db: Session, deltas: Mapping[TableKey, Mapping[str, int]], groups: Mapping[TableKey, str]) -> None:
+    """Add `deltas` to the stored rows, creating missing ones."""
+    if not deltas:
+        return
+    now = datetime.datetime.utcnow()
+    rows = [
+        {
+            "league_id": league_id,
+            "season": season,
+            "team_id": team_id,
+            "group_name": groups.get((league_id, season, team_id)),
+            **counters,
+            "form": "",
+            "updated_at": now,
+        }
+        for (league_id, season, team_id), counters in sorted(deltas.items())
+    ]
+
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        for row in rows:
+            entry = db.get(LeagueTableEntry, (row["league_id"], row["season"], row["team_id"]))
+            if entry is None:
+                db.add(LeagueTableEntry(**row))
+                continue
+            for column in COUNTERS:
+                setattr(entry, column, getattr(entry, column) + row[column])
+            if row["group_name"]:
+                entry.group_name = row["group_name"]
+            entry.updated_at = now
+        db.flush()
+        return
+
+    table = LeagueTableEntry.__table__
+    for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+        statement = insert(LeagueTableEntry).values(rows[start:start + _UPSERT_BATCH_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=["league_id", "season", "team_id"],
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in COUNTERS},
+                "group_name": func.coalesce(statement.excluded.group_name, table.c.group_name),
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        db.execute(statement)
+
+
+def _refresh_form(db: Session, keys: Set[TableKey]) -> None:
+    """Recompute the form string of `keys` from their latest counted results."""
+    if not keys:
+        return
+    league_ids = {league_id for league_id, _season, _team_id in keys}
+    team_ids = {team_id for _league_id, _season, team_id in keys}
+    first_season = min(season for _league_id, season, _team_id in keys)
+    results = (
+        db.query(
+            Match.league_id, Match.start_time, Match.home_team_id, Match.away_team_id,
+            Match.home_score, Match.away_score,
+        )
+        .filter(
+            Match.league_id.in_(league_ids),
+            Match.start_time >= season_start(first_season),
+            or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)),
+            *_counted_filter(),
+        )
+        .order_by(Match.start_time.desc(), Match.id.desc())
+    )
+
+    latest: Dict[TableKey, List[str]] = defaultdict(list)
+    for row in results:
+        season = season_of(row.start_time)
+        for team_id, _line, result in _contributions(row._mapping):
+            key = (row.league_id, season, team_id)
+            if key in keys and len(latest[key]) < FORM_LENGTH:
+                latest[key].append(result)
+
+    db.execute(
+        sa_update(LeagueTableEntry),
+        [
+            {
+                "league_id": league_id,
+                "season": season,
+                "team_id": team_id,
+                "form": "".join(reversed(latest[(league_id, season, team_id)])),
+            }
+            for league_id, season, team_id in sorted(keys)
+        ],
+    )
+
+
+def _match_rows(db: Session, league_ids: Iterable[int]) -> List[Dict[str, Any]]:
+    columns = [getattr(Match, column) for column in MATCH_COLUMNS]
+    return [
+        dict(row._mapping)
+        for row in db.query(*columns).filter(Match.league_id.in_(list(league_ids)), _table_fixture_filter())
+    ]
+
+
+def _rebuild(db: Session, league_ids: Set[int]) -> None:
+    db.query(LeagueTableEntry).filter(LeagueTableEntry.league_id.in_(league_ids)).delete(synchronize_session=False)
+    deltas, groups, form_keys = _accumulate(((None, row) for row in _match_rows(db, league_ids)), league_ids)
+    _upsert_deltas(db, deltas, groups)
+    _refresh_form(db, form_keys)
+
+
+def _apply_changes(db: Session, changes: Sequence[Tuple[Optional[Mapping[str, Any]], Mapping[str, Any]]]) -> None:
+    league_ids = {
+        row["league_id"]
+        for pair in changes
+        for row in pair
+        if row is not None and _is_table_fixture(row)
+    }
+    materialized = {
+        league_id
+        for (league_id,) in db.query(LeagueTableEntry.league_id)
+        .filter(LeagueTableEntry.league_id.in_(league_ids))
+        .distinct()
+    }
+    # The matches are already written: a first-seen league is read whole.
+    if league_ids - materialized:
+        _rebuild(db, league_ids - materialized)
+
+    deltas, groups, form_keys = _accumulate(changes, materialized)
+    _upsert_deltas(db, deltas, groups)
+    _refresh_form(db, form_keys)
+
+
+def refresh_league_tables(
+    db: Session,
+    changes: Iterable[Tuple[Optional[Mapping[str, Any]], Mapping[str, Any]]],
+) -> None:
+    """Apply stored matches' ``(previous, current)`` states to their tables.
+
+    States are dicts with `MATCH_COLUMNS`; ``previous`` is None for a new
+    match. Runs in the caller's transaction, inside a SAVEPOINT so a
+    missing ``league_table_entries`` table (migration not applied yet)
+    can't abort it.
+    """
+    changes = [
+        (previous, current)
+        for previous, current in changes
+        if _table_state(previous) != _table_state(current)
+    ]
+    if not changes or not _table_available(db):
+        return
+    try:
+        with db.begin_nested():
+            _apply_changes(db, changes)
+    except Exception:
+        logger.warning("Could not refresh league tables; readers fall back to live queries", exc_info=True)
+
+
+def rebuild_league_tables(db: Session, league_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuild the tables of `league_ids` (default: every league). Returns the rows written."""
+    if league_ids is None:
+        league_ids = [
+            league_id
+            for (league_id,) in db.query(Match.league_id)
+            .filter(Match.league_id.isnot(None), _table_fixture_filter())
+            .distinct()
+        ]
+    league_ids = set(league_ids)
+    if not league_ids:
+        return 0
+    _rebuild(db, league_ids)
+    return db.query(LeagueTableEntry).filter(LeagueTableEntry.league_id.in_(league_ids)).count()
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+
+def stored_league_table(db: Session, league_id: int) -> Optional[List[Dict[str, Any]]]:
+    """The rows (unsorted) of the league's latest season, or None when the store has none to serve."""
+    if not _table_available(db):
+        return None
+    latest_season = (
+        db.query(func.max(LeagueTableEntry.season))
+        .filter(LeagueTableEntry.league_id == league_id)
+        .scalar_subquery()
+    )
+    rows = (
+        db.query(LeagueTableEntry, Team.name, Team.logo_url)
+        .outerjoin(Team, Team.id == LeagueTableEntry.team_id)
+        .filter(LeagueTableEntry.league_id == league_id, LeagueTableEntry.season == latest_season)
+        .all()
+    )
+    if not rows:
+        return None
+    return [
+        {
+            "season": entry.season,
+            "team_id": entry.team_id,
+            "team_name": name or f"Team {entry.team_id}",
+            "team_logo": logo_url or "",
+            "group_name": entry.group_name,
+            **{column: getattr(entry, column) for column in COUNTERS},
+            "goal_difference": entry.goals_for - entry.goals_against,
+            "form": entry.form or "",
+        }
+        for entry, name, logo_url in rows
+    ]
+
+
+def with_live_results(db: Session, league_id: int, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """`rows` with the league's in-play scores of their season applied as if they were final.
+
+    Nothing is persisted; rows of teams playing right now get ``live: True``.
+    Form strings only ever carry finished results.
+    """
+    if not rows:
+        return rows
+    season = rows[0]["season"]
+    columns = [getattr(Match, column) for column in MATCH_COLUMNS]
+    playing = [
+        row._mapping
+        for row in db.query(*columns).filter(
+            Match.league_id == league_id,
+            Match.start_time >= season_start(season),
+            Match.start_time < season_start(season + 1),
+            Match.status.in_(list(LIVE_STATUSES)),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None),
+            _table_fixture_filter(),
+        )
+    ]
+
+    by_team = {row["team_id"]: {**row, "live": False} for row in rows}
+    for match in playing:
+        if not _counts(match, LIVE_STATUSES):
+            continue
+        for team_id, line, _result in _contributions(match):
+            row = by_team.get(team_id)
+            if row is None:
+                continue
+            for column, value in line.items():
+                row[column] += value
+            row["goal_difference"] = row["goals_for"] - row["goals_against"]
+            row["live"] = True
+    return list(by_team.values())
+
+
+def sort_table(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Points, then goal difference, then goals scored, then name."""
+    return sorted(rows, key=lambda row: (-row["points"], -row["goal_difference"], -row["goals_for"], row["team_name"]))
+
+
+def main() -> None:
+    try:
+        from backend.database import SessionLocal
+    except ImportError:
+        from database import SessionLocal  # type: ignore[no-redef]
+
+    db = SessionLocal()
+    try:
+        count = rebuild_league_tables(db)
+        db.commit()
+        print(f"Persisted {count} league table rows.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,91 +2,194 @@
 
 The scheduler runs on a `BackgroundScheduler` worker thread, so it cannot
 directly `await manager.broadcast(...)`. We therefore expose a sync
-`enqueue_match_updates` API that pushes payloads onto an in-memory queue,
-and a long-running asyncio task (started during FastAPI's lifespan) that
-drains the queue and fans out the messages to connected clients.
+`enqueue_match_updates` API that publishes payloads through a
+`services.live_broker` backend (in-process by default, Postgres
+LISTEN/NOTIFY when several workers serve WebSockets), and a long-running
+asyncio task (started during FastAPI's lifespan) per worker that drains
+what the broker delivers in batches and fans out the messages to
+connected clients.
+
+Each batch is coalesced by `match_id` (only the latest state of a match
+within one tick survives) and sent as one frame per subscriber:
+
+    {"type": "match_updates", "data": [<match payload>, ...]}
+
+Payloads carry a per-match `seq` stamped by the scheduler; the latest
+payload per match is kept so clients can request a resync snapshot.
 
 This keeps the scheduler completely decoupled from the WebSocket runtime
-and makes broadcasts best-effort: if the consumer task isn't running yet
-(e.g. during startup), updates are buffered in the queue and flushed on
-the first tick.
+and makes broadcasts best-effort. Updates published before a worker's
+consumer task is running (e.g. during startup) only survive with the
+in-process broker, which buffers up to 2048 of them and hands them over
+when the consumer starts; the Postgres and socket brokers deliver only to
+consumers that are already listening, so those updates are lost and
+clients catch up on the match's next update (or a resync snapshot).
 """
 
 from __future__ import annotations
 
 import asyncio
+import collections
 import json
 import logging
-import queue as thread_queue
-from typing import Iterable, List, Mapping, Optional
+import os
+from typing import Dict, Iterable, List, Mapping, Optional
 
 try:
-    from backend.connection_manager import manager
+    from backend.connection_manager import league_topic, manager, match_topic
+    from backend.services.live_broker import LiveBroker, create_broker
 except ImportError:  # script-style execution
-    from connection_manager import manager  # type: ignore[no-redef]
+    from connection_manager import league_topic, manager, match_topic  # type: ignore[no-redef]
+    from services.live_broker import LiveBroker, create_broker  # type: ignore[no-redef]
 
 
 logger = logging.getLogger(__name__)
 
 
-# Cross-thread queue: APScheduler threads put, the asyncio consumer gets.
 # Bounded so we never balloon memory if the consumer falls behind for a
 # long time (in practice each item is ~150 bytes; 2048 ≈ 300KB).
-_UPDATE_QUEUE: "thread_queue.Queue[dict]" = thread_queue.Queue(maxsize=2048)
+_MAX_PENDING_UPDATES = 2048
+
+# How long the consumer keeps collecting after the first update of a
+# tick, so a sync that persists dozens of fixtures goes out as one frame.
+_BATCH_WINDOW_SECONDS = float(os.getenv("LIVE_BROADCAST_BATCH_WINDOW_MS", "50")) / 1000.0
+
+# Transport between publishers and consumers; see `services.live_broker`.
+_broker: LiveBroker = create_broker()
 
+# asyncio side: created by `start_consumer` on the serving loop.
+_update_queue: Optional["asyncio.Queue[dict]"] = None
 _consumer_task: Optional[asyncio.Task] = None
 
+# Latest payload delivered per match, so a client that notices a gap in a
+# match's `seq` can ask for a resync snapshot over the socket. Bounded LRU.
+_MAX_SNAPSHOT_MATCHES = 5000
+_latest_state: "collections.OrderedDict[int, dict]" = collections.OrderedDict()
 
-def enqueue_match_updates(payloads: Iterable[Mapping[str, object]]) -> None:
-    """Submit one or more match updates for broadcast.
 
-    Safe to call from any thread (used by APScheduler jobs). Drops the
-    item with a warning if the queue is saturated rather than blocking
-    the scheduler thread.
-    """
-    count = 0
+def _ingest(payloads: List[dict]) -> None:
+    """Runs on the event loop: move a batch into the asyncio queue."""
+    if _update_queue is None:
+        return
     for payload in payloads:
-        message = {
-            "type": "match_update",
-            "data": dict(payload),
-        }
         try:
-            _UPDATE_QUEUE.put_nowait(message)
-            count += 1
-        except thread_queue.Full:
+            _update_queue.put_nowait(payload)
+        except asyncio.QueueFull:
             logger.warning(
                 "live_broadcaster queue is full; dropping update for match=%s",
                 payload.get("match_id"),
             )
-    if count:
-        logger.debug("live_broadcaster: enqueued %s payload(s)", count)
 
 
-async def _consume_loop() -> None:
-    """Drain the cross-thread queue and broadcast over WebSocket."""
-    loop = asyncio.get_running_loop()
-    logger.info("live_broadcaster consumer started")
+def enqueue_match_updates(payloads: Iterable[Mapping[str, object]]) -> None:
+    """Submit one or more match updates for broadcast.
+
+    Safe to call from any thread (used by APScheduler jobs). Never blocks
+    on WebSocket delivery: the in-process broker crosses to the event loop
+    in one `call_soon_threadsafe` hop per call, and overflow is dropped
+    with a warning.
+    """
+    batch = [dict(payload) for payload in payloads]
+    if not batch:
+        return
+    _broker.publish(batch)
+    logger.debug("live_broadcaster: published %s payload(s) via %s", len(batch), _broker.name)
+
+
+def _topics_for(payload: Mapping[str, object]) -> List[str]:
+    """Topics a match payload is published on: its match and its league."""
+    topics: List[str] = []
+    if payload.get("match_id") is not None:
+        topics.append(match_topic(payload["match_id"]))
+    if payload.get("league_id") is not None:
+        topics.append(league_topic(payload["league_id"]))
+    return topics
+
+
+def _coalesce(payloads: Iterable[dict]) -> List[dict]:
+    """Keep the latest payload per match, ordered by its last arrival."""
+    latest: Dict[object, dict] = {}
+    for payload in payloads:
+        match_id = payload.get("match_id")
+        latest.pop(match_id, None)
+        latest[match_id] = payload
+    return list(latest.values())
 
+
+def _render_batch(payloads: List[object]) -> str:
+    return json.dumps({"type": "match_updates", "data": payloads})
+
+
+def _drain_nowait(queue: "asyncio.Queue[dict]", into: List[dict]) -> None:
     while True:
         try:
-            # Pull from the threaded queue without blocking the event loop.
-            message: dict = await loop.run_in_executor(None, _UPDATE_QUEUE.get)
-        except asyncio.CancelledError:
-            logger.info("live_broadcaster consumer cancelled")
-            raise
-        except Exception:
-            logger.exception("live_broadcaster: error reading queue")
-            await asyncio.sleep(0.5)
+            into.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return
+
+
+def _remember(updates: Iterable[dict]) -> None:
+    for payload in updates:
+        match_id = payload.get("match_id")
+        if match_id is None:
             continue
+        _latest_state.pop(match_id, None)
+        _latest_state[match_id] = payload
+    while len(_latest_state) > _MAX_SNAPSHOT_MATCHES:
+        _latest_state.popitem(last=False)
 
-        try:
-            await manager.broadcast(json.dumps(message))
-        except Exception:
-            # Never let a single bad client crash the consumer loop.
-            logger.exception(
-                "live_broadcaster: broadcast failed for match=%s",
-                message.get("data", {}).get("match_id"),
-            )
+
+def snapshot(match_ids: Iterable[int]) -> List[dict]:
+    """Latest broadcast payload (including `seq`) for each known match."""
+    return [_latest_state[match_id] for match_id in match_ids if match_id in _latest_state]
+
+
+def publish_batch(payloads: Iterable[dict]) -> int:
+    """Coalesce a batch and enqueue it for every interested subscriber."""
+    updates = _coalesce(payloads)
+    if not updates:
+        return 0
+    _remember(updates)
+    return manager.publish_grouped(
+        [(_topics_for(payload), payload) for payload in updates],
+        _render_batch,
+    )
+
+
+async def _consume_loop(queue: "asyncio.Queue[dict]") -> None:
+    """Drain broker deliveries in batches and broadcast over WebSocket."""
+    loop = asyncio.get_running_loop()
+    try:
+        await _broker.start(loop, _ingest)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("live_broadcaster: %s broker failed to start", _broker.name)
+        raise
+    logger.info("live_broadcaster consumer started (broker=%s)", _broker.name)
+
+    try:
+        while True:
+            try:
+                batch = [await queue.get()]
+                if _BATCH_WINDOW_SECONDS > 0:
+                    await asyncio.sleep(_BATCH_WINDOW_SECONDS)
+                _drain_nowait(queue, batch)
+            except asyncio.CancelledError:
+                logger.info("live_broadcaster consumer cancelled")
+                raise
+
+            try:
+                # Per-socket writer tasks do the actual sends, so a stalled
+                # client can't hold up this loop.
+                publish_batch(batch)
+            except Exception:
+                # Never let a single bad client crash the consumer loop.
+                logger.exception(
+                    "live_broadcaster: broadcast failed for %s update(s)", len(batch)
+                )
+    finally:
+        await _broker.stop()
 
 
 def start_consumer(loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.Task:
@@ -94,19 +197,20 @@ def start_consumer(loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.
 
     Idempotent: returns the existing task if one is already running.
     """
-    global _consumer_task
+    global _consumer_task, _update_queue
 
     if _consumer_task is not None and not _consumer_task.done():
         return _consumer_task
 
     target_loop = loop or asyncio.get_event_loop()
-    _consumer_task = target_loop.create_task(_consume_loop())
+    _update_queue = asyncio.Queue(maxsize=_MAX_PENDING_UPDATES)
+    _consumer_task = target_loop.create_task(_consume_loop(_update_queue))
     return _consumer_task
 
 
 async def stop_consumer() -> None:
     """Cancel the consumer task and drain the queue."""
-    global _consumer_task
+    global _consumer_task, _update_queue
 
     if _consumer_task is None:
         return
@@ -120,12 +224,9 @@ async def stop_consumer() -> None:
         _consumer_task = None
 
     # Drop anything left in the queue — we're shutting down.
-    drained = 0
-    while True:
-        try:
-            _UPDATE_QUEUE.get_nowait()
-            drained += 1
-        except thread_queue.Empty:
-            break
+    drained: List[dict] = []
+    if _update_queue is not None:
+        _drain_nowait(_update_queue, drained)
+        _update_queue = None
     if drained:
-        logger.info("live_broadcaster: drained %s pending update(s) on shutdown", drained)
+        logger.info("live_broadcaster: drained %s pending update(s) on shutdown", len(drained))
@@ -0,0 +1,337 @@
+"""Pub/sub transport between the live-score publisher and WebSocket workers.
+
+``services.live_broadcaster`` used to hand updates to its consumer through
+a process-local queue, which only works while the scheduler and every
+WebSocket client live in the same process. With several uvicorn workers
+(or replicas) the scheduler runs in one of them and the others never see
+an update. This module puts a small broker interface in between:
+
+* ``publish(payloads)`` — sync and thread-safe; called from APScheduler
+  jobs via ``enqueue_match_updates``.
+* ``start(loop, deliver)`` / ``stop()`` — run on each worker's event loop;
+  ``deliver(batch)`` is always invoked *on that loop* with a list of
+  payload dicts.
+
+Backends, selected with ``LIVE_BROKER``:
+
+* ``inprocess`` (default) — ``loop.call_soon_threadsafe`` into the local
+  loop. Single-process deployments and tests.
+* ``postgres`` — ``NOTIFY`` on publish, ``LISTEN`` on a dedicated
+  connection to the ``database.engine`` URL. Every worker that listens
+  gets every update, so one scheduler can feed any number of web workers.
+* ``socket`` — UDP datagrams on ``LIVE_BROKER_SOCKET_ADDR`` (default
+  ``127.0.0.1:8765``). One listener; meant for tests and local
+  multi-process experiments without a database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[List[dict]], None]
+
+# Postgres caps a NOTIFY payload at 8000 bytes; UDP datagrams on loopback
+# comfortably take far more, but we chunk both the same way.
+NOTIFY_CHANNEL = os.getenv("LIVE_BROKER_CHANNEL", "live_match_updates")
+_MAX_NOTIFY_BYTES = 7500
+_MAX_DATAGRAM_BYTES = 60000
+
+
+def _chunk_payloads(payloads: List[dict], max_bytes: int) -> List[str]:
+    """Split a batch into JSON arrays that each fit in `max_bytes`."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 2
+    for payload in payloads:
+        encoded = json.dumps(payload, default=str)
+        if current and size + len(encoded) + 1 > max_bytes:
+            chunks.append("[" + ",".join(current) + "]")
+            current, size = [], 2
+        current.append(encoded)
+        size += len(encoded) + 1
+    if current:
+        chunks.append("[" + ",".join(current) + "]")
+    return chunks
+
+
+def _decode_chunk(raw) -> List[dict]:
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        logger.warning("live_broker: dropping undecodable message")
+        return []
+    return [item for item in data if isinstance(item, dict)] if isinstance(data, list) else []
+
+
+class LiveBroker:
+    """Interface shared by all transports."""
+
+    name = "base"
+
+    def publish(self, payloads: List[dict]) -> None:
+        raise NotImplementedError
+
+    async def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        return None
+
+
+class InProcessBroker(LiveBroker):
+    """Hands batches to the local event loop; buffers until it starts."""
+
+    name = "inprocess"
+
+    def __init__(self, max_pending: int = 2048):
+        self._lock = threading.Lock()
+        self._pending: Deque[dict] = collections.deque()
+        self._max_pending = max_pending
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deliver: Optional[Deliver] = None
+
+    def publish(self, payloads: List[dict]) -> None:
+        with self._lock:
+            loop, deliver = self._loop, self._deliver
+            if loop is None or deliver is None or loop.is_closed():
+                # No consumer yet (e.g. during startup): buffer and flush
+                # on start.
+                for payload in payloads:
+                    if len(self._pending) >= self._max_pending:
+                        logger.warning(
+                            "live_broker buffer is full; dropping update for match=%s",
+                            payload.get("match_id"),
+                        )
+                        continue
+                    self._pending.append(payload)
+                return
+        try:
+            loop.call_soon_threadsafe(deliver, payloads)
+        except RuntimeError:
+            logger.warning("live_broker: event loop closed; dropped %s update(s)", len(payloads))
+
+    async def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        with self._lock:
+            buffered = list(self._pending)
+            self._pending.clear()
+            self._loop, self._deliver = loop, deliver
+        if buffered:
+            deliver(buffered)
+
+    async def stop(self) -> None:
+        with self._lock:
+            self._loop, self._deliver = None, None
+
+
+class PostgresNotifyBroker(LiveBroker):
+    """LISTEN/NOTIFY on the application database.
+
+    Publishing borrows a pooled connection for a single ``pg_notify``
+    round-trip per chunk. Listening holds one dedicated autocommit
+    psycopg2 connection per worker, polled from the event loop with
+    ``add_reader`` so no thread is parked on it. LISTEN needs a
+    session-mode connection: point ``DATABASE_URL`` at a direct or
+    session-pooler endpoint, not a transaction pooler.
+    """
+
+    name = "postgres"
+
+    def __init__(self, engine=None, channel: str = NOTIFY_CHANNEL):
+        if engine is None:
+            try:
+                from backend.database import engine as default_engine
+            except ImportError:
+                from database import engine as default_engine  # type: ignore[no-redef]
+            engine = default_engine
+        self._engine = engine
+        self._channel = channel
+        self._listen_conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deliver: Optional[Deliver] = None
+        # The pending (re)connect, if any; `stop` cancels it.
+        self._retry_task: Optional[asyncio.Task] = None
+        self._stopped = True
+
+    def _dsn(self) -> str:
+        return self._engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    def publish(self, payloads: List[dict]) -> None:
+        chunks = _chunk_payloads(payloads, _MAX_NOTIFY_BYTES)
+        if not chunks:
+            return
+        raw = self._engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for chunk in chunks:
+                cursor.execute("SELECT pg_notify(%s, %s)", (self._channel, chunk))
+            cursor.close()
+            raw.commit()
+        finally:
+            raw.close()
+
+    def _on_readable(self) -> None:
+        conn = self._listen_conn
+        if conn is None or self._deliver is None:
+            return
+        try:
+            conn.poll()
+        except Exception:
+            logger.exception("live_broker: LISTEN connection failed; reconnecting")
+            self._reconnect()
+            return
+        batch: List[dict] = []
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            batch.extend(_decode_chunk(notify.payload))
+        if batch:
+            self._deliver(batch)
+
+    def _connect_listener(self):
+        # Blocking (DNS + TLS to a remote pooler can take a while), so it
+        # always runs in the default executor, never on the loop.
+        import psycopg2
+        import psycopg2.extensions
+
+        conn = psycopg2.connect(self._dsn(), connect_timeout=10)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self._channel}"')
+        return conn
+
+    def _attach(self, conn) -> None:
+        self._listen_conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _close_listener(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is None:
+            return
+        try:
+            if self._loop is not None:
+                self._loop.remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _reconnect(self, delay: float = 0) -> None:
+        self._close_listener()
+        if self._stopped or self._loop is None:
+            return
+        if self._retry_task is not None and not self._retry_task.done():
+            return
+        self._retry_task = self._loop.create_task(self._reconnect_async(delay))
+
+    async def _reconnect_async(self, delay: float = 0) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        while not self._stopped and self._listen_conn is None:
+            try:
+                conn = await self._loop.run_in_executor(None, self._connect_listener)
+            except Exception:
+                logger.exception("live_broker: LISTEN reconnect failed; retrying in 5s")
+                await asyncio.sleep(5)
+                continue
+            if self._stopped:
+                conn.close()
+                return
+            self._attach(conn)
+
+    async def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        self._loop, self._deliver = loop, deliver
+        self._stopped = False
+        try:
+            conn = await loop.run_in_executor(None, self._connect_listener)
+        except Exception:
+            # E.g. the database is briefly unreachable at boot: keep the
+            # consumer up and LISTEN as soon as it comes back.
+            logger.exception("live_broker: LISTEN connect failed; retrying in 5s")
+            self._reconnect(delay=5)
+            return
+        if self._stopped:
+            conn.close()
+            return
+        self._attach(conn)
+
+    async def stop(self) -> None:
+        self._stopped = True
+        task, self._retry_task = self._retry_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._close_listener()
+        self._loop, self._deliver = None, None
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    def __init__(self, deliver: Deliver):
+        self._deliver = deliver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        batch = _decode_chunk(data.decode("utf-8", errors="replace"))
+        if batch:
+            self._deliver(batch)
+
+
+class LocalSocketBroker(LiveBroker):
+    """UDP on a local address: publishers send, one listener receives."""
+
+    name = "socket"
+
+    def __init__(self, address: Optional[Tuple[str, int]] = None):
+        if address is None:
+            host, _, port = os.getenv("LIVE_BROKER_SOCKET_ADDR", "127.0.0.1:8765").rpartition(":")
+            address = (host or "127.0.0.1", int(port))
+        self.address = address
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._send_lock = threading.Lock()
+        self._send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def publish(self, payloads: List[dict]) -> None:
+        with self._send_lock:
+            for chunk in _chunk_payloads(payloads, _MAX_DATAGRAM_BYTES):
+                self._send_socket.sendto(chunk.encode("utf-8"), self.address)
+
+    async def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        self._transport, _protocol = await loop.create_datagram_endpoint(
+            lambda: _DatagramReceiver(deliver),
+            local_addr=self.address,
+        )
+        # Report the real port when bound to port 0 (tests).
+        self.address = self._transport.get_extra_info("sockname")[:2]
+
+    async def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+_BROKERS = {
+    InProcessBroker.name: InProcessBroker,
+    PostgresNotifyBroker.name: PostgresNotifyBroker,
+    LocalSocketBroker.name: LocalSocketBroker,
+}
+
+
+def create_broker(name: Optional[str] = None) -> LiveBroker:
+    """Build the broker named by `name` or the ``LIVE_BROKER`` env var."""
+    key = (name or os.getenv("LIVE_BROKER", InProcessBroker.name)).strip().lower()
+    broker_cls = _BROKERS.get(key)
+    if broker_cls is None:
+        logger.warning("Unknown LIVE_BROKER=%r; falling back to in-process delivery", key)
+        broker_cls = InProcessBroker
+    return broker_cls()
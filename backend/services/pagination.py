@@ -0,0 +1,161 @@
+"""Keyset (cursor) pagination and cached listing totals.
+
+`OFFSET n` makes the database walk and discard n rows, and the exact
+``count()`` next to it scans every row of the filter, so both the page and
+the total of a listing get slower the further a client scrolls and the
+longer the history grows. Listings therefore also accept an opaque
+``cursor``: the sort key of the last row served, so the next page is a
+range read that starts where the previous one stopped.
+
+* A cursor encodes the key columns of a row, e.g. ``(start_time, id)`` for
+  matches or ``(name, id)`` for players. The id is the tie-breaker that
+  makes the order total. Rows whose key has a NULL have no position in it
+  and are left out of cursor pages.
+* `keyset_page` orders a statement by the key (every column ascending, or
+  every column descending, so the condition is a single row comparison an
+  index can range-scan) and fetches one row more than the page to tell
+  whether there is a next one. `split_page` cuts that row off and builds
+  ``next_cursor``, which paged envelopes return in the body and bare-list
+  endpoints in the ``X-Next-Cursor`` header.
+* Totals are optional. When requested they are cached per filter for
+  ``PAGINATION_TOTAL_TTL_SECONDS`` (0 disables the cache), so a client
+  paging through one listing pays for the count once per TTL rather than
+  once per page.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import collections
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+
+TOTAL_TTL_SECONDS = float(os.getenv("PAGINATION_TOTAL_TTL_SECONDS", "30"))
+TOTAL_MAX_ENTRIES = int(os.getenv("PAGINATION_TOTAL_MAX_ENTRIES", "1024"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# ── Cursors ─────────────────────────────────────────────────────────────────
+
+
+def encode_cursor(values: Sequence[Any]) -> Optional[str]:
+    """Opaque cursor for a row key, or None if part of the key is NULL."""
+    if any(value is None for value in values):
+        return None
+    payload = [value.isoformat() if isinstance(value, datetime.datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> Tuple[Any, ...]:
+    """The key values in `cursor`, typed like `columns`.
+
+    Raises HTTPException(400) for anything `encode_cursor` did not produce
+    for a key of these columns.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("wrong key length")
+        values = []
+        for value, column in zip(payload, columns):
+            python_type = column.type.python_type
+            if python_type is datetime.datetime:
+                value = datetime.datetime.fromisoformat(value)
+            elif not isinstance(value, python_type) or isinstance(value, bool):
+                raise ValueError(f"expected {python_type.__name__}")
+            values.append(value)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {exc}")
+    return tuple(values)
+
+
+# ── Pages ───────────────────────────────────────────────────────────────────
+
+
+def keyset_page(statement, columns: Sequence[Any], *, descending: bool, cursor: Optional[str], limit: int):
+    """`statement` ordered by `columns`, after `cursor`, fetching ``limit + 1`` rows.
+
+    Works on a `Select` or an ORM `Query`. Without a cursor this is the
+    first page, and the caller may still add an ``offset``.
+    """
+    if cursor:
+        key = tuple_(*columns)
+        after = tuple_(*decode_cursor(cursor, columns))
+        statement = statement.where(*(column.isnot(None) for column in columns if column.nullable))
+        statement = statement.where(key < after if descending else key > after)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    return statement.order_by(*ordering).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int, key_attrs: Sequence[str]) -> Tuple[list, bool, Optional[str]]:
+    """`(page, has_more, next_cursor)` from the ``limit + 1`` rows of `keyset_page`."""
+    page = list(rows[:limit])
+    has_more = len(rows) > limit
+    next_cursor = None
+    if has_more and page:
+        next_cursor = encode_cursor([getattr(page[-1], attr) for attr in key_attrs])
+    return page, has_more, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Send `next_cursor` in a header, for listings whose body is a bare list."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+# ── Totals ──────────────────────────────────────────────────────────────────
+
+
+class TotalCache:
+    """Thread-safe LRU of listing totals keyed by the count statement."""
+
+    def __init__(self, ttl_seconds: float = TOTAL_TTL_SECONDS, max_entries: int = TOTAL_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "collections.OrderedDict[str, Tuple[float, int]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(statement) -> str:
+        compiled = statement.compile()
+        return f"{compiled}|{sorted(compiled.params.items())!r}"
+
+    def get(self, statement) -> Optional[int]:
+        if self.ttl_seconds <= 0:
+            return None
+        key = self.key(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, statement, total: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = self.key(statement)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+totals = TotalCache()
@@ -0,0 +1,272 @@
+"""`select()` builders and row shaping shared by the sync and async read paths.
+
+`routers/api.py` serves these endpoints through the threadpool with a sync
+`Session`; `routers/api_async.py` serves the same paths with an
+`AsyncSession` when ``DB_ASYNC`` is enabled. Both build their statements
+and shape their rows here, so the two paths cannot drift apart: only the
+`execute` call differs.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.orm import selectinload
+
+try:
+    from backend.models import League, Match, MatchEvent, Player, Team
+    from backend.services import pagination
+except ImportError:  # script-style execution
+    from models import League, Match, MatchEvent, Player, Team  # type: ignore[no-redef]
+    from services import pagination  # type: ignore[no-redef]
+
+
+STATUS_GROUPS = {
+    "live": ["LIVE", "HT", "ET", "P", "1H", "2H"],
+    "upcoming": ["NS", "TBD", "PST", "SUSP"],
+    "finished": ["FT", "AET", "PEN"],
+}
+ALL_KNOWN_STATUSES = ["LIVE", "HT", "ET", "P", "1H", "2H", "NS", "TBD", "PST", "SUSP", "FT", "AET", "PEN"]
+
+MAX_BULK_EVENT_MATCHES = 200
+
+# Relationships every match card renders. Loaded with one extra `IN` query
+# per page instead of one lazy SELECT per match (200 round-trips to the
+# pooler for a full page), and required on an AsyncSession, which cannot
+# lazy-load at all.
+MATCH_CARD_LOADS = (selectinload(Match.prediction),)
+
+# Sort key of match listings, and the attributes a cursor is built from.
+MATCH_PAGE_KEY = (Match.start_time, Match.id)
+MATCH_PAGE_KEY_ATTRS = ("start_time", "id")
+
+
+def with_match_card_loads(statement: Select) -> Select:
+    """Add `MATCH_CARD_LOADS` to a statement selecting `Match` rows."""
+    return statement.options(*MATCH_CARD_LOADS)
+
+
+# ── /leagues ────────────────────────────────────────────────────────────────
+
+
+def leagues_statement() -> Select:
+    return select(League)
+
+
+# ── /live-matches ───────────────────────────────────────────────────────────
+
+
+def live_matches_statements(
+    league_id: Optional[int],
+    status: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    days_back: Optional[int],
+    days_forward: Optional[int],
+    limit: int,
+    offset: int,
+    order: str,
+    cursor: Optional[str] = None,
+) -> Tuple[Select, Select]:
+    """`(page, total)` statements for `/live-matches`.
+
+    The page is ordered by `MATCH_PAGE_KEY` and fetches ``limit + 1`` rows
+    (see `pagination.split_page`); it starts after `cursor` when one is
+    given, else at `offset`. Raises HTTPException(400) for unparsable
+    dates, like the endpoint always has, and for a bad cursor.
+    """
+    if status:
+        normalized = status.strip().lower()
+        if normalized in STATUS_GROUPS:
+            wanted_statuses = STATUS_GROUPS[normalized]
+        else:
+            wanted_statuses = [s.strip().upper() for s in status.split(",") if s.strip()]
+    else:
+        wanted_statuses = ALL_KNOWN_STATUSES
+
+    statement = select(Match).where(Match.status.in_(wanted_statuses))
+
+    # Resolve the requested time window. No defaults: caller decides whether
+    # to narrow by date. The pagination keeps the response cheap regardless.
+    window_start = None
+    window_end = None
+    # Whole minutes, so the `days_back` / `days_forward` windows of
+    # requests a few seconds apart compile to the same statement and share
+    # a cached total (`pagination.totals`).
+    now_utc = datetime.datetime.utcnow().replace(second=0, microsecond=0)
+
+    if days_back is not None:
+        window_start = now_utc - datetime.timedelta(days=days_back)
+    if days_forward is not None:
+        window_end = now_utc + datetime.timedelta(days=days_forward)
+
+    if date_from:
+        try:
+            window_start = datetime.datetime.strptime(date_from, "%Y-%m-%d")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid date_from: {exc}")
+    if date_to:
+        try:
+            # Make date_to inclusive of the entire day.
+            window_end = datetime.datetime.strptime(date_to, "%Y-%m-%d") + datetime.timedelta(days=1)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid date_to: {exc}")
+
+    if window_start is not None:
+        statement = statement.where(Match.start_time >= window_start)
+    if window_end is not None:
+        statement = statement.where(Match.start_time <= window_end)
+
+    if league_id is not None:
+        # Match either explicit league_id on Match or via home team membership.
+        statement = statement.outerjoin(Team, Team.id == Match.home_team_id).where(
+            or_(Match.league_id == league_id, Team.league_id == league_id)
+        )
+
+    total_statement = select(func.count()).select_from(statement.with_only_columns(Match.id).subquery())
+
+    page_statement = pagination.keyset_page(
+        statement, MATCH_PAGE_KEY, descending=order == "desc", cursor=cursor, limit=limit
+    )
+    if not cursor:
+        page_statement = page_statement.offset(offset)
+    return with_match_card_loads(page_statement), total_statement
+
+
+def teams_by_id_statement(matches: Iterable[Match]) -> Optional[Select]:
+    """Every team referenced by `matches`, in one query (None if there are none)."""
+    team_ids = set()
+    for match in matches:
+        if match.home_team_id is not None:
+            team_ids.add(match.home_team_id)
+        if match.away_team_id is not None:
+            team_ids.add(match.away_team_id)
+    if not team_ids:
+        return None
+    return select(Team).where(Team.id.in_(team_ids))
+
+
+def live_match_item(match: Match, teams_by_id: Mapping[int, Any], prediction: Any) -> Dict[str, Any]:
+    home_team = teams_by_id.get(match.home_team_id)
+    away_team = teams_by_id.get(match.away_team_id)
+    return {
+        "id": match.id,
+        "start_time": match.start_time,
+        "status": match.status,
+        "home_score": match.home_score,
+        "away_score": match.away_score,
+        "home_team_id": match.home_team_id,
+        "away_team_id": match.away_team_id,
+        "home_team_name": home_team.name if home_team else f"Team {match.home_team_id}",
+        "away_team_name": away_team.name if away_team else f"Team {match.away_team_id}",
+        "home_team_logo": home_team.logo_url if home_team else None,
+        "away_team_logo": away_team.logo_url if away_team else None,
+        "league_id": match.league_id if match.league_id else (home_team.league_id if home_team else None),
+        "prediction": prediction,
+    }
+
+
+def split_match_page(matches: List[Match], limit: int) -> Tuple[List[Match], bool, Optional[str]]:
+    """`(matches, has_more, next_cursor)` for the rows of a `live_matches_statements` page."""
+    return pagination.split_page(matches, limit, MATCH_PAGE_KEY_ATTRS)
+
+
+def live_matches_page(
+    items: List[Dict[str, Any]],
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    has_more: bool,
+    next_cursor: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "items": items,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
+
+
+# ── /match-events/bulk ──────────────────────────────────────────────────────
+
+
+def parse_match_ids(match_ids: Optional[str]) -> List[int]:
+    """Parse, de-duplicate and cap the `match_ids` query parameter."""
+    parsed_ids: List[int] = []
+    for raw in (match_ids or "").split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            parsed_ids.append(int(raw))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid match id: {raw!r}")
+
+    # De-duplicate and cap so a runaway client can't ask for the whole DB.
+    unique_ids = list({mid for mid in parsed_ids})
+    if len(unique_ids) > MAX_BULK_EVENT_MATCHES:
+        raise HTTPException(status_code=400, detail=f"Too many match_ids (max {MAX_BULK_EVENT_MATCHES}).")
+    return unique_ids
+
+
+def match_events_statement(match_ids: List[int]) -> Select:
+    return (
+        select(MatchEvent)
+        .where(MatchEvent.match_id.in_(match_ids))
+        .order_by(MatchEvent.match_id.asc(), MatchEvent.minute.asc().nullslast(), MatchEvent.id.asc())
+    )
+
+
+def group_match_events(match_ids: List[int], rows: Iterable[MatchEvent]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[int, List[Dict[str, Any]]] = {mid: [] for mid in match_ids}
+    for row in rows:
+        grouped.setdefault(row.match_id, []).append({
+            "id": row.id,
+            "minute": row.minute,
+            "event_type": row.event_type,
+            "team_id": row.team_id,
+            "player_id": row.player_id,
+            "player_name": row.player_name,
+            "assist_player_id": row.assist_player_id,
+            "assist_player_name": row.assist_player_name,
+            "detail": row.detail,
+        })
+
+    # Stringify keys so the JSON response is predictable from the frontend.
+    return {str(mid): grouped[mid] for mid in match_ids}
+
+
+# ── /match/{id}/details ─────────────────────────────────────────────────────
+
+
+def match_statement(match_id: int) -> Select:
+    return with_match_card_loads(select(Match).where(Match.id == match_id))
+
+
+def squad_preview_statement(team_id: Optional[int], limit: int = 11) -> Select:
+    return select(Player).where(Player.team_id == team_id).limit(limit)
+
+
+def match_details_payload(match: Match, home_team, away_team, home_players, away_players, prediction) -> Dict[str, Any]:
+    return {
+        "id": match.id,
+        "start_time": match.start_time,
+        "status": match.status,
+        "home_score": match.home_score,
+        "away_score": match.away_score,
+        "home_team_id": match.home_team_id,
+        "away_team_id": match.away_team_id,
+        "home_team_name": home_team.name if home_team else f"Team {match.home_team_id}",
+        "away_team_name": away_team.name if away_team else f"Team {match.away_team_id}",
+        "home_team_logo": home_team.logo_url if home_team else None,
+        "away_team_logo": away_team.logo_url if away_team else None,
+        "home_team_stadium": home_team.stadium if home_team else None,
+        "home_players": [{"name": p.name, "position": p.position} for p in home_players],
+        "away_players": [{"name": p.name, "position": p.position} for p in away_players],
+        "prediction": prediction,
+    }
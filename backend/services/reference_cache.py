@@ -0,0 +1,338 @@
+"""Process-wide read-through cache for teams, leagues and player summaries.
+
+Team and league rows change a handful of times a week (a rename, a new
+crest, a promoted club) but nearly every endpoint resolves them by primary
+key, usually one row at a time. The routers used to either re-query them
+per row or keep a per-request dict; this module keeps one bounded cache
+per process instead.
+
+* Entries are immutable snapshots (`TeamRef`, `LeagueRef`, `PlayerRef`)
+  rather than ORM instances, so they can be shared across sessions and
+  threads without ever being lazily refreshed against a closed session.
+  They expose the same attribute names as the models, so code that reads
+  `team.name` / `league.logo_url` works unchanged.
+* Each kind is an LRU bounded by ``REFERENCE_CACHE_MAX_ENTRIES`` with a
+  ``REFERENCE_CACHE_TTL_SECONDS`` expiry. Missing ids are cached too, so a
+  dangling foreign key does not turn into a query per request.
+* Bulk lookups (`get_teams`, ...) load every miss with one ``IN`` query.
+* Any ORM session that flushes a new, modified or deleted Team / League /
+  Player invalidates those ids when it commits. That covers any seed
+  script run inside the API process; Core writes, such as the scheduler's
+  bulk `_upsert_teams` / `_upsert_leagues`, report theirs with
+  `note_reference_writes`. Writes made by *other* processes (seed scripts
+  run from a shell, another uvicorn worker) are picked up when the TTL
+  expires.
+
+`stats()` reports hits, misses and evictions per kind; it is served at
+``/api/v1/cache/stats``.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+try:
+    from backend.models import League, Player, Team
+except ImportError:  # script-style execution
+    from models import League, Player, Team  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+MAX_ENTRIES = int(os.getenv("REFERENCE_CACHE_MAX_ENTRIES", "20000"))
+
+# (kind, id) pairs each session has written in its current transaction.
+_pending_writes: "weakref.WeakKeyDictionary[Session, Set[Tuple[str, int]]]" = weakref.WeakKeyDictionary()
+_pending_lock = threading.Lock()
+
+# Cached value for ids that have no row, distinct from "not cached".
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class LeagueRef:
+    id: int
+    name: Optional[str]
+    country: Optional[str]
+    logo_url: Optional[str]
+
+
+@dataclass(frozen=True)
+class TeamRef:
+    id: int
+    name: Optional[str]
+    logo_url: Optional[str]
+    stadium: Optional[str]
+    league_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class PlayerRef:
+    id: int
+    name: Optional[str]
+    position: Optional[str]
+    team_id: Optional[int]
+    nationality: Optional[str]
+    height: Optional[str]
+    photo_url: Optional[str]
+
+
+def _league_ref(row: League) -> LeagueRef:
+    return LeagueRef(id=row.id, name=row.name, country=row.country, logo_url=row.logo_url)
+
+
+def _team_ref(row: Team) -> TeamRef:
+    return TeamRef(
+        id=row.id,
+        name=row.name,
+        logo_url=row.logo_url,
+        stadium=row.stadium,
+        league_id=row.league_id,
+    )
+
+
+def _player_ref(row: Player) -> PlayerRef:
+    return PlayerRef(
+        id=row.id,
+        name=row.name,
+        position=row.position,
+        team_id=row.team_id,
+        nationality=row.nationality,
+        height=row.height,
+        photo_url=row.photo_url,
+    )
+
+
+# kind -> (model, snapshot builder, columns to load)
+_KINDS: Dict[str, Tuple[Any, Callable[[Any], Any], Tuple[Any, ...]]] = {
+    "league": (League, _league_ref, (League.id, League.name, League.country, League.logo_url)),
+    "team": (
+        Team,
+        _team_ref,
+        (Team.id, Team.name, Team.logo_url, Team.stadium, Team.league_id),
+    ),
+    "player": (
+        Player,
+        _player_ref,
+        (
+            Player.id,
+            Player.name,
+            Player.position,
+            Player.team_id,
+            Player.nationality,
+            Player.height,
+            Player.photo_url,
+        ),
+    ),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _builder, _columns) in _KINDS.items()}
+
+
+class _TTLCache:
+    """Thread-safe LRU with a per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "collections.OrderedDict[int, Tuple[float, Any]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: int) -> Any:
+        """Return the cached value, `_MISSING` for a cached miss, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: int, value: Any) -> None:
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, keys: Iterable[int]) -> None:
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ReferenceDataCache:
+    def __init__(self, ttl_seconds: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES):
+        self._caches = {kind: _TTLCache(ttl_seconds, max_entries) for kind in _KINDS}
+
+    def _split(self, kind: str, ids: Iterable[Optional[int]]) -> Tuple[Dict[int, Any], Set[int]]:
+        cache = self._caches[kind]
+        found: Dict[int, Any] = {}
+        misses: Set[int] = set()
+        for key in ids:
+            if key is None or key in found or key in misses:
+                continue
+            value = cache.get(key)
+            if value is None:
+                misses.add(key)
+            elif value is not _MISSING:
+                found[key] = value
+        return found, misses
+
+    def _fill(self, kind: str, rows, misses: Set[int], found: Dict[int, Any]) -> Dict[int, Any]:
+        cache = self._caches[kind]
+        builder = _KINDS[kind][1]
+        for row in rows:
+            ref = builder(row)
+            cache.put(ref.id, ref)
+            found[ref.id] = ref
+            misses.discard(ref.id)
+        for key in misses:
+            cache.put(key, _MISSING)
+        return found
+
+    def _get_many(self, db: Session, kind: str, ids: Iterable[Optional[int]]) -> Dict[int, Any]:
+        found, misses = self._split(kind, ids)
+        if not misses:
+            return found
+        model, _builder, columns = _KINDS[kind]
+        rows = db.query(*columns).filter(model.id.in_(misses)).all()
+        return self._fill(kind, rows, misses, found)
+
+    async def _get_many_async(self, db, kind: str, ids: Iterable[Optional[int]]) -> Dict[int, Any]:
+        """`_get_many` for an `AsyncSession` (the ``DB_ASYNC`` read path)."""
+        found, misses = self._split(kind, ids)
+        if not misses:
+            return found
+        model, _builder, columns = _KINDS[kind]
+        result = await db.execute(select(*columns).where(model.id.in_(misses)))
+        return self._fill(kind, result.all(), misses, found)
+
+    def _get_one(self, db: Session, kind: str, key: Optional[int]):
+        if key is None:
+            return None
+        return self._get_many(db, kind, [key]).get(key)
+
+    def get_team(self, db: Session, team_id: Optional[int]) -> Optional[TeamRef]:
+        return self._get_one(db, "team", team_id)
+
+    def get_teams(self, db: Session, team_ids: Iterable[Optional[int]]) -> Dict[int, TeamRef]:
+        return self._get_many(db, "team", team_ids)
+
+    async def get_teams_async(self, db, team_ids: Iterable[Optional[int]]) -> Dict[int, TeamRef]:
+        return await self._get_many_async(db, "team", team_ids)
+
+    def get_league(self, db: Session, league_id: Optional[int]) -> Optional[LeagueRef]:
+        return self._get_one(db, "league", league_id)
+
+    def get_leagues(self, db: Session, league_ids: Iterable[Optional[int]]) -> Dict[int, LeagueRef]:
+        return self._get_many(db, "league", league_ids)
+
+    def get_player(self, db: Session, player_id: Optional[int]) -> Optional[PlayerRef]:
+        return self._get_one(db, "player", player_id)
+
+    def get_players(self, db: Session, player_ids: Iterable[Optional[int]]) -> Dict[int, PlayerRef]:
+        return self._get_many(db, "player", player_ids)
+
+    def invalidate(self, kind: str, ids: Iterable[int]) -> None:
+        self._caches[kind].invalidate(ids)
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {f"{kind}s": cache.stats() for kind, cache in self._caches.items()}
+
+
+reference_cache = ReferenceDataCache()
+
+
+# ── Invalidation on write ───────────────────────────────────────────────────
+
+
+def _collect_reference_writes(session: Session, _flush_context) -> None:
+    # `dirty` includes objects whose attributes were merely re-assigned to
+    # the same value (the scheduler does that every sync); skip those.
+    written = list(session.new) + list(session.deleted)
+    written.extend(obj for obj in session.dirty if session.is_modified(obj))
+
+    keys = set()
+    for obj in written:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None and obj.id is not None:
+            keys.add((kind, obj.id))
+    if keys:
+        with _pending_lock:
+            _pending_writes.setdefault(session, set()).update(keys)
+
+
+def note_reference_writes(session: Session, kind: str, ids: Iterable[int]) -> None:
+    """Invalidate `ids` of `kind` when `session` commits, for writes that bypass the ORM flush."""
+    keys = {(kind, key) for key in ids}
+    if keys:
+        with _pending_lock:
+            _pending_writes.setdefault(session, set()).update(keys)
+
+
+def _apply_reference_writes(session: Session) -> None:
+    with _pending_lock:
+        pending = _pending_writes.pop(session, None)
+    if not pending:
+        return
+    by_kind: Dict[str, Set[int]] = collections.defaultdict(set)
+    for kind, key in pending:
+        by_kind[kind].add(key)
+    for kind, keys in by_kind.items():
+        reference_cache.invalidate(kind, keys)
+    logger.debug("reference_cache: invalidated %s", {kind: len(keys) for kind, keys in by_kind.items()})
+
+
+def _discard_reference_writes(session: Session) -> None:
+    with _pending_lock:
+        _pending_writes.pop(session, None)
+
+
+event.listen(Session, "after_flush", _collect_reference_writes)
+event.listen(Session, "after_commit", _apply_reference_writes)
+event.listen(Session, "after_rollback", _discard_reference_writes)
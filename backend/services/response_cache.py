@@ -0,0 +1,277 @@
+"""Versioned response cache with ETag / 304 support for derived read endpoints.
+
+Standings, brackets, team statistics, head-to-head and the enhanced player
+card are all recomputed from raw matches on every request, although their
+inputs only change when the scheduler persists a new result, score or
+status. `cached_response` memoizes the rendered JSON of such endpoints:
+
+* Entries are keyed by path + sorted query string and tagged with the
+  data version they were computed at. A strong ``ETag`` (SHA-256 of the
+  body) is sent with every response, and a matching ``If-None-Match``
+  gets an empty 304.
+* The version is the ``matches`` row of ``data_versions`` (bumped by the
+  scheduler in the same transaction as the write, see
+  `bump_data_version`) combined with a process-local counter that the
+  bump increments on commit, so the process that wrote sees it at once.
+  Other workers re-read the shared row at most every
+  ``RESPONSE_CACHE_VERSION_POLL_SECONDS``.
+* Entries also expire after ``RESPONSE_CACHE_TTL_SECONDS`` as a backstop
+  for inputs the counter doesn't track (player stats synced by scripts,
+  external enrichment), and the cache is an LRU of at most
+  ``RESPONSE_CACHE_MAX_ENTRIES`` bodies.
+
+Only successful responses are cached; `HTTPException`s propagate as
+usual.
+"""
+
+from __future__ import annotations
+
+import collections
+import datetime
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    from backend.models import DataVersion
+except ImportError:  # script-style execution
+    from models import DataVersion  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+MATCHES_SCOPE = "matches"
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600"))
+VERSION_POLL_SECONDS = float(os.getenv("RESPONSE_CACHE_VERSION_POLL_SECONDS", "5"))
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+# ── Data version ────────────────────────────────────────────────────────────
+
+_version_lock = threading.Lock()
+_local_version = 0
+_shared_version: Optional[int] = None
+_shared_version_read_at = 0.0
+
+
+def _bump_local_version(_session=None) -> None:
+    global _local_version
+    with _version_lock:
+        _local_version += 1
+
+
+def bump_data_version(db: Session, scope: str = MATCHES_SCOPE) -> None:
+    """Mark derived responses stale, inside the caller's transaction.
+
+    This process's cache is invalidated when the transaction commits (not
+    before, or a request could re-cache the pre-commit data under the new
+    version). The shared row is updated in a SAVEPOINT so a missing
+    ``data_versions`` table (migration not applied yet) can't abort the
+    caller's transaction.
+    """
+    if not event.contains(db, "after_commit", _bump_local_version):
+        event.listen(db, "after_commit", _bump_local_version, once=True)
+
+    now = datetime.datetime.utcnow()
+    try:
+        with db.begin_nested():
+            updated = (
+                db.query(DataVersion)
+                .filter(DataVersion.name == scope)
+                .update(
+                    {DataVersion.version: DataVersion.version + 1, DataVersion.updated_at: now},
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                db.add(DataVersion(name=scope, version=1, updated_at=now))
+    except Exception:
+        logger.warning("Could not bump data version %r; other workers will rely on the TTL", scope, exc_info=True)
+
+
+def _read_shared_version(db: Session) -> Optional[int]:
+    global _shared_version, _shared_version_read_at
+
+    now = time.monotonic()
+    with _version_lock:
+        if now - _shared_version_read_at < VERSION_POLL_SECONDS:
+            return _shared_version
+        _shared_version_read_at = now
+
+    try:
+        with db.begin_nested():
+            version = (
+                db.query(DataVersion.version)
+                .filter(DataVersion.name == MATCHES_SCOPE)
+                .scalar()
+            )
+    except Exception:
+        logger.warning("Could not read data version; relying on TTL", exc_info=True)
+        version = None
+
+    with _version_lock:
+        _shared_version = version
+    return version
+
+
+def current_data_version(db: Session) -> Tuple[Optional[int], int]:
+    """`(shared, local)` version pair that cached entries are tagged with."""
+    shared = _read_shared_version(db)
+    with _version_lock:
+        return shared, _local_version
+
+
+# ── Response cache ──────────────────────────────────────────────────────────
+
+
+class _Entry:
+    __slots__ = ("version", "body", "etag", "expires")
+
+    def __init__(self, version, body: bytes, etag: str, expires: float):
+        self.version = version
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {candidate.strip() for candidate in header.split(",")}
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "collections.OrderedDict[CacheKey, _Entry]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.stale = 0
+
+    @staticmethod
+    def key_for(request: Request, params: Optional[Collection[str]] = None) -> CacheKey:
+        """Path plus the query parameters in `params` (all of them when None).
+
+        Parameters the endpoint doesn't read don't change its body, so they
+        must not make a new entry: otherwise any caller could skip the
+        cache (and force a recompute) by appending ``?x=<random>``.
+        """
+        items = request.query_params.multi_items()
+        if params is not None:
+            items = [(name, value) for name, value in items if name in params]
+        return request.url.path, tuple(sorted(items))
+
+    def _lookup(self, key: CacheKey, version) -> Optional[_Entry]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.version != version or entry.expires <= now):
+                del self._entries[key]
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key: CacheKey, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def respond(
+        self,
+        request: Request,
+        db: Session,
+        compute: Callable[[], Any],
+        params: Optional[Collection[str]] = None,
+    ) -> Response:
+        """Serve `compute()` as JSON from cache, honouring ``If-None-Match``."""
+        key = self.key_for(request, params)
+        version = current_data_version(db)
+        entry = self._lookup(key, version)
+        if entry is None:
+            body = JSONResponse(jsonable_encoder(compute())).body
+            entry = _Entry(version, body, _etag_for(body), time.monotonic() + self.ttl_seconds)
+            self._store(key, entry)
+
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _if_none_match(request, entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "stale": self.stale,
+                "not_modified": self.not_modified,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(func: Callable[..., Any]) -> Callable[..., Response]:
+    """Route decorator: serve the endpoint through `response_cache`.
+
+    The endpoint must take its session as ``db``. A ``request: Request``
+    parameter is added to the route signature when it doesn't declare one.
+    Entries are keyed on the query parameters the endpoint declares.
+    """
+    signature = inspect.signature(func)
+    inject_request = "request" not in signature.parameters
+    params = frozenset(signature.parameters)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        request = kwargs.pop("request") if inject_request else kwargs["request"]
+        return response_cache.respond(request, kwargs["db"], lambda: func(*args, **kwargs), params)
+
+    if inject_request:
+        parameters = list(signature.parameters.values())
+        parameters.append(
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        )
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
@@ -0,0 +1,237 @@
+"""Single-owner lease for the APScheduler jobs.
+
+Every uvicorn worker (and every replica) runs FastAPI's startup hook, so
+calling `start_scheduler()` there unconditionally runs the live sync,
+prediction, news and retrain jobs once *per process*: N times the
+football-data.org quota and N times the writes.
+
+`SchedulerLease` makes the jobs single-owner with a Postgres
+session-level advisory lock:
+
+* A background thread connects (with an ``application_name`` identifying
+  host and pid) and calls ``pg_try_advisory_lock``. The process that gets
+  it keeps that connection open and starts the scheduler; everyone else
+  disconnects and retries every ``SCHEDULER_LEASE_RETRY_SECONDS``.
+* The leader heartbeats on the same connection. If the process dies or
+  the connection drops, Postgres releases the lock and a follower takes
+  over on its next attempt; a leader that loses its connection stops its
+  scheduler before trying again.
+* `status()` reports this process's role and the current holder, read
+  from ``pg_locks`` joined to ``pg_stat_activity``.
+
+On non-Postgres databases (SQLite in tests) or with
+``SCHEDULER_LEADER_ELECTION=0`` the process always considers itself the
+leader, which is the previous behaviour.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary, but fixed: every process must agree on it. Kept below 2**31
+# so it shows up as `objid` (with classid 0) in pg_locks.
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "815221001"))
+RETRY_SECONDS = float(os.getenv("SCHEDULER_LEASE_RETRY_SECONDS", "15"))
+
+_HOLDER_SQL = """
+    SELECT a.application_name, a.pid, a.client_addr::text, a.backend_start
+    FROM pg_locks l
+    JOIN pg_stat_activity a ON a.pid = l.pid
+    WHERE l.locktype = 'advisory'
+      AND l.classid = 0
+      AND l.objid = %s
+      AND l.objsubid = 1
+      AND l.granted
+    LIMIT 1
+"""
+
+
+def _leader_election_enabled() -> bool:
+    return os.getenv("SCHEDULER_LEADER_ELECTION", "1").strip().lower() not in {"0", "false", "no"}
+
+
+class SchedulerLease:
+    def __init__(
+        self,
+        start_scheduler: Callable[[], Any],
+        engine=None,
+        lock_key: int = SCHEDULER_LOCK_KEY,
+        retry_seconds: float = RETRY_SECONDS,
+    ):
+        if engine is None:
+            try:
+                from backend.database import engine as default_engine
+            except ImportError:
+                from database import engine as default_engine  # type: ignore[no-redef]
+            engine = default_engine
+
+        self._start_scheduler = start_scheduler
+        self._engine = engine
+        self._lock_key = lock_key
+        self._retry_seconds = retry_seconds
+        self.identity = f"terraball-scheduler:{socket.gethostname()}:{os.getpid()}"
+
+        self._scheduler = None
+        self._conn = None
+        self._leader_since: Optional[datetime.datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._state_lock = threading.Lock()
+
+    @property
+    def uses_advisory_lock(self) -> bool:
+        return _leader_election_enabled() and self._engine.dialect.name == "postgresql"
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_since is not None
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    def start(self) -> None:
+        if not self.uses_advisory_lock:
+            self._become_leader()
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scheduler-lease", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._retry_seconds + 5)
+            self._thread = None
+        self._step_down()
+
+    # ── Internals ──────────────────────────────────────────────────────
+
+    def _become_leader(self) -> None:
+        with self._state_lock:
+            if self._scheduler is None:
+                self._scheduler = self._start_scheduler()
+            self._leader_since = datetime.datetime.now(tz=datetime.timezone.utc)
+        logger.info("Scheduler lease acquired by %s", self.identity)
+
+    def _step_down(self) -> None:
+        with self._state_lock:
+            scheduler, self._scheduler = self._scheduler, None
+            was_leader = self._leader_since is not None
+            self._leader_since = None
+            conn, self._conn = self._conn, None
+        if scheduler is not None:
+            try:
+                scheduler.shutdown(wait=False)
+            except Exception:
+                logger.exception("Failed to stop scheduler while releasing the lease")
+        if conn is not None:
+            try:
+                conn.close()  # closing the session releases the advisory lock
+            except Exception:
+                pass
+        if was_leader:
+            logger.info("Scheduler lease released by %s", self.identity)
+
+    def _connect(self):
+        import psycopg2
+
+        dsn = self._engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(
+            dsn,
+            application_name=self.identity[:63],
+            connect_timeout=10,
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=5,
+        )
+        conn.autocommit = True
+        return conn
+
+    def _try_acquire(self) -> bool:
+        # Followers don't keep a connection open between attempts: the
+        # Supabase pooler budget is small and shared by every worker.
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (self._lock_key,))
+                acquired = bool(cursor.fetchone()[0])
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def _heartbeat(self) -> None:
+        with self._conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+
+    def _tick(self) -> None:
+        """One heartbeat (leader) or acquisition attempt (follower)."""
+        try:
+            if self.is_leader:
+                self._heartbeat()
+            elif self._try_acquire():
+                self._become_leader()
+        except Exception:
+            if self.is_leader:
+                logger.exception("Scheduler lease connection lost; stepping down")
+            else:
+                logger.warning("Scheduler lease attempt failed", exc_info=True)
+            self._step_down()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._tick()
+            self._stop.wait(self._retry_seconds)
+
+    def _current_holder(self) -> Optional[Dict[str, Any]]:
+        raw = self._engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute(_HOLDER_SQL, (self._lock_key,))
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            raw.close()
+        if row is None:
+            return None
+        application_name, pid, client_addr, backend_start = row
+        return {
+            "identity": application_name,
+            "pid": pid,
+            "client_addr": client_addr,
+            "connected_since": backend_start,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """This process's role plus who currently holds the lease."""
+        status: Dict[str, Any] = {
+            "identity": self.identity,
+            "is_leader": self.is_leader,
+            "leader_since": self._leader_since,
+            "mode": "advisory_lock" if self.uses_advisory_lock else "always_leader",
+        }
+        if not self.uses_advisory_lock:
+            status["holder"] = {"identity": self.identity} if self.is_leader else None
+            return status
+        try:
+            status["holder"] = self._current_holder()
+        except Exception:
+            logger.warning("Could not read scheduler lease holder", exc_info=True)
+            status["holder"] = None
+        return status
@@ -0,0 +1,230 @@
+"""Team-centric match index: `team_matches`, kept in step with `matches`.
+
+A team's history used to be read with ``home_team_id = :team OR
+away_team_id = :team`` ordered by ``start_time``: the routers' form and
+player cards, `XGFeatureBuilder.team_history`, the 1X2 feature helpers and
+the next-event team prior and player form. No single index serves that
+filter, so Postgres scanned `matches`. `team_matches` holds one row per
+team per match (``is_home``, ``goals_for``/``goals_against`` from the
+team's side) under a ``(team_id, start_time DESC, match_id DESC)`` index,
+and `recent_team_matches` reads the last N matches of a team before a
+kickoff as one range scan joined back to `matches` by primary key.
+
+Keeping it in step:
+
+- ORM writes: any session that flushes a new, changed or deleted `Match`
+  rewrites that match's rows in the same transaction (``after_flush``),
+  once this module is imported (the API and the scheduler import it).
+- Core writes, such as the scheduler's set-based fixture upserts, call
+  `sync_team_matches` with the rows they wrote.
+- `rebuild_team_matches` (``python -m services.team_matches``) rebuilds
+  everything; the migration backfills it too. Re-run it after scripts that
+  write `matches` without importing this module.
+
+Without the table (migration not applied yet; checked once per process)
+`recent_team_matches` runs the ``OR`` query instead, with the same result.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import weakref
+from typing import Any, Collection, Iterable, List, Mapping, Optional
+
+from sqlalchemy import event, inspect as sa_inspect, or_
+from sqlalchemy.orm import Session
+
+try:
+    from backend.models import Match, TeamMatch
+except ImportError:
+    from models import Match, TeamMatch  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("FT", "AET", "PEN")
+
+# The `Match` columns a team's rows are derived from.
+SOURCE_COLUMNS = ("id", "home_team_id", "away_team_id", "start_time", "status", "home_score", "away_score", "league_id")
+
+_SYNC_BATCH_SIZE = 1000
+
+_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _table_available(db: Session) -> bool:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    present = _table_present.get(engine)
+    if present is None:
+        present = sa_inspect(db.connection()).has_table(TeamMatch.__tablename__)
+        _table_present[engine] = present
+    return present
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+
+def recent_team_matches(
+    db: Session,
+    team_id: int,
+    before: Optional[datetime.datetime] = None,
+    limit: int = 10,
+    *,
+    statuses: Collection[str] = FINISHED_STATUSES,
+    scored: bool = False,
+    is_home: Optional[bool] = None,
+    exclude_match_id: Optional[int] = None,
+) -> List[Match]:
+    """The team's last `limit` matches in `statuses` kicking off before `before`, newest first.
+
+    ``scored`` keeps only matches with both scores set; ``is_home`` keeps
+    only home (True) or away (False) matches. Ties on kickoff go to the
+    higher match id.
+    """
+    if _table_available(db):
+        query = (
+            db.query(Match)
+            .join(TeamMatch, TeamMatch.match_id == Match.id)
+            .filter(TeamMatch.team_id == team_id, TeamMatch.status.in_(list(statuses)))
+        )
+        if before is not None:
+            query = query.filter(TeamMatch.start_time < before)
+        if scored:
+            query = query.filter(TeamMatch.goals_for.isnot(None), TeamMatch.goals_against.isnot(None))
+        if is_home is not None:
+            query = query.filter(TeamMatch.is_home == is_home)
+        if exclude_match_id is not None:
+            query = query.filter(TeamMatch.match_id != exclude_match_id)
+        query = query.order_by(TeamMatch.start_time.desc(), TeamMatch.match_id.desc())
+    else:
+        if is_home is None:
+            side = or_(Match.home_team_id == team_id, Match.away_team_id == team_id)
+        elif is_home:
+            side = Match.home_team_id == team_id
+        else:
+            side = Match.away_team_id == team_id
+        query = db.query(Match).filter(side, Match.status.in_(list(statuses)))
+        if before is not None:
+            query = query.filter(Match.start_time < before)
+        if scored:
+            query = query.filter(Match.home_score.isnot(None), Match.away_score.isnot(None))
+        if exclude_match_id is not None:
+            query = query.filter(Match.id != exclude_match_id)
+        query = query.order_by(Match.start_time.desc(), Match.id.desc())
+    return query.limit(limit).all()
+
+
+# ── Writing ─────────────────────────────────────────────────────────────────
+
+
+def team_match_rows(match: Mapping[str, Any]) -> List[dict]:
+    """The `team_matches` rows of a match given as a dict of `SOURCE_COLUMNS`."""
+    rows = []
+    for team_id, is_home, goals_for, goals_against in (
+        (match["home_team_id"], True, match["home_score"], match["away_score"]),
+        (match["away_team_id"], False, match["away_score"], match["home_score"]),
+    ):
+        if team_id is None or any(row["team_id"] == team_id for row in rows):
+            continue
+        rows.append({
+            "match_id": match["id"],
+            "team_id": team_id,
+            "is_home": is_home,
+            "start_time": match["start_time"],
+            "status": match["status"],
+            "goals_for": goals_for,
+            "goals_against": goals_against,
+            "league_id": match["league_id"],
+        })
+    return rows
+
+
+def _replace_rows(db: Session, match_ids: Iterable[int], rows: List[dict]) -> None:
+    match_ids = sorted(set(match_ids))
+    table = TeamMatch.__table__
+    for start in range(0, len(match_ids), _SYNC_BATCH_SIZE):
+        db.execute(table.delete().where(table.c.match_id.in_(match_ids[start:start + _SYNC_BATCH_SIZE])))
+    for start in range(0, len(rows), _SYNC_BATCH_SIZE):
+        db.execute(table.insert(), rows[start:start + _SYNC_BATCH_SIZE])
+
+
+def sync_team_matches(db: Session, matches: Iterable[Mapping[str, Any]]) -> None:
+    """Rewrite the rows of `matches` (dicts of `SOURCE_COLUMNS`) in the caller's transaction.
+
+    For writes that bypass the ORM flush. A no-op until the table exists.
+    """
+    matches = list(matches)
+    if not matches or not _table_available(db):
+        return
+    _replace_rows(
+        db,
+        (match["id"] for match in matches),
+        [row for match in matches for row in team_match_rows(match)],
+    )
+
+
+def _source_changed(match: Match) -> bool:
+    state = sa_inspect(match)
+    return any(state.attrs[column].history.has_changes() for column in SOURCE_COLUMNS)
+
+
+def _sync_flushed_matches(session: Session, _flush_context) -> None:
+    written = [
+        match
+        for match in session.new
+        if isinstance(match, Match)
+    ] + [
+        match
+        for match in session.dirty
+        if isinstance(match, Match) and _source_changed(match)
+    ]
+    deleted = [match.id for match in session.deleted if isinstance(match, Match)]
+    if not (written or deleted) or not _table_available(session):
+        return
+    _replace_rows(
+        session,
+        [match.id for match in written] + deleted,
+        [
+            row
+            for match in written
+            for row in team_match_rows({column: getattr(match, column) for column in SOURCE_COLUMNS})
+        ],
+    )
+
+
+event.listen(Session, "after_flush", _sync_flushed_matches)
+
+
+def rebuild_team_matches(db: Session) -> int:
+    """Replace every row from `matches`. Returns the number of rows written."""
+    db.execute(TeamMatch.__table__.delete())
+    columns = [getattr(Match, column) for column in SOURCE_COLUMNS]
+    rows = [
+        row
+        for match in db.query(*columns).yield_per(_SYNC_BATCH_SIZE)
+        for row in team_match_rows(match._mapping)
+    ]
+    for start in range(0, len(rows), _SYNC_BATCH_SIZE):
+        db.execute(TeamMatch.__table__.insert(), rows[start:start + _SYNC_BATCH_SIZE])
+    return len(rows)
+
+
+def main() -> None:
+    try:
+        from backend.database import SessionLocal
+    except ImportError:
+        from database import SessionLocal  # type: ignore[no-redef]
+
+    db = SessionLocal()
+    try:
+        count = rebuild_team_matches(db)
+        db.commit()
+        print(f"Persisted {count} team match rows.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
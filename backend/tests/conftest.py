@@ -0,0 +1,101 @@
+"""Shared fixtures: in-memory databases, API clients and football-data.org feed rows."""
+import contextlib
+import os
+import sys
+
+import pytest
+
+# Ensure backend package is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def memory_sessions():
+    """Call with a models ``metadata`` to get a sessionmaker on a new in-memory database.
+
+    Pass the metadata the module under test resolved (``api.Match.metadata``,
+    ``scheduler.Match.metadata``, ...): routers and services import the
+    models as ``backend.models`` when they can, which is a different
+    ``Base`` from ``models``. All sessions share one connection
+    (``StaticPool``), so a TestClient's worker thread sees what the test
+    wrote. The engine is ``factory.kw["bind"]``; it is disposed after the
+    test.
+    """
+    engines = []
+
+    def make(metadata):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        metadata.create_all(engine)
+        engines.append(engine)
+        return sessionmaker(bind=engine, autoflush=False)
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def api_client():
+    """Call with a sessionmaker to get a TestClient serving `routers.api` on it.
+
+    Pass other router modules to serve those instead; each one's ``get_db``
+    is overridden. The response cache the routers use is cleared before
+    and after the test.
+    """
+    from routers import api
+
+    response_cache = sys.modules[api.cached_response.__module__].response_cache
+    response_cache.clear()
+    with contextlib.ExitStack() as stack:
+
+        def make(session_factory, *routers):
+            def override_get_db():
+                db = session_factory()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app = FastAPI()
+            for module in routers or (api,):
+                app.include_router(module.router)
+                app.dependency_overrides[module.get_db] = override_get_db
+            return stack.enter_context(TestClient(app))
+
+        yield make
+    response_cache.clear()
+
+
+def _feed_fixture(
+    match_id, home, away, status="TIMED", score=(None, None), day=1, date=None, league_id=2021, **extra
+):
+    return {
+        "id": match_id,
+        "utcDate": date or f"2026-03-{day:02d}T15:00:00Z",
+        "status": status,
+        "homeTeam": {"id": home, "name": f"Team {home}", "crest": f"{home}.png"},
+        "awayTeam": {"id": away, "name": f"Team {away}", "crest": f"{away}.png"},
+        "score": {"fullTime": {"home": score[0], "away": score[1]}},
+        "competition": {"id": league_id, "name": "Premier League"},
+        **extra,
+    }
+
+
+@pytest.fixture
+def feed_fixture():
+    """Builds a football-data.org ``matches`` entry, as `scheduler._persist_matches` takes them.
+
+    ``feed_fixture(1, 1, 2, status="FINISHED", score=(2, 1), day=3)`` is a
+    2-1 home win kicking off 2026-03-03 15:00 UTC; ``date`` sets the
+    kickoff outright and extra keywords (``minute``, ``stage``, ...) are
+    added to the entry.
+    """
+    return _feed_fixture
@@ -0,0 +1,104 @@
+"""Parity between the sync handlers and their DB_ASYNC counterparts."""
+import datetime
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from routers import api, api_async
+from routers.api import get_db
+from routers.api_async import get_async_db
+from services.reference_cache import reference_cache
+
+# Resolve the models through the router so both paths share one registry.
+League, Match, MatchEvent, Player, Prediction, Team = (
+    api.League, api.Match, api.MatchEvent, api.Player, api.Prediction, api.Team
+)
+
+
+@pytest.fixture
+def clients(tmp_path):
+    path = tmp_path / "parity.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    api.Match.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    kickoff = datetime.datetime(2026, 5, 1, 15, 0)
+    with SessionLocal() as db:
+        db.add(League(id=39, name="Premier League", country="England", logo_url="pl.png"))
+        db.add_all([
+            Team(id=1, name="Home FC", logo_url="h.png", stadium="Home Park", league_id=39),
+            Team(id=2, name="Away FC", logo_url="a.png", stadium="Away Park", league_id=39),
+        ])
+        db.add_all([
+            Match(id=10, home_team_id=1, away_team_id=2, league_id=39, start_time=kickoff,
+                  status="FT", home_score=2, away_score=1),
+            Match(id=11, home_team_id=2, away_team_id=1, league_id=None,
+                  start_time=kickoff + datetime.timedelta(days=7), status="NS"),
+        ])
+        db.add(Prediction(id=1, match_id=11, home_win_prob=40.0, draw_prob=30.0,
+                          away_win_prob=30.0, confidence_score=0.6))
+        db.add_all([Player(id=100 + i, name=f"Player {i}", position="Midfielder", team_id=1) for i in range(3)])
+        db.add_all([
+            MatchEvent(id=1, match_id=10, minute=55, event_type="Goal", team_id=1, player_name="Player 0"),
+            MatchEvent(id=2, match_id=10, minute=12, event_type="Card", team_id=2, detail="Yellow Card"),
+        ])
+        db.commit()
+    reference_cache.clear()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    sync_app = FastAPI()
+    sync_app.include_router(api.router)
+    sync_app.dependency_overrides[get_db] = override_get_db
+
+    async_app = FastAPI()
+    async_app.include_router(api_async.router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(sync_app) as sync_client, TestClient(async_app) as async_client:
+        yield sync_client, async_client
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/v1/leagues",
+        "/api/v1/live-matches",
+        "/api/v1/live-matches?league_id=39&status=finished",
+        "/api/v1/live-matches?order=desc&limit=1&offset=1",
+        "/api/v1/live-matches?limit=1&include_total=false",
+        "/api/v1/live-matches?cursor=WyIyMDI2LTA1LTAxVDE1OjAwOjAwIiwxMF0",
+        "/api/v1/live-matches?cursor=bogus",
+        "/api/v1/match/11/details",
+        "/api/v1/match/999/details",
+        "/api/v1/match-events/bulk?match_ids=10,11,10",
+        "/api/v1/match-events/bulk?match_ids=abc",
+    ],
+)
+def test_async_handlers_match_sync_handlers(clients, url):
+    sync_client, async_client = clients
+    expected = sync_client.get(url)
+    actual = async_client.get(url)
+
+    assert actual.status_code == expected.status_code
+    assert actual.json() == expected.json()
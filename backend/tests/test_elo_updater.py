@@ -0,0 +1,80 @@
+"""Incremental Elo replay: the same snapshots and ratings as a full rebuild."""
+import datetime
+import random
+
+import pytest
+
+from ai import elo_updater, match_outcome_features
+
+# Resolve the models through the module under test so both share one registry.
+Match, TeamEloRating, TeamEloSnapshot = elo_updater.Match, elo_updater.TeamEloRating, elo_updater.TeamEloSnapshot
+
+KICKOFF = datetime.datetime(2025, 8, 1, 15, 0)
+
+
+@pytest.fixture
+def db(memory_sessions):
+    SessionLocal = memory_sessions(Match.metadata)
+
+    rng = random.Random(5)
+    with SessionLocal() as session:
+        for match_id in range(1, 121):
+            home, away = rng.sample(range(1, 13), 2)
+            finished = match_id <= 100
+            session.add(Match(
+                id=match_id, home_team_id=home, away_team_id=away, league_id=39,
+                start_time=KICKOFF + datetime.timedelta(days=match_id // 3, hours=rng.choice([0, 2])),
+                status="FT" if finished else "NS",
+                home_score=rng.randint(0, 4) if finished else None,
+                away_score=rng.randint(0, 3) if finished else None,
+            ))
+        session.flush()
+        elo_updater.rebuild_elo(session)
+        session.commit()
+        yield session
+
+
+def _state(db):
+    snapshots = sorted(
+        (s.team_id, s.match_id, s.pre_match_elo, s.post_match_elo, s.is_home, s.snapshot_at)
+        for s in db.query(TeamEloSnapshot).all()
+    )
+    ratings = sorted((r.team_id, r.rating, r.last_match_id, r.last_match_at) for r in db.query(TeamEloRating).all())
+    return snapshots, ratings
+
+
+def test_incremental_replay_matches_full_rebuild(db):
+    # A new result at full time, a late result a month back, a corrected
+    # score and a result that turns out not to be final after all.
+    db.get(Match, 101).status, db.get(Match, 101).home_score, db.get(Match, 101).away_score = "FT", 2, 2
+    db.add(Match(id=500, home_team_id=1, away_team_id=2, league_id=39, status="FT",
+                 start_time=KICKOFF + datetime.timedelta(days=10, hours=1), home_score=4, away_score=0))
+    db.get(Match, 40).home_score += 3
+    db.get(Match, 70).status = "PST"
+    db.flush()
+
+    since = min(db.get(Match, match_id).start_time for match_id in (101, 500, 40, 70))
+    touched = elo_updater.refresh_elo(db, since)
+    assert {1, 2} <= set(touched)
+    incremental = _state(db)
+
+    elo_updater.rebuild_elo(db)
+    assert incremental == _state(db)
+
+
+def test_new_result_replays_only_that_match(db):
+    match = db.get(Match, 101)
+    match.status, match.home_score, match.away_score = "FT", 1, 0
+    match.start_time = KICKOFF + datetime.timedelta(days=200)
+    db.flush()
+    before = {s.match_id for s in db.query(TeamEloSnapshot).filter(TeamEloSnapshot.snapshot_at < match.start_time)}
+
+    touched = elo_updater.refresh_elo(db, match.start_time)
+
+    assert set(touched) == {match.home_team_id, match.away_team_id}
+    assert before | {101} == {s.match_id for s in db.query(TeamEloSnapshot)}
+    upcoming = KICKOFF + datetime.timedelta(days=365)
+    for team_id in touched:
+        rating = db.get(TeamEloRating, team_id)
+        assert rating.last_match_id == 101
+        assert match_outcome_features._team_latest_post_elo(db, team_id, upcoming) == rating.rating
@@ -152,3 +152,239 @@ class TestAuth:
             with pytest.raises(HTTPException) as exc_info:
                 await get_current_user(token="fake", db=MagicMock())
             assert exc_info.value.status_code == 500
+
+
+# ─── Scheduler lease ─────────────────────────────────────────────────────────────
+
+class FakeAdvisoryLocks:
+    """One Postgres advisory lock: held by a session until it closes or drops."""
+
+    def __init__(self):
+        self.holder = None
+        self.connections = []
+
+    def connect(self):
+        conn = FakeLeaseConnection(self)
+        self.connections.append(conn)
+        return conn
+
+
+class FakeLeaseConnection:
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+        self.dropped = False
+
+    def cursor(self):
+        return FakeLeaseCursor(self)
+
+    def drop(self):
+        self.dropped = True
+        if self.server.holder is self:
+            self.server.holder = None
+
+    def close(self):
+        self.closed = True
+        if self.server.holder is self:
+            self.server.holder = None
+
+
+class FakeLeaseCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.dropped or self.conn.closed:
+            raise OSError("server closed the connection unexpectedly")
+        if "pg_try_advisory_lock" in sql:
+            granted = self.conn.server.holder in (None, self.conn)
+            if granted:
+                self.conn.server.holder = self.conn
+            self.row = (granted,)
+        else:
+            self.row = (1,)
+
+    def fetchone(self):
+        return self.row
+
+
+class TestSchedulerLease:
+    def test_non_postgres_engine_is_always_leader(self):
+        from sqlalchemy import create_engine
+        from services.scheduler_lease import SchedulerLease
+
+        scheduler = MagicMock()
+        lease = SchedulerLease(lambda: scheduler, engine=create_engine("sqlite://"))
+        lease.start()
+
+        assert lease.is_leader
+        assert lease.status()["mode"] == "always_leader"
+        assert lease.status()["holder"] == {"identity": lease.identity}
+
+        lease.stop()
+        scheduler.shutdown.assert_called_once_with(wait=False)
+        assert not lease.is_leader
+
+    def _lease(self, server, monkeypatch):
+        from services.scheduler_lease import SchedulerLease
+
+        monkeypatch.setenv("SCHEDULER_LEADER_ELECTION", "1")
+        engine = MagicMock()
+        engine.dialect.name = "postgresql"
+        scheduler = MagicMock()
+        lease = SchedulerLease(lambda: scheduler, engine=engine)
+        monkeypatch.setattr(lease, "_connect", server.connect)
+        return lease, scheduler
+
+    def test_advisory_lock_acquire_lose_and_takeover(self, monkeypatch):
+        server = FakeAdvisoryLocks()
+        first, first_scheduler = self._lease(server, monkeypatch)
+        second, second_scheduler = self._lease(server, monkeypatch)
+        assert first.uses_advisory_lock
+
+        # Acquire: the first instance gets the lock, the second is denied
+        # and does not keep its connection open.
+        first._tick()
+        second._tick()
+        assert first.is_leader and first.scheduler is first_scheduler
+        assert not second.is_leader and second.scheduler is None
+        assert server.holder is server.connections[0]
+        assert server.connections[1].closed
+
+        # A healthy heartbeat keeps the lease.
+        first._tick()
+        assert first.is_leader
+
+        # Lose the lease: the heartbeat fails, the scheduler stops.
+        server.connections[0].drop()
+        first._tick()
+        assert not first.is_leader and first.scheduler is None
+        first_scheduler.shutdown.assert_called_once_with(wait=False)
+
+        # Takeover by the second instance; the first is now a follower.
+        second._tick()
+        first._tick()
+        assert second.is_leader and second.scheduler is second_scheduler
+        assert not first.is_leader
+
+        # Re-acquire once the new leader goes away.
+        second.stop()
+        second_scheduler.shutdown.assert_called_once_with(wait=False)
+        first._tick()
+        assert first.is_leader and first.scheduler is first_scheduler
+
+
+# ─── Reference-data cache ───────────────────────────────────────────────────────
+
+class TestReferenceCache:
+    @pytest.fixture
+    def session(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        # Use the models the cache module resolved (package or script-style).
+        from services.reference_cache import League, Team
+
+        engine = create_engine("sqlite://")
+        Team.metadata.create_all(engine, tables=[League.__table__, Team.__table__])
+        db = sessionmaker(bind=engine)()
+        db.add(League(id=39, name="Premier League", country="England", logo_url=""))
+        db.add(Team(id=1, name="Arsenal", logo_url="a.png", stadium="Emirates", league_id=39))
+        db.commit()
+        yield db
+        db.close()
+
+    def test_hits_after_first_lookup_and_invalidates_on_commit(self, session):
+        import services.reference_cache as reference_module
+        from services.reference_cache import ReferenceDataCache, Team
+
+        cache = ReferenceDataCache(ttl_seconds=60, max_entries=10)
+        with patch.object(reference_module, "reference_cache", cache):
+            assert cache.get_team(session, 1).name == "Arsenal"
+            assert cache.get_teams(session, [1, 2]) == {1: cache.get_team(session, 1)}
+            assert cache.stats()["teams"]["hits"] == 2
+            assert cache.get_team(session, 2) is None  # cached miss
+
+            session.query(Team).filter(Team.id == 1).one().name = "Arsenal FC"
+            session.add(Team(id=2, name="Chelsea", logo_url="", stadium="", league_id=39))
+            session.commit()
+
+            assert cache.get_team(session, 1).name == "Arsenal FC"
+            assert cache.get_team(session, 2).name == "Chelsea"
+            assert cache.stats()["teams"]["invalidations"] == 2
+
+    def test_size_bound_evicts_least_recently_used(self, session):
+        from services.reference_cache import ReferenceDataCache
+
+        cache = ReferenceDataCache(ttl_seconds=60, max_entries=1)
+        cache.get_league(session, 39)
+        cache.get_league(session, 40)
+
+        stats = cache.stats()["leagues"]
+        assert stats["size"] == 1
+        assert stats["evictions"] == 1
+
+
+# ─── Response cache / ETags ─────────────────────────────────────────────────────
+
+class TestResponseCache:
+    def test_etag_304_and_invalidation_on_data_version_bump(self):
+        from fastapi import Depends, FastAPI
+        from fastapi.testclient import TestClient
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        import services.response_cache as response_module
+
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        response_module.DataVersion.metadata.create_all(
+            engine, tables=[response_module.DataVersion.__table__]
+        )
+        SessionLocal = sessionmaker(bind=engine)
+
+        def get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        calls = []
+        app = FastAPI()
+
+        @app.get("/league/{league_id}/standings")
+        @response_module.cached_response
+        def standings(league_id: int, db=Depends(get_db)):
+            calls.append(league_id)
+            return {"league_id": league_id, "computed": len(calls)}
+
+        cache = response_module.ResponseCache()
+        with patch.object(response_module, "response_cache", cache), \
+                patch.object(response_module, "VERSION_POLL_SECONDS", 0):
+            client = TestClient(app)
+            first = client.get("/league/39/standings")
+            etag = first.headers["etag"]
+            assert first.json() == {"league_id": 39, "computed": 1}
+
+            cached = client.get("/league/39/standings", headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert calls == [39]
+
+            db = SessionLocal()
+            response_module.bump_data_version(db)
+            db.commit()
+            db.close()
+
+            fresh = client.get("/league/39/standings", headers={"If-None-Match": etag})
+            assert fresh.status_code == 200
+            assert fresh.json()["computed"] == 2
+            assert fresh.headers["etag"] != etag
+            assert cache.stats()["not_modified"] == 1
@@ -0,0 +1,87 @@
+"""generate_predictions: batch scoring and the single-statement upsert."""
+import datetime
+
+import pytest
+
+from sqlalchemy import event
+
+import generate_predictions
+
+# Resolve the models through the module under test so both share one registry.
+Match, Prediction, Standing = generate_predictions.Match, generate_predictions.Prediction, generate_predictions.Standing
+
+KICKOFF = datetime.datetime(2026, 8, 15, 15, 0)
+
+
+@pytest.fixture
+def session_factory(memory_sessions, monkeypatch):
+    SessionLocal = memory_sessions(Match.metadata)
+
+    with SessionLocal() as db:
+        for match_id in range(1, 41):
+            db.add(Match(
+                id=match_id, home_team_id=match_id % 10 + 1, away_team_id=(match_id + 3) % 10 + 1,
+                league_id=39, start_time=KICKOFF + datetime.timedelta(hours=match_id),
+                status="NS" if match_id <= 30 else "FT",
+            ))
+        db.add_all([
+            Standing(id=team_id, league_id=39, team_id=team_id, points=3 * team_id, played=10)
+            for team_id in range(1, 11)
+        ])
+        # A stale prediction the job must overwrite rather than duplicate.
+        db.add(Prediction(id=1, match_id=2, home_win_prob=0.1, draw_prob=0.1, away_win_prob=0.8,
+                          confidence_score=0.8))
+        db.commit()
+
+    # The model scores even match ids; odd ones take the standings heuristic.
+    monkeypatch.setattr(
+        generate_predictions,
+        "predict_for_matches",
+        lambda db, matches: {m.id: (0.5, 0.3, 0.2) for m in matches if m.id % 2 == 0},
+    )
+    monkeypatch.setattr(generate_predictions, "SessionLocal", SessionLocal)
+    return SessionLocal.kw["bind"], SessionLocal
+
+
+def test_generate_predictions_upserts_one_row_per_match(session_factory):
+    engine, SessionLocal = session_factory
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda _c, _cur, statement, *_a: statements.append(statement))
+
+    generate_predictions.generate_predictions()
+    first_run = len(statements)
+    statements.clear()
+    generate_predictions.generate_predictions()
+
+    # Upcoming matches, standings, and the upsert inside its savepoint,
+    # however many matches there are.
+    assert first_run == len(statements) == 5
+    assert sum(statement.lstrip().upper().startswith("INSERT") for statement in statements) == 1
+
+    with SessionLocal() as db:
+        predictions = {p.match_id: p for p in db.query(Prediction).all()}
+        assert sorted(predictions) == list(range(1, 31))
+        assert db.query(Prediction).count() == 30
+        assert predictions[2].id == 1
+        assert (predictions[2].home_win_prob, predictions[2].confidence_score) == (0.5, 0.5)
+
+        match = db.get(Match, 3)
+        expected = generate_predictions._heuristic_probabilities(
+            db.get(Standing, match.home_team_id), db.get(Standing, match.away_team_id)
+        )
+        actual = predictions[3]
+        assert (actual.home_win_prob, actual.draw_prob, actual.away_win_prob) == expected
+        assert actual.confidence_score == max(expected)
+
+
+def test_generate_predictions_without_unique_index_falls_back(session_factory):
+    engine, SessionLocal = session_factory
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX uq_predictions_match_id")
+
+    generate_predictions.generate_predictions()
+    generate_predictions.generate_predictions()
+
+    with SessionLocal() as db:
+        assert sorted(p.match_id for p in db.query(Prediction).all()) == list(range(1, 31))
+        assert db.get(Prediction, 1).home_win_prob == 0.5
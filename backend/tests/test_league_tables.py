@@ -0,0 +1,121 @@
+"""Materialized league tables: incremental updates, reversals and the live overlay."""
+import pytest
+
+import scheduler
+from routers import api
+
+league_tables = api.league_tables
+LEAGUE_ID = 2021
+
+
+@pytest.fixture
+def session_factory(memory_sessions):
+    return memory_sessions(api.Match.metadata)
+
+
+def _sync(session_factory, feed):
+    with session_factory() as db:
+        scheduler._persist_matches(db, feed)
+        db.commit()
+
+
+def _stored(db, league_id=LEAGUE_ID):
+    rows = league_tables.stored_league_table(db, league_id)
+    return {row["team_id"]: row for row in rows}
+
+
+def _assert_matches_recomputed(db):
+    stored = _stored(db)
+    expected = {row.pop("team_id"): row for row in api._compute_league_standings(LEAGUE_ID, db)}
+    assert set(stored) == set(expected)
+    for team_id, row in expected.items():
+        row.pop("rank")
+        assert {key: stored[team_id][key] for key in row} == row
+
+    league_tables.rebuild_league_tables(db, [LEAGUE_ID])
+    assert _stored(db) == stored
+
+
+def test_results_and_corrections_are_applied_incrementally(session_factory, feed_fixture):
+    _sync(session_factory, [feed_fixture(match_id, home, away, day=match_id) for match_id, home, away in (
+        (1, 1, 2), (2, 3, 4), (3, 1, 3), (4, 2, 4), (5, 4, 1), (6, 2, 3),
+    )])
+    with session_factory() as db:
+        assert {row["played"] for row in _stored(db).values()} == {0}
+
+    _sync(session_factory, [
+        feed_fixture(1, 1, 2, status="FINISHED", score=(2, 1), day=1),
+        feed_fixture(2, 3, 4, status="FINISHED", score=(0, 0), day=2),
+        feed_fixture(3, 1, 3, status="FINISHED", score=(0, 3), day=3),
+        feed_fixture(4, 2, 4, status="IN_PLAY", score=(1, 0), day=4, minute=30),
+    ])
+    with session_factory() as db:
+        _assert_matches_recomputed(db)
+        assert _stored(db)[1]["form"] == "WL"
+
+    # A corrected score, a result withdrawn and a new one.
+    _sync(session_factory, [
+        feed_fixture(1, 1, 2, status="FINISHED", score=(1, 1), day=1),
+        feed_fixture(3, 1, 3, status="POSTPONED", day=3),
+        feed_fixture(4, 2, 4, status="FINISHED", score=(1, 0), day=4),
+    ])
+    with session_factory() as db:
+        _assert_matches_recomputed(db)
+        team_1 = _stored(db)[1]
+        assert (team_1["played"], team_1["points"], team_1["goals_for"], team_1["form"]) == (1, 1, 1, "D")
+
+
+def test_endpoints_serve_the_store_with_a_live_overlay(session_factory, feed_fixture, api_client):
+    _sync(session_factory, [
+        feed_fixture(1, 1, 2, status="FINISHED", score=(2, 0), day=1),
+        feed_fixture(2, 3, 4, status="IN_PLAY", score=(3, 0), day=2, minute=70),
+        feed_fixture(3, 5, 6, status="FINISHED", score=(1, 0), day=1, stage="GROUP_STAGE", group="Group A")
+        | {"competition": {"id": 2000, "name": "World Cup"}},
+        feed_fixture(4, 5, 6, status="FINISHED", score=(4, 0), day=5, stage="LAST_16")
+        | {"competition": {"id": 2000, "name": "World Cup"}},
+    ])
+
+    client = api_client(session_factory)
+    table = client.get(f"/api/v1/league/{LEAGUE_ID}/standings").json()
+    assert [(row["rank"], row["team_id"], row["points"]) for row in table] == [
+        (1, 1, 3), (2, 3, 0), (3, 4, 0), (4, 2, 0),
+    ]
+    assert "live" not in table[0]
+
+    live = client.get(f"/api/v1/league/{LEAGUE_ID}/standings?live=true").json()
+    assert [(row["team_id"], row["points"], row["live"]) for row in live] == [
+        (3, 3, True), (1, 3, False), (2, 0, False), (4, 0, True),
+    ]
+
+    groups = client.get("/api/v1/league/2000/standings").json()
+    assert groups["type"] == "tournament"
+    assert [(row["position"], row["team_id"], row["played"]) for row in groups["groups"][0]["table"]] == [
+        (1, 5, 1), (2, 6, 1),
+    ]
+
+    # The overlay is never persisted.
+    with session_factory() as db:
+        assert _stored(db)[3]["points"] == 0
+
+
+def test_only_the_latest_season_is_served(session_factory, feed_fixture, api_client):
+    last_season = "2025-03-01T15:00:00Z"
+    _sync(session_factory, [
+        feed_fixture(1, 1, 2, status="FINISHED", score=(2, 0), date=last_season),
+        feed_fixture(2, 7, 1, status="FINISHED", score=(3, 0), date=last_season),
+    ])
+    with session_factory() as db:
+        assert {team_id: row["points"] for team_id, row in _stored(db).items()} == {1: 3, 2: 0, 7: 3}
+
+    # The first fixture of the new season starts a new table.
+    _sync(session_factory, [feed_fixture(3, 1, 2, status="FINISHED", score=(0, 1), day=2)])
+    with session_factory() as db:
+        stored = _stored(db)
+        assert set(stored) == {1, 2}
+        assert (stored[1]["played"], stored[1]["points"], stored[1]["form"]) == (1, 0, "L")
+
+        league_tables.rebuild_league_tables(db, [LEAGUE_ID])
+        assert _stored(db) == stored
+
+    table = api_client(session_factory).get(f"/api/v1/league/{LEAGUE_ID}/standings").json()
+    assert [(row["team_id"], row["played"], row["points"]) for row in table] == [(2, 1, 3), (1, 1, 0)]
@@ -0,0 +1,408 @@
+"""Unit tests for the live WebSocket fan-out (topics, queues, batching)."""
+import asyncio
+import collections
+import json
+
+import pytest
+
+from connection_manager import ALL_TOPIC, ConnectionManager, league_topic, match_topic
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.accepted = False
+        self.closed_code = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_code = code
+
+
+class StalledWebSocket(FakeWebSocket):
+    """Accepts the first send and then never completes another one."""
+
+    async def send_text(self, message):
+        if self.sent:
+            await asyncio.sleep(3600)
+        self.sent.append(message)
+
+
+async def _settle():
+    # Let the per-connection writer tasks run.
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+# ─── Topic index ────────────────────────────────────────────────────────────────
+
+class TestTopicSubscriptions:
+    @pytest.mark.asyncio
+    async def test_legacy_client_defaults_to_all(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        assert manager.subscriptions(ws) == {ALL_TOPIC}
+
+    @pytest.mark.asyncio
+    async def test_publish_only_reaches_topic_subscribers(self):
+        manager = ConnectionManager()
+        match_fan, league_fan, other_fan, everything = (FakeWebSocket() for _ in range(4))
+        await manager.connect(match_fan, [match_topic(10)])
+        await manager.connect(league_fan, [league_topic(2021)])
+        await manager.connect(other_fan, [match_topic(99)])
+        await manager.connect(everything)
+
+        manager.publish([match_topic(10), league_topic(2021)], "goal")
+        await _settle()
+
+        assert match_fan.sent == ["goal"]
+        assert league_fan.sent == ["goal"]
+        assert everything.sent == ["goal"]
+        assert other_fan.sent == []
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_and_disconnect_clean_the_index(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, [match_topic(1), match_topic(2)])
+
+        assert manager.unsubscribe(ws, [match_topic(1)]) == {match_topic(2)}
+        manager.disconnect(ws)
+
+        assert manager.topic_counts() == {}
+        assert manager.active_connections == []
+
+
+class TestSubscriptionProtocol:
+    @pytest.mark.asyncio
+    async def test_subscribe_message_updates_topics(self):
+        from routers import ws as ws_router
+
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, [])
+
+        original = ws_router.manager
+        ws_router.manager = manager
+        try:
+            ws_router._handle_client_message(
+                ws, json.dumps({"action": "subscribe", "match_ids": [5], "league_ids": "39"})
+            )
+        finally:
+            ws_router.manager = original
+        await _settle()
+
+        reply = json.loads(ws.sent[-1])
+        assert reply["type"] == "subscriptions"
+        assert reply["data"]["topics"] == sorted([match_topic(5), league_topic(39)])
+
+
+# ─── Outbound queues / slow consumers ───────────────────────────────────────────
+
+class TestSlowConsumers:
+    @pytest.mark.asyncio
+    async def test_stalled_client_does_not_block_others(self):
+        manager = ConnectionManager(max_queue=4, send_timeout=60)
+        stalled, healthy = StalledWebSocket(), FakeWebSocket()
+        await manager.connect(stalled)
+        await manager.connect(healthy)
+
+        for minute in range(3):
+            manager.broadcast(f"tick-{minute}")
+        await _settle()
+
+        assert healthy.sent == ["tick-0", "tick-1", "tick-2"]
+        assert manager.stats()["queue_depth"]["max"] >= 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_backlog_downgrades_to_latest_state_per_key(self):
+        manager = ConnectionManager(max_queue=3, send_timeout=60)
+        stalled = StalledWebSocket()
+        await manager.connect(stalled)
+        manager.broadcast("first")
+        await _settle()  # writer is now stuck sending "second"
+
+        for minute in range(10):
+            manager.broadcast(f"match-1 minute {minute}", key="match:1")
+            manager.broadcast(f"match-2 minute {minute}", key="match:2")
+
+        stats = manager.stats()
+        assert stats["degraded_clients"] == 1
+        assert stats["evicted_total"] == 0
+        assert stats["queue_depth"]["max"] <= 3
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unkeyed_backlog_evicts_client(self):
+        manager = ConnectionManager(max_queue=2, send_timeout=60)
+        stalled = StalledWebSocket()
+        await manager.connect(stalled)
+
+        for index in range(6):
+            manager.broadcast(f"frame-{index}")
+        await _settle()
+
+        stats = manager.stats()
+        assert stats["evicted_total"] == 1
+        assert stats["evicted_by_reason"] == {"queue_full": 1}
+        assert stats["connections"] == 0
+        assert stalled.closed_code == 1013
+
+    @pytest.mark.asyncio
+    async def test_eviction_close_is_tracked_until_done(self):
+        closing = asyncio.Event()
+
+        class SlowCloseWebSocket(StalledWebSocket):
+            async def close(self, code=1000):
+                await closing.wait()
+                await super().close(code)
+
+        manager = ConnectionManager(max_queue=1, send_timeout=60)
+        stalled = SlowCloseWebSocket()
+        await manager.connect(stalled)
+        for index in range(4):
+            manager.broadcast(f"frame-{index}")
+        await _settle()
+
+        assert manager.stats()["evicted_total"] == 1
+        assert len(manager._close_tasks) == 1
+        closing.set()
+        await _settle()
+        assert not manager._close_tasks
+        assert stalled.closed_code == 1013
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_evicts_client(self):
+        manager = ConnectionManager(max_queue=8, send_timeout=0.01)
+        stalled = StalledWebSocket()
+        await manager.connect(stalled)
+
+        manager.broadcast("first")
+        manager.broadcast("second")
+        await asyncio.sleep(0.05)
+        await _settle()
+
+        assert manager.stats()["evicted_by_reason"] == {"send_timeout": 1}
+
+
+# ─── Broadcaster batching ───────────────────────────────────────────────────────
+
+class TestBroadcasterBatching:
+    @pytest.mark.asyncio
+    async def test_batch_is_coalesced_and_filtered_per_subscriber(self, monkeypatch):
+        from services import live_broadcaster
+
+        manager = ConnectionManager()
+        monkeypatch.setattr(live_broadcaster, "manager", manager)
+        match_fan, everything = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(match_fan, [match_topic(1)])
+        await manager.connect(everything)
+
+        live_broadcaster.publish_batch([
+            {"match_id": 1, "league_id": 39, "current_minute": 10},
+            {"match_id": 2, "league_id": 39, "current_minute": 10},
+            {"match_id": 1, "league_id": 39, "current_minute": 11},
+        ])
+        await _settle()
+
+        everything_frame = json.loads(everything.sent[-1])
+        assert everything_frame["type"] == "match_updates"
+        assert [(item["match_id"], item["current_minute"]) for item in everything_frame["data"]] == [
+            (2, 10), (1, 11)
+        ]
+        assert json.loads(match_fan.sent[-1])["data"] == [
+            {"match_id": 1, "league_id": 39, "current_minute": 11}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_thread_handoff_reaches_consumer(self, monkeypatch):
+        from services import live_broadcaster
+
+        manager = ConnectionManager()
+        monkeypatch.setattr(live_broadcaster, "manager", manager)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+
+        live_broadcaster.start_consumer()
+        try:
+            await asyncio.to_thread(
+                live_broadcaster.enqueue_match_updates,
+                [{"match_id": 7, "status": "LIVE"}, {"match_id": 7, "status": "HT"}],
+            )
+            for _ in range(50):
+                if ws.sent:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await live_broadcaster.stop_consumer()
+
+        assert json.loads(ws.sent[-1])["data"] == [{"match_id": 7, "status": "HT"}]
+
+
+# ─── Delta-only scheduler broadcasts ────────────────────────────────────────────
+
+class TestDeltaBroadcasts:
+    def _payload(self, minute, home_score=0):
+        return {
+            "match_id": 42,
+            "league_id": 39,
+            "status": "LIVE",
+            "home_score": home_score,
+            "away_score": 0,
+            "current_minute": minute,
+        }
+
+    def test_unchanged_payloads_are_suppressed_and_seq_increases(self, monkeypatch):
+        import scheduler
+
+        monkeypatch.setattr(scheduler, "_last_broadcast_state", collections.OrderedDict())
+
+        first = scheduler._select_changed_broadcasts([self._payload(10)])
+        repeat = scheduler._select_changed_broadcasts([self._payload(10)])
+        goal = scheduler._select_changed_broadcasts([self._payload(10, home_score=1)])
+
+        assert [p["seq"] for p in first] == [1]
+        assert repeat == []
+        assert [p["seq"] for p in goal] == [2]
+
+    def test_broadcast_state_is_bounded(self, monkeypatch):
+        import scheduler
+
+        monkeypatch.setattr(scheduler, "_last_broadcast_state", collections.OrderedDict())
+        monkeypatch.setattr(scheduler, "_BROADCAST_STATE_MAX", 3)
+
+        for match_id in range(10):
+            scheduler._select_changed_broadcasts([{**self._payload(10), "match_id": match_id}])
+        # Re-seen matches stay; the oldest ones are evicted.
+        scheduler._select_changed_broadcasts([{**self._payload(10), "match_id": 7}])
+        scheduler._select_changed_broadcasts([{**self._payload(10), "match_id": 10}])
+
+        assert list(scheduler._last_broadcast_state) == [9, 7, 10]
+
+    def test_resync_returns_latest_snapshot(self, monkeypatch):
+        from services import live_broadcaster
+
+        monkeypatch.setattr(live_broadcaster, "manager", ConnectionManager())
+        monkeypatch.setattr(live_broadcaster, "_latest_state", collections.OrderedDict())
+        live_broadcaster.publish_batch([{**self._payload(12), "seq": 3}])
+
+        assert live_broadcaster.snapshot([42, 999]) == [{**self._payload(12), "seq": 3}]
+
+
+# ─── Pub/sub brokers ────────────────────────────────────────────────────────────
+
+class TestLiveBrokers:
+    @pytest.mark.asyncio
+    async def test_local_socket_broker_round_trip(self):
+        from services.live_broker import LocalSocketBroker
+
+        received = []
+        broker = LocalSocketBroker(address=("127.0.0.1", 0))
+        await broker.start(asyncio.get_running_loop(), received.extend)
+        try:
+            publisher = LocalSocketBroker(address=broker.address)
+            await asyncio.to_thread(publisher.publish, [{"match_id": 1}, {"match_id": 2}])
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await broker.stop()
+
+        assert received == [{"match_id": 1}, {"match_id": 2}]
+
+    @pytest.mark.asyncio
+    async def test_in_process_broker_buffers_until_started(self):
+        from services.live_broker import InProcessBroker
+
+        received = []
+        broker = InProcessBroker()
+        broker.publish([{"match_id": 3}])
+        await broker.start(asyncio.get_running_loop(), received.extend)
+        await asyncio.to_thread(broker.publish, [{"match_id": 4}])
+        await _settle()
+        await broker.stop()
+
+        assert received == [{"match_id": 3}, {"match_id": 4}]
+
+    @pytest.mark.asyncio
+    async def test_postgres_broker_keeps_retrying_a_failed_first_connect(self, monkeypatch):
+        import socket
+
+        from services import live_broker
+
+        readable, writable = socket.socketpair()
+
+        class FakeListenConnection:
+            notifies = []
+
+            def fileno(self):
+                return readable.fileno()
+
+            def close(self):
+                pass
+
+        attempts = []
+
+        def connect_listener():
+            attempts.append(len(attempts))
+            if len(attempts) < 3:
+                raise OSError("database is starting up")
+            return FakeListenConnection()
+
+        real_sleep = asyncio.sleep
+        monkeypatch.setattr(live_broker.asyncio, "sleep", lambda _seconds: real_sleep(0))
+        broker = live_broker.PostgresNotifyBroker(engine=object())
+        monkeypatch.setattr(broker, "_connect_listener", connect_listener)
+        try:
+            await broker.start(asyncio.get_running_loop(), lambda batch: None)
+            for _ in range(50):
+                if broker._listen_conn is not None:
+                    break
+                await real_sleep(0.01)
+            assert isinstance(broker._listen_conn, FakeListenConnection)
+            assert len(attempts) == 3
+        finally:
+            await broker.stop()
+            readable.close()
+            writable.close()
+
+    @pytest.mark.asyncio
+    async def test_stopped_postgres_broker_does_not_reconnect(self, monkeypatch):
+        from services import live_broker
+
+        attempts = []
+
+        def connect_listener():
+            attempts.append(len(attempts))
+            raise OSError("database is starting up")
+
+        broker = live_broker.PostgresNotifyBroker(engine=object())
+        monkeypatch.setattr(broker, "_connect_listener", connect_listener)
+        await broker.start(asyncio.get_running_loop(), lambda batch: None)
+        retry = broker._retry_task
+        assert retry is not None and not retry.done()  # sleeping before the next attempt
+
+        await broker.stop()
+        assert retry.cancelled()
+        broker._reconnect()  # e.g. a late readable callback
+        assert broker._retry_task is None
+        await asyncio.sleep(0)
+        assert attempts == [0]
+
+    def test_chunks_respect_notify_payload_limit(self):
+        from services.live_broker import _chunk_payloads
+
+        payloads = [{"match_id": index, "status": "LIVE" * 20} for index in range(200)]
+        chunks = _chunk_payloads(payloads, 7500)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 7500 for chunk in chunks)
+        assert sum(len(json.loads(chunk)) for chunk in chunks) == 200
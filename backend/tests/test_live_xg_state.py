@@ -0,0 +1,105 @@
+"""Shared live xG state: incremental advances render what a from-scratch call does."""
+import datetime
+
+import pytest
+
+import scheduler
+from ai import xg_model
+
+KICKOFF = datetime.datetime(2026, 3, 1, 15, 0)
+
+
+@pytest.fixture
+def db(memory_sessions):
+    session = memory_sessions(xg_model.Match.metadata)()
+
+    session.add(xg_model.League(id=39, name="Premier League", country="England", logo_url=""))
+    session.add_all([
+        xg_model.Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=39)
+        for team_id in (1, 2)
+    ])
+    for i in range(8):
+        session.add(xg_model.Match(
+            id=100 + i, home_team_id=1 + i % 2, away_team_id=2 - i % 2, league_id=39,
+            start_time=KICKOFF - datetime.timedelta(days=7 * (i + 1)), status="FT",
+            home_score=i % 3, away_score=1,
+        ))
+    session.add(xg_model.Match(id=1, home_team_id=1, away_team_id=2, league_id=39, start_time=KICKOFF,
+                               status="2H", home_score=1, away_score=0, current_minute=58))
+    session.add(xg_model.MatchStatistics(match_id=1, shots_on_home=5, shots_on_away=3, shots_off_home=4,
+                                         shots_off_away=6, corners_home=3, corners_away=2,
+                                         possession_home=58, possession_away=42))
+    _add_events(session, [(1, 12, 1, "Goal", "Normal Goal"), (2, 30, 2, "Card", "Yellow Card")])
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _add_events(db, rows):
+    db.add_all([
+        xg_model.MatchEvent(id=event_id, match_id=1, minute=minute, team_id=team_id, event_type=event_type, detail=detail)
+        for event_id, minute, team_id, event_type, detail in rows
+    ])
+
+
+@pytest.fixture
+def service(tmp_path):
+    return xg_model.XGInferenceService(artifact_path=tmp_path / "missing.pkl")
+
+
+def _without_timestamp(payload):
+    return {key: value for key, value in payload.items() if key != "generated_at_utc"}
+
+
+def _assert_matches_fresh(service, db, match):
+    shared = service.predict_live_shared(db, match, force_refresh=True)
+    assert _without_timestamp(shared) == _without_timestamp(service.predict_live(db, match))
+    for minute in (0, 20, 45, 75, 120):
+        assert _without_timestamp(service.predict_live_shared(db, match, minute)) == _without_timestamp(
+            service.predict_live(db, match, minute)
+        )
+
+
+def test_incremental_advances_match_from_scratch(db, service):
+    match = db.get(xg_model.Match, 1)
+    _assert_matches_fresh(service, db, match)
+
+    # New events, one of them reported late for an earlier minute.
+    _add_events(db, [(3, 55, 2, "Goal", "Normal Goal"), (4, 20, 1, "Card", "Red Card"), (5, 57, 2, "Assist", "")])
+    db.commit()
+    _assert_matches_fresh(service, db, match)
+
+    # The feed replaced the events: the state starts over.
+    db.query(xg_model.MatchEvent).delete()
+    _add_events(db, [(6, 40, 1, "Goal", "Penalty")])
+    db.commit()
+    _assert_matches_fresh(service, db, match)
+
+
+def test_viewers_share_one_render_until_the_match_moves(db, service, monkeypatch):
+    monkeypatch.setattr(xg_model, "LIVE_XG_REFRESH_SECONDS", 3600)
+    match = db.get(xg_model.Match, 1)
+    first = service.predict_live_shared(db, match)
+
+    _add_events(db, [(3, 58, 2, "Goal", "Normal Goal")])
+    db.commit()
+    assert service.predict_live_shared(db, match) == first
+
+    match.current_minute = 59
+    assert service.predict_live_shared(db, match)["live_signals"]["away_goal_events"] == 1
+
+
+def test_live_payloads_carry_xg(db, service, monkeypatch):
+    monkeypatch.setattr(scheduler, "xg_inference_service", service)
+    payloads = [
+        {"match_id": 1, "status": "2H", "home_score": 1, "away_score": 0, "current_minute": 58},
+        {"match_id": 100, "status": "NS", "home_score": None, "away_score": None, "current_minute": None},
+    ]
+    scheduler._attach_live_xg(db, payloads)
+
+    live = service.predict_live(db, db.get(xg_model.Match, 1))
+    assert payloads[0]["xg"] == {
+        "home": live["home_current_xg"], "away": live["away_current_xg"], "minute": live["minute_context"],
+    }
+    assert "xg" not in payloads[1]
@@ -0,0 +1,77 @@
+"""Match-outcome inference: backends agree, and reloads swap whole snapshots."""
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import torch
+from sklearn.isotonic import IsotonicRegression
+from sklearn.preprocessing import StandardScaler
+
+from ai import match_outcome_inference
+from ai.model import FootballPredictor
+
+WIDTH = 9
+
+
+def _write_artifacts(tmp_path, seed):
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    model = FootballPredictor(input_size=WIDTH, hidden1=96, hidden2=48, hidden3=24, dropout=0.20)
+    torch.save(model.state_dict(), tmp_path / "football_model.pth")
+
+    train = rng.normal(loc=3.0, scale=2.0, size=(200, WIDTH)).astype(np.float32)
+    calibrators = [
+        IsotonicRegression(out_of_bounds="clip").fit(rng.random(50), rng.random(50)) for _ in range(3)
+    ]
+    with (tmp_path / "match_outcome_artifacts.pkl").open("wb") as fh:
+        pickle.dump({
+            "scaler": StandardScaler().fit(train),
+            "isotonic_calibrators": calibrators,
+            "temperature": 1.3,
+            "feature_columns": [f"f{i}" for i in range(WIDTH)],
+        }, fh)
+    return rng.normal(loc=3.0, scale=2.0, size=(64, WIDTH)).astype(np.float32)
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(match_outcome_inference, "TORCH_WEIGHTS_PATH", tmp_path / "football_model.pth")
+    monkeypatch.setattr(match_outcome_inference, "ARTIFACTS_PATH", tmp_path / "match_outcome_artifacts.pkl")
+    monkeypatch.setattr(match_outcome_inference, "RELOAD_CHECK_SECONDS", 0.0)
+    return tmp_path
+
+
+@pytest.mark.parametrize("isotonic", ["0", "1"])
+def test_backends_agree_with_torch(artifacts, monkeypatch, isotonic):
+    monkeypatch.setenv("TERRABALL_ENABLE_ISOTONIC", isotonic)
+    features = _write_artifacts(artifacts, seed=1)
+
+    expected = match_outcome_inference.MatchOutcomeInferenceService(backend="torch").predict_batch(features)
+    for backend in ("torchscript", "numpy"):
+        service = match_outcome_inference.MatchOutcomeInferenceService(backend=backend)
+        batch = service.predict_batch(features)
+        np.testing.assert_allclose(batch, expected, atol=1e-5)
+        assert service.predict(features[:1]) == pytest.approx(tuple(batch[0]), abs=1e-6)
+
+
+def test_reload_swaps_snapshot_when_artifacts_change(artifacts):
+    features = _write_artifacts(artifacts, seed=1)
+    service = match_outcome_inference.MatchOutcomeInferenceService(backend="numpy")
+    before = service.predict_batch(features)
+    first_snapshot = service._snapshot
+
+    _write_artifacts(artifacts, seed=2)
+    mtime = first_snapshot.weights_mtime + 10
+    os.utime(artifacts / "football_model.pth", (mtime, mtime))
+
+    after = service.predict_batch(features)
+    assert service._snapshot is not first_snapshot
+    assert not np.allclose(before, after)
+    np.testing.assert_allclose(
+        after, match_outcome_inference.MatchOutcomeInferenceService(backend="torch").predict_batch(features), atol=1e-5
+    )
+
+    (artifacts / "football_model.pth").unlink()
+    assert not service.is_ready()
@@ -0,0 +1,95 @@
+"""Next-event predictions reuse a per-match pre-match context across requests."""
+import datetime
+
+import pytest
+
+from sqlalchemy import event
+
+from ai import next_event_features, next_event_ranker
+
+# Models as the module under test imports them.
+League, Match, MatchEvent, Player, Team = (
+    next_event_features.League,
+    next_event_features.Match,
+    next_event_features.MatchEvent,
+    next_event_features.Player,
+    next_event_features.Team,
+)
+
+KICKOFF = datetime.datetime(2026, 3, 1, 15, 0)
+POSITIONS = ["Goalkeeper"] + ["Defender"] * 4 + ["Midfielder"] * 4 + ["Attacker"] * 4
+
+
+@pytest.fixture
+def session_factory(memory_sessions):
+    SessionLocal = memory_sessions(Match.metadata)
+    with SessionLocal() as db:
+        db.add(League(id=39, name="Premier League", country="England", logo_url=""))
+        db.add_all([Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=39) for team_id in (1, 2)])
+        player_id = 0
+        for team_id in (1, 2):
+            for i, position in enumerate(POSITIONS):
+                player_id += 1
+                db.add(Player(id=player_id, name=f"Player {team_id}{chr(65 + i)}", team_id=team_id, position=position,
+                              minutes_played=3000 - 100 * i, goals_season=i % 5, assists_season=i % 3,
+                              rating_season=6.5 + i / 10))
+        for i in range(6):
+            db.add(Match(id=100 + i, home_team_id=1 + i % 2, away_team_id=2 - i % 2, league_id=39,
+                         start_time=KICKOFF - datetime.timedelta(days=7 * (i + 1)), status="FT",
+                         home_score=i % 3, away_score=1))
+            db.add(MatchEvent(id=100 + i, match_id=100 + i, minute=20 + i, team_id=1, event_type="Goal",
+                              player_name=f"Player 1{chr(74 + i % 4)}", detail="Assist: Player 1G"))
+        db.add(Match(id=1, home_team_id=1, away_team_id=2, league_id=39, start_time=KICKOFF,
+                     status="2H", home_score=0, away_score=0, current_minute=50))
+        db.add(MatchEvent(id=1, match_id=1, minute=12, team_id=1, event_type="Goal", player_name="Player 1K"))
+        db.commit()
+    return SessionLocal
+
+
+def _predict(service, db, match):
+    payload = service.predict_for_match(db, match)
+    payload.pop("generated_at_utc")
+    return payload
+
+
+def test_cached_context_serves_live_state_with_one_query(session_factory, tmp_path):
+    service = next_event_ranker.NextEventInferenceService(artifact_path=tmp_path / "missing.pkl")
+    statements = []
+    event.listen(session_factory.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with session_factory() as db:
+        _predict(service, db, db.get(Match, 1))
+
+    # A red card and a substitution after the context was built.
+    with session_factory() as db:
+        db.add_all([
+            MatchEvent(id=2, match_id=1, minute=55, team_id=2, event_type="Card", player_name="Player 2D", detail="Red Card"),
+            MatchEvent(id=3, match_id=1, minute=60, team_id=1, event_type="subst", player_name="Player 1M",
+                       detail="Player 1M for Player 1K"),
+        ])
+        db.commit()
+
+    with session_factory() as db:
+        match = db.get(Match, 1)
+        statements.clear()
+        cached = _predict(service, db, match)
+        assert len(statements) == 1  # the match's events
+
+        fresh = _predict(next_event_ranker.NextEventInferenceService(artifact_path=tmp_path / "missing.pkl"), db, match)
+    assert cached == fresh
+    assert cached["next_goal"]["minute_context"] == 60
+    assert "Player 1K" not in {candidate["player_name"] for candidate in cached["next_goal"]["top_candidates"]}
+
+
+def test_context_is_rebuilt_when_the_fixture_changes(session_factory, tmp_path):
+    service = next_event_ranker.NextEventInferenceService(artifact_path=tmp_path / "missing.pkl")
+
+    with session_factory() as db:
+        match = db.get(Match, 1)
+        _predict(service, db, match)
+        first = service._contexts[1][1]
+
+        match.start_time = KICKOFF - datetime.timedelta(days=10)
+        _predict(service, db, match)
+        assert service._contexts[1][1] is not first
+        assert service._contexts[1][1].key == (1, match.start_time, 1, 2)
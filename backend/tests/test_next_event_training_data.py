@@ -0,0 +1,95 @@
+"""Bulk-loaded, parallel next-event training frames match the session builder and are cached."""
+import datetime
+
+import pandas as pd
+import pytest
+
+from ai import next_event_features, next_event_training_data
+
+League, Match, MatchEvent, Player, Standing, Team = (
+    next_event_features.League,
+    next_event_features.Match,
+    next_event_features.MatchEvent,
+    next_event_features.Player,
+    next_event_features.Standing,
+    next_event_features.Team,
+)
+
+KICKOFF = datetime.datetime(2025, 8, 1, 15, 0)
+POSITIONS = ["Goalkeeper"] + ["Defender"] * 4 + ["Midfielder"] * 4 + ["Attacker"] * 4
+TEAMS = (1, 2, 3, 4)
+
+
+@pytest.fixture
+def db(memory_sessions):
+    session = memory_sessions(Match.metadata)()
+
+    session.add(League(id=39, name="Premier League", country="England", logo_url=""))
+    session.add_all([Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=39) for team_id in TEAMS])
+    session.add(Standing(id=1, league_id=39, team_id=4, played=10, points=18, goals_for=15, goals_against=8,
+                         goal_difference=7))
+    player_id = 0
+    for team_id in TEAMS:
+        for i, position in enumerate(POSITIONS):
+            player_id += 1
+            session.add(Player(id=player_id, name=f"Player {team_id}{chr(65 + i)}", team_id=team_id, position=position,
+                               minutes_played=3000 - 150 * i, goals_season=i % 5, assists_season=i % 3,
+                               rating_season=6.5 + i / 10))
+
+    # Two kickoffs a day, so the per-day caches see several matches.
+    event_id = 0
+    for match_id in range(1, 25):
+        home, away = TEAMS[match_id % 4], TEAMS[(match_id + 1 + match_id // 4) % 4]
+        if home == away:
+            away = TEAMS[(match_id + 2) % 4]
+        session.add(Match(id=match_id, home_team_id=home, away_team_id=away, league_id=39,
+                          start_time=KICKOFF + datetime.timedelta(days=match_id // 2, hours=3 * (match_id % 2)),
+                          status="FT", home_score=match_id % 3, away_score=match_id % 2))
+        for j in range(match_id % 4 + 1):
+            event_id += 1
+            team_id = home if j % 2 == 0 else away
+            session.add(MatchEvent(id=event_id, match_id=match_id, minute=10 + 17 * j, team_id=team_id,
+                                   event_type="Goal", player_name=f"Player {team_id}{chr(74 + (match_id + j) % 4)}",
+                                   detail=f"Assist: Player {team_id}{chr(69 + j)}"))
+        event_id += 1
+        session.add(MatchEvent(id=event_id, match_id=match_id, minute=60, team_id=home, event_type="subst",
+                               player_name=f"Player {home}M", detail=f"Player {home}M for Player {home}K"))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _session_frames(db):
+    builder = next_event_features.NextEventFeatureBuilder(db)
+    return {task: builder.build_training_frame(task) for task in next_event_training_data.TASKS}
+
+
+def test_snapshot_frames_match_the_session_builder(db):
+    expected = _session_frames(db)
+    snapshot = next_event_training_data.load_training_snapshot(db)
+
+    for workers in (1, 3):
+        frames = next_event_training_data.build_training_frames(snapshot, workers=workers)
+        for task in next_event_training_data.TASKS:
+            assert len(expected[task]) > 0
+            pd.testing.assert_frame_equal(frames[task], expected[task])
+
+
+def test_frames_are_cached_until_the_data_changes(db, tmp_path, monkeypatch):
+    first = next_event_training_data.cached_training_frames(db, workers=1, cache_dir=tmp_path)
+
+    build = next_event_training_data.build_training_frames
+    monkeypatch.setattr(next_event_training_data, "build_training_frames", None)
+    cached = next_event_training_data.cached_training_frames(db, workers=1, cache_dir=tmp_path)
+    for task in next_event_training_data.TASKS:
+        pd.testing.assert_frame_equal(cached[task], first[task])
+
+    # A player stats sync changes the features: rebuilt, and the old files go.
+    db.get(Player, 1).goals_season = 9
+    db.commit()
+    monkeypatch.setattr(next_event_training_data, "build_training_frames", build)
+    rebuilt = next_event_training_data.cached_training_frames(db, workers=1, cache_dir=tmp_path)
+    for task in next_event_training_data.TASKS:
+        pd.testing.assert_frame_equal(rebuilt[task], _session_frames(db)[task])
+    assert len(list(tmp_path.iterdir())) == len(next_event_training_data.TASKS)
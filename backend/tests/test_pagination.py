@@ -0,0 +1,105 @@
+"""Cursor pages walk a listing exactly like one big offset page does."""
+import datetime
+
+import pytest
+
+from routers import api, news_router
+
+KICKOFF = datetime.datetime(2026, 5, 1, 15, 0)
+
+
+@pytest.fixture
+def client(memory_sessions, api_client):
+    SessionLocal = memory_sessions(api.Match.metadata)
+
+    with SessionLocal() as db:
+        db.add(api.League(id=39, name="Premier League", country="England", logo_url=""))
+        # Repeated names and kickoffs: the id has to break the ties.
+        db.add_all([
+            api.Team(id=team_id, name=f"Team {team_id % 5}", logo_url="", stadium="", league_id=39)
+            for team_id in range(1, 13)
+        ])
+        db.add_all([
+            api.Player(id=player_id, name=f"Player {player_id % 7}", position="Midfielder", team_id=1)
+            for player_id in range(1, 24)
+        ])
+        db.add_all([
+            api.Match(
+                id=match_id, home_team_id=match_id % 12 + 1, away_team_id=(match_id + 5) % 12 + 1,
+                league_id=39, start_time=KICKOFF + datetime.timedelta(hours=match_id // 3),
+                status="FT" if match_id % 4 else "NS",
+            )
+            for match_id in range(1, 27)
+        ])
+        db.add_all([
+            news_router.NewsArticle(
+                id=article_id, title=f"Article {article_id}", summary="", content="", news_type="post_match",
+                dedupe_key=f"article-{article_id}", is_published=True,
+                created_at=KICKOFF + datetime.timedelta(hours=article_id // 2),
+            )
+            for article_id in range(1, 12)
+        ])
+        db.commit()
+
+    api.pagination.totals.clear()
+    return api_client(SessionLocal, api, news_router)
+
+
+def _walk_envelope(client, url):
+    ids, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if cursor is None:
+            return ids
+
+
+def _walk_headers(client, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("query", ["order=asc", "order=desc", "order=desc&status=finished"])
+def test_live_matches_cursor_walk_matches_offset_listing(client, query):
+    expected = [item["id"] for item in client.get(f"/api/v1/live-matches?limit=200&{query}").json()["items"]]
+    assert len(expected) > 4
+    assert _walk_envelope(client, f"/api/v1/live-matches?limit=4&{query}") == expected
+
+    second = client.get(f"/api/v1/live-matches?limit=4&offset=4&{query}").json()
+    assert [item["id"] for item in second["items"]] == expected[4:8]
+
+
+@pytest.mark.parametrize("url, limit", [
+    ("/api/v1/teams", 200), ("/api/v1/players", 100), ("/api/v1/editorial", 100), ("/api/v1/editorial/feed", 50),
+])
+def test_list_endpoints_cursor_walk_matches_full_listing(client, url, limit):
+    expected = [row["id"] for row in client.get(f"{url}?limit={limit}").json()]
+    assert len(expected) > 3
+    assert _walk_headers(client, f"{url}?limit=3") == expected
+
+
+def test_totals_are_optional_and_bad_cursors_are_rejected(client):
+    page = client.get("/api/v1/live-matches?limit=2&include_total=false").json()
+    assert page["total"] is None and page["has_more"] and page["next_cursor"]
+
+    assert client.get("/api/v1/live-matches?cursor=not-a-cursor").status_code == 400
+    assert client.get(f"/api/v1/live-matches?offset=2&cursor={page['next_cursor']}").status_code == 400
+    # A (name, id) key is not a match key.
+    player_cursor = client.get("/api/v1/players?limit=2").headers["X-Next-Cursor"]
+    assert client.get(f"/api/v1/live-matches?cursor={player_cursor}").status_code == 400
+
+
+def test_relative_windows_share_a_cached_total():
+    statements = [
+        api.read_queries.live_matches_statements(None, "finished", None, None, 7, 1, 30, 0, "asc")[1]
+        for _ in range(2)
+    ]
+    assert api.pagination.TotalCache.key(statements[0]) == api.pagination.TotalCache.key(statements[1])
@@ -0,0 +1,72 @@
+"""Round-trip budgets for list endpoints (guards against N+1 regressions)."""
+import datetime
+
+import pytest
+
+from sqlalchemy import event
+
+from routers import api
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, _conn, _cursor, statement, *_args):
+        self.statements.append(statement)
+
+    def reset(self):
+        self.statements.clear()
+
+
+@pytest.fixture
+def live_matches_client(memory_sessions, api_client):
+    SessionLocal = memory_sessions(api.Match.metadata)
+
+    kickoff = datetime.datetime(2026, 5, 1, 15, 0)
+    with SessionLocal() as db:
+        db.add(api.League(id=39, name="Premier League", country="England", logo_url=""))
+        db.add_all([
+            api.Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=39)
+            for team_id in range(1, 21)
+        ])
+        for match_id in range(1, 61):
+            db.add(api.Match(
+                id=match_id,
+                home_team_id=match_id % 20 + 1,
+                away_team_id=(match_id + 7) % 20 + 1,
+                league_id=39,
+                start_time=kickoff + datetime.timedelta(hours=match_id),
+                status="NS",
+            ))
+            db.add(api.Prediction(
+                id=match_id, match_id=match_id, home_win_prob=40.0,
+                draw_prob=30.0, away_win_prob=30.0, confidence_score=0.5,
+            ))
+        db.commit()
+
+    return api_client(SessionLocal), QueryCounter(SessionLocal.kw["bind"])
+
+
+def test_live_matches_query_count_is_independent_of_page_size(live_matches_client):
+    client, counter = live_matches_client
+
+    counts = {}
+    for limit in (5, 60):
+        api.pagination.totals.clear()
+        counter.reset()
+        response = client.get(f"/api/v1/live-matches?limit={limit}")
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert len(items) == limit
+        assert all(item["prediction"] is not None for item in items)
+        counts[limit] = len(counter.statements)
+
+    # total + page + predictions (one IN query) + teams (one IN query)
+    assert counts[5] == counts[60] == 4
+
+    # The total is cached per filter; the next page only reads rows.
+    counter.reset()
+    assert client.get("/api/v1/live-matches?limit=60").json()["total"] == 60
+    assert len(counter.statements) == 3
@@ -0,0 +1,162 @@
+"""EXPLAIN regression suite: the hot query shapes must stay on their indexes.
+
+Runs `scripts.query_plans.SHAPES` against a Postgres seeded at production-like
+row counts (about ten seasons of fixtures across 500 competitions). Needs a
+disposable database: set ``QUERY_PLAN_DATABASE_URL`` (e.g.
+``postgresql://postgres@localhost/football_plans``). Everything is created
+in a scratch schema that is dropped afterwards. Skipped when the variable
+is unset.
+"""
+import os
+import pathlib
+import re
+
+import pytest
+
+from sqlalchemy import create_engine, text
+
+from scripts import query_plans
+
+DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="QUERY_PLAN_DATABASE_URL is not set")
+
+MIGRATION = pathlib.Path(__file__).resolve().parents[1] / "scripts" / "migrations" / "2026_06_hot_query_indexes.sql"
+
+# 500 leagues of 20 teams, 400k fixtures 13 minutes apart (the last 10k
+# upcoming, the last 20 of those live), 3 events per result.
+SEED = (
+    """
+    INSERT INTO leagues (id, name, country, logo_url)
+    SELECT g, 'League ' || g, 'Country', '' FROM generate_series(1, 500) AS g
+    """,
+    """
+    INSERT INTO teams (id, name, logo_url, stadium, league_id)
+    SELECT g, 'Team ' || g, '', '', 1 + (g - 1) / 20 FROM generate_series(1, 10000) AS g
+    """,
+    """
+    INSERT INTO players (id, name, position, team_id)
+    SELECT g, 'Player ' || g, 'Midfielder', 1 + (g - 1) % 10000 FROM generate_series(1, 200000) AS g
+    """,
+    """
+    INSERT INTO matches (id, league_id, home_team_id, away_team_id, start_time, status, home_score, away_score, stage)
+    SELECT g,
+           1 + g % 500,
+           (g % 500) * 20 + 1 + (g / 500) % 20,
+           (g % 500) * 20 + 1 + (g / 500 + 1 + (g / 10000) % 19) % 20,
+           timestamp '2016-01-01' + g * interval '13 minutes',
+           CASE WHEN g > 399980 THEN '2H' WHEN g > 390000 THEN 'NS' ELSE 'FT' END,
+           CASE WHEN g > 390000 AND g <= 399980 THEN NULL ELSE g % 4 END,
+           CASE WHEN g > 390000 AND g <= 399980 THEN NULL ELSE g % 3 END,
+           CASE WHEN g % 500 < 10 AND g % 7 = 0 THEN 'LAST_16' ELSE 'REGULAR_SEASON' END
+    FROM generate_series(1, 400000) AS g
+    """,
+    """
+    INSERT INTO team_matches (match_id, team_id, is_home, start_time, status, goals_for, goals_against, league_id)
+    SELECT id, home_team_id, TRUE, start_time, status, home_score, away_score, league_id FROM matches
+    UNION ALL
+    SELECT id, away_team_id, FALSE, start_time, status, away_score, home_score, league_id FROM matches
+    """,
+    """
+    INSERT INTO match_events (id, match_id, minute, event_type, player_name, detail)
+    SELECT g, 1 + (g - 1) / 3, (g * 37) % 95, CASE WHEN g % 3 = 0 THEN 'Card' ELSE 'Goal' END,
+           'Player ' || g % 1000, ''
+    FROM generate_series(1, 1170000) AS g
+    """,
+    """
+    INSERT INTO predictions (id, match_id, home_win_prob, draw_prob, away_win_prob, confidence_score)
+    SELECT g, g, 40, 30, 30, 0.5 FROM generate_series(1, 400000) AS g
+    """,
+    """
+    INSERT INTO standings (id, league_id, team_id, rank, points, played, won, drawn, lost, goals_for,
+                           goals_against, goal_difference)
+    SELECT g, 1 + (g - 1) % 500, 1 + (g - 1) % 10000, 1 + g % 20, g % 90, 38, g % 30, g % 8, g % 10, g % 80,
+           g % 70, g % 80 - g % 70
+    FROM generate_series(1, 50000) AS g
+    """,
+    """
+    INSERT INTO league_table_entries (league_id, season, team_id, played, won, drawn, lost, goals_for,
+                                      goals_against, points, form)
+    SELECT 1 + (g - 1) / 20, s, g, 0, 0, 0, 0, 0, 0, 0, ''
+    FROM generate_series(1, 10000) AS g CROSS JOIN generate_series(2016, 2025) AS s
+    """,
+    """
+    INSERT INTO team_elo_snapshots (id, team_id, match_id, pre_match_elo, post_match_elo, is_home, snapshot_at)
+    SELECT m.id * 2 - 1 + s.side, CASE s.side WHEN 0 THEN m.home_team_id ELSE m.away_team_id END, m.id,
+           1500, 1500, s.side = 0, m.start_time
+    FROM matches AS m CROSS JOIN (VALUES (0), (1)) AS s(side)
+    WHERE m.status = 'FT'
+    """,
+    """
+    INSERT INTO news_articles (id, title, summary, content, news_type, dedupe_key, is_published, created_at)
+    SELECT g, 'Title ' || g, '', '', 'post_match', 'article-' || g, g % 10 <> 0,
+           timestamp '2024-01-01' + g * interval '10 minutes'
+    FROM generate_series(1, 50000) AS g
+    """,
+)
+
+
+def _migration_indexes(path):
+    return re.findall(r"CREATE INDEX CONCURRENTLY IF NOT EXISTS (\w+)", path.read_text())
+
+
+def _statements(path):
+    for chunk in path.read_text().split(";"):
+        lines = [line for line in chunk.splitlines() if line.strip() and not line.strip().startswith("--")]
+        if lines:
+            yield "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(DATABASE_URL)
+    schema = f"query_plans_{os.getpid()}"
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        conn.commit()
+        try:
+            # The models declare the migration's indexes too: start from the
+            # tables as they were before it, so the migration builds them.
+            query_plans.Match.metadata.create_all(conn)
+            for name in _migration_indexes(MIGRATION):
+                conn.execute(text(f"DROP INDEX {name}"))
+            for statement in SEED:
+                conn.execute(text(statement))
+            conn.commit()
+
+            # The migration must apply cleanly on top (CONCURRENTLY needs autocommit).
+            autocommit = conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in _statements(MIGRATION):
+                autocommit.exec_driver_sql(statement)
+            for table in query_plans.Match.metadata.sorted_tables:
+                autocommit.exec_driver_sql(f"ANALYZE {table.name}")
+
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def sample(connection):
+    return query_plans.load_sample(connection)
+
+
+def test_migration_builds_valid_indexes(connection):
+    names = _migration_indexes(MIGRATION)
+    valid = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_index AS i JOIN pg_class AS c ON c.oid = i.indexrelid "
+            "WHERE c.relname = ANY(:names) AND i.indisvalid AND c.relnamespace = current_schema()::regnamespace"
+        ),
+        {"names": names},
+    ).scalars().all()
+    assert sorted(valid) == sorted(names)
+
+
+@pytest.mark.parametrize("shape", query_plans.SHAPES, ids=lambda shape: shape.name)
+def test_shape_reads_through_an_index(connection, sample, shape):
+    plan = query_plans.explain(connection, shape.build(sample))
+    assert query_plans.sequential_scans(plan, shape.tables) == [], plan
@@ -0,0 +1,143 @@
+"""Set-based fixture persistence in the scheduler."""
+import copy
+import datetime
+import sys
+
+import pytest
+
+from sqlalchemy import event
+
+import scheduler
+
+# The cache instance the scheduler reports its writes to.
+reference_cache = sys.modules[scheduler.note_reference_writes.__module__].reference_cache
+
+
+@pytest.fixture
+def session_factory(memory_sessions, monkeypatch):
+    factory = memory_sessions(scheduler.Match.metadata)
+
+    calls = []
+    monkeypatch.setattr(scheduler, "sync_team_matches", lambda db, rows: None)
+    monkeypatch.setattr(scheduler, "refresh_league_tables", lambda db, changes: calls.append(("tables", len(changes))))
+    monkeypatch.setattr(scheduler, "refresh_elo", lambda db, since: calls.append(("elo", since)) or {})
+    monkeypatch.setattr(scheduler, "refresh_team_form", lambda db, changes: calls.append(("form", dict(changes))))
+    monkeypatch.setattr(scheduler, "bump_data_version", lambda db: calls.append(("bump",)))
+    monkeypatch.setattr(
+        scheduler, "refresh_tournament_projections", lambda db, league_ids: calls.append(("tournaments", set(league_ids)))
+    )
+    monkeypatch.setattr(scheduler, "SessionLocal", factory)
+    monkeypatch.setattr(scheduler, "_stale_form", {})
+    monkeypatch.setattr(scheduler, "_stale_tournaments", set())
+    statements = []
+    event.listen(factory.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    factory.calls = calls
+    factory.statements = statements
+    return factory
+
+
+def test_full_season_sync_is_a_handful_of_statements(session_factory, feed_fixture):
+    feed = [feed_fixture(match_id, 1 + match_id % 10, 11 + match_id % 10) for match_id in range(1, 381)]
+    feed.append(copy.deepcopy(feed[0]))  # overlapping date windows
+
+    with session_factory() as db:
+        scanned, inserted, updated, broadcasts = scheduler._persist_matches(db, feed)
+        db.commit()
+    assert (scanned, inserted, updated, broadcasts) == (381, 380, 0, [])
+    # Prefetch + upsert for leagues, teams and matches.
+    assert len(session_factory.statements) == 6
+
+    session_factory.statements.clear()
+    with session_factory() as db:
+        assert scheduler._persist_matches(db, feed) == (381, 0, 0, [])
+    assert len(session_factory.statements) == 3
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in session_factory.statements)
+
+    with session_factory() as db:
+        assert db.query(scheduler.Match).count() == 380
+        assert db.query(scheduler.Team).count() == 20
+        assert db.get(scheduler.Match, 1).start_time == datetime.datetime(2026, 3, 1, 15, 0)
+
+
+def test_changed_fixtures_update_counts_broadcasts_and_form(session_factory, feed_fixture):
+    with session_factory() as db:
+        scheduler._persist_matches(db, [feed_fixture(1, 1, 2), feed_fixture(2, 3, 4)])
+        db.commit()
+    with session_factory() as db:
+        assert reference_cache.get_team(db, 4).name == "Team 4"
+    session_factory.calls.clear()
+    session_factory.statements.clear()
+
+    feed = [
+        feed_fixture(1, 1, 2, status="FINISHED", score=(2, 1)),
+        feed_fixture(2, 3, 4),
+        feed_fixture(3, 1, 3, status="IN_PLAY", score=(0, 0), minute=12),
+    ]
+    feed[1]["awayTeam"]["name"] = "Renamed FC"
+    with session_factory() as db:
+        scanned, inserted, updated, broadcasts = scheduler._persist_matches(db, feed)
+        db.commit()
+
+    assert (scanned, inserted, updated) == (3, 1, 1)
+    assert broadcasts == [
+        {"match_id": 1, "league_id": 2021, "status": "FT", "home_score": 2, "away_score": 1, "current_minute": None},
+        {"match_id": 3, "league_id": 2021, "status": "LIVE", "home_score": 0, "away_score": 0, "current_minute": 12},
+    ]
+    kickoff = datetime.datetime(2026, 3, 1, 15, 0)
+    assert session_factory.calls == [("tables", 2), ("bump",)]
+    # Only the league is unchanged: teams and matches are upserted.
+    assert len(session_factory.statements) == 5
+
+    with session_factory() as db:
+        assert reference_cache.get_team(db, 4).name == "Renamed FC"
+        match = db.get(scheduler.Match, 1)
+        assert (match.status, match.home_score, match.away_score) == ("FT", 2, 1)
+        assert db.get(scheduler.Match, 3).current_minute == 12
+
+    # Elo and form are replayed after the commit, by the derived-data job.
+    session_factory.calls.clear()
+    scheduler.refresh_derived_data()
+    assert session_factory.calls == [("elo", kickoff), ("form", {1: kickoff, 2: kickoff}), ("bump",)]
+
+
+def test_derived_data_is_refreshed_after_the_sync_commits(session_factory, feed_fixture):
+    group_result = feed_fixture(1, 1, 2, status="FINISHED", score=(1, 0), league_id=2000, group="GROUP_A")
+    with session_factory() as db:
+        scheduler._persist_matches(db, [group_result])
+        assert ("tournaments", {2000}) not in session_factory.calls
+        db.rollback()
+    scheduler.refresh_derived_data()
+    assert not any(call[0] == "tournaments" for call in session_factory.calls)
+
+    with session_factory() as db:
+        scheduler._persist_matches(db, [group_result])
+        db.commit()
+    session_factory.calls.clear()
+    scheduler.refresh_derived_data()
+    kickoff = datetime.datetime(2026, 3, 1, 15, 0)
+    assert session_factory.calls == [
+        ("elo", kickoff), ("form", {1: kickoff, 2: kickoff}), ("bump",), ("tournaments", {2000}), ("bump",)
+    ]
+
+    session_factory.calls.clear()
+    scheduler.refresh_derived_data()
+    assert session_factory.calls == []
+
+
+def test_failed_elo_refresh_is_retried(session_factory, feed_fixture, monkeypatch):
+    with session_factory() as db:
+        scheduler._persist_matches(db, [feed_fixture(1, 1, 2, status="FINISHED", score=(2, 1))])
+        db.commit()
+
+    def failing_refresh(db, since):
+        raise RuntimeError("replay failed")
+
+    monkeypatch.setattr(scheduler, "refresh_elo", failing_refresh)
+    scheduler.refresh_derived_data()
+    kickoff = datetime.datetime(2026, 3, 1, 15, 0)
+    assert scheduler._stale_form == {1: kickoff, 2: kickoff}
+
+    monkeypatch.setattr(scheduler, "refresh_elo", lambda db, since: {})
+    scheduler.refresh_derived_data()
+    assert scheduler._stale_form == {}
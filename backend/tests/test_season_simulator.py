@@ -0,0 +1,126 @@
+"""Season simulator and the cached /league/{id}/projections endpoint."""
+import datetime
+
+import numpy as np
+import pytest
+
+from routers import api
+
+season_simulator = api.season_simulator
+
+KICKOFF = datetime.datetime(2026, 3, 1, 15, 0)
+LAST_SEASON = datetime.datetime(2025, 3, 1, 15, 0)
+
+
+def test_certain_results_give_certain_positions():
+    # Team 3 wins both remaining games: it overtakes team 2 and draws level
+    # with team 1 on points, but stays behind it (current table order).
+    state = season_simulator.SeasonState(
+        team_ids=(1, 2, 3, 4),
+        points=np.array([10, 9, 4, 1], dtype=np.float32),
+        home_index=np.array([2, 2]),
+        away_index=np.array([1, 3]),
+        probabilities=np.array([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]]),
+    )
+    counts, points_sum = season_simulator.simulate_season_positions(state, 5000, seed=1)
+
+    assert (counts == 5000 * np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]])).all()
+    assert (points_sum / 5000).tolist() == [10, 9, 10, 1]
+
+
+@pytest.fixture
+def session_factory(memory_sessions):
+    SessionLocal = memory_sessions(api.Match.metadata)
+
+    with SessionLocal() as db:
+        db.add_all([
+            api.League(id=39, name="Premier League", country="England", logo_url=""),
+            api.League(id=2000, name="World Cup", country="World", logo_url=""),
+            api.League(id=2001, name="Champions League", country="Europe", logo_url=""),
+        ])
+        db.add_all([
+            api.Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=39)
+            for team_id in range(1, 7)
+        ])
+        match_id = 0
+        for home in range(1, 7):
+            for away in range(1, 7):
+                if home == away:
+                    continue
+                match_id += 1
+                finished = match_id <= 15
+                db.add(api.Match(
+                    id=match_id, home_team_id=home, away_team_id=away, league_id=39,
+                    start_time=KICKOFF + datetime.timedelta(days=match_id),
+                    status="FT" if finished else "NS",
+                    home_score=(home + away) % 3 if finished else None,
+                    away_score=home % 2 if finished else None,
+                ))
+                if not finished and match_id % 2:
+                    db.add(api.Prediction(match_id=match_id, home_win_prob=0.5, draw_prob=0.3,
+                                          away_win_prob=0.2, confidence_score=0.5))
+        # Last season: a result that must not count and a fixture never played.
+        db.add(api.Match(id=996, home_team_id=1, away_team_id=2, league_id=39,
+                         start_time=LAST_SEASON, status="FT", home_score=5, away_score=0))
+        db.add(api.Match(id=997, home_team_id=3, away_team_id=4, league_id=39,
+                         start_time=LAST_SEASON, status="NS"))
+        # A European tie between two of the league's clubs earns no league points.
+        db.add(api.Match(id=998, home_team_id=1, away_team_id=2, league_id=2001,
+                         start_time=KICKOFF, status="NS", stage="LAST_16"))
+        db.add(api.Match(id=999, home_team_id=101, away_team_id=102, league_id=2000,
+                         start_time=KICKOFF, status="NS", stage="GROUP_STAGE", group_name="Group A"))
+        db.commit()
+
+    return SessionLocal
+
+
+@pytest.fixture
+def client(session_factory, api_client):
+    return api_client(session_factory)
+
+
+def test_projections_endpoint(client, monkeypatch):
+    monkeypatch.setattr(season_simulator, "DEFAULT_SIMULATIONS", 2000)
+    response = client.get("/api/v1/league/39/projections")
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["simulations"] == 2000
+    assert body["remaining_fixtures"] == 15
+    positions = np.array([team["positions"] for team in body["teams"]])
+    np.testing.assert_allclose(positions.sum(axis=0), 1.0, atol=1e-3)
+    np.testing.assert_allclose(positions.sum(axis=1), 1.0, atol=1e-3)
+    for team in body["teams"]:
+        assert team["title"] == team["positions"][0]
+        assert team["points"] <= team["expected_points"] <= team["points"] + 3 * (10 - team["played"])
+
+    # Undeclared parameters (the old `simulations` included) hit the same entry.
+    monkeypatch.setattr(season_simulator, "project_league", None)
+    cached = client.get(
+        "/api/v1/league/39/projections?simulations=100000&x=1",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+
+    assert client.get("/api/v1/league/2000/projections").status_code == 404
+    assert client.get("/api/v1/league/12345/projections").status_code == 404
+
+
+@pytest.mark.parametrize("materialized", [False, True])
+def test_projections_start_from_the_current_season(session_factory, monkeypatch, materialized):
+    monkeypatch.setattr(season_simulator, "DEFAULT_SIMULATIONS", 500)
+    with session_factory() as db:
+        if materialized:
+            api.league_tables.rebuild_league_tables(db, [39])
+            db.commit()
+        body = api.get_league_projections.__wrapped__(39, db)
+
+    assert body["season"] == 2025
+    assert body["remaining_fixtures"] == 15
+    # 15 results this season, two teams each; last season's 5-0 is not among them.
+    assert sum(team["played"] for team in body["teams"]) == 30
+    with session_factory() as db:
+        current = api._compute_league_standings(39, db, season=2025)
+    assert {team["team_id"]: team["points"] for team in body["teams"]} == {
+        row["team_id"]: row["points"] for row in current
+    }
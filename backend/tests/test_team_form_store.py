@@ -0,0 +1,160 @@
+"""Team form store: store-backed features equal the ad-hoc query features."""
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from ai import match_outcome_features, team_form_store, xg_model
+from ai.elo import EloEngine, EloMatchInput
+from ai.next_event_features import NextEventFeatureBuilder
+
+# Resolve the models through the module under test so both share one registry.
+League, Match, MatchStatistics, Team, TeamEloSnapshot, TeamFormSnapshot = (
+    xg_model.League, xg_model.Match, xg_model.MatchStatistics, xg_model.Team,
+    match_outcome_features.TeamEloSnapshot, team_form_store.TeamFormSnapshot,
+)
+
+KICKOFF = datetime.datetime(2025, 8, 1, 15, 0)
+SNAPSHOT_COLUMNS = [
+    column.name for column in TeamFormSnapshot.__table__.columns if column.name not in {"id", "updated_at"}
+]
+
+
+def _seed(db, rng, first_id, count, finished_until):
+    for match_id in range(first_id, first_id + count):
+        home, away = rng.sample(range(1, 11), 2)
+        start_time = KICKOFF + datetime.timedelta(days=match_id // 2, hours=rng.choice([0, 0, 3]))
+        finished = match_id < finished_until
+        db.add(Match(
+            id=match_id, home_team_id=home, away_team_id=away, league_id=39 if home < 9 else 999,
+            start_time=start_time, status="FT" if finished else "NS",
+            home_score=rng.randint(0, 4) if finished and match_id % 23 else None,
+            away_score=rng.randint(0, 3) if finished and match_id % 23 else None,
+        ))
+        if finished and rng.random() < 0.6:
+            db.add(MatchStatistics(
+                match_id=match_id, possession_home=rng.choice([None, 45, 58]), possession_away=42,
+                shots_on_home=rng.randint(0, 9), shots_on_away=rng.randint(0, 9),
+                shots_off_home=rng.randint(0, 9), shots_off_away=rng.choice([None, 4]),
+                corners_home=rng.randint(0, 9), corners_away=rng.randint(0, 9),
+            ))
+
+
+def _replay_elo(db):
+    db.query(TeamEloSnapshot).delete()
+    engine = EloEngine()
+    finished = (
+        db.query(Match)
+        .filter(Match.status == "FT", Match.home_score.isnot(None), Match.away_score.isnot(None))
+        .order_by(Match.start_time.asc(), Match.id.asc())
+        .all()
+    )
+    for match in finished:
+        update = engine.update_from_match(EloMatchInput(
+            match.id, match.home_team_id, match.away_team_id, match.home_score, match.away_score,
+        ))
+        for team_id, pre, post, is_home in (
+            (match.home_team_id, update.home_pre, update.home_post, True),
+            (match.away_team_id, update.away_pre, update.away_post, False),
+        ):
+            db.add(TeamEloSnapshot(team_id=team_id, match_id=match.id, pre_match_elo=pre,
+                                   post_match_elo=post, is_home=is_home, snapshot_at=match.start_time))
+    db.flush()
+
+
+@pytest.fixture
+def db(memory_sessions):
+    SessionLocal = memory_sessions(Match.metadata)
+
+    with SessionLocal() as session:
+        session.add_all([
+            League(id=39, name="Premier League", country="England"),
+            League(id=999, name="Regional Cup", country="Nowhere"),
+        ])
+        session.add_all([Team(id=team_id, name=f"Team {team_id}", league_id=39 if team_id < 9 else 999)
+                         for team_id in range(1, 11)])
+        _seed(session, random.Random(3), first_id=1, count=160, finished_until=140)
+        session.flush()
+        # Strong opponents exist so form_vs_strong is exercised.
+        _replay_elo(session)
+        session.query(TeamEloSnapshot).filter(TeamEloSnapshot.team_id.in_([1, 2])).update(
+            {TeamEloSnapshot.post_match_elo: TeamEloSnapshot.post_match_elo + 150.0},
+            synchronize_session=False,
+        )
+        team_form_store.rebuild_team_form_store(session)
+        session.commit()
+        yield session
+
+
+def _without_store(monkeypatch, compute):
+    with monkeypatch.context() as patch:
+        patch.setattr(team_form_store, "ENABLED", False)
+        return compute()
+
+
+def test_store_backed_features_equal_query_features(db, monkeypatch):
+    matches = db.query(Match).filter(Match.id >= 40).order_by(Match.id).all()
+    served_from_store = 0
+
+    for match in matches:
+        expected = _without_store(monkeypatch, lambda: match_outcome_features.build_inference_features(db, match))
+        actual = match_outcome_features.build_inference_features(db, match)
+        assert np.array_equal(actual, expected), match.id
+
+        for team_id in (match.home_team_id, match.away_team_id):
+            assert (
+                xg_model.XGFeatureBuilder(db, use_feature_store=True)._aggregate_team_context(team_id, match.start_time, 12)
+                == xg_model.XGFeatureBuilder(db)._aggregate_team_context(team_id, match.start_time, 12)
+            )
+            assert (
+                NextEventFeatureBuilder(db, use_feature_store=True)._team_prior(team_id, match.start_time)
+                == NextEventFeatureBuilder(db)._team_prior(team_id, match.start_time)
+            )
+            served_from_store += team_form_store.latest_team_form(db, team_id, match.start_time) is not None
+
+    assert served_from_store == 2 * len(matches)
+
+
+def test_batch_feature_matrix_equals_per_match_features(db, monkeypatch):
+    matches = db.query(Match).order_by(Match.id).all()
+    scored, matrix = match_outcome_features.build_inference_feature_matrix(db, matches)
+
+    assert [m.id for m in scored] == [m.id for m in matches]
+    for match, row in zip(scored, matrix):
+        assert np.array_equal(row, match_outcome_features.build_inference_features(db, match)[0]), match.id
+        expected = _without_store(monkeypatch, lambda: match_outcome_features.build_inference_features(db, match))
+        assert np.array_equal(row, expected[0]), match.id
+
+
+def test_incremental_refresh_matches_full_rebuild(db):
+    # A late result in the middle of the season, plus a corrected score.
+    late = Match(id=500, home_team_id=3, away_team_id=4, league_id=39, status="FT",
+                 start_time=KICKOFF + datetime.timedelta(days=30, hours=1), home_score=5, away_score=0)
+    db.add(late)
+    corrected = db.get(Match, 60)
+    corrected.home_score = (corrected.home_score or 0) + 2
+
+    changes = {}
+    team_form_store.note_form_change(changes, (3, 4), late.start_time)
+    team_form_store.note_form_change(changes, (corrected.home_team_id, corrected.away_team_id), corrected.start_time)
+    team_form_store.refresh_team_form(db, changes)
+
+    def snapshot_rows():
+        return sorted(
+            tuple(getattr(row, name) for name in SNAPSHOT_COLUMNS)
+            for row in db.query(TeamFormSnapshot).all()
+        )
+
+    incremental = snapshot_rows()
+    team_form_store.rebuild_team_form_store(db)
+    assert incremental == snapshot_rows()
+
+
+def test_note_form_change_accepts_provider_and_stored_kickoffs():
+    stored = datetime.datetime(2026, 5, 1, 15, 0)
+    provider = datetime.datetime(2026, 5, 1, 16, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+
+    changes = {}
+    team_form_store.note_form_change(changes, (1, None), stored, provider)
+    assert changes == {1: datetime.datetime(2026, 5, 1, 14, 0)}
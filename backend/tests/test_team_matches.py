@@ -0,0 +1,89 @@
+"""`team_matches` follows every match write and answers team-history queries like the OR scan."""
+import datetime
+import sys
+
+import pytest
+
+import scheduler
+
+team_matches = sys.modules[scheduler.sync_team_matches.__module__]
+Match, TeamMatch = team_matches.Match, team_matches.TeamMatch
+
+KICKOFF = datetime.datetime(2026, 3, 1, 15, 0)
+
+
+@pytest.fixture
+def db(memory_sessions):
+    session = memory_sessions(Match.metadata)()
+    for match_id in range(1, 31):
+        finished = match_id <= 24
+        session.add(Match(
+            id=match_id, home_team_id=1 + match_id % 4, away_team_id=1 + (match_id + 1 + match_id // 4 % 3) % 4,
+            league_id=39, start_time=KICKOFF + datetime.timedelta(days=match_id // 2),
+            status="FT" if finished else "NS",
+            home_score=match_id % 3 if finished and match_id % 7 else None,
+            away_score=match_id % 2 if finished else None,
+        ))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _stored_rows(db):
+    return sorted(
+        (row.match_id, row.team_id, row.is_home, row.start_time, row.status, row.goals_for, row.goals_against)
+        for row in db.query(TeamMatch)
+    )
+
+
+def _expected_rows(db):
+    columns = [getattr(Match, column) for column in team_matches.SOURCE_COLUMNS]
+    return sorted(
+        (row["match_id"], row["team_id"], row["is_home"], row["start_time"], row["status"], row["goals_for"],
+         row["goals_against"])
+        for match in db.query(*columns)
+        for row in team_matches.team_match_rows(match._mapping)
+    )
+
+
+def test_rows_follow_orm_and_scheduler_writes(db):
+    assert _stored_rows(db) == _expected_rows(db)
+
+    match = db.get(Match, 25)
+    match.status, match.home_score, match.away_score = "FT", 2, 2
+    match.away_team_id = 1 if match.home_team_id != 1 else 2
+    db.delete(db.get(Match, 30))
+    db.commit()
+    assert _stored_rows(db) == _expected_rows(db)
+
+    scheduler.sync_team_matches(db, [{
+        "id": 26, "home_team_id": 4, "away_team_id": 3, "start_time": KICKOFF, "status": "FT",
+        "home_score": 1, "away_score": 0, "league_id": 39,
+    }])
+    assert {(row.team_id, row.is_home, row.goals_for) for row in db.query(TeamMatch).filter_by(match_id=26)} == {
+        (4, True, 1), (3, False, 0),
+    }
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"limit": 10},
+    {"limit": 15, "scored": True},
+    {"limit": 5, "scored": True, "is_home": True},
+    {"limit": 5, "scored": True, "is_home": False},
+    {"limit": 30, "exclude_match_id": 12},
+    {"limit": 30, "statuses": ("NS",), "before": None},
+])
+def test_recent_team_matches_matches_the_or_scan(db, monkeypatch, kwargs):
+    kwargs = {"before": KICKOFF + datetime.timedelta(days=11), **kwargs}
+    indexed = {
+        team_id: [match.id for match in team_matches.recent_team_matches(db, team_id, **kwargs)]
+        for team_id in range(1, 5)
+    }
+    monkeypatch.setattr(team_matches, "_table_available", lambda _db: False)
+    scanned = {
+        team_id: [match.id for match in team_matches.recent_team_matches(db, team_id, **kwargs)]
+        for team_id in range(1, 5)
+    }
+    assert indexed == scanned
+    assert any(indexed.values())
@@ -0,0 +1,105 @@
+"""Tournament simulator and the precomputed /league/{id}/bracket/projections endpoint."""
+import datetime
+import itertools
+
+import pytest
+
+from routers import api
+
+tournament_simulator = api.tournament_simulator
+
+KICKOFF = datetime.datetime(2026, 6, 11, 18, 0)
+LEAGUE_ID = 2000
+
+
+@pytest.fixture
+def session_factory(memory_sessions):
+    SessionLocal = memory_sessions(api.Match.metadata)
+
+    # Two finished groups of four; the lower id always wins, so the tables
+    # read 1, 2, 3, 4 and 5, 6, 7, 8.
+    with SessionLocal() as db:
+        db.add_all([
+            api.League(id=LEAGUE_ID, name="World Cup", country="World", logo_url=""),
+            api.League(id=39, name="Premier League", country="England", logo_url=""),
+        ])
+        db.add_all([
+            api.Team(id=team_id, name=f"Team {team_id}", logo_url="", stadium="", league_id=LEAGUE_ID)
+            for team_id in range(1, 9)
+        ])
+        match_id = 0
+        for group, teams in (("Group A", range(1, 5)), ("Group B", range(5, 9))):
+            for home, away in itertools.combinations(teams, 2):
+                match_id += 1
+                db.add(api.Match(
+                    id=match_id, home_team_id=home, away_team_id=away, league_id=LEAGUE_ID,
+                    start_time=KICKOFF + datetime.timedelta(days=match_id), status="FT",
+                    home_score=2, away_score=0, stage="GROUP_STAGE", group_name=group,
+                ))
+        db.commit()
+
+    return SessionLocal
+
+
+def _add_knockout(db, match_id, stage, home, away, status="NS", score=(None, None), probabilities=None):
+    db.add(api.Match(
+        id=match_id, home_team_id=home, away_team_id=away, league_id=LEAGUE_ID,
+        start_time=KICKOFF + datetime.timedelta(days=match_id), status=status,
+        home_score=score[0], away_score=score[1], stage=stage,
+    ))
+    if probabilities is not None:
+        home_win, draw, away_win = probabilities
+        db.add(api.Prediction(match_id=match_id, home_win_prob=home_win, draw_prob=draw,
+                              away_win_prob=away_win, confidence_score=0.5))
+
+
+def _rounds(projection):
+    return {team["team_id"]: team["rounds"] for team in projection["teams"]}
+
+
+def test_group_winners_and_runners_up_fill_the_bracket(session_factory):
+    with session_factory() as db:
+        projection = tournament_simulator.project_tournament(db, LEAGUE_ID, n_simulations=4000)
+
+    assert [r["stage"] for r in projection["rounds"]] == ["SEMI_FINALS", "FINAL", "WINNER"]
+    rounds = _rounds(projection)
+    assert {team_id for team_id, r in rounds.items() if r["SEMI_FINALS"] == 1.0} == {1, 2, 5, 6}
+    assert all(rounds[team_id]["SEMI_FINALS"] == 0.0 for team_id in (3, 4, 7, 8))
+    assert sum(r["FINAL"] for r in rounds.values()) == pytest.approx(2.0, abs=1e-3)
+    assert sum(r["WINNER"] for r in rounds.values()) == pytest.approx(1.0, abs=1e-3)
+    for r in rounds.values():
+        assert r["SEMI_FINALS"] >= r["FINAL"] >= r["WINNER"]
+
+
+def test_finished_ties_and_extra_time(session_factory):
+    with session_factory() as db:
+        _add_knockout(db, 101, "SEMI_FINALS", 1, 6, status="FT", score=(3, 1))
+        # Level after extra time: team 5 plays the final, so it won on penalties.
+        _add_knockout(db, 102, "SEMI_FINALS", 2, 5, status="PEN", score=(1, 1))
+        # A certain draw after 90 minutes: extra time and penalties are even.
+        _add_knockout(db, 103, "FINAL", 1, 5, probabilities=(0.0, 1.0, 0.0))
+        db.commit()
+        rounds = _rounds(tournament_simulator.project_tournament(db, LEAGUE_ID, n_simulations=20000))
+
+    assert rounds[1]["FINAL"] == rounds[5]["FINAL"] == 1.0
+    assert rounds[2]["FINAL"] == rounds[6]["FINAL"] == 0.0
+    assert rounds[1]["WINNER"] == pytest.approx(0.5, abs=0.02)
+    assert rounds[1]["WINNER"] + rounds[5]["WINNER"] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_endpoint_serves_the_stored_projection(session_factory, api_client, monkeypatch):
+    with session_factory() as db:
+        tournament_simulator.refresh_tournament_projections(db, [LEAGUE_ID, 39])
+        db.commit()
+
+    # Serving must never simulate.
+    monkeypatch.setattr(tournament_simulator, "simulate_tournament", None)
+    client = api_client(session_factory)
+    response = client.get(f"/api/v1/league/{LEAGUE_ID}/bracket/projections")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["simulations"] == tournament_simulator.DEFAULT_SIMULATIONS
+    assert body["computed_at"]
+    assert {team["team_id"] for team in body["teams"]} == set(range(1, 9))
+
+    assert client.get("/api/v1/league/39/bracket/projections").status_code == 404
@@ -0,0 +1,89 @@
+"""Parity between the bulk xG training frame and the row-by-row reference builder."""
+import datetime
+import random
+
+import pandas as pd
+import pytest
+
+from sqlalchemy import event
+
+from ai import xg_model
+
+# Resolve the models through the module under test so both share one registry.
+League, Match, MatchStatistics, Team = (
+    xg_model.League, xg_model.Match, xg_model.MatchStatistics, xg_model.Team
+)
+
+
+@pytest.fixture
+def session(memory_sessions):
+    SessionLocal = memory_sessions(Match.metadata)
+
+    rng = random.Random(7)
+    kickoff = datetime.datetime(2025, 8, 1, 15, 0)
+    with SessionLocal() as db:
+        db.add_all([
+            League(id=39, name="Premier League", country="England"),
+            League(id=2, name="UEFA Champions League", country="World"),
+            League(id=999, name="Regional Cup", country="Nowhere"),
+        ])
+        league_for = {team_id: 39 for team_id in range(1, 9)}
+        league_for.update({9: 2, 10: 999, 11: 999, 12: None})
+        db.add_all([Team(id=team_id, name=f"Team {team_id}", league_id=league_id)
+                    for team_id, league_id in league_for.items()])
+
+        statuses = ["FT"] * 8 + ["AET", "PEN", "NS"]
+        for match_id in range(1, 241):
+            home, away = rng.sample(range(1, 13), 2)
+            # Several matches share a kickoff so tie ordering is exercised.
+            start_time = kickoff + datetime.timedelta(days=match_id // 3, hours=rng.choice([0, 0, 2]))
+            status = rng.choice(statuses)
+            finished = status != "NS"
+            db.add(Match(
+                id=match_id, home_team_id=home, away_team_id=away, league_id=league_for[home],
+                start_time=start_time, status=status,
+                home_score=rng.randint(0, 4) if finished else None,
+                away_score=rng.randint(0, 3) if finished and match_id % 29 else None,
+            ))
+            if finished and rng.random() < 0.6:
+                db.add(MatchStatistics(
+                    match_id=match_id,
+                    possession_home=rng.choice([None, 40, 55, 61]),
+                    possession_away=rng.choice([None, 39, 45, 60]),
+                    shots_on_home=rng.randint(0, 9), shots_on_away=rng.choice([None, 2, 5]),
+                    shots_off_home=rng.randint(0, 9), shots_off_away=rng.randint(0, 9),
+                    corners_home=rng.choice([None, 3, 7]), corners_away=rng.randint(0, 10),
+                ))
+        db.commit()
+
+    with SessionLocal() as db:
+        yield db
+
+
+@pytest.mark.parametrize("history_window", [3, 5, 12])
+def test_bulk_frame_matches_row_by_row_builder(session, history_window):
+    config = xg_model.XGTrainingConfig(history_window=history_window)
+
+    expected = xg_model.XGFeatureBuilder(session).build_proxy_training_frame_rowwise(config)
+    actual = xg_model.XGFeatureBuilder(session).build_proxy_training_frame(config)
+
+    assert len(expected) > 100
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def test_bulk_frame_query_count_is_constant(session):
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        frame = xg_model.XGFeatureBuilder(session).build_proxy_training_frame(xg_model.XGTrainingConfig())
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not frame.empty
+    # leagues, teams, matches, statistics
+    assert len(statements) == 4
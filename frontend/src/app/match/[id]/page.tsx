@@ -87,11 +87,11 @@ function MatchPageErrorState({
 export default function MatchDetailsPage() {
     const params = useParams();
     const queryClient = useQueryClient();
-    const lastMessage = useWebSocket(WS_URL);
 
     const successToastShown = useRef(false);
     const lastErrorToast = useRef<string | null>(null);
     const lastPartialToastKey = useRef('');
+    const lastLiveSeq = useRef<number | null>(null);
 
     const matchId = useMemo(() => {
         const rawId = Array.isArray(params.id) ? params.id[0] : params.id;
@@ -100,6 +100,9 @@ export default function MatchDetailsPage() {
         return Number.isFinite(parsed) ? parsed : null;
     }, [params.id]);
 
+    // Only subscribe to this match's topic instead of the whole live slate.
+    const lastMessage = useWebSocket(matchId ? `${WS_URL}?match_id=${matchId}` : WS_URL);
+
     const query = useQuery({
         queryKey: ['match-experience', matchId],
         queryFn: () => getMatchExperience(matchId as number),
@@ -186,8 +189,25 @@ export default function MatchDetailsPage() {
     }, [query.data]);
 
     useEffect(() => {
-        if (!matchId || !lastMessage || lastMessage.type !== 'match_update') return;
-        if (Number(lastMessage?.data?.match_id) !== matchId) return;
+        if (!matchId || !lastMessage) return;
+
+        // The live channel sends coalesced batches (`match_updates`); keep
+        // accepting single `match_update` frames as well.
+        const updates = lastMessage.type === 'match_updates'
+            ? (Array.isArray(lastMessage.data) ? lastMessage.data : [])
+            : lastMessage.type === 'match_update' ? [lastMessage.data] : [];
+        const update = updates.find((item: any) => Number(item?.match_id) === matchId);
+        if (!update) return;
+
+        // `seq` increases by one per broadcast for this match; a jump means
+        // we missed an update, so resync the whole header from the API.
+        if (typeof update.seq === 'number') {
+            const previousSeq = lastLiveSeq.current;
+            lastLiveSeq.current = update.seq;
+            if (previousSeq !== null && update.seq > previousSeq + 1) {
+                queryClient.invalidateQueries({ queryKey: ['match-experience', matchId] });
+            }
+        }
 
         queryClient.setQueryData<MatchExperience>(['match-experience', matchId], (current) => {
             if (!current) return current;
@@ -196,19 +216,19 @@ export default function MatchDetailsPage() {
                 ...current,
                 header: {
                     ...current.header,
-                    status: lastMessage.data.status || current.header.status,
+                    status: update.status || current.header.status,
                     current_minute:
-                        typeof lastMessage.data.current_minute === 'number'
-                            ? lastMessage.data.current_minute
+                        typeof update.current_minute === 'number'
+                            ? update.current_minute
                             : current.header.current_minute,
                     score: {
                         home:
-                            typeof lastMessage.data.home_score === 'number'
-                                ? lastMessage.data.home_score
+                            typeof update.home_score === 'number'
+                                ? update.home_score
                                 : current.header.score.home,
                         away:
-                            typeof lastMessage.data.away_score === 'number'
-                                ? lastMessage.data.away_score
+                            typeof update.away_score === 'number'
+                                ? update.away_score
                                 : current.header.score.away,
                     },
                 },
@@ -29,6 +29,7 @@ interface TabState {
     loading: boolean;
     error: string | null;
     hasMore: boolean;
+    nextCursor: string | null;
 }
 
 const emptyTabState: TabState = {
@@ -38,6 +39,7 @@ const emptyTabState: TabState = {
     loading: false,
     error: null,
     hasMore: true,
+    nextCursor: null,
 };
 
 const tabOrder: Record<MatchTab, 'asc' | 'desc'> = {
@@ -111,7 +113,7 @@ export default function Home() {
                     limit: 1,
                     offset: 0,
                     signal: aborter.signal,
-                }).then((res) => ({ tab, total: res.total }))
+                }).then((res) => ({ tab, total: res.total ?? 0 }))
             )
         )
             .then((results) => {
@@ -194,11 +196,12 @@ export default function Home() {
                     ...prev,
                     [tab]: {
                         items: res.items,
-                        total: res.total,
+                        total: res.total ?? 0,
                         loadedKey: key,
                         loading: false,
                         error: null,
                         hasMore: res.has_more,
+                        nextCursor: res.next_cursor,
                     },
                 }));
             })
@@ -272,7 +275,7 @@ export default function Home() {
                                 ...res.items,
                                 ...prev.live.items.slice(res.items.length),
                             ],
-                            total: res.total,
+                            total: res.total ?? prev.live.total,
                         },
                     }));
                     // Drop cached events for these live matches so the next
@@ -305,7 +308,10 @@ export default function Home() {
             status: tab,
             leagueId: selectedLeague,
             limit: PAGE_SIZE,
-            offset: state.items.length,
+            // Follow the cursor so deep pages cost the same as the first;
+            // the tab count is already known.
+            ...(state.nextCursor ? { cursor: state.nextCursor } : { offset: state.items.length }),
+            includeTotal: false,
             order: tabOrder[tab],
         })
             .then((res) => {
@@ -313,11 +319,12 @@ export default function Home() {
                     ...prev,
                     [tab]: {
                         items: [...prev[tab].items, ...res.items],
-                        total: res.total,
+                        total: prev[tab].total,
                         loadedKey: prev[tab].loadedKey,
                         loading: false,
                         error: null,
                         hasMore: res.has_more,
+                        nextCursor: res.next_cursor,
                     },
                 }));
             })
@@ -313,10 +313,13 @@ export type MatchStatusGroup = "live" | "upcoming" | "finished";
 
 export interface PaginatedMatches {
   items: Match[];
-  total: number;
+  // null when requested with includeTotal: false.
+  total: number | null;
   limit: number;
   offset: number;
   has_more: boolean;
+  // Pass as `cursor` to fetch the next page; null on the last one.
+  next_cursor: string | null;
 }
 
 export interface GetLiveMatchesParams {
@@ -324,6 +327,8 @@ export interface GetLiveMatchesParams {
   leagueId?: number;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  includeTotal?: boolean;
   order?: "asc" | "desc";
   daysBack?: number;
   daysForward?: number;
@@ -338,6 +343,8 @@ export async function getLiveMatches(
   if (typeof params.leagueId === "number") search.set("league_id", String(params.leagueId));
   if (typeof params.limit === "number") search.set("limit", String(params.limit));
   if (typeof params.offset === "number") search.set("offset", String(params.offset));
+  if (params.cursor) search.set("cursor", params.cursor);
+  if (params.includeTotal === false) search.set("include_total", "false");
   if (params.order) search.set("order", params.order);
   if (typeof params.daysBack === "number") search.set("days_back", String(params.daysBack));
   if (typeof params.daysForward === "number") search.set("days_forward", String(params.daysForward));
@@ -355,6 +362,7 @@ export async function getLiveMatches(
       limit: payload.length,
       offset: 0,
       has_more: false,
+      next_cursor: null,
     };
   }
   return payload as PaginatedMatches;